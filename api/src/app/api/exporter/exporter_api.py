@@ -16,15 +16,18 @@ def init(app, get_db):
                      request: Request,
                      skip: int = 0,
                      limit: int = 100,
+                     format: str = "xlsx",
                      db: Session = Depends(get_db)):
         try:
             user_id = request.state.user_id
+            if format not in export_service.FORMATS:
+                raise HTTPException(status_code=400, detail="format must be one of {}".format(list(export_service.FORMATS)))
             if user_service.is_user_org_admin(org_id, user_id, db):
-                # Create a StreamingResponse
-                output = export_service.export_data(org_id)
-                response = StreamingResponse(output,
-                                             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-                response.headers["Content-Disposition"] = "attachment; filename=data.xlsx"
+                # Stream the spooled export file in chunks
+                _, media_type, file_name = export_service.FORMATS[format]
+                output = export_service.export_data(org_id, format)
+                response = StreamingResponse(export_service.iter_file(output), media_type=media_type)
+                response.headers["Content-Disposition"] = "attachment; filename={}".format(file_name)
                 return response
         except exception_service.BadRequestException as e:
             logger.error({"request_id": request.state.request_id, "detail": e.to_json()})
@@ -1,9 +1,13 @@
 
-from app.api.filter.antlr.dqqlVisitor import DqqlVisitor
+from app.api.filter.antlr.dqqlVisitor import DqqlVisitor, parse
 
 def get_sql(filter_str: str, tags: list, org_id: int, user_id: int, db_schema: str):
+    return get_sql_from_tree(parse(filter_str), tags, org_id, user_id, db_schema)
+
+
+def get_sql_from_tree(tree, tags: list, org_id: int, user_id: int, db_schema: str):
     visitor = DqqlVisitor(db_schema, tags)
-    sqlSelect = visitor.build_full_sql_clause(filter_str)
+    sqlSelect = visitor.build_sql_clause(tree)
     dynamic_columns = visitor.build_dynamic_columns("root")
 
     sqlSelect = add_security_to_sql(
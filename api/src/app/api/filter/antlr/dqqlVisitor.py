@@ -8,6 +8,25 @@ from app.api.filter.antlr.path_service import convert_path_to_sql, is_path
 from app.model.sqlalchemy.source_object_model import EntityTag
 
 TAG_COLUMN_MAPPING = EntityTag.get_all_column_names()
+
+
+def tokenize(filter_str: str) -> CommonTokenStream:
+    """Lex the whole filter up front; the parser would otherwise lex lazily while parsing"""
+    stream = CommonTokenStream(dqql_grammarLexer(InputStream(filter_str)))
+    stream.fill()
+    return stream
+
+
+def parse_tokens(stream: CommonTokenStream):
+    parser = dqql_grammarParser(stream)
+    parser.addErrorListener(AntlrErrorListener())
+    return parser.expr()
+
+
+def parse(filter_str: str):
+    return parse_tokens(tokenize(filter_str))
+
+
 class DqqlVisitor(dqql_grammarVisitor):
     def __init__(self, db_schema, tags):
         self.tags = tags
@@ -120,6 +139,9 @@ class DqqlVisitor(dqql_grammarVisitor):
         self.sql_header_tables = number_of_tables
     
     def build_full_sql_clause(self, filter_str):
+        return self.build_sql_clause(parse(filter_str))
+
+    def build_sql_clause(self, tree):
 
         def build_subquery():
             sub_query = ""
@@ -129,12 +151,6 @@ class DqqlVisitor(dqql_grammarVisitor):
                 sub_query = "ORDER BY et.entity_id, et.tag_id"
             return sub_query
         
-        data = InputStream(filter_str)
-        lexer = dqql_grammarLexer(data)
-        stream = CommonTokenStream(lexer)
-        parser = dqql_grammarParser(stream)
-        parser.addErrorListener(AntlrErrorListener())
-        tree = parser.expr()
         self.visit(tree)
         sqlQuery = self.sqlSelect + ' where ' + self.sqlWhere + ')'
         dynamic_columns = self.build_dynamic_columns("et")
@@ -4,7 +4,7 @@ import logging
 from app.api.filter.antlr.antlr_service import get_sql
 from app.model.pydantic.filter import filter_schema, value_schema
 from app.model.sqlalchemy.source_object_model import EntityTag
-from app.services import config_service, exception_service
+from app.services import config_service, exception_service, json_response_service, value_service
 from app.services.acl import org_service
 from fastapi import HTTPException
 from sqlalchemy import text
@@ -13,6 +13,7 @@ from sqlalchemy.exc import ProgrammingError
 logger = logging.getLogger(__name__)
 
 TAG_COLUMN_MAPPING = EntityTag.get_all_column_names()
+VALUE_FIELDS = json_response_service.schema_fields(value_schema.Value)
 
 def generate_entity_data(rs, tags):
     result = defaultdict(lambda: {"entity_id": None, "tags": []})
@@ -69,17 +70,12 @@ def get_values(db, req_filter: value_schema.ValueRequest, user: int):
         sql_template = get_aggregation_values_query()
     else:
         sql_template = get_values_query()
-    entity_ids = ""
-    value_table = ""
-    for entity in entities:
-        entity_ids += str(entity[0]) + ","
-        value_table = entity[1]
+    entity_ids = ",".join(str(entity["entity_id"]) for entity in entities)
     if entity_ids != "":
-        entity_ids = entity_ids[:-1]
+        value_table = value_service.get_org_tables(db, req_filter.org_id).value_table
         sql = attach_query_variables(sql_template, req_filter, entity_ids, value_table)
-        rs = db.execute(text(sql)).fetchall()
-        for row in rs:
-            result.append(row)
+        rs = db.execute(text(sql))
+        result = json_response_service.project_rows(VALUE_FIELDS, rs.keys(), rs)
     return result
 
 
@@ -4,8 +4,9 @@ from sqlalchemy.orm import Session
 from app.api.filter.filter import filter_objects, get_values, get_variable_values
 from app.api.filter.antlr.antlr_error_listener import AntlrError
 from app.services.acl import user_service
+from app.services import json_response_service
 import traceback
-import json
+import orjson
 import logging
 from app.services.acl import user_service
 
@@ -20,7 +21,7 @@ def init(app, get_db):
                             ):
         try:
             user_id = request.state.user_id
-            return filter_objects(db=db, req_filter=filter, user=user_id)
+            return json_response_service.RowsResponse(filter_objects(db=db, req_filter=filter, user=user_id))
         except AntlrError as e:
             logger.error({"request_id": request.state.request_id, "error_message": str(e)})
             traceback.print_exc()
@@ -34,13 +35,13 @@ def init(app, get_db):
     async def get_values_for_filtered_points(request: Request,
                                              db: Session = Depends(get_db)):
         try:
-            filterDict = json.loads(await request.body())
+            filterDict = orjson.loads(await request.body())
 
             filter = value_schema.ValueRequest.parse_obj(filterDict)
 
             user_id = request.state.user_id
             result = get_values(db=db, req_filter=filter, user=user_id)
-            return result
+            return json_response_service.RowsResponse(result)
         except AntlrError as e:
             logger.error({"request_id": request.state.request_id, "error_message": str(e)})
             traceback.print_exc()
@@ -54,7 +55,7 @@ def init(app, get_db):
     async def get_var_values(request: Request,
                              db: Session = Depends(get_db)):
         try:
-            filter_dict = json.loads(await request.body())
+            filter_dict = orjson.loads(await request.body())
             req_filter = value_schema.ValueRequest.parse_obj(filter_dict)
             user_id = request.state.user_id
             result = get_variable_values(db=db, req_filter=req_filter, user=user_id)
@@ -2,7 +2,7 @@ from fastapi import Depends, HTTPException,Request
 import traceback
 from app.model.pydantic.filter import value_schema
 from app.dto.source_objects import value_dto
-from app.services import exception_service
+from app.services import exception_service, json_response_service
 from sqlalchemy.orm import Session
 import logging
 from app.services.acl import user_service
@@ -78,7 +78,7 @@ def init(app, get_db):
         try:
             user_id = request.state.user_id
             db_value = value_dto.get_values_by_object(db, org_id, entity_id, user_id = user_id, skip=skip, limit=limit)
-            return db_value
+            return json_response_service.RowsResponse(db_value)
         except exception_service.BadRequestException as e:
             logger.error({"request_id": request.state.request_id, "detail": e.to_json()})
             traceback.print_exc()
@@ -100,8 +100,8 @@ def init(app, get_db):
         try:
             user_id = request.state.user_id
             default_user_id = request.state.default_user_id
-            return value_dto.get_values_for_points(
-                db=db , value=value, user_id=user_id)
+            return json_response_service.RowsResponse(value_dto.get_values_for_points(
+                db=db , value=value, user_id=user_id))
         except exception_service.BadRequestException as e:
             logger.error({"request_id": request.state.request_id, "detail": e.to_json()})
             traceback.print_exc()
@@ -3,15 +3,43 @@ from fastapi import Depends, HTTPException, Request
 import json
 from app.api.filter.antlr.antlr_error_listener import AntlrError
 from app.services import config_service
+from app.services.acl import app_user_service
+from app.services.value_current_buffer import buffer as value_current_buffer
+from app.services.value_table_registry import registry as value_table_registry
+from app.services.tracing_service import tracer
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 import traceback
 
 logger = logging.getLogger(__name__)
-def init(app):
+def init(app, get_db):
     @app.get("/health", status_code=200)
     def get_app_health():
         return {"status":"ok"}
 
+    @app.get("/health/value-current-buffer", status_code=200)
+    def get_value_current_buffer_health():
+        """Write-behind buffer for current values: pending entities and flush counters"""
+        return value_current_buffer.get_stats()
+
+    @app.get("/health/value-tables", status_code=200)
+    def get_value_table_registry_health():
+        """Org -> value table registry: routed orgs, value_dict capability and refresh counters"""
+        return value_table_registry.get_stats()
+
+    @app.get("/system/performance", status_code=200)
+    def get_performance_stats(request: Request, limit: int = 20, db: Session = Depends(get_db)):
+        """Per-route p50/p95/p99 latency and phase timings, and the most expensive SQL fingerprints (app admins)"""
+        if app_user_service.is_user_app_admin(db, request.state.user_id):
+            return tracer.get_stats(limit)
+
+    @app.delete("/system/performance", status_code=200)
+    def reset_performance_stats(request: Request, db: Session = Depends(get_db)):
+        """Start a new measurement window (app admins)"""
+        if app_user_service.is_user_app_admin(db, request.state.user_id):
+            tracer.reset()
+            return {"status": "ok"}
+
     @app.get("/health/databases", status_code=200)
     def get_database_health(request: Request):
         """Check health status of all configured databases"""
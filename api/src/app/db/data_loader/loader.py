@@ -1,6 +1,8 @@
 import csv
+import io
 import os
 import json
+import time
 
 from app.db.database import Database
 from app.model.sqlalchemy import source_object_model
@@ -11,6 +13,56 @@ from app.model.sqlalchemy import history_model
 import logging
 
 logger = logging.getLogger(__name__)
+
+# Bulk bootstrap: CSV headers that differ from the column they load into
+BULK_COLUMN_RENAMES = {"object_id": "entity_id"}
+# Columns the row-by-row loaders default to an empty array/object instead of NULL
+BULK_EMPTY_DEFAULTS = {"value_list": "{}", "value_dict": "{}"}
+BULK_BATCH_ROWS = 50000
+
+
+def quote_table(table):
+    return ".".join('"{}"'.format(part) for part in (table.schema, table.name) if part)
+
+
+def to_array_literal(values):
+    return "{" + ",".join('"{}"'.format(v.replace("\\", "\\\\").replace('"', '\\"')) for v in values) + "}"
+
+
+def get_copy_columns(table, header):
+    """(csv header, table column) pairs for the CSV columns the table has."""
+    columns = []
+    for field in header or []:
+        column = BULK_COLUMN_RENAMES.get(field, field)
+        if column in table.c:
+            columns.append((field, column))
+    return columns
+
+
+def to_copy_rows(rows, columns, converters=None):
+    """CSV dict rows -> tuples for COPY; empty strings become NULL or the column's empty default."""
+    converters = converters or {}
+    for row in rows:
+        values = []
+        for field, column in columns:
+            value = row[field]
+            if value == "" or value is None:
+                value = BULK_EMPTY_DEFAULTS.get(column)
+            elif column in converters:
+                value = converters[column](value)
+            values.append(value)
+        yield values
+
+
+def to_copy_buffer(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow(["\\N" if v is None else v for v in row])
+    buffer.seek(0)
+    return buffer
+
+
 class DataLoader():
     def __init__(
             self,
@@ -73,6 +125,135 @@ class DataLoader():
         #self.loadOrgTagPermissions()
         self.loadOrgEntityPermissions()
 
+    def get_bulk_load_plan(self):
+        """Tables in dependency order with the CSV snapshot each is loaded from."""
+        return [
+            (acl_user_model.User, self.__user_file_path),
+            (acl_org_model.Org, self.__org_file_path),
+            (source_object_model.TagDef, self.__tag_def_file_path),
+            (source_object_model.TagDefEnum, self.__tag_def_enum_file_path),
+            (source_object_model.TagMeta, self.__tag_meta_file_path),
+            (aggregate_model.TagHierarchy, self.__tag_hierarchy_file_path),
+            (source_object_model.Entity, self.__entity_file_path),
+            (source_object_model.EntityTag, self.__tag_entity_tag_file_path),
+            (acl_org_model.OrgUser, self.__org_user_file_path),
+            (acl_org_model.OrgAdmin, self.__org_admin_file_path),
+            (acl_org_model.OrgTagPermission, self.__org_tag_permissions_file_path),
+            (acl_org_model.OrgEntityPermission, self.__org_entity_permissions_file_path),
+            (history_model.TagDefHistory, self.__tag_def_h_file_path),
+            (history_model.TagDefEnumHistory, self.__tag_def_enum_h_file_path),
+            (history_model.TagMetaHistory, self.__tag_meta_h_file_path),
+            (history_model.TagHierarchyHistory, self.__tag_hierarchy_h_file_path),
+            (history_model.EntityTagHistory, self.__tag_entity_tag_h_file_path),
+        ]
+
+    def bulk_load(self):
+        """Bootstrap every CSV snapshot with COPY in a single transaction.
+
+        Each file is streamed into a staging table and inserted with
+        ON CONFLICT DO NOTHING, so rows that already exist are skipped the
+        way the row-by-row loaders skip them. A table that fails is rolled
+        back to its savepoint and reported; the others still load. Sequences
+        are reset and references validated once, after all tables.
+        """
+        connection = self.__database_service.get_engine().raw_connection()
+        report = {"tables": {}}
+        loaded = []
+        try:
+            cursor = connection.cursor()
+            for model, file_name in self.get_bulk_load_plan():
+                table = model.__table__
+                cursor.execute("SAVEPOINT bulk_load_table")
+                try:
+                    report["tables"][table.name] = self.bulk_load_table(cursor, table, file_name)
+                    cursor.execute("RELEASE SAVEPOINT bulk_load_table")
+                    loaded.append(table)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_load_table")
+                    logger.error("Bulk load of {} from {} failed: {}".format(table.name, file_name, e))
+                    report["tables"][table.name] = {"error": str(e)}
+            report["sequences"] = self.reset_sequences(cursor, loaded)
+            report["invalid_references"] = self.validate_references(cursor, loaded)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        logger.info("Bulk CSV bootstrap finished: {}".format(report))
+        return report
+
+    def bulk_load_table(self, cursor, table, file_name):
+        if not os.path.exists(file_name):
+            return {"skipped": "file not found"}
+        started = time.monotonic()
+        target = quote_table(table)
+        converters = {"pref_unit": self.convertPrefUnit}
+        with open(file_name, newline="") as csvfile:
+            reader = csv.DictReader(csvfile, delimiter=",", skipinitialspace=True)
+            columns = get_copy_columns(table, reader.fieldnames)
+            column_list = ", ".join('"{}"'.format(column) for _, column in columns)
+            cursor.execute("DROP TABLE IF EXISTS pg_temp.bulk_stage")
+            cursor.execute("CREATE TEMP TABLE bulk_stage (LIKE {}) ON COMMIT DROP".format(target))
+            copy_sql = "COPY bulk_stage ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')".format(column_list)
+            staged = 0
+            batch = []
+            for row in to_copy_rows(reader, columns, converters):
+                batch.append(row)
+                if len(batch) >= BULK_BATCH_ROWS:
+                    cursor.copy_expert(copy_sql, to_copy_buffer(batch))
+                    staged += len(batch)
+                    batch = []
+            if batch:
+                cursor.copy_expert(copy_sql, to_copy_buffer(batch))
+                staged += len(batch)
+        cursor.execute("INSERT INTO {target} ({columns}) SELECT {columns} FROM bulk_stage ON CONFLICT DO NOTHING".format(
+            target=target, columns=column_list))
+        inserted = cursor.rowcount
+        cursor.execute("DROP TABLE pg_temp.bulk_stage")
+        elapsed = time.monotonic() - started
+        logger.info("Bulk loaded {}: {} rows, {} already present, {:.1f}s ({:.0f} rows/sec)".format(
+            table.name, inserted, staged - inserted, elapsed, staged / elapsed if elapsed > 0 else 0))
+        return {"rows": staged, "inserted": inserted, "skipped": staged - inserted, "seconds": round(elapsed, 3)}
+
+    def reset_sequences(self, cursor, tables):
+        """Move each serial id sequence past the ids COPY inserted explicitly."""
+        sequences = {}
+        for table in tables:
+            for column in table.primary_key.columns:
+                cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", (quote_table(table), column.name))
+                sequence = cursor.fetchone()[0]
+                if sequence is None:
+                    continue
+                cursor.execute("SELECT setval(%s, COALESCE((SELECT MAX(\"{}\") FROM {}), 0) + 1, false)".format(
+                    column.name, quote_table(table)), (sequence,))
+                sequences[sequence] = cursor.fetchone()[0]
+        return sequences
+
+    def validate_references(self, cursor, tables):
+        """Validate NOT VALID constraints and count rows whose model foreign keys point nowhere."""
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE NOT convalidated AND conrelid = ANY(%s::regclass[])",
+            ([quote_table(table) for table in tables],))
+        for relation, constraint in cursor.fetchall():
+            cursor.execute('ALTER TABLE {} VALIDATE CONSTRAINT "{}"'.format(relation, constraint))
+        invalid = {}
+        for table in tables:
+            for fk in table.foreign_keys:
+                cursor.execute(
+                    'SELECT count(*) FROM {child} c WHERE c."{column}" IS NOT NULL AND NOT EXISTS '
+                    '(SELECT 1 FROM {parent} p WHERE p."{parent_column}" = c."{column}")'.format(
+                        child=quote_table(table), column=fk.parent.name,
+                        parent=quote_table(fk.column.table), parent_column=fk.column.name))
+                count = cursor.fetchone()[0]
+                if count:
+                    name = "{}.{}".format(table.name, fk.parent.name)
+                    invalid[name] = count
+                    logger.warning("{} rows of {} reference a missing {}.{}".format(
+                        count, name, fk.column.table.name, fk.column.name))
+        return invalid
+
     def loadEntities(self):
         data = self.read_file(self.__entity_file_path)
         s = self.__database_service.get_local_session()
@@ -332,6 +513,12 @@ class DataLoader():
     def convertStrToList(self, value: str):
         return [] if value == "" else value[2:-2].split(",")
 
+    def convertPrefUnit(self, value: str):
+        # Already a Postgres array literal, e.g. {"kW","W"}
+        if value.startswith("{"):
+            return value
+        return to_array_literal(self.convertStrToList(value))
+
 
     def loadTagHierarchy(self):
         data = self.read_file(self.__tag_hierarchy_file_path)
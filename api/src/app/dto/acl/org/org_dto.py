@@ -1,14 +1,29 @@
+import logging
+
 from sqlalchemy.orm import Session
 from app.model.pydantic.acl.org import org_schema
 from app.services.acl import org_service,\
     app_user_service, \
     user_service
+from app.services.value_table_registry import registry as value_table_registry
+
+logger = logging.getLogger(__name__)
+
+def _refresh_value_tables(db: Session, org_id: int):
+    """Re-read a committed org's value tables; a failure must not fail the org change"""
+    try:
+        value_table_registry.refresh_org(db, org_id)
+    except Exception as e:
+        db.rollback()
+        logger.error("Value table refresh for org {} failed, the next registry refresh will pick it up: {}".format(
+            org_id, str(e)))
 
 def create_org(db: Session, org: org_schema.OrgCreate, user_id : int):
     try:
         if app_user_service.is_user_app_admin(db, user_id):
             db_user = org_service.add_org(db, org)
             db.commit()
+            _refresh_value_tables(db, db_user.id)
             return db_user
     except Exception as e:
         db.rollback()
@@ -30,6 +45,7 @@ def update_org(db : Session,  org : org_schema.OrgUpdate,  org_id : int, user_id
         if app_user_service.is_user_app_admin(db, user_id):
             db_org = org_service.update_org(db, org, org_id)
             db.commit()
+            _refresh_value_tables(db, org_id)
             return db_org
     except Exception as e:
         db.rollback()
@@ -40,6 +56,7 @@ def delete_org(db : Session, org_id : int, user_id : int):
         if app_user_service.is_user_app_admin(db, user_id):
             db_org = org_service.delete_org(db, org_id)
             db.commit()
+            _refresh_value_tables(db, org_id)
             return db_org
     except Exception as e:
         db.rollback()
@@ -1,14 +1,20 @@
 from sqlalchemy.orm import Session
 from app.model.pydantic.filter import value_schema
 from app.services.acl import user_service
-from app.services import value_service, config_service, util_service, exception_service
+from app.services import value_service, config_service, util_service, exception_service, json_response_service
+from app.services.value_current_buffer import buffer as value_current_buffer
 import time
 import logging
 
 logger = logging.getLogger(__name__)
+
+# Reads are returned as dicts in the response models' shape and encoded by json_response_service
+VALUE_FIELDS = json_response_service.schema_fields(value_schema.ValueBase)
+POINT_VALUE_FIELDS = json_response_service.schema_fields(value_schema.ValueBaseResponse)
+
 def get_values_by_object(db: Session, org_id : int, object_id : int, user_id : int, skip: int = 0, limit: int = 100):
     if user_service.is_entity_visible_for_user(db, org_id, user_id, object_id):
-        return value_service.get_all_by_object(db, org_id, object_id, skip, limit)
+        return value_service.get_all_by_object(db, org_id, object_id, skip, limit, VALUE_FIELDS)
 
 
 
@@ -37,7 +43,7 @@ def get_values_for_points(db: Session, value: value_schema.ValueForPoints, user_
             )
         )
     if user_service.is_entities_visible_for_user(db, org_id, user_id, value.points):
-        return value_service.get_all_by_objects(db, value.points, date_from, date_to, org_id, skip, limit)
+        return value_service.get_all_by_objects(db, value.points, date_from, date_to, org_id, skip, limit, POINT_VALUE_FIELDS)
 
 def create_value(db: Session, value : value_schema.ValueBaseCreate, user_id : int, default_user_id : str):
     if default_user_id is not None or user_service.is_entity_visible_for_user(db, value.org_id, user_id, value.entity_id):
@@ -58,8 +64,11 @@ def create_bulk_value(db: Session, values : value_schema.ValueBulkCreate, user_i
             if config_service.log_timing == '1':
                 st = time.time()
             db_values = value_service.add_bulk_value(db, values)
-            db_values_current =value_service.add_bulk_value_current(db, values)
+            if not value_current_buffer.enabled:
+                value_service.add_bulk_value_current(db, values)
             db.commit()
+            if value_current_buffer.enabled:
+                value_current_buffer.add(db, values)
             if config_service.log_timing == '1':
                 et = time.time()
                 elapsed_time = et - st
@@ -90,8 +99,12 @@ def create_bulk_value_multi_db(all_databases: list, values: value_schema.ValueBu
                     if config_service.log_timing == '1':
                         st = time.time()
                     db_values = value_service.add_bulk_value(db_session, values)
-                    db_values_current = value_service.add_bulk_value_current(db_session, values)
+                    if not value_current_buffer.enabled:
+                        value_service.add_bulk_value_current(db_session, values)
                     db_session.commit()
+                    # Current values are written behind, once the history rows are committed
+                    if value_current_buffer.enabled:
+                        value_current_buffer.add(db_session, values)
                     
                     if config_service.log_timing == '1':
                         et = time.time()
@@ -4,6 +4,8 @@ import uvicorn
 import asyncio
 import threading
 import app.db.data_loader.loader as loader
+import sys
+import time
 from app.db.database import Database
 from app.db.database_grafana_connector import DatabaseGrafanaConnector
 from app.api.source_objects import entity as entity_api
@@ -35,12 +37,12 @@ import uuid
 from app.model.sqlalchemy.base import Base
 from app.services import config_service
 from app.services import logger_service as lg
+from app.services.compression_service import CompressionMiddleware
+from app.services.tracing_service import tracer, TracedJSONResponse
 from app.services.acl import user_service
+from app.services.value_current_buffer import buffer as value_current_buffer
+from app.services.value_table_registry import registry as value_table_registry
 import logging
-from app.model.sqlalchemy import values_tables
-from app.model.sqlalchemy import core_ess_table
-from app.model.sqlalchemy import core_renu_table
-from app.model.sqlalchemy import dynamic_value_tables
 
 lg.logger(
     fileName="app.log",
@@ -49,10 +51,14 @@ lg.logger(
 )
 
 logger = logging.getLogger(__name__)
+startup_started = time.monotonic()
+startup_timings = {}
 database = Database(config_service.database, config_service.main_db_pool_size, config_service.main_db_max_overflow)
 database.init_database()
 database_grafana_connector = DatabaseGrafanaConnector(config_service.database_grafana_connector, config_service.grafana_db_pool_size, config_service.grafana_db_max_overflow)
 database_grafana_connector.init_database()
+tracer.instrument(database.get_engine())
+tracer.instrument(database_grafana_connector.get_engine())
 
 def log_connection_stats_periodically():
     """Background task to log connection stats every 2 minutes"""
@@ -73,49 +79,76 @@ def log_connection_stats_periodically():
 # Start connection stats logging
 log_connection_stats_periodically()
 
-# Initialize databases only for available configs
+# Probe every configured database with the engine it will use; keep the available ones
 all_databases = []
-for config in config_service.available_configs:
-    try:
-        db = Database(config['dbUrl'], config_service.main_db_pool_size, config_service.main_db_max_overflow)
-        db.init_database()
-        all_databases.append({
-            'key': config['key'],
-            'database': db,
-            'dbSchema': config['dbScheme'],
-            'is_primary': config['is_primary'],
-            'is_available': config['is_available']
-        })
-        logger.info(f"Successfully initialized database connection for {config['key']}")
-    except Exception as e:
+for config in config_service.all_configs:
+    db = Database(config['dbUrl'], config_service.main_db_pool_size, config_service.main_db_max_overflow)
+    db.init_database()
+    config['is_available'] = config_service.check_database_availability(db.get_engine())
+    if not config['is_available']:
+        db.get_engine().dispose()
         if config['is_primary']:
-            logger.error(f"Failed to initialize primary database {config['key']}: {str(e)}")
-            raise e  # Stop application if primary database fails
-        else:
-            logger.warning(f"Failed to initialize secondary database {config['key']}: {str(e)}. Continuing without it.")
+            # Primary database is not available - stop the application
+            logger.error(f"Primary database {config['key']} is not available. Stopping application.")
+            sys.exit(1)
+        logger.warning(f"Failed to initialize secondary database {config['key']}. Continuing without it.")
+        continue
+    tracer.instrument(db.get_engine())
+    config_service.available_configs.append(config)
+    all_databases.append({
+        'key': config['key'],
+        'database': db,
+        'dbSchema': config['dbScheme'],
+        'is_primary': config['is_primary'],
+        'is_available': config['is_available']
+    })
+    logger.info(f"Successfully initialized database connection for {config['key']}")
 # tag_def_parents_model.create_views(database.get_engine())
 # Base.metadata.create_all(bind=database.get_engine())  # Schema already created by SQL initialization files
-
-values_tables.getMapOfValueTables(database.get_local_session())
-core_renu_table.getMapOfCoreRenuTable(database.get_local_session())
-core_ess_table.getMapOfCoreEssTable(database.get_local_session())
-dynamic_value_tables.getMapOfTestValuesTable(database.get_local_session())
+# Per-org value tables are resolved on first use and reloaded by value_table_registry
+startup_timings['databases'] = time.monotonic() - startup_started
 
 load_data_from_csv = config_service.load_data_from_csv
 if load_data_from_csv:
-    dataLoader = loader.DataLoader(database).load()
-app = FastAPI()
+    if config_service.csv_bulk_load:
+        loader.DataLoader(database).bulk_load()
+    else:
+        dataLoader = loader.DataLoader(database).load()
+app = FastAPI(default_response_class=TracedJSONResponse)
+startup_timings['total'] = time.monotonic() - startup_started
+logger.info("App module initialized in {:.3f}s ({})".format(
+    startup_timings['total'], ", ".join("{}: {:.3f}s".format(k, v) for k, v in startup_timings.items())))
+
+
+@app.on_event("startup")
+def start_value_current_buffer():
+    value_current_buffer.start()
+
+
+@app.on_event("startup")
+def start_value_table_registry():
+    value_table_registry.start(database.get_engine())
+
+
+@app.on_event("shutdown")
+def flush_value_current_buffer():
+    # Write behind: pending current values must reach the database before exit
+    value_current_buffer.stop()
+    logger.info("Flushed value_current buffer: {}".format(value_current_buffer.get_stats()))
+    value_table_registry.stop()
 
 @app.middleware("http")
 async def db_session_middleware(request: Request, call_next):
     response = Response("Internal server error", status_code=500)
+    trace, trace_token = tracer.start_request()
     try:
         request_id = str(uuid.uuid4())
         request.state.db = database.get_local_session()
         request.state.db_grafana_connector = database_grafana_connector.get_local_session()
         request.state.all_databases = all_databases
         request.state.request_id = request_id
-        request.state.user_id = 0 if "/health" in str(request.url) or  "/authorize/token" in str(request.url)  else user_service.get_current_user(request, request.state.db, config_service.default_user)
+        with tracer.phase("auth"):
+            request.state.user_id = 0 if "/health" in str(request.url) or  "/authorize/token" in str(request.url)  else user_service.get_current_user(request, request.state.db, config_service.default_user)
         request.state.default_user_id = config_service.default_user
         response = await call_next(request)
         response.headers["dq-request-id"] = request_id
@@ -131,9 +164,21 @@ async def db_session_middleware(request: Request, call_next):
     finally:
         request.state.db.close()
         request.state.db_grafana_connector.close()
+        server_timing = tracer.finish_request(request, response.status_code, trace, trace_token)
+        if server_timing is not None:
+            response.headers["Server-Timing"] = server_timing
     return response
 
 
+# Added after db_session_middleware so it is the outermost layer: handlers see
+# decompressed bodies and every response, errors included, can be compressed
+app.add_middleware(CompressionMiddleware,
+                   minimum_size=config_service.compression_min_bytes,
+                   gzip_level=config_service.compression_gzip_level,
+                   zstd_level=config_service.compression_zstd_level,
+                   max_request_size=config_service.request_max_body_bytes)
+
+
 def get_db(request: Request):
     return request.state.db
 
@@ -162,7 +207,7 @@ report_api.init(app, get_db)
 poller_config_api.init(app, get_db)
 uploaded_files_api.init(app, get_db)
 fleet_report_api.init(app, get_db)
-system_api.init(app)
+system_api.init(app, get_db)
 tag_def_parents_api.init(app, get_db)
 #exporter_api.init(app, get_db)
 auth.init(app)
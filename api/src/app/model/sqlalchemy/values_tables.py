@@ -1,85 +1,40 @@
-from app.model.sqlalchemy.base import Base
-from app.services.acl import org_service
-from sqlalchemy.orm import Session
 from sqlalchemy import Boolean, \
     Column, \
-    ForeignKey, \
     Integer,\
+    MetaData,\
     String,\
     Numeric,\
+    Table,\
     TIMESTAMP, \
-    UniqueConstraint, \
     PrimaryKeyConstraint
-from app.db.types._varchar import _Varchar
-from sqlalchemy.orm import relationship
-from app.model.sqlalchemy.base import Base
 from sqlalchemy import func
 from app.services import config_service
 from app.db.types.jsonb import Jsonb
 
-value_tables = {}
-value_virtual_point_tables = {}
-value_current_tables = {}
-def getMapOfValueTables(db : Session):
-    orgs = org_service.get_all(db, 0, 100000)
-    created_tables = {}
-    for org in orgs:
-        if org.value_table not in created_tables.keys():
-            attrs = {
-                '__tablename__' : org.value_table,
-                'entity_id' : Column(Integer, ForeignKey("{}.entity.id".format(config_service.dbSchema)), index=True,
-                              nullable=False),
-                'ts' : Column(TIMESTAMP, server_default=func.now(), nullable=False),
-                'value_n' : Column(Numeric),
-                'value_b' : Column(Boolean),
-                'value_s' : Column(String),
-                'value_ts' : Column(TIMESTAMP),
-                'value_dict' : Column(Jsonb),
-                'status' : Column(String),
-                '__table_args__' : (
-                    PrimaryKeyConstraint('entity_id', 'ts'),
-                    {'schema': config_service.dbSchema},
-                )
-                }
-            value_tables[org.id] = type(org.value_table, (Base,), attrs)
-            created_tables[org.value_table] = value_tables[org.id]
-            attrs = {
-                '__tablename__': "{}_current".format(org.value_table),
-                'entity_id': Column(Integer, ForeignKey("{}.entity.id".format(config_service.dbSchema)), index=True,
-                                    nullable=False),
-                'ts': Column(TIMESTAMP, server_default=func.now(), nullable=False),
-                'value_n': Column(Numeric),
-                'value_b': Column(Boolean),
-                'value_s': Column(String),
-                'value_ts': Column(TIMESTAMP),
-                'value_dict': Column(Jsonb),
-                'status': Column(String),
-                '__table_args__': (
-                    PrimaryKeyConstraint('entity_id'),
-                    {'schema': config_service.dbSchema},
-                )
-            }
-            value_current_tables[org.id] = type("{}_current".format(org.value_table), (Base,), attrs)
-            created_tables["{}_current".format(org.value_table)] = value_current_tables[org.id]
-            #attrs = {
-            #    '__tablename__': "{}_virtual_points".format(org.value_table),
-            #    'entity_id': Column(Integer, ForeignKey("{}.entity.id".format(config_service.dbSchema)), index=True,
-            #                        nullable=False),
-            #    'ts': Column(TIMESTAMP, server_default=func.now(), nullable=False),
-            #    'value_n': Column(Numeric),
-            #    'value_b': Column(Boolean),
-            #    'value_s': Column(String),
-            #    'value_ts': Column(TIMESTAMP),
-            #    'status': Column(String),
-            #    '__table_args__': (
-            #        PrimaryKeyConstraint('entity_id', 'ts'),
-            #        {'schema': config_service.dbSchema},
-            #    )
-            #}
-            #value_virtual_point_tables[org.id] = type("{}_virtual_points".format(org.value_table), (Base,), attrs)
-            #created_tables["{}_virtual_points".format(org.value_table)] = value_virtual_point_tables[org.id]
-            i = 1
-        else:
-#            value_virtual_point_tables[org.id] = created_tables["{}_virtual_points".format(org.value_table)]
-            value_tables[org.id] = created_tables[org.value_table]
-            value_current_tables[org.id] = created_tables["{}_current".format(org.value_table)]
\ No newline at end of file
+# Columns a value table can have. Which ones an org's tables actually have is
+# read from the catalog by value_table_registry.
+VALUE_COLUMNS = {
+    'entity_id': lambda: Column('entity_id', Integer, nullable=False, index=True),
+    'ts': lambda: Column('ts', TIMESTAMP, server_default=func.now(), nullable=False),
+    'value_n': lambda: Column('value_n', Numeric),
+    'value_b': lambda: Column('value_b', Boolean),
+    'value_s': lambda: Column('value_s', String),
+    'value_ts': lambda: Column('value_ts', TIMESTAMP),
+    'value_dict': lambda: Column('value_dict', Jsonb),
+    'status': lambda: Column('status', String),
+}
+
+
+def build_value_table(name: str, current: bool = False, columns=None):
+    """Core table for a <value_table> or <value_table>_current table.
+
+    Each table gets its own MetaData, so a table whose columns changed can
+    be rebuilt without touching the declarative Base or other orgs.
+    """
+    columns = VALUE_COLUMNS.keys() if columns is None else columns
+    return Table(
+        name, MetaData(),
+        *[VALUE_COLUMNS[column]() for column in VALUE_COLUMNS if column in columns],
+        PrimaryKeyConstraint('entity_id') if current else PrimaryKeyConstraint('entity_id', 'ts'),
+        schema=config_service.dbSchema,
+    )
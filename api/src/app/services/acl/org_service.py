@@ -3,6 +3,7 @@ from app.model.sqlalchemy import source_object_model, \
     acl_org_model
 from sqlalchemy.orm import Session
 from app.services import exception_service
+from app.services.tracing_service import tracer
 from app.model.pydantic.acl.org import org_schema
 from datetime import datetime
 
@@ -64,6 +65,7 @@ def get_user_orgs(db : Session, user_id : int, skip : int, limit : int):
         .all()
     return result if result is not None else []
 
+@tracer.traced("acl")
 def is_org_visible_for_user(db : Session, org_id : int, user_id :int):
     result = db.query(acl_org_model.OrgUser) \
         .filter(acl_org_model.OrgUser.user_id == user_id) \
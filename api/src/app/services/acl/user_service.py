@@ -5,6 +5,7 @@ from app.model.sqlalchemy import source_object_model, acl_org_model, acl_user_mo
 from app.model.pydantic.acl.user import user_schema
 from datetime import datetime
 from app.services import tag_meta_service, request_service, config_service
+from app.services.tracing_service import tracer
 import jwt
 import requests
 from fastapi import Request, HTTPException, Depends
@@ -130,6 +131,7 @@ def get_user_by_id(db : Session, user_id : int) -> acl_user_model.User:
     )
 
 
+@tracer.traced("acl")
 def is_user_org_admin(org_id : int, user_id: id, db: Session):
     result = db.query(acl_org_model.OrgAdmin)\
         .filter(acl_org_model.OrgAdmin.org_id == org_id)\
@@ -143,6 +145,7 @@ def is_user_org_admin(org_id : int, user_id: id, db: Session):
         )
     )
 
+@tracer.traced("acl")
 def is_meta_visible_for_user(db : Session, org_id : int, user_id : int, meta_id : int):
     db_meta = tag_meta_service.get_meta_by_id(db, meta_id, org_id)
 
@@ -190,6 +193,7 @@ def is_meta_visible_for_user(db : Session, org_id : int, user_id : int, meta_id
         )
     )
 
+@tracer.traced("acl")
 def is_tag_visible_for_user(db : Session, org_id : int, user_id : int, tag_id : int):
     result = db.query(acl_org_model.OrgUser) \
         .filter(acl_org_model.OrgUser.user_id == user_id) \
@@ -241,6 +245,7 @@ def is_tag_visible_for_user(db : Session, org_id : int, user_id : int, tag_id :
         )
     )
 
+@tracer.traced("acl")
 def is_entity_visible_for_user(db : Session, org_id : int, user_id : int, entity_id : int):
     result = db.query(acl_org_model.OrgUser)\
         .filter(acl_org_model.OrgUser.user_id == user_id)\
@@ -280,6 +285,7 @@ def is_entity_visible_for_user(db : Session, org_id : int, user_id : int, entity
         )
     )
 
+@tracer.traced("acl")
 def is_entities_visible_for_user(db : Session, org_id : int, user_id : int, entity_ids : list[int]):
     result = db.query(acl_org_model.OrgUser)\
         .filter(acl_org_model.OrgUser.user_id == user_id)\
@@ -0,0 +1,220 @@
+"""Negotiated response compression and transparent request decompression.
+
+Responses with a JSON or text content type, at least COMPRESSION_MIN_BYTES
+long, are compressed with the best encoding the client accepts: zstd when
+the zstandard package is installed, then gzip. Streaming responses are
+compressed chunk by chunk.
+
+Request bodies sent with Content-Encoding gzip or zstd are decompressed
+before routing, so handlers and request.body() see plain JSON. The
+decompressed size is capped at REQUEST_MAX_BODY_MB.
+"""
+
+import io
+import logging
+import zlib
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+GZIP_WBITS = 31  # zlib container with a gzip header
+READ_CHUNK = 64 * 1024
+DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class RequestBodyError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def supported_encodings() -> list:
+    """Encodings in server preference order."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str):
+    """Best supported encoding for an Accept-Encoding header, or None.
+
+    Highest q-value wins; ties go to the server preference order. q=0
+    excludes an encoding, also when it would match *.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name] = q
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith("+json")
+
+
+def compressor(encoding: str, gzip_level: int, zstd_level: int):
+    """Streaming compressor with compress(data) and flush()."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compressobj()
+    return zlib.compressobj(gzip_level, zlib.DEFLATED, GZIP_WBITS)
+
+
+def decompress(encoding: str, body: bytes, max_size: int) -> bytes:
+    """Decompress a request body; raises RequestBodyError if invalid or larger than max_size."""
+    encoding = encoding.strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding not in supported_encodings():
+        raise RequestBodyError(415, "Unsupported Content-Encoding: {}".format(encoding))
+    output = io.BytesIO()
+    try:
+        if encoding == "zstd":
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)) as reader:
+                chunk = reader.read(READ_CHUNK)
+                while chunk:
+                    output.write(chunk)
+                    if output.tell() > max_size:
+                        break
+                    chunk = reader.read(READ_CHUNK)
+        else:
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            output.write(decompressor.decompress(body, max_size + 1))
+            if output.tell() <= max_size and not decompressor.eof:
+                raise RequestBodyError(400, "Truncated {} request body".format(encoding))
+    except DECOMPRESS_ERRORS as e:
+        raise RequestBodyError(400, "Invalid {} request body: {}".format(encoding, str(e)))
+    if output.tell() > max_size:
+        raise RequestBodyError(413, "Decompressed request body exceeds {} bytes".format(max_size))
+    return output.getvalue()
+
+
+class CompressionMiddleware:
+    """ASGI middleware: decompresses request bodies and compresses responses."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 5, zstd_level: int = 3,
+                 max_request_size: int = 100 * 1024 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.max_request_size = max_request_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get("content-encoding"):
+            try:
+                scope, receive = await self.decompress_request(scope, receive, headers)
+            except RequestBodyError as e:
+                logger.warning("Rejected request body for {}: {}".format(scope.get("path"), e.detail))
+                await JSONResponse(status_code=e.status_code, content={"detail": e.detail})(scope, receive, send)
+                return
+        encoding = negotiate_encoding(headers.get("accept-encoding", "")) if self.minimum_size >= 0 else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self, encoding)(scope, receive, send)
+
+    async def decompress_request(self, scope, receive, headers):
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                raise RequestBodyError(400, "Client disconnected")
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = decompress(headers["content-encoding"], bytes(body), self.max_request_size)
+
+        raw_headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        sent = False
+
+        async def receive_decompressed():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return dict(scope, headers=raw_headers), receive_decompressed
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = None
+        self.initial_message = None
+        self.compressor = None
+        self.started = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if message["type"] == "http.response.start":
+            # Headers go out with the first body chunk, once we know whether it is compressed
+            self.initial_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.compressor = compressor(self.encoding, self.middleware.gzip_level, self.middleware.zstd_level)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+                body = self.compressor.compress(body)
+            else:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+        if self.compressor is None:
+            await self.send(message)
+            return
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -2,8 +2,7 @@ import jsoncfg
 import os
 import logging
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
-import sys
+from sqlalchemy import text
 
 load_dotenv()
 
@@ -42,30 +41,46 @@ main_db_max_overflow = int(os.getenv('MAIN_DB_MAX_OVERFLOW', '5'))
 grafana_db_pool_size = int(os.getenv('GRAFANA_DB_POOL_SIZE', '1'))
 grafana_db_max_overflow = int(os.getenv('GRAFANA_DB_MAX_OVERFLOW', '0'))
 
-def check_database_availability(db_url: str) -> bool:
-    """Check if database is available by attempting a connection"""
+# Write-behind buffer for <value_table>_current upserts from /bulk/value
+# (0 disables buffering: the upsert runs in the request transaction)
+value_current_flush_ms = int(os.getenv('VALUE_CURRENT_FLUSH_MS', '1000'))
+value_current_buffer_max = int(os.getenv('VALUE_CURRENT_BUFFER_MAX', '5000'))
+
+# Org -> value table registry: full catalog reload interval (0 = only on demand)
+value_table_refresh_s = int(os.getenv('VALUE_TABLE_REFRESH_S', '300'))
+
+# loadDataFromCsv: 1 bootstraps every csv/ snapshot with COPY in one transaction
+# instead of the row-by-row ORM loaders
+csv_bulk_load = os.getenv('CSV_BULK_LOAD', '0') == '1'
+
+# HTTP compression: responses of at least COMPRESSION_MIN_BYTES are gzip/zstd
+# compressed when the client accepts it (-1 disables); gzip/zstd request bodies
+# are decompressed up to REQUEST_MAX_BODY_MB
+compression_min_bytes = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+compression_gzip_level = int(os.getenv('COMPRESSION_GZIP_LEVEL', '5'))
+compression_zstd_level = int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3'))
+request_max_body_bytes = int(os.getenv('REQUEST_MAX_BODY_MB', '100')) * 1024 * 1024
+
+# Request tracing: per-route latency percentiles, phase timings and SQL
+# fingerprints; statements slower than SLOW_QUERY_MS are logged (0 disables)
+# with their EXPLAIN plan
+tracing_enabled = os.getenv('TRACING_ENABLED', '1') == '1'
+slow_query_ms = int(os.getenv('SLOW_QUERY_MS', '500'))
+slow_query_explain = os.getenv('SLOW_QUERY_EXPLAIN', '1') == '1'
+trace_sample_size = int(os.getenv('TRACE_SAMPLE_SIZE', '1000'))
+
+def check_database_availability(engine) -> bool:
+    """Check if database is available by running a query on the app's own engine"""
     try:
-        # Check if required PostgreSQL driver is available
-        try:
-            import psycopg2
-        except ImportError:
-            try:
-                import psycopg2_binary
-            except ImportError:
-                logger.error(f"PostgreSQL driver not found. Please install psycopg2 or psycopg2-binary")
-                return False
-        
-        engine = create_engine(db_url, echo=False, pool_pre_ping=True)
         with engine.connect() as connection:
             connection.execute(text("SELECT 1"))
-        engine.dispose()
         return True
     except Exception as e:
         error_msg = str(e)
         if "Can't load plugin: sqlalchemy.dialects:postgres" in error_msg:
             logger.error(f"PostgreSQL dialect not available. Please install psycopg2-binary: pip install psycopg2-binary")
         else:
-            logger.error(f"Database connection failed for {db_url}: {error_msg}")
+            logger.error(f"Database connection failed for {engine.url!r}: {error_msg}")
         return False
 
 # All configs (used for /bulk/value and /value endpoints)
@@ -88,22 +103,9 @@ for i, key in enumerate(config_keys):
     except:
         cfg['defaultUser'] = None
     
-    # Check database availability
-    is_available = check_database_availability(cfg['dbUrl'])
-    cfg['is_available'] = is_available
-    
-    if i == 0 and not is_available:
-        # Primary database is not available - stop the application
-        logger.error(f"Primary database {key} is not available. Stopping application.")
-        sys.exit(1)
-    
+    # Availability is probed at startup with the engine main.py creates for the config,
+    # which then adds it to available_configs
     all_configs.append(cfg)
-    
-    if is_available:
-        available_configs.append(cfg)
-        logger.info(f"Database {key} is available")
-    else:
-        logger.warning(f"Database {key} is not available and will be skipped")
 
 try:
     default_user = config[primary_config_key].defaultUser()
@@ -112,7 +114,6 @@ except:
 print("dbSchema: {}".format(dbSchema))
 print("testing: ", test_table)
 print("all_configs: {}".format([cfg['key'] for cfg in all_configs]))
-print("available_configs: {}".format([cfg['key'] for cfg in available_configs]))
 
 try:
     load_data_from_csv = config.development.loadDataFromCsv()
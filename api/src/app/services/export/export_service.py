@@ -3,24 +3,11 @@ from app.services.export.services import hierarchy_service, xls_service, entity_
 from app.services.export.services import sql_service
 import logging
 import psycopg2
-import argparse
+import tempfile
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
-parser = argparse.ArgumentParser(description="Export data from Rally into CSV file(s)")
-parser.add_argument(
-    "-e", "--environment", help="Rally environment, section must exist in configuration file.", default="DEFAULT"
-)
-parser.add_argument(
-    "-c",
-    "--config",
-    help="Configuration file in INI format. See `Rally exporter parameters.md` for details.",
-    default="config.ini",
-)
-args = parser.parse_args()
-
-
 lg.logger(
     fileName="app.log",
     level=config_service.log_level,
@@ -28,8 +15,24 @@ lg.logger(
 )
 
 schema="core"
-def export_data(org_id):
+FORMATS = {
+    "xlsx": (xls_service.writeXLSFile, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "data.xlsx"),
+    "csv": (xls_service.writeCSVZip, "application/zip", "data.zip"),
+}
+# Exports larger than this spill from memory to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+def export_data(org_id, file_format: str = "xlsx"):
+    """Export an org's entities, one sheet (or CSV) per entity type.
+
+    Entities are classified in one set-based pass and streamed through a
+    server-side cursor into a write-only workbook or a CSV zip, so memory
+    stays flat regardless of org size. Returns a file object positioned
+    at the start; iter_file streams it.
+    """
     logger.info("export started...")
+    writer = FORMATS[file_format][0]
     result = urlparse(config_service.database)
     username = result.username
     password = result.password
@@ -43,13 +46,33 @@ def export_data(org_id):
     host = hostname,
     port = port
 )
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
     try:
         tags = sql_service.getTagsBySql(conn, schema)
-        entity_refs =entity_service.get_entity_refs(conn, org_id, schema)
+        tag_kinds = entity_service.get_tag_kinds(tags)
         tag_hierarchy=hierarchy_service.get_tag_hierarchy(conn, org_id, schema)
         hierarchy = hierarchy_service.get_entity_hierarchy(conn, org_id, tag_hierarchy, schema)
-        return xls_service.createXLSFile(hierarchy, conn, org_id, tags, entity_refs, schema, tag_hierarchy)
+        columns_by_type = entity_service.get_columns_by_type(conn, tag_kinds, schema)
+        entities = entity_service.stream_entities(conn, tag_kinds, tags, schema)
+        writer(hierarchy, columns_by_type, entities, output)
+        output.seek(0)
+        logger.info("export finished: {} types".format(len(hierarchy)))
+        return output
     except Exception as e:
         logger.error(e)
+        output.close()
+        raise
+    finally:
+        conn.rollback()
         conn.close()
 
+def iter_file(output, chunk_size: int = CHUNK_SIZE):
+    """Stream an export file in chunks and close it afterwards."""
+    try:
+        while True:
+            chunk = output.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        output.close()
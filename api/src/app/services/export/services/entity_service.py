@@ -1,4 +1,5 @@
 import logging
+from app.services.export.services import hierarchy_service
 
 
 logger = logging.getLogger(__name__)
@@ -18,93 +19,88 @@ def isTagEnum(tag_id, enums):
             return True
     return False
 
-def get_entity_refs(conn, org_id, schema):
-    logger.info("here is the hierarchy")
+def get_tag_kinds(tags):
+    """How each tag's value is exported, decided once per tag instead of per row."""
+    enum_tag_ids = {enum["tag_id"] for enum in tags["enums"].values()}
+    kinds = {}
+    for tag_id, tag_name in tags["tags"].items():
+        if not tag_id.isdigit():
+            continue
+        tag_parent = tags["tag_parents"].get(tag_id) or ""
+        kind = None
+        if int(tag_id) in enum_tag_ids:
+            kind = "enum"
+        elif ",str," in tag_parent or ",coord," in tag_parent:
+            kind = "str"
+        elif ",number," in tag_parent:
+            kind = "number"
+        elif ",ref," in tag_parent:
+            kind = "ref"
+        elif ",marker," in tag_parent:
+            kind = "marker"
+        kinds[int(tag_id)] = (tag_name, kind)
+    return kinds
+
+def get_columns_by_type(conn, tag_kinds, schema):
+    """Sheet columns per entity type: db_id, disabled, then the tags in use."""
     cursor = conn.cursor()
-    entity_refs = {}
+    columns = {}
     try:
-        sql = """select et.id, et.entity_id, tag_id, value_n, value_b, value_s, value_ts, value_list, value_dict, value_ref, value_enum, et.disabled_ts from {}.entity_tag et, {}.tag_def td, {}.org_entity_permission oep  where et.tag_id  = td.id  and oep.entity_id  = et.entity_id and oep.org_id  = {}  and td.name = 'id'""".format(
-            schema, schema, schema, org_id,)
+        sql = "select t.entity_type, et.tag_id from {} t join {}.entity_tag et on et.entity_id = t.entity_id group by t.entity_type, et.tag_id".format(
+            hierarchy_service.ENTITY_TYPES_TABLE, schema)
         cursor.execute(sql)
-        res = cursor.fetchall()
-        for r in res:
-            entity_refs[str(r[1])] = r[5]
-
-        return entity_refs
-    except Exception as e:
-        logger.error(e)
-        return []
+        for entity_type, tag_id in cursor.fetchall():
+            if tag_id in tag_kinds:
+                columns.setdefault(entity_type, []).append(tag_kinds[tag_id][0])
+        return {entity_type: ["db_id", "disabled"] + sorted(set(names)) for entity_type, names in columns.items()}
     finally:
         cursor.close()
 
-def get_entities_by_type(entity_types, conn, org_id, tags, entity_refs, schema):
-    logger.info("here is the hierarchy")
-    cursor = conn.cursor()
-    data = []
-    columns = ["db_id", "disabled"]
+def stream_entities(conn, tag_kinds, tags, schema, itersize: int = 5000):
+    """Yield (entity_type, row dict) per entity, grouped by type in sheet order.
+
+    Reads through a server-side cursor, so only itersize tag rows are held
+    in memory at a time. Refs are resolved to the target's id in the query.
+    """
+    enums = tags["enums"]
+    cursor = conn.cursor(name="export_entities")
+    cursor.itersize = itersize
     try:
-        for entity_type in entity_types[1]["real_tags"]:
-            entity_typ = entity_type.split(" ")
-            sql = """select et2.id, entity_id, tag_id, value_n, value_b, value_s, value_ts, value_list, value_dict, value_ref, value_enum, et2.disabled_ts, et3.disabled_ts entity_disabled_ts from {}.entity_tag et2, {}.entity et3  where et3.id = et2.entity_id and et2.entity_id in (
-                        select entity_id from (
-                        select et.entity_id, (','::text || string_agg(td.name::text, ','::text) || ',')  parents from {}.entity_tag et, {}.tag_def td, {}.org_entity_permission oep  where et.tag_id  = td.id  and oep.entity_id  = et.entity_id and oep.org_id  = {} group by et.entity_id) a
-                        where ##replace_with_parent_cond##) order by entity_id """.format(schema, schema, schema, schema, schema,
-                org_id)
-            parent_condition = ""
-            for et in entity_typ:
-                parent_condition += " parents like '%,{},%' and ".format(et)
-            parent_condition = parent_condition[0:-4]
-            sql = sql.replace("##replace_with_parent_cond##", parent_condition)
-            cursor.execute(sql)
-            res = cursor.fetchall()
-            entity_id = -1
-            entity_data = {}
-            i = 0
-            for r in res:
-                try:
-                    if r[1] != entity_id:
-                        if entity_data != {}:
-                            data.append(entity_data)
-                        entity_id = r[1]
-                        entity_data = {"db_id" : r[1]}
-                    if r[1] == 28038:
-                        aaa = 22
-                    if i == 0:
-                        entity_data["disabled"] = r[12] if r[12] is not None else ""
-                    tag_name = tags["tags"][str(r[2])]
-                    tag_parent = tags["tag_parents"][str(r[2])]
-                    if tag_name not in columns:
-                        columns.append(tag_name)
-                    if isTagEnum(r[2], tags["enums"]):
-                        if r[10] is not None:
-                            entity_data[tag_name] =  tags["enums"][str(r[10])]["label"]
-                        else:
-                            entity_data[tag_name] = r[5]
-                        continue
-                    if ",str," in tag_parent:
-                        entity_data[tag_name] = r[5]
-                        continue
-                    if ",coord," in tag_parent:
-                        entity_data[tag_name] = r[5]
-                        continue
-                    if ",number," in tag_parent:
-                        entity_data[tag_name] = r[3]
-                        continue
-                    if ",ref," in tag_parent:
-                        if tag_name not in entity_data:
-                            entity_data[tag_name] = entity_refs[str(r[9])]
-                        else:
-                            entity_data[tag_name] = entity_data[tag_name] + ",{}".format(entity_refs[str(r[9])])
-                        continue
-                    if ",marker," in tag_parent:
-                        entity_data[tag_name] = '1'
-                except Exception as e:
-                    raise e
-            if entity_data != {}:
-                data.append(entity_data)
-        return columns, data
-    except Exception as e:
-        logger.error(e)
-        return []
+        sql = """select t.entity_type, et.entity_id, e.disabled_ts, et.tag_id, et.value_n, et.value_s, et.value_enum, ref_id.value_s
+            from {} t
+            join {}.entity e on e.id = t.entity_id
+            join {}.entity_tag et on et.entity_id = t.entity_id
+            left join {}.entity_tag ref_id on ref_id.entity_id = et.value_ref and ref_id.tag_id = %s
+            order by t.type_len desc, t.entity_type, et.entity_id, et.id""".format(
+            hierarchy_service.ENTITY_TYPES_TABLE, schema, schema, schema)
+        cursor.execute(sql, (tags["tags"]["id"],))
+        entity_type = None
+        entity_data = None
+        for r in cursor:
+            if entity_data is None or r[1] != entity_data["db_id"]:
+                if entity_data is not None:
+                    yield entity_type, entity_data
+                entity_type = r[0]
+                entity_data = {"db_id": r[1], "disabled": r[2] if r[2] is not None else ""}
+            tag_name, kind = tag_kinds.get(r[3], (None, None))
+            if kind is None:
+                continue
+            if kind == "enum":
+                entity_data[tag_name] = enums[str(r[6])]["label"] if str(r[6]) in enums else r[5]
+            elif kind == "str":
+                entity_data[tag_name] = r[5]
+            elif kind == "number":
+                entity_data[tag_name] = r[4]
+            elif kind == "ref":
+                if r[7] is None:
+                    continue
+                if tag_name not in entity_data:
+                    entity_data[tag_name] = r[7]
+                else:
+                    entity_data[tag_name] = entity_data[tag_name] + ",{}".format(r[7])
+            elif kind == "marker":
+                entity_data[tag_name] = '1'
+        if entity_data is not None:
+            yield entity_type, entity_data
     finally:
         cursor.close()
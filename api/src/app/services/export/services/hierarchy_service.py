@@ -20,42 +20,57 @@ def get_all_refs(conn, org_id,schema):
     finally:
         cursor.close()
 
+ENTITY_TYPES_TABLE = "export_entity_types"
+
+def classify_entities(conn, org_id, tag_hierarchy, schema):
+    """Classify every org entity into its type in one set-based pass.
+
+    Fills the session temp table export_entity_types with one row per entity:
+    its type (sorted entity markers its mandatory tags map to, e.g. "equip"),
+    the number of markers and its sorted mandatory tags. Entities without a
+    mandatory tag are left out, as before.
+    """
+    cursor = conn.cursor()
+    try:
+        tag_names = list(tag_hierarchy.keys())
+        cursor.execute("drop table if exists pg_temp.{}".format(ENTITY_TYPES_TABLE))
+        sql = """create temp table {} as
+            select et.entity_id,
+                string_agg(distinct th.entity_type, ' ' order by th.entity_type) entity_type,
+                count(distinct th.entity_type) type_len,
+                string_agg(distinct td.name, ' ' order by td.name) real_tags
+            from {}.entity_tag et
+            join {}.org_entity_permission oep on oep.entity_id = et.entity_id and oep.org_id = %s
+            join {}.tag_def td on td.id = et.tag_id
+            join unnest(%s::text[], %s::text[]) th(tag, entity_type) on th.tag = td.name
+            group by et.entity_id""".format(ENTITY_TYPES_TABLE, schema, schema, schema)
+        cursor.execute(sql, (org_id, tag_names, [tag_hierarchy[tag] for tag in tag_names]))
+        classified = cursor.rowcount
+        cursor.execute("create index on {} (entity_id)".format(ENTITY_TYPES_TABLE))
+        cursor.execute("analyze {}".format(ENTITY_TYPES_TABLE))
+        return classified
+    finally:
+        cursor.close()
+
 def get_entity_types(conn, org_id, tag_hierarchy, schema):
+    """Entity types with their tag combinations, most specific first.
+
+    Returns [(entity_type, {"len": n, "real_tags": [...]})], the shape the
+    info sheet and the type sheets are built from.
+    """
     logger.info("here is the hierarchy")
+    classify_entities(conn, org_id, tag_hierarchy, schema)
     cursor = conn.cursor()
     hierarchy = {}
     try:
-        sql = "select tags from (select (','::text || string_agg(td.name::text, ','::text)) || ','::text AS tags from {}.entity_tag et, {}.tag_def td, {}.org_entity_permission oep where et.entity_id = oep.entity_id and oep.org_id = {} and et.tag_id  = td.id group by et.entity_id) a group by tags".format(
-            schema, schema, schema, org_id)
+        sql = "select entity_type, type_len, real_tags from {} group by entity_type, type_len, real_tags order by type_len desc, entity_type, real_tags".format(
+            ENTITY_TYPES_TABLE)
         cursor.execute(sql)
-        res = cursor.fetchall()
-        for r in res:
-            tags = r[0].split(",")
-            temp_tags = []
-            real_tags = []
-            for tag in tags:
-                if tag in tag_hierarchy:
-                    if tag_hierarchy[tag] not in temp_tags:
-                        temp_tags.append(tag_hierarchy[tag] )
-                    if tag not in real_tags:
-                        real_tags.append(tag )
-            tagsAsString = ""
-            realTagsAsString=""
-            if len(temp_tags) > 0:
-                real_tags.sort()
-                temp_tags.sort()
-                tagsAsString = " ".join(temp_tags)
-                realTagsAsString = " ".join(real_tags)
-            if tagsAsString != "":
-                if tagsAsString not in hierarchy:
-                    hierarchy[tagsAsString] = {"len" : len(temp_tags), "real_tags" : [realTagsAsString]}
-                else:
-                    if realTagsAsString not in hierarchy[tagsAsString]["real_tags"]:
-                        hierarchy[tagsAsString]["real_tags"].append(realTagsAsString)
-        return  sorted(hierarchy.items(), key=lambda x:x[1]["len"], reverse=True)
-    except Exception as e:
-        logger.error(e)
-        return []
+        for entity_type, type_len, real_tags in cursor.fetchall():
+            if entity_type not in hierarchy:
+                hierarchy[entity_type] = {"len": type_len, "real_tags": []}
+            hierarchy[entity_type]["real_tags"].append(real_tags)
+        return list(hierarchy.items())
     finally:
         cursor.close()
 
@@ -1,13 +1,13 @@
 from openpyxl import Workbook
-from app.services.export.services import entity_service
+from itertools import chain, groupby, zip_longest
+from operator import itemgetter
+import csv
 import io
-def removeLoadedData(data, loaded_data):
-    res = []
-    for d in data:
-        if d["db_id"] not in loaded_data:
-            loaded_data[d["db_id"]] = d["db_id"]
-            res.append(d)
-    return res
+import re
+import zipfile
+
+# Excel sheet names: at most 31 characters, none of []:*?/\
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
 
 
 def getSheetName(tags, tag_hierarchy):
@@ -20,40 +20,64 @@ def getSheetName(tags, tag_hierarchy):
             sheetName += "{} ".format(tag)
     return sheetName.strip()
 
-def fillInfoTab(infoSheet, hierarchy):
-    i = 1
-    for entity_type in hierarchy:
-        infoSheet.cell(row=1, column=i).value = entity_type[0]
-        j = 2
-        for tags in entity_type[1]["real_tags"]:
-            infoSheet.cell(row=j, column=i).value = tags
-            j+=1
-        i += 1
-def createXLSFile(hierarchy, conn, org_id, tags, entity_refs, schema, tag_hierarchy, save: bool=True):
-    wb = Workbook()
-    loaded_data = {}
-    infoSheet = wb.active
-    infoSheet.title = "info"
-    fillInfoTab(infoSheet, hierarchy)
-    for entity_type in hierarchy:
-        #sheetName =getSheetName(entity_type[0], tag_hierarchy)
-        ws = wb.create_sheet(title=entity_type[0])
-        columns, tempData = entity_service.get_entities_by_type(entity_type,conn, org_id, tags, entity_refs, schema)
-        if len(tempData) > 0:
-            data = removeLoadedData(tempData, loaded_data)
-            for idx, x in enumerate(columns):
-                ws.cell(row=1, column=idx+1).value = x
-            j=1
-            for idx, x in enumerate(data):
-               j +=1
-               for k in x.keys():
-                   i = columns.index(k)
-                   ws.cell(row=j, column=i + 1).value = x[k]
-
-
-    # Save the file
-    # Save the workbook to a BytesIO object
-    output = io.BytesIO()
+def getSafeSheetName(name, used):
+    title = INVALID_SHEET_CHARS.sub("_", name)[:31] or "sheet"
+    suffix = 1
+    while title.lower() in used:
+        suffix += 1
+        tail = "~{}".format(suffix)
+        title = title[:31 - len(tail)] + tail
+    used.add(title.lower())
+    return title
+
+def getInfoRows(hierarchy):
+    """Info tab row by row: entity types across, their tag combinations below."""
+    yield [entity_type[0] for entity_type in hierarchy]
+    for row in zip_longest(*[entity_type[1]["real_tags"] for entity_type in hierarchy]):
+        yield list(row)
+
+def toRow(entity_data, index, width):
+    values = [None] * width
+    for k, v in entity_data.items():
+        values[index[k]] = v
+    return values
+
+def getSheetRows(columns_by_type, entities):
+    """Group streamed entities into (entity_type, columns, rows) per sheet, lazily."""
+    for entity_type, group in groupby(entities, key=itemgetter(0)):
+        columns = columns_by_type[entity_type]
+        index = {name: i for i, name in enumerate(columns)}
+        yield entity_type, columns, (toRow(entity_data, index, len(columns)) for _, entity_data in group)
+
+def writeXLSFile(hierarchy, columns_by_type, entities, output):
+    """Stream entities into a write-only workbook: rows go straight to disk."""
+    wb = Workbook(write_only=True)
+    used = set()
+    infoSheet = wb.create_sheet(title=getSafeSheetName("info", used))
+    for row in getInfoRows(hierarchy):
+        infoSheet.append(row)
+    for entity_type, columns, rows in getSheetRows(columns_by_type, entities):
+        ws = wb.create_sheet(title=getSafeSheetName(entity_type, used))
+        ws.append(columns)
+        for row in rows:
+            ws.append(row)
     wb.save(output)
-    output.seek(0)
+    return output
+
+def writeCSVZip(hierarchy, columns_by_type, entities, output):
+    """Stream entities into a zip with one CSV per entity type plus info.csv."""
+    used = set()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+        sheets = [("info", None, getInfoRows(hierarchy))]
+        for entity_type, columns, rows in chain(sheets, getSheetRows(columns_by_type, entities)):
+            name = "{}.csv".format(getSafeSheetName(entity_type, used))
+            with zf.open(name, "w") as member:
+                text = io.TextIOWrapper(member, encoding="utf-8", newline="")
+                writer = csv.writer(text)
+                if columns is not None:
+                    writer.writerow(columns)
+                for row in rows:
+                    writer.writerow(["" if v is None else v for v in row])
+                text.flush()
+                text.detach()
     return output
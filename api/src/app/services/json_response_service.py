@@ -0,0 +1,52 @@
+"""Lean JSON responses for high-volume read endpoints.
+
+Value and filter reads return plain dicts built from result tuples and are
+encoded with orjson, skipping per-row pydantic validation and FastAPI's
+jsonable_encoder. The output matches the endpoints' response models:
+every model field is present, in model order, and missing ones are null.
+
+Decimal policy: numeric values are written as JSON floats, as FastAPI's
+default encoder does.
+"""
+
+import decimal
+
+import orjson
+from fastapi.responses import Response
+
+from app.services.tracing_service import tracer
+
+
+def encode_default(obj):
+    """orjson hook for the types it does not encode natively."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError("Type is not JSON serializable: {}".format(type(obj).__name__))
+
+
+class RowsResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        with tracer.phase("serialization"):
+            return orjson.dumps(content, default=encode_default)
+
+
+def schema_fields(model) -> list:
+    """Field names of a pydantic response model, in declaration order."""
+    return list(model.__fields__)
+
+
+def rows_to_dicts(fields: list, rows) -> list:
+    """Dicts for rows whose columns are already in fields order."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def project_rows(fields: list, keys, rows) -> list:
+    """Dicts for rows with result columns keys, reduced to fields; absent fields are None."""
+    keys = list(keys)
+    positions = [keys.index(field) if field in keys else None for field in fields]
+    return [
+        {field: (row[position] if position is not None else None) for field, position in zip(fields, positions)}
+        for row in rows
+    ]
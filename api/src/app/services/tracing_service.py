@@ -0,0 +1,299 @@
+"""Request-level performance tracing and slow-query log.
+
+db_session_middleware opens a trace per request, and SQLAlchemy engine
+events attribute SQL work to it. For each request the tracer records the
+time spent in these phases:
+- auth: resolving the user from the token,
+- acl: entity and org visibility checks (including the SQL they run),
+- sql_compile: from Connection.execute to the DBAPI cursor, i.e. statement
+  compilation or compiled-cache lookup,
+- db_execute: DBAPI cursor execution,
+- serialization: rendering the response body,
+- total: the whole request inside the middleware.
+
+Phases can overlap, so they do not add up to total. They are also sent
+back in the Server-Timing header.
+
+Every statement is also grouped by a fingerprint: the SQL with literals,
+parameters and IN lists normalized. Count, total and max latency are kept
+per fingerprint. Statements slower than SLOW_QUERY_MS are logged, with
+their EXPLAIN plan when SLOW_QUERY_EXPLAIN is on. The plan is logged at
+most once a minute per fingerprint.
+
+Latency percentiles per route are computed over the last
+TRACE_SAMPLE_SIZE requests of each route.
+"""
+
+import contextvars
+import functools
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+
+from app.services import config_service
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("auth", "acl", "sql_compile", "db_execute", "serialization")
+EXPLAIN_INTERVAL_S = 60
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+MAX_FINGERPRINTS = 1000
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+PARAMETER = re.compile(r"%\(\w+\)s|%s")
+NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str):
+    """(id, normalized SQL) for a statement; equal query shapes share an id."""
+    normalized = STRING_LITERAL.sub("?", statement)
+    normalized = PARAMETER.sub("?", normalized)
+    normalized = NUMBER.sub("?", normalized)
+    normalized = VALUE_LIST.sub("(?)", normalized)
+    normalized = WHITESPACE.sub(" ", normalized).strip()
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()[:12], normalized
+
+
+def percentile(sorted_samples: list, q: float):
+    if not sorted_samples:
+        return None
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+class RequestTrace():
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+        self.statements = 0
+        self.active = set()
+
+    def server_timing(self, total: float) -> str:
+        parts = ["{};dur={:.1f}".format(name, self.phases[name] * 1000) for name in PHASES if name in self.phases]
+        parts.append("total;dur={:.1f}".format(total * 1000))
+        return ", ".join(parts)
+
+
+class Tracer():
+    def __init__(self, enabled: bool, slow_query_ms: int, explain: bool, sample_size: int):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.sample_size = sample_size
+        # route -> {"count", "errors", "samples" (seconds), "phases" (total seconds), "statements"}
+        self.__routes = {}
+        # fingerprint id -> {"sql", "count", "total_ms", "max_ms", "slow"}
+        self.__statements = {}
+        self.__explained = {}
+        self.__route_paths = {}
+        self.__lock = threading.Lock()
+        self.stats = {"requests": 0, "statements": 0, "slow_statements": 0, "dropped_fingerprints": 0}
+
+    def instrument(self, engine):
+        """Time every statement run through engine."""
+        if not self.enabled or event.contains(engine, "before_cursor_execute", self.__before_cursor_execute):
+            return
+        event.listen(engine, "before_execute", self.__before_execute)
+        event.listen(engine, "before_cursor_execute", self.__before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.__after_cursor_execute)
+
+    def start_request(self):
+        if not self.enabled:
+            return None, None
+        trace = RequestTrace()
+        return trace, current_trace.set(trace)
+
+    def finish_request(self, request, status_code: int, trace, token):
+        """Record the request under its route; returns its Server-Timing value."""
+        if trace is None:
+            return None
+        current_trace.reset(token)
+        total = time.perf_counter() - trace.started
+        route = self.route_of(request)
+        with self.__lock:
+            self.stats["requests"] += 1
+            stats = self.__routes.get(route)
+            if stats is None:
+                stats = {"count": 0, "errors": 0, "samples": deque(maxlen=self.sample_size),
+                         "phases": defaultdict(float), "statements": 0}
+                self.__routes[route] = stats
+            stats["count"] += 1
+            stats["errors"] += 1 if status_code >= 500 else 0
+            stats["samples"].append(total)
+            stats["statements"] += trace.statements
+            for name, seconds in trace.phases.items():
+                stats["phases"][name] += seconds
+        return trace.server_timing(total)
+
+    def route_of(self, request) -> str:
+        """METHOD and path template of the route that handled request."""
+        endpoint = request.scope.get("endpoint")
+        path = self.__route_paths.get(endpoint)
+        if path is None and endpoint is not None:
+            for route in request.app.router.routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    self.__route_paths[endpoint] = path
+                    break
+        return "{} {}".format(request.method, path or "unmatched")
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the block to the current request's phase."""
+        trace = current_trace.get()
+        if trace is None or name in trace.active:
+            # no request, or nested inside the same phase: counted by the outer block
+            yield
+            return
+        trace.active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.phases[name] += time.perf_counter() - started
+            trace.active.discard(name)
+
+    def traced(self, name: str):
+        """Decorator form of phase()."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get_stats(self, limit: int = 20):
+        """Per-route percentiles and phase averages, and the slowest fingerprints by total time."""
+        with self.__lock:
+            stats = dict(self.stats)
+            routes = {route: (dict(s, phases=dict(s["phases"])), sorted(s["samples"]))
+                      for route, s in self.__routes.items()}
+            statements = sorted(({"fingerprint": fp, **s} for fp, s in self.__statements.items()),
+                                 key=lambda s: s["total_ms"], reverse=True)[:limit]
+        stats.update({
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "routes": {
+                route: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+                    "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+                    "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+                    "max_ms": round(samples[-1] * 1000, 2),
+                    "avg_statements": round(s["statements"] / s["count"], 2),
+                    "avg_phase_ms": {name: round(seconds / s["count"] * 1000, 2)
+                                     for name, seconds in s["phases"].items()},
+                }
+                for route, (s, samples) in sorted(routes.items())
+            },
+            "statements": [dict(s, total_ms=round(s["total_ms"], 2), max_ms=round(s["max_ms"], 2))
+                           for s in statements],
+        })
+        return stats
+
+    def reset(self):
+        with self.__lock:
+            self.__routes = {}
+            self.__statements = {}
+            self.__explained = {}
+            self.stats = {"requests": 0, "statements": 0, "slow_statements": 0, "dropped_fingerprints": 0}
+
+    def record_statement(self, statement: str, seconds: float):
+        """Add one execution to its fingerprint; returns (id, normalized SQL, is slow)."""
+        fp, normalized = fingerprint(statement)
+        elapsed_ms = seconds * 1000
+        slow = 0 < self.slow_query_ms <= elapsed_ms
+        with self.__lock:
+            self.stats["statements"] += 1
+            self.stats["slow_statements"] += 1 if slow else 0
+            stats = self.__statements.get(fp)
+            if stats is None:
+                if len(self.__statements) >= MAX_FINGERPRINTS:
+                    self.stats["dropped_fingerprints"] += 1
+                    return fp, normalized, slow
+                stats = {"sql": normalized[:1000], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0}
+                self.__statements[fp] = stats
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["slow"] += 1 if slow else 0
+        return fp, normalized, slow
+
+    def __before_execute(self, conn, clauseelement, multiparams, params, execution_options):
+        conn.info["trace_execute_started"] = time.perf_counter()
+
+    def __before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        now = time.perf_counter()
+        started = conn.info.pop("trace_execute_started", None)
+        trace = current_trace.get()
+        if trace is not None and started is not None:
+            trace.phases["sql_compile"] += now - started
+        conn.info["trace_cursor_started"] = now
+
+    def __after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("trace_cursor_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        trace = current_trace.get()
+        if trace is not None:
+            trace.phases["db_execute"] += elapsed
+            trace.statements += 1
+        fp, normalized, slow = self.record_statement(statement, elapsed)
+        if slow:
+            logger.warning("Slow query {:.1f} ms [{}]: {}{}".format(
+                elapsed * 1000, fp, normalized[:2000],
+                self.__explain(conn, fp, statement, parameters, executemany)))
+
+    def __explain(self, conn, fp: str, statement: str, parameters, executemany: bool) -> str:
+        """EXPLAIN plan of a slow statement, at most once per EXPLAIN_INTERVAL_S per fingerprint."""
+        if not self.explain or executemany or not statement.lstrip().lower().startswith(EXPLAINABLE):
+            return ""
+        now = time.monotonic()
+        with self.__lock:
+            if now - self.__explained.get(fp, -EXPLAIN_INTERVAL_S) < EXPLAIN_INTERVAL_S:
+                return ""
+            self.__explained[fp] = now
+        # Plain EXPLAIN does not run the statement. The savepoint keeps a failed
+        # EXPLAIN from aborting the caller's transaction.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT trace_explain")
+            try:
+                cursor.execute("EXPLAIN " + statement, parameters)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                cursor.execute("RELEASE SAVEPOINT trace_explain")
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT trace_explain")
+                raise
+            return "\n" + plan
+        except Exception as e:
+            logger.debug("EXPLAIN for [{}] failed: {}".format(fp, str(e)))
+            return ""
+        finally:
+            cursor.close()
+
+
+class TracedJSONResponse(JSONResponse):
+    """Default response class; times rendering as the serialization phase."""
+
+    def render(self, content) -> bytes:
+        with tracer.phase("serialization"):
+            return super().render(content)
+
+
+tracer = Tracer(config_service.tracing_enabled, config_service.slow_query_ms,
+                config_service.slow_query_explain, config_service.trace_sample_size)
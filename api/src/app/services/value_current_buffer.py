@@ -0,0 +1,144 @@
+"""Write-behind coalescing buffer for <value_table>_current upserts.
+
+Pollers send overlapping /bulk/value batches every few seconds, so upserting
+the current table inside every request rewrites the same hot rows and turns
+it into a lock-contention point. Instead, each request's newest sample per
+entity is merged into this buffer, which keeps only the newest sample per
+(database, org, entity) and upserts them in one statement per table every
+VALUE_CURRENT_FLUSH_MS, or sooner once VALUE_CURRENT_BUFFER_MAX entities are
+pending.
+
+Durability semantics:
+- The value (history) table is still written and committed synchronously in
+  the request, so an acknowledged /bulk/value is durable there and primary
+  database failures still surface as 503s.
+- The current table is a derived "latest value" cache and is eventually
+  consistent: an acknowledged sample becomes visible there within one flush
+  interval.
+- Newest wins, both in the buffer and in the upsert's ts guard, so flush
+  order across requests, workers and retries cannot move a row backwards.
+- A failed flush puts its rows back (unless a newer sample arrived
+  meanwhile) and retries on the next cycle.
+- stop() flushes everything pending and is called from the app's shutdown
+  hook. A hard kill loses at most one interval of current-table updates.
+  Those samples are still in the history table, and the next poll for
+  each entity heals the row.
+"""
+
+import logging
+import threading
+
+from app.services import config_service, value_service
+
+logger = logging.getLogger(__name__)
+
+
+class ValueCurrentBuffer():
+    def __init__(self, flush_interval_ms: int, max_pending: int):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+        self.enabled = flush_interval_ms > 0
+        # (engine, org_id) -> (table, {entity_id: row})
+        self.__pending = {}
+        self.__pending_count = 0
+        self.__lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.stats = {"buffered": 0, "coalesced": 0, "flushed": 0, "flushes": 0, "failed_flushes": 0}
+
+    def start(self):
+        if not self.enabled or self.__thread is not None:
+            return
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__run, name="value-current-flush", daemon=True)
+        self.__thread.start()
+        logger.info("Started value_current write-behind buffer (flush every {} ms, max {} entities)".format(
+            int(self.flush_interval * 1000), self.max_pending))
+
+    def stop(self):
+        """Stop the flush thread and flush everything still pending."""
+        if self.__thread is not None:
+            self.__stopped.set()
+            self.__wakeup.set()
+            self.__thread.join()
+            self.__thread = None
+        self.flush()
+
+    def add(self, db, values):
+        """Buffer the newest sample per entity of a bulk request.
+
+        db is the request's Session; only its engine is kept, the flush
+        uses its own connection.
+        """
+        table = value_service.get_value_current_table(db, values.org_id)
+        rows = value_service.latest_value_current_rows(values, value_service.has_value_dict(table))
+        self.__merge(db.get_bind(), values.org_id, table, rows)
+        with self.__lock:
+            self.stats["buffered"] += len(rows)
+        if self.__pending_count >= self.max_pending:
+            self.__wakeup.set()
+
+    def __merge(self, engine, org_id, table, rows: dict):
+        with self.__lock:
+            key = (engine, org_id)
+            if key not in self.__pending:
+                self.__pending[key] = (table, {})
+            pending = self.__pending[key][1]
+            for entity_id, row in rows.items():
+                existing = pending.get(entity_id)
+                if existing is None:
+                    pending[entity_id] = row
+                    self.__pending_count += 1
+                else:
+                    self.stats["coalesced"] += 1
+                    if row["ts"] > existing["ts"]:
+                        pending[entity_id] = row
+
+    def flush(self):
+        """Upsert everything pending, one statement per (database, org)."""
+        with self.__flush_lock:
+            with self.__lock:
+                batches = self.__pending
+                self.__pending = {}
+                self.__pending_count = 0
+            for (engine, org_id), (table, rows) in batches.items():
+                try:
+                    with engine.begin() as connection:
+                        value_service.upsert_value_current(connection, org_id, table, rows)
+                    with self.__lock:
+                        self.stats["flushed"] += len(rows)
+                        self.stats["flushes"] += 1
+                except Exception as e:
+                    with self.__lock:
+                        self.stats["failed_flushes"] += 1
+                    logger.error("Flushing {} current values for org {} failed, will retry: {}".format(
+                        len(rows), org_id, str(e)))
+                    self.__merge(engine, org_id, table, rows)
+
+    def pending(self) -> int:
+        return self.__pending_count
+
+    def get_stats(self):
+        with self.__lock:
+            stats = dict(self.stats)
+        stats.update({
+            "enabled": self.enabled,
+            "pending": self.__pending_count,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "max_pending": self.max_pending
+        })
+        return stats
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            self.__wakeup.wait(self.flush_interval)
+            self.__wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("value_current flush loop error: {}".format(str(e)))
+
+
+buffer = ValueCurrentBuffer(config_service.value_current_flush_ms, config_service.value_current_buffer_max)
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
 from app.model.pydantic.filter import value_schema
 from app.services.acl import org_service
-from app.services import config_service, exception_service, entity_tag_service
+from app.services import config_service, exception_service, entity_tag_service, json_response_service
 import logging
-from app.model.sqlalchemy import values_tables
-from sqlalchemy.dialects.postgresql import insert
+from app.services.value_table_registry import registry as value_table_registry
+from sqlalchemy import null, select, type_coerce
+from sqlalchemy.dialects.postgresql import insert, JSONB
 from sqlalchemy.inspection import inspect
 from app.model.sqlalchemy import dynamic_value_tables
 
@@ -12,46 +13,58 @@ from app.model.sqlalchemy import dynamic_value_tables
 logger = logging.getLogger(__name__)
 
 test_table = config_service.test_table
-orgs_with_value_dict = [1,2,3,5,6,7,8,9]
+def org_table_not_found(org_id: int):
+    logger.error("table for org {} not found".format(org_id))
+    return exception_service.AccessDeniedException(
+        exception_service.DtoExceptionObject(
+            [exception_service.Detail(msg="the client is not authorized to access the op", type="access.denied",
+                                      loc=[])],
+            exception_service.Ctx("")
+        )
+    )
+
+def get_org_tables(db: Session, org_id: int):
+    """The org's registry entry; raises AccessDenied for unknown orgs."""
+    entry = value_table_registry.get(db, org_id)
+    if entry is None:
+        raise org_table_not_found(org_id)
+    return entry
+
+def get_value_table(db: Session, org_id: int):
+    table = get_org_tables(db, org_id).table
+    if test_table:
+        return dynamic_value_tables.tables["value"]
+    return table
+
+def has_value_dict(table) -> bool:
+    """Whether the table has a value_dict column, as found in the catalog."""
+    return "value_dict" in table.c
+
 def add_value(db: Session, value: value_schema.ValueBaseCreate):
-    if value.org_id in values_tables.value_tables:
-        if not test_table:
-            table = values_tables.value_tables[value.org_id]
-        else:
-            table = dynamic_value_tables.tables["value"]
-        #if entity_tag_service.isEntityVirtualPoint(db, value.entity_id):
-        #    table = values_tables.value_virtual_point_tables[value.org_id]
+    table = get_value_table(db, value.org_id)
+    #if entity_tag_service.isEntityVirtualPoint(db, value.entity_id):
+    #    table = values_tables.value_virtual_point_tables[value.org_id]
+    db_value = {
+        "ts": value.ts,
+        "entity_id": value.entity_id,
+        "value_n": value.value_n,
+        "value_b": value.value_b,
+        "value_s": value.value_s,
+        "value_ts": value.value_ts,
+    }
+    if has_value_dict(table):
         db_value = {
-            "ts": value.ts,
-            "entity_id": value.entity_id,
-            "value_n": value.value_n,
-            "value_b": value.value_b,
-            "value_s": value.value_s,
-            "value_ts": value.value_ts,
+                "ts":value.ts,
+                "entity_id":value.entity_id,
+                "value_n":value.value_n,
+                "value_b":value.value_b,
+                "value_s":value.value_s,
+                "value_ts":value.value_ts,
+                "value_dict": value.value_dict
         }
-        if value.org_id not in orgs_with_value_dict:
-            db_value = {
-                    "ts":value.ts,
-                    "entity_id":value.entity_id,
-                    "value_n":value.value_n,
-                    "value_b":value.value_b,
-                    "value_s":value.value_s,
-                    "value_ts":value.value_ts,
-                    "value_dict": value.value_dict
-            }
-
-    else:
-        logger.error("table for org {} not found. Available tables: {}".format(value.org_id, list(values_tables.value_tables.keys())))
-        raise exception_service.AccessDeniedException(
-            exception_service.DtoExceptionObject(
-                [exception_service.Detail(msg="the client is not authorized to access the op", type="access.denied",
-                                          loc=[])],
-                exception_service.Ctx("")
-            )
-        )
     stmt = insert(table).values(db_value)
     primary_keys = [key.name for key in inspect(table).primary_key]
-    if value.org_id not in orgs_with_value_dict:
+    if has_value_dict(table):
         stmt = stmt.on_conflict_do_update(
             index_elements=primary_keys,
             set_={
@@ -79,44 +92,31 @@ def add_value(db: Session, value: value_schema.ValueBaseCreate):
     return db_value
 
 def add_bulk_value(db: Session, values: value_schema.ValueBulkCreate):
-    if values.org_id in values_tables.value_tables:
-        if not test_table:
-            table = values_tables.value_tables[values.org_id]
-        else:
-            table = dynamic_value_tables.tables["value"]
-        db_values = []
-        for val in values.values:
+    table = get_value_table(db, values.org_id)
+    db_values = []
+    for val in values.values:
+        db_value = {
+            "ts": val.ts,
+            "entity_id": val.entity_id,
+            "value_n": val.value_n,
+            "value_b": val.value_b,
+            "value_s": val.value_s,
+            "value_ts": val.value_ts,
+        }
+        if has_value_dict(table):
             db_value = {
-                "ts": val.ts,
-                "entity_id": val.entity_id,
-                "value_n": val.value_n,
-                "value_b": val.value_b,
-                "value_s": val.value_s,
-                "value_ts": val.value_ts,
+                    "ts":val.ts,
+                    "entity_id":val.entity_id,
+                    "value_n":val.value_n,
+                    "value_b":val.value_b,
+                    "value_s":val.value_s,
+                    "value_ts":val.value_ts,
+                    "value_dict": val.value_dict
             }
-            if values.org_id not in orgs_with_value_dict:
-                db_value = {
-                        "ts":val.ts,
-                        "entity_id":val.entity_id,
-                        "value_n":val.value_n,
-                        "value_b":val.value_b,
-                        "value_s":val.value_s,
-                        "value_ts":val.value_ts,
-                        "value_dict": val.value_dict
-                }
-            db_values.append(db_value)
-    else:
-        logger.error("table for org {} not found. Value in the database is {}".format(values.org_id, values_tables))
-        raise exception_service.AccessDeniedException(
-            exception_service.DtoExceptionObject(
-                [exception_service.Detail(msg="the client is not authorized to access the op", type="access.denied",
-                                          loc=[])],
-                exception_service.Ctx("")
-            )
-        )
+        db_values.append(db_value)
     stmt = insert(table).values(db_values)
     primary_keys = [key.name for key in inspect(table).primary_key]
-    if values.org_id not in orgs_with_value_dict:
+    if has_value_dict(table):
         stmt = stmt.on_conflict_do_update(
             index_elements=primary_keys,
             set_={
@@ -142,44 +142,52 @@ def add_bulk_value(db: Session, values: value_schema.ValueBulkCreate):
     return []
 
 def add_bulk_value_current(db: Session, values: value_schema.ValueBulkCreate):
-    if values.org_id in values_tables.value_current_tables:
-        if not test_table:
-            table = values_tables.value_current_tables[values.org_id]
-        else:
-            table = dynamic_value_tables.tables["value_current"]
-        entity_map = {}
+    table = get_value_current_table(db, values.org_id)
+    upsert_value_current(db, values.org_id, table, latest_value_current_rows(values, has_value_dict(table)))
+    #db.bulk_save_objects(db_values)
+    return []
 
-        for val in values.values:
-            db_value = {
-                "ts": val.ts,
-                "entity_id": val.entity_id,
-                "value_n": val.value_n,
-                "value_b": val.value_b,
-                "value_s": val.value_s,
-                "value_ts": val.value_ts,
-            }
-            if values.org_id not in orgs_with_value_dict:
-                db_value["value_dict"] = val.value_dict
+def get_value_current_table(db: Session, org_id: int):
+    table = get_org_tables(db, org_id).current_table
+    if table is None:
+        raise org_table_not_found(org_id)
+    if test_table:
+        return dynamic_value_tables.tables["value_current"]
+    return table
 
-            existing = entity_map.get(val.entity_id)
+def latest_value_current_rows(values: value_schema.ValueBulkCreate, with_value_dict: bool):
+    """Newest row per entity in a bulk request, keyed by entity_id."""
+    entity_map = {}
+    for val in values.values:
+        db_value = {
+            "ts": val.ts,
+            "entity_id": val.entity_id,
+            "value_n": val.value_n,
+            "value_b": val.value_b,
+            "value_s": val.value_s,
+            "value_ts": val.value_ts,
+        }
+        if with_value_dict:
+            db_value["value_dict"] = val.value_dict
 
-            # Only keep if newer, or first time seeing this entity_id
-            if existing is None or val.ts > existing["ts"]:
-                entity_map[val.entity_id] = db_value
+        existing = entity_map.get(val.entity_id)
 
-        db_values = list(entity_map.values())
-    else:
-        logger.error("table for org {} not found. Value in the database is {}".format(values.org_id, values_tables))
-        raise exception_service.AccessDeniedException(
-            exception_service.DtoExceptionObject(
-                [exception_service.Detail(msg="the client is not authorized to access the op", type="access.denied",
-                                          loc=[])],
-                exception_service.Ctx("")
-            )
-        )
+        # Only keep if newer, or first time seeing this entity_id
+        if existing is None or val.ts > existing["ts"]:
+            entity_map[val.entity_id] = db_value
+    return entity_map
+
+def upsert_value_current(db, org_id: int, table, entity_map: dict):
+    """Upsert rows into a current value table, never replacing a newer sample.
+
+    db may be a Session or a Core Connection.
+    """
+    if not entity_map:
+        return
+    db_values = list(entity_map.values())
     stmt = insert(table).values(db_values)
     primary_keys = [key.name for key in inspect(table).primary_key]
-    if values.org_id not in orgs_with_value_dict:
+    if has_value_dict(table):
         stmt = stmt.on_conflict_do_update(
             index_elements=primary_keys,
             set_={
@@ -190,7 +198,7 @@ def add_bulk_value_current(db: Session, values: value_schema.ValueBulkCreate):
                 "value_ts": stmt.excluded.value_ts,
                 "value_dict": stmt.excluded.value_dict,
             },
-            where=(stmt.excluded.ts > table.ts)
+            where=(stmt.excluded.ts > table.c.ts)
         )
     else:
         stmt = stmt.on_conflict_do_update(
@@ -202,58 +210,43 @@ def add_bulk_value_current(db: Session, values: value_schema.ValueBulkCreate):
                 "value_s": stmt.excluded.value_s,
                 "value_ts": stmt.excluded.value_ts,
             },
-            where=(stmt.excluded.ts > table.ts)
+            where=(stmt.excluded.ts > table.c.ts)
         )
     db.execute(stmt)
-    #db.bulk_save_objects(db_values)
-    return []
 
-def get_all_by_object(db: Session, org_id: int, object_id: int, skip: int, limit: int):
-    """Get all values for a specific entity (object_id) using dynamic org table"""
-    if org_id in values_tables.value_tables:
-        table = values_tables.value_tables[org_id]
-        results = []
-        result = db.query(table)\
-            .filter(table.entity_id == object_id)\
-            .order_by(table.ts.desc())\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
-        if result is not None:
-            return result
-        return results
-    else:
-        raise exception_service.AccessDeniedException(
-            exception_service.DtoExceptionObject(
-                [exception_service.Detail(
-                    msg="the client is not authorized to access the op",
-                    type="access.denied",
-                    loc=[])],
-                exception_service.Ctx("")
-            )
-        )
+def select_value_fields(table, fields: list):
+    """Core select of a value table's columns in fields order.
 
-def get_all_by_objects(db: Session, object_ids: list[int], date_from: str, date_to: str, org_id: int, skip: int , limit: int):
-    if org_id in values_tables.value_tables:
-        table = values_tables.value_tables[org_id]
-        results = []
-        result = db.query(table)\
-            .filter(table.entity_id.in_(object_ids)) \
-            .filter(table.ts > date_from) \
-            .filter(table.ts < date_to) \
-            .order_by(table.ts.desc()) \
-            .offset(skip)\
-            .limit(limit) \
-            .all()
-        if result is not None:
-            return result
-        return results
-    else:
-        raise exception_service.AccessDeniedException(
-            exception_service.DtoExceptionObject(
-                [exception_service.Detail(msg="the client is not authorized to access the op", type="access.denied",
-                                          loc=[])],
-                exception_service.Ctx("")
-            )
-        )
+    Fields the table does not have come back as NULL. value_dict is read as
+    plain jsonb, so the driver's dict is returned without a re-encode.
+    """
+    columns = []
+    for field in fields:
+        if field not in table.c:
+            columns.append(null().label(field))
+        elif field == "value_dict":
+            columns.append(type_coerce(table.c.value_dict, JSONB).label(field))
+        else:
+            columns.append(table.c[field])
+    return select(*columns)
+
+def get_all_by_object(db: Session, org_id: int, object_id: int, skip: int, limit: int, fields: list):
+    """Values for a specific entity (object_id) from the org's table, as dicts of fields"""
+    table = get_org_tables(db, org_id).table
+    stmt = select_value_fields(table, fields)\
+        .where(table.c.entity_id == object_id)\
+        .order_by(table.c.ts.desc())\
+        .offset(skip)\
+        .limit(limit)
+    return json_response_service.rows_to_dicts(fields, db.execute(stmt))
 
+def get_all_by_objects(db: Session, object_ids: list[int], date_from: str, date_to: str, org_id: int, skip: int , limit: int, fields: list):
+    table = get_org_tables(db, org_id).table
+    stmt = select_value_fields(table, fields)\
+        .where(table.c.entity_id.in_(object_ids)) \
+        .where(table.c.ts > date_from) \
+        .where(table.c.ts < date_to) \
+        .order_by(table.c.ts.desc()) \
+        .offset(skip)\
+        .limit(limit)
+    return json_response_service.rows_to_dicts(fields, db.execute(stmt))
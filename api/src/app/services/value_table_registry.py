@@ -0,0 +1,164 @@
+"""Org -> value table registry.
+
+Routes value reads and writes to an org's <value_table> and
+<value_table>_current tables with one dict lookup. The tables and their
+columns, such as whether an org's tables have value_dict, come from the
+catalog rather than from a hard-coded list, so new orgs and schema changes
+need no restart:
+- an org missing from the registry is looked up on its first request;
+  an unknown org is remembered as a miss for MISS_TTL_S or until the next
+  refresh, so a client repeating a bad org_id does not query the catalog
+  on every request,
+- the whole registry is reloaded every VALUE_TABLE_REFRESH_S in the
+  background,
+- org updates and deletes through the API refresh that org right away.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import text
+
+from app.model.sqlalchemy import values_tables
+from app.services import config_service
+
+logger = logging.getLogger(__name__)
+
+# Seconds an unknown org id is answered from the registry without a catalog query
+MISS_TTL_S = 30
+
+OrgValueTables = namedtuple("OrgValueTables", ["value_table", "table", "current_table"])
+
+CATALOG_QUERY = """
+    SELECT o.id, o.value_table, c.table_name, c.column_name
+    FROM {schema}.org o
+    JOIN information_schema.columns c
+      ON c.table_schema = :schema
+     AND c.table_name IN (o.value_table, o.value_table || '_current')
+    WHERE o.disabled_ts IS NULL {org_filter}
+"""
+
+
+class ValueTableRegistry():
+    def __init__(self, refresh_interval_s: int):
+        self.refresh_interval = refresh_interval_s
+        # org id -> OrgValueTables; replaced wholesale on refresh, read without locking
+        self.__entries = {}
+        # org id -> monotonic deadline until which the org is known not to exist
+        self.__misses = {}
+        # (table name, columns) -> Table, so unchanged tables keep their Table object
+        self.__tables = {}
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__engine = None
+        self.stats = {"refreshes": 0, "failed_refreshes": 0, "org_lookups": 0, "cached_misses": 0,
+                      "last_refresh_ms": None}
+
+    def start(self, engine):
+        """Load the registry and keep it fresh in the background."""
+        self.__engine = engine
+        if self.refresh_interval <= 0 or self.__thread is not None:
+            return
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__run, name="value-table-registry", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        if self.__thread is not None:
+            self.__stopped.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def get(self, db, org_id: int):
+        """The org's tables, or None if the org or its value table does not exist."""
+        entry = self.__entries.get(org_id)
+        if entry is None:
+            if self.__misses.get(org_id, 0) > time.monotonic():
+                with self.__lock:
+                    self.stats["cached_misses"] += 1
+                return None
+            entry = self.refresh_org(db, org_id)
+        return entry
+
+    def refresh_org(self, db, org_id: int):
+        """Re-read one org from the catalog; db is a Session or Connection."""
+        rows = db.execute(
+            text(CATALOG_QUERY.format(schema=config_service.dbSchema, org_filter="AND o.id = :org_id")),
+            {"schema": config_service.dbSchema, "org_id": org_id}).fetchall()
+        entry = self.__build(rows).get(org_id)
+        with self.__lock:
+            self.stats["org_lookups"] += 1
+            if entry is None:
+                self.__entries.pop(org_id, None)
+                self.__misses[org_id] = time.monotonic() + MISS_TTL_S
+            else:
+                self.__entries[org_id] = entry
+                self.__misses.pop(org_id, None)
+        return entry
+
+    def refresh(self):
+        """Reload every org in one catalog query."""
+        started = time.monotonic()
+        with self.__engine.connect() as connection:
+            rows = connection.execute(
+                text(CATALOG_QUERY.format(schema=config_service.dbSchema, org_filter="")),
+                {"schema": config_service.dbSchema}).fetchall()
+        entries = self.__build(rows)
+        with self.__lock:
+            self.__entries = entries
+            self.__misses = {}
+            self.stats["refreshes"] += 1
+            self.stats["last_refresh_ms"] = round((time.monotonic() - started) * 1000, 1)
+        return entries
+
+    def __build(self, rows):
+        orgs = {}
+        for org_id, value_table, table_name, column_name in rows:
+            orgs.setdefault(org_id, (value_table, {}))[1].setdefault(table_name, set()).add(column_name)
+        entries = {}
+        for org_id, (value_table, columns) in orgs.items():
+            if value_table not in columns:
+                continue
+            current_name = "{}_current".format(value_table)
+            entries[org_id] = OrgValueTables(
+                value_table,
+                self.__table(value_table, False, columns[value_table]),
+                self.__table(current_name, True, columns[current_name]) if current_name in columns else None,
+            )
+        return entries
+
+    def __table(self, name: str, current: bool, columns: set):
+        key = (name, frozenset(columns & values_tables.VALUE_COLUMNS.keys()))
+        table = self.__tables.get(key)
+        if table is None:
+            table = values_tables.build_value_table(name, current, key[1])
+            self.__tables[key] = table
+        return table
+
+    def get_stats(self):
+        with self.__lock:
+            stats = dict(self.stats)
+            entries = list(self.__entries.values())
+        stats.update({
+            "orgs": len(entries),
+            "missing_orgs": len(self.__misses),
+            "orgs_with_value_dict": sum(1 for entry in entries if "value_dict" in entry.table.c),
+            "refresh_interval_s": self.refresh_interval,
+        })
+        return stats
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                with self.__lock:
+                    self.stats["failed_refreshes"] += 1
+                logger.error("Value table registry refresh failed: {}".format(str(e)))
+            self.__stopped.wait(self.refresh_interval)
+
+
+registry = ValueTableRegistry(config_service.value_table_refresh_s)
@@ -9,6 +9,7 @@ import  db_converter.services.user_importer_service as user_importer
 import db_converter.services.post_load_service as post_importer
 import  db_converter.services.org_importer_service as org_importer
 import  db_converter.services.sql_utils_service as sql_utils
+import db_converter.services.bulk_import_service as bulk_importer
 import json
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,7 @@ class ImportJson():
         self.configService = config
         self.fileService = file_service.FileService("")
         self.sqlUtilsService = sql_utils.ExecuteUtilsService()
+        self.bulkImportService = bulk_importer.BulkImportService(config)
 
 
     def importSites(self):
@@ -85,81 +87,11 @@ class ImportJson():
                 conn.commit()
 
     def handleTagMetaAndTagHierarchy(self, cursor, conn, fileDataJson):
-        tagHash = {}
-        for row in fileDataJson["rows"]:
-            tag = self.sqlUtilsService.getFirstRow(cursor, (),
-                                                   "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                       row["def"]["val"]))
-            tagId = tag[1]
-            for rk in row.keys():
-                if rk == "children" or rk == "dependsOn" or rk == "def" or rk == "wikipedia" or rk == "doc":
-                    continue
-                if rk in (
-                "enum", "dis", "fileExt", "mime", "version", "minVal", "maxVal", "wikipedia", "doc", "def", "children",
-                "baseUri", "prefUnit"):
-                    continue
-                rkTag = self.sqlUtilsService.getFirstRow(cursor, (),
-                                                         "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                             rk))
-                rkTagId = rkTag[1]
-                if rk not in tagHash:
-                    tagHash[rk] = {}
-                if not isinstance(row[rk], str) and not isinstance(row[rk], int):
-                    if isinstance(row[rk], list):
-                        for ll in row[rk]:
-                            depTag = self.sqlUtilsService.getFirstRow(cursor, (),
-                                                                      "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                                          ll["val"]))
-                            depTagId = depTag[1]
-                            cursor.execute(
-                                "insert into core_dev.tag_meta (tag_id, attribute, value) values (%s, %s, %s)",
-                                (tagId, rkTagId, depTagId))
-                            conn.commit()
-                        tagHash[rk] = row[rk]
-                    else:
-                        if "val" not in row[rk]:
-                            if not self.rowExists(
-                                    "select * from core_dev.tag_meta where tag_id = %s and attribute = %s",
-                                    (tagId, rkTagId), cursor):
-                                cursor.execute(
-                                    "insert into core_dev.tag_meta (tag_id, attribute) values (%s, %s)",
-                                    (tagId, rkTagId))
-                                conn.commit()
-                            i = 2
-                        else:
-                            if not self.rowExists(
-                                    "select * from core_dev.tag_meta where tag_id = %s and attribute = %s",
-                                    (tagId, rkTagId), cursor):
-                                rkValTag = self.sqlUtilsService.getFirstRow(cursor, (),
-                                                                            "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                                                row[rk]["val"]))
-                                rkValTagId = rkValTag[1]
-                                cursor.execute(
-                                    "insert into core_dev.tag_meta (tag_id, attribute, value) values (%s, %s, %s)",
-                                    (tagId, rkTagId, rkValTagId))
-                                conn.commit()
-                        for rkk in row[rk].keys():
-                            tagHash[rk].update({rkk: row[rk][rkk]})
+        return self.bulkImportService.importDefs(fileDataJson)
 
-                else:
-                    tagHash[rk] = row[rk]
-            if "def" not in row:
-                i = 2
-            if "val" not in row["def"]:
-                i = 3
-            if "is" in row:
-
-                for ss in row["is"]:
-                    parentTag = self.sqlUtilsService.getFirstRow(cursor, (),
-                                                                 "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                                     ss["val"]))
-                    parentTagId = parentTag[1]
-                    cursor.execute("insert into core_dev.tag_hierarchy (parent_id, child_id) values (%s, %s)",
-                                   (parentTagId, tagId))
-                    conn.commit()
-                    i = 1
-
-                i = 1
+    def importEntityTags(self, fileName):
+        logger.info("Start importing entity tags from {}".format(fileName))
+        return self.bulkImportService.importEntityTags(bulk_importer.getCsvEntityTagRows(fileName))
 
     def addTag(self, row, cursor, conn):
         tag = self.sqlUtilsService.getFirstRow(cursor, (),
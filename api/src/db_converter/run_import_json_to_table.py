@@ -25,6 +25,14 @@ def main():
         help="Configuration file in INI format. See `Rally exporter parameters.md` for details.",
         default="config.ini",
     )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        help="sites: run the site importers, defs: bulk load tag_meta/tag_hierarchy from file_name, "
+             "entity_tags: bulk load an entity,tag,value CSV given by file_name.",
+        choices=["sites", "defs", "entity_tags"],
+        default="sites",
+    )
     args = parser.parse_args()
     config = config_service.ConfigService(args.config, args.environment)
     log_time = datetime.datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
@@ -34,8 +42,12 @@ def main():
         format="%(asctime)s\t%(levelname)s\t%(threadName)s" "\t[%(filename)s.%(funcName)s:%(lineno)d]\t%(message)s",
     )
     importerService = importer.ImportJson(config)
-    #importerService.importIntoTable()
-    importerService.importSites()
+    if args.mode == "defs":
+        importerService.importIntoTable()
+    elif args.mode == "entity_tags":
+        importerService.importEntityTags(config.getFileName())
+    else:
+        importerService.importSites()
 
 
 if __name__ == "__main__":
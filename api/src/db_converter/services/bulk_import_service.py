@@ -0,0 +1,299 @@
+"""Set-based bulk importer.
+
+Source rows are streamed into staging tables with COPY, tag names are
+resolved against tag_def with a single join, and entity_tag, tag_meta and
+tag_hierarchy rows are written with one INSERT ... SELECT per table instead
+of one lookup and commit per marker. Entity tags are partitioned by entity
+and each worker thread inserts its partition over its own connection, so no
+cursor or transaction is shared between threads.
+"""
+import concurrent.futures
+import csv
+import io
+import logging
+import threading
+import time
+import uuid
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# Keys of a defs JSON row that are tag_def columns or documentation, not tag_meta attributes
+SKIPPED_DEF_KEYS = ("children", "dependsOn", "def", "wikipedia", "doc", "enum", "dis", "fileExt", "mime",
+                    "version", "minVal", "maxVal", "baseUri", "prefUnit")
+
+COPY_NULL = "\\N"
+
+
+class ImportProgress:
+    """Thread-safe row counter that logs progress and rows/sec."""
+
+    def __init__(self, name, total=None, logEvery=5.0):
+        self.name = name
+        self.total = total
+        self.logEvery = logEvery
+        self.rows = 0
+        self.started = time.monotonic()
+        self.lastLog = self.started
+        self.lock = threading.Lock()
+
+    def add(self, count):
+        with self.lock:
+            self.rows += count
+            now = time.monotonic()
+            if now - self.lastLog >= self.logEvery:
+                self.lastLog = now
+                logger.info(self.describe(now))
+
+    def describe(self, now=None):
+        elapsed = (now or time.monotonic()) - self.started
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        done = "{}/{}".format(self.rows, self.total) if self.total is not None else str(self.rows)
+        return "{}: {} rows in {:.1f}s ({:.0f} rows/sec)".format(self.name, done, elapsed, rate)
+
+    def finish(self):
+        elapsed = time.monotonic() - self.started
+        logger.info(self.describe())
+        return {"rows": self.rows, "seconds": round(elapsed, 3),
+                "rows_per_sec": round(self.rows / elapsed, 1) if elapsed > 0 else 0.0}
+
+
+def toCopyBuffer(rows):
+    """Render rows as COPY csv input; None becomes NULL, '' stays an empty string."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([COPY_NULL if v is None else v for v in row])
+    buffer.seek(0)
+    return buffer
+
+
+def getDefRows(fileDataJson):
+    """Flatten a defs JSON document into (tag, attribute, value) rows.
+
+    Lists give one row per item, {"val": x} gives (tag, attribute, x) and a
+    dict without "val" gives (tag, attribute, None). Scalar values are
+    tag_def fields, not tag_meta, and are skipped.
+    """
+    for row in fileDataJson["rows"]:
+        tag = row["def"]["val"]
+        for rk, rv in row.items():
+            if rk in SKIPPED_DEF_KEYS or isinstance(rv, (str, int)):
+                continue
+            if isinstance(rv, list):
+                for ll in rv:
+                    yield tag, rk, ll["val"]
+            else:
+                yield tag, rk, rv.get("val")
+
+
+def getCsvEntityTagRows(fileName):
+    """Stream (entity, tag, value) rows from a CSV file with those headers.
+
+    entity is the entity's value_table_id (e.g. point:123); an empty value
+    imports the tag as a marker.
+    """
+    with open(fileName, newline="") as file:
+        for row in csv.DictReader(file):
+            value = row.get("value")
+            yield row["entity"], row["tag"], value if value != "" else None
+
+
+class BulkImportService:
+    def __init__(self, config):
+        self.configService = config
+        self.schema = config.getSchema()
+        self.batchSize = config.getBatchSize()
+        self.threads = config.getThreads()
+
+    def connect(self):
+        return psycopg2.connect(dbname=self.configService.getDbName(),
+                                user=self.configService.getDbUsername(),
+                                password=self.configService.getDbPassword(),
+                                host=self.configService.getDbHost(),
+                                port=self.configService.getDbPort())
+
+    def copyRows(self, cursor, table, columns, rows, progress=None):
+        """COPY rows into table in batches of batchSize; returns the row count."""
+        sql = "COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '{}')".format(table, ", ".join(columns), COPY_NULL)
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batchSize:
+                cursor.copy_expert(sql, toCopyBuffer(batch))
+                count += len(batch)
+                if progress:
+                    progress.add(len(batch))
+                batch = []
+        if batch:
+            cursor.copy_expert(sql, toCopyBuffer(batch))
+            count += len(batch)
+            if progress:
+                progress.add(len(batch))
+        return count
+
+    def getTagId(self, cursor, name):
+        cursor.execute("select id from {}.tag_def where name = %s".format(self.schema), (name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def getMarkerTagIds(self, cursor):
+        """Ids of every tag whose `is` chain in tag_meta reaches marker."""
+        cursor.execute("""
+            with recursive markers(tag_id) as (
+                select tm.tag_id from {schema}.tag_meta tm
+                where tm.attribute = %(is)s and tm.value = %(marker)s
+                union
+                select tm.tag_id from {schema}.tag_meta tm
+                join markers m on tm.value = m.tag_id
+                where tm.attribute = %(is)s
+            )
+            select tag_id from markers
+        """.format(schema=self.schema), {"is": self.getTagId(cursor, "is"), "marker": self.getTagId(cursor, "marker")})
+        return [row[0] for row in cursor.fetchall()]
+
+    def importDefs(self, fileDataJson):
+        """Load tag_meta and tag_hierarchy for a defs JSON document in one transaction."""
+        progress = ImportProgress("defs staging")
+        conn = self.connect()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("create temp table stage_def (tag varchar, attribute varchar, value varchar) on commit drop")
+                self.copyRows(cursor, "stage_def", ("tag", "attribute", "value"), getDefRows(fileDataJson), progress)
+                result = progress.finish()
+                cursor.execute("""
+                    select n.name, count(*) from (
+                        select tag as name from stage_def
+                        union all select attribute from stage_def
+                        union all select value from stage_def where value is not null
+                    ) n
+                    left join {}.tag_def td on td.name = n.name
+                    where td.id is null
+                    group by n.name
+                """.format(self.schema))
+                result["not_found"] = dict(cursor.fetchall())
+                cursor.execute("""
+                    insert into {schema}.tag_meta (tag_id, attribute, value)
+                    select distinct t.id, a.id, v.id
+                    from stage_def s
+                    join {schema}.tag_def t on t.name = s.tag
+                    join {schema}.tag_def a on a.name = s.attribute
+                    left join {schema}.tag_def v on v.name = s.value
+                    where (s.value is null or v.id is not null)
+                    and not exists (
+                        select 1 from {schema}.tag_meta tm
+                        where tm.tag_id = t.id and tm.attribute = a.id and tm.value is not distinct from v.id
+                    )
+                """.format(schema=self.schema))
+                result["tag_meta"] = cursor.rowcount
+                cursor.execute("""
+                    insert into {schema}.tag_hierarchy (parent_id, child_id)
+                    select distinct p.id, c.id
+                    from stage_def s
+                    join {schema}.tag_def c on c.name = s.tag
+                    join {schema}.tag_def p on p.name = s.value
+                    where s.attribute = 'is'
+                    on conflict (child_id, parent_id) do nothing
+                """.format(schema=self.schema))
+                result["tag_hierarchy"] = cursor.rowcount
+        finally:
+            conn.close()
+        logger.info("Defs imported: {}".format(result))
+        return result
+
+    def importEntityTags(self, rows):
+        """Import (entity value_table_id, tag name, value) rows into entity_tag.
+
+        Rows without a value are markers and are only imported for tags that
+        are markers. Values are stored in value_s.
+        """
+        stage = "{}.stage_entity_tag_{}".format(self.schema, uuid.uuid4().hex[:8])
+        conn = self.connect()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("create unlogged table {} (entity varchar, tag varchar, value varchar)".format(stage))
+                progress = ImportProgress("entity tag staging")
+                self.copyRows(cursor, stage, ("entity", "tag", "value"), rows, progress)
+                result = {"staging": progress.finish()}
+                cursor.execute("analyze {}".format(stage))
+                cursor.execute("""
+                    select s.tag, count(*) from {stage} s
+                    left join {schema}.tag_def td on td.name = s.tag
+                    where td.id is null
+                    group by s.tag
+                """.format(stage=stage, schema=self.schema))
+                result["not_found"] = dict(cursor.fetchall())
+                markerIds = self.getMarkerTagIds(cursor)
+
+            # Partition by entity so concurrent workers never insert the same (entity, tag)
+            sql = """
+                insert into {schema}.entity_tag (entity_id, tag_id, value_s)
+                select distinct on (e.id, td.id) e.id, td.id, s.value
+                from {stage} s
+                join {schema}.entity e on e.value_table_id = s.entity and e.disabled_ts is null
+                join {schema}.tag_def td on td.name = s.tag
+                where (s.value is not null or td.id = any(%(markers)s))
+                and abs(hashtext(s.entity)) %% %(parts)s = %(part)s
+                and not exists (
+                    select 1 from {schema}.entity_tag et
+                    where et.entity_id = e.id and et.tag_id = td.id and et.disabled_ts is null
+                )
+            """.format(schema=self.schema, stage=stage)
+            result["entity_tag"] = self.runPartitioned("entity_tag", sql, {"markers": markerIds})
+        finally:
+            with conn:
+                conn.cursor().execute("drop table if exists {}".format(stage))
+            conn.close()
+        logger.info("Entity tags imported: {}".format(result))
+        return result
+
+    def importPointMarkers(self):
+        """Import public.point markers straight from the source table, no staging needed."""
+        conn = self.connect()
+        try:
+            with conn:
+                markerIds = self.getMarkerTagIds(conn.cursor())
+        finally:
+            conn.close()
+        sql = """
+            insert into {schema}.entity_tag (entity_id, tag_id)
+            select distinct e.id, td.id
+            from public.point p
+            cross join unnest(p.markers) m(name)
+            join {schema}.entity e on e.value_table_id = 'point:' || p.id and e.disabled_ts is null
+            join {schema}.tag_def td on td.name = m.name
+            where td.id = any(%(markers)s)
+            and abs(p.id) %% %(parts)s = %(part)s
+            and not exists (
+                select 1 from {schema}.entity_tag et
+                where et.entity_id = e.id and et.tag_id = td.id and et.disabled_ts is null
+            )
+        """.format(schema=self.schema)
+        result = self.runPartitioned("point markers", sql, {"markers": markerIds})
+        logger.info("Point markers imported: {}".format(result))
+        return result
+
+    def runPartitioned(self, name, sql, params):
+        """Run sql once per partition, each worker on its own connection and transaction."""
+        progress = ImportProgress(name)
+
+        def runPart(part):
+            conn = self.connect()
+            try:
+                with conn:
+                    cursor = conn.cursor()
+                    cursor.execute(sql, dict(params, parts=self.threads, part=part))
+                    progress.add(cursor.rowcount)
+                    return cursor.rowcount
+            finally:
+                conn.close()
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix="bulk_importer"
+        ) as executor:
+            list(executor.map(runPart, range(self.threads)))
+        return progress.finish()
@@ -38,6 +38,8 @@ class ConfigService:
         self.file_name = config.get(domain, "file_name")
         self.threads = int(config.get(domain, "threads", fallback="5"))
         self.log_level = config.get(domain, "log_level", fallback="INFO")
+        self.schema = config.get(domain, "schema", fallback="core")
+        self.batch_size = int(config.get(domain, "batch_size", fallback="50000"))
 
     def getDbHost(self):
         return self.db_host
@@ -78,3 +80,9 @@ class ConfigService:
 
     def getThreads(self):
         return self.threads
+
+    def getSchema(self):
+        return self.schema
+
+    def getBatchSize(self):
+        return self.batch_size
@@ -1,7 +1,6 @@
 import  db_converter.services.sql_utils_service as sql_utils
+import db_converter.services.bulk_import_service as bulk_importer
 import logging
-import concurrent.futures
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +10,6 @@ class PointImporterService:
         self.cursor = connection.cursor()
         self.sqlUtilsService = sql_utils.ExecuteUtilsService()
         self.configService = config
-        self.notFoundMarkers = {}
 
     def importPoints(self):
         #self.importPointEnitities()
@@ -39,71 +37,8 @@ class PointImporterService:
             logger.info(notFoundTags)
 
     def importMarkers(self):
-        self.cursor.execute("select * from public.point where markers != '{}'")
-
-        records = self.cursor.fetchall()
-        self.cursor.close()
-        cur = self.connection.cursor()
-        isTag = self.sqlUtilsService.getFirstRow(cur, (),
-                                                 "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                     'is'))
-        self.isTagId = isTag[1]
-        realMarkerTag = self.sqlUtilsService.getFirstRow(cur, (),
-                                                         "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                             'marker'))
-        self.realMarkerTagId = realMarkerTag[1]
-        rows = []
-        for row in records:
-            rows.append(row)
-            if len(rows) >20:
-                with concurrent.futures.ThreadPoolExecutor(
-                        max_workers=self.configService.getThreads(), thread_name_prefix="point_markers_importer"
-                ) as executor:
-                    executor.map(self.importPointMarkers, rows)
-                rows = []
-        with concurrent.futures.ThreadPoolExecutor(
-                max_workers=self.configService.getThreads(), thread_name_prefix="point_markers_importer"
-        ) as executor:
-            executor.map(self.importPointMarkers, rows)
-
-
-        logger.info(self.notFoundMarkers)
-
-    def importPointMarkers(self, row):
-        try:
-            cur = self.connection.cursor()
-            for marker in row[7]:
-                realMarker = marker
-                markerTag = self.sqlUtilsService.getFirstRow(cur, (),
-                                                             "select name, id  from core_dev.tag_def where name = '{}'".format(
-                                                                 realMarker))
-                if markerTag is None:
-                    if realMarker in self.notFoundMarkers:
-                        self.notFoundMarkers[realMarker] = self.notFoundMarkers[realMarker] + 1
-                    else:
-                        self.notFoundMarkers[realMarker] = 0
-                    continue
-                markerTagId = markerTag[1]
-
-                if not markerTag or not self.sqlUtilsService.tagIsOfType(markerTagId, self.isTagId, self.realMarkerTagId,
-                                                                         self.connection):
-                    if realMarker in self.notFoundMarkers:
-                        self.notFoundMarkers[realMarker] = self.notFoundMarkers[realMarker] + 1
-                    else:
-                        self.notFoundMarkers[realMarker] = 0
-                else:
-                    objectId = self.sqlUtilsService.getFirstRow(cur, (),
-                                                                "select value_table_id, id from core_dev.object where value_table_id = 'point:{}'".format(
-                                                                    row[0]))
-                    if not self.sqlUtilsService.rowExists(
-                            "select * from core_dev.object_tag_relationship where object_Id = '{}' and tag_id = {}".format(
-                                objectId[1], markerTagId), (), self.connection.cursor()):
-                        cur.execute(
-                            "insert into core_dev.object_tag_relationship (object_id, tag_id) values ({}, '{}')".format(
-                                objectId[1], markerTagId))
-                        self.connection.commit()
-        except Exception as e:
-            logger.error("Error on line {} {}".format(e.__traceback__.tb_lineno, traceback.format_exc()))
+        result = bulk_importer.BulkImportService(self.configService).importPointMarkers()
+        logger.info(result)
 
     def importPointEnitities(self):
         self.cursor.execute("select * from public.point ")
@@ -89,6 +89,38 @@ def test_bulk_create_values(client, simulator_org, simulator_entities):
     assert response.status_code in [200, 400, 403]
 
 
+@pytest.mark.integration
+def test_bulk_values_update_current_after_flush(client, simulator_org, simulator_entities, db):
+    """Test POST /bulk/value - Newest sample per entity reaches the current table"""
+    from sqlalchemy import text
+    from app.services.value_current_buffer import buffer as value_current_buffer
+
+    entity_id = simulator_entities[0]["id"]
+    newest = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    payload = {
+        "org_id": simulator_org["id"],
+        "values": [
+            {"entity_id": entity_id, "ts": (newest - timedelta(minutes=15)).isoformat(), "value_n": 1.0},
+            {"entity_id": entity_id, "ts": newest.isoformat(), "value_n": 2.0}
+        ]
+    }
+
+    response = client.post("/bulk/value", json=payload)
+    if response.status_code != 200:
+        pytest.skip("Entity not writable for this org")
+
+    # Write behind: visible once the buffer flushes (forced here)
+    value_current_buffer.flush()
+    row = db.execute(
+        text(f"SELECT ts, value_n FROM core.values_{simulator_org['key']}_current WHERE entity_id = :id"),
+        {"id": entity_id}
+    ).fetchone()
+    assert row is not None
+    assert row[0] == newest
+    assert float(row[1]) == 2.0
+    assert value_current_buffer.pending() == 0
+
+
 @pytest.mark.integration
 def test_get_values_for_invalid_entity(client, simulator_org):
     """Test GET /value/{entity_id} - Returns 403 for security (prevents ID enumeration)"""
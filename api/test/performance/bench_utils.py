@@ -0,0 +1,130 @@
+"""
+Helpers for the API benchmark suite: timing, percentile summaries, JSON
+results and synthetic values from the simulator's generators.
+
+Every benchmark writes test/performance/results/<name>.json (or
+$PERF_RESULTS_DIR) with the git commit and settings it ran with, so two
+runs can be compared case by case.
+"""
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+API_ROOT = Path(__file__).parent.parent.parent
+SIMULATOR_ROOT = Path(os.getenv("SIMULATOR_ROOT", API_ROOT.parent / "simulator"))
+RESULTS_DIR = Path(os.getenv("PERF_RESULTS_DIR", Path(__file__).parent / "results"))
+
+REPEAT = int(os.getenv("BENCH_REPEAT", "20"))
+WARMUP = int(os.getenv("BENCH_WARMUP", "2"))
+# Synthetic values are generated from a fixed start so every run writes the same rows
+START = datetime.datetime.fromisoformat(os.getenv("BENCH_START", "2020-01-06T00:00:00"))
+INTERVALS = int(os.getenv("BENCH_INTERVALS", "96"))
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def env_list(name: str, default: str) -> list:
+    return [int(v) for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+def time_calls(call, repeat: int = REPEAT, warmup: int = WARMUP) -> list:
+    """Seconds per call, after warmup untimed calls."""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def summarize(latencies: list, items_per_call: int = None) -> dict:
+    """Latency percentiles in ms, plus items/s when each call handles items_per_call items."""
+    ordered = sorted(latencies)
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    summary = {
+        "calls": len(ordered),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+    if items_per_call:
+        summary["items_per_call"] = items_per_call
+        summary["items_per_sec"] = round(items_per_call * len(ordered) / sum(ordered), 1)
+    return summary
+
+
+def run_metadata() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=API_ROOT, capture_output=True, text=True,
+                                  timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "repeat": REPEAT,
+        "warmup": WARMUP,
+    }
+
+
+def write_results(name: str, cases: dict) -> dict:
+    """Print and write results/<name>.json; cases maps case name -> summary."""
+    report = {"benchmark": name, "meta": run_metadata(), "cases": cases}
+    print(json.dumps(report, indent=2))
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / "{}.json".format(name)).write_text(json.dumps(report, indent=2))
+    return report
+
+
+def simulator_modules():
+    """Import the simulator's generators and value serializer from simulator/src."""
+    src = str(SIMULATOR_ROOT / "src")
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    from generators.time_series import TimeSeriesGenerator
+    from generators.weather import WeatherSimulator
+    from generators.schedules import ScheduleGenerator
+    from service.api_sink import ApiValueSink
+    return TimeSeriesGenerator, WeatherSimulator, ScheduleGenerator, ApiValueSink
+
+
+def generate_values(building_config: dict, entity_map: dict, start: datetime.datetime = START,
+                    intervals: int = INTERVALS) -> list:
+    """/bulk/value items for intervals data intervals from start, as the simulator's API sink posts them."""
+    TimeSeriesGenerator, WeatherSimulator, ScheduleGenerator, ApiValueSink = simulator_modules()
+    interval_minutes = building_config["generation"]["data_interval_minutes"]
+    end = start + datetime.timedelta(minutes=interval_minutes * (intervals - 1))
+    weather_sim = WeatherSimulator(building_config["weather"])
+    generator = TimeSeriesGenerator(building_config, entity_map, weather_sim=weather_sim)
+    weather = weather_sim.generate_series(start, end, interval_minutes)
+    occupancies = ScheduleGenerator(building_config).get_occupancy_ratios(weather.index)
+    values = []
+    for timestamp, outdoor_temp, season, occupancy in zip(
+            weather.index, weather["dry_bulb_temp"], weather["season"], occupancies):
+        points = generator._generate_timestamp_data(
+            timestamp.to_pydatetime(), float(outdoor_temp), season, float(occupancy))
+        values.extend(ApiValueSink.serialize_point(point) for point in points)
+    return values
+
+
+def chunks(items: list, size: int) -> list:
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,55 @@
+"""
+Compare two benchmark result directories case by case.
+
+    python -m test.performance.compare results-main/ results-branch/ --threshold 10
+
+Prints p50/p95 for every case found in both directories. Exits 1 if any
+p50 or p95 regressed by more than --threshold percent.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = ("p50_ms", "p95_ms")
+
+
+def load(directory: Path) -> dict:
+    results = {}
+    for path in sorted(directory.glob("*.json")):
+        report = json.loads(path.read_text())
+        for case, summary in report.get("cases", {}).items():
+            results["{}/{}".format(report.get("benchmark", path.stem), case)] = summary
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """(case, metric, baseline, current, change %) for metrics both runs have; regressions are flagged."""
+    rows = []
+    for case in sorted(baseline.keys() & current.keys()):
+        for metric in METRICS:
+            before, after = baseline[case].get(metric), current[case].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            rows.append((case, metric, before, after, change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results of two runs")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    rows = compare(load(args.baseline), load(args.current), args.threshold)
+    for case, metric, before, after, change, regressed in rows:
+        print("{:<50} {:<7} {:>10.3f} -> {:>10.3f} ms {:>+7.1f}%{}".format(
+            case, metric, before, after, change, "  REGRESSION" if regressed else ""))
+    sys.exit(1 if any(row[-1] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
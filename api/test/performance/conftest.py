@@ -0,0 +1,80 @@
+"""
+Benchmark fixtures.
+
+PREREQUISITES: the same stack as the integration tests (TimescaleDB with the
+simulator's org and entities). Values are generated with the simulator's
+generators for a fixed window (BENCH_START, BENCH_INTERVALS) and ingested
+once per session, so reads measure the same rows on every run.
+"""
+
+import datetime
+import os
+
+import pytest
+import yaml
+from sqlalchemy import text
+
+from test.performance import bench_utils
+
+
+@pytest.fixture(scope="session")
+def building_config():
+    path = os.getenv("BENCH_BUILDING_CONFIG", bench_utils.SIMULATOR_ROOT / "config" / "building_config.yaml")
+    with open(path) as file:
+        return yaml.safe_load(file)
+
+
+@pytest.fixture(scope="session")
+def bench_entity_map(db_engine):
+    """Simulator entity names (the id tag) -> entity ids"""
+    with db_engine.connect() as connection:
+        rows = connection.execute(text("""
+            SELECT e.id, et.value_s
+            FROM core.entity e
+            JOIN core.entity_tag et ON et.entity_id = e.id
+            JOIN core.tag_def td ON td.id = et.tag_id
+            WHERE td.name = 'id' AND e.disabled_ts IS NULL
+        """)).fetchall()
+    if not rows:
+        pytest.fail("No simulator entities found! Run simulator first: docker-compose up simulator")
+    return {name: entity_id for entity_id, name in rows if name}
+
+
+@pytest.fixture(scope="session")
+def bench_values(building_config, bench_entity_map):
+    """/bulk/value items for the benchmark window"""
+    values = bench_utils.generate_values(building_config, bench_entity_map)
+    assert values, "simulator generated no values"
+    return values
+
+
+@pytest.fixture(scope="session")
+def bench_window(client, simulator_org, bench_values):
+    """Ingest the benchmark window once; returns (date_from, date_to) bounding it"""
+    for batch in bench_utils.chunks(bench_values, 1000):
+        response = client.post("/bulk/value", json={"org_id": simulator_org["id"], "values": batch})
+        assert response.status_code == 200, response.text
+    timestamps = [datetime.datetime.fromisoformat(value["ts"]) for value in bench_values]
+    return ((min(timestamps) - datetime.timedelta(seconds=1)).strftime(bench_utils.DATE_FORMAT),
+            (max(timestamps) + datetime.timedelta(seconds=1)).strftime(bench_utils.DATE_FORMAT))
+
+
+@pytest.fixture(scope="session")
+def bench_points(bench_values):
+    """Entity ids of numeric points in the benchmark window, most samples first"""
+    counts = {}
+    for value in bench_values:
+        if "value_n" in value:
+            counts[value["entity_id"]] = counts.get(value["entity_id"], 0) + 1
+    return sorted(counts, key=counts.get, reverse=True)
+
+
+@pytest.fixture(scope="session")
+def bench_user_id(db_engine, simulator_org):
+    """A member of the simulator org, for direct ACL checks"""
+    with db_engine.connect() as connection:
+        row = connection.execute(text("SELECT user_id FROM core.org_user WHERE org_id = :org_id LIMIT 1"),
+                                 {"org_id": simulator_org["id"]}).fetchone()
+    if row is None:
+        pytest.fail("No org_user for the simulator org")
+    return row[0]
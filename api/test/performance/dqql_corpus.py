@@ -0,0 +1,25 @@
+"""
+DQQL expressions benchmarked by test_bench_filter and test_bench_dqql,
+written against the simulator's Haystack model: tag tests, comparisons,
+IN lists and ref paths, alone and combined as dashboards and reports
+send them.
+"""
+
+# name -> (expression, tags requested)
+FILTER_CORPUS = {
+    "has_point": ("point", []),
+    "has_and": ("point and sensor and temp", []),
+    "has_or_parens": ("(equip and ahu) or (point and temp)", []),
+    "has_or_equip_types": ("ahu or vav or chiller or meter", []),
+    "missing": ("point and not sensor", []),
+    "cmp_str": ("point and kind == \"Number\"", []),
+    "cmp_number": ("equip and chiller and coolingCapacity >= 100", []),
+    "cmp_in": ("point and kind IN ('Number','Bool')", []),
+    "path_one_hop": ("point and equipRef->ahu", []),
+    "path_two_hops": ("point and equipRef->siteRef->site", []),
+    "path_cmp": ("point and equipRef->dis == \"AHU-1\"", []),
+    "ahu_air_temps": ("point and sensor and temp and air and (discharge or return or mixed)", []),
+    "mixed": ("point and his and kind == \"Number\" and unit != \"%\" and equipRef->siteRef->site", []),
+    "has_point_with_tags": ("point and sensor and temp", ["dis", "kind", "unit"]),
+    "has_point_all_tags": ("point and sensor and temp", ["*"]),
+}
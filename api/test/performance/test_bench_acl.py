@@ -0,0 +1,43 @@
+"""
+ACL check benchmark: entity visibility for growing id lists, called
+directly and through an ACL-bound endpoint.
+
+Run with: pytest -m performance test/performance/test_bench_acl.py -s
+Results: test/performance/results/acl.json.
+"""
+
+import pytest
+
+from test.performance import bench_utils
+
+ENTITY_COUNTS = bench_utils.env_list("BENCH_ACL_ENTITY_COUNTS", "1,10,100,1000")
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_acl_checks(client, db, simulator_org, bench_user_id, bench_entity_map):
+    # imported once the client fixture has pointed the app at the test config
+    from app.services.acl import org_service, user_service
+
+    org_id = simulator_org["id"]
+    entity_ids = sorted(bench_entity_map.values())
+    cases = {}
+
+    cases["org_visible"] = bench_utils.summarize(bench_utils.time_calls(
+        lambda: org_service.is_org_visible_for_user(db, org_id, bench_user_id)))
+    cases["entity_visible"] = bench_utils.summarize(bench_utils.time_calls(
+        lambda: user_service.is_entity_visible_for_user(db, org_id, bench_user_id, entity_ids[0])))
+    for count in ENTITY_COUNTS:
+        ids = (entity_ids * (count // len(entity_ids) + 1))[:count]
+        cases["entities_visible_{}".format(count)] = bench_utils.summarize(bench_utils.time_calls(
+            lambda: user_service.is_entities_visible_for_user(db, org_id, bench_user_id, ids)), items_per_call=count)
+
+    def value_page():
+        # limit=1 keeps the value read negligible next to the visibility check
+        response = client.get("/value/{}?org_id={}&limit=1".format(entity_ids[0], org_id))
+        assert response.status_code == 200, response.text
+
+    cases["endpoint_value_limit_1"] = bench_utils.summarize(bench_utils.time_calls(value_page))
+
+    bench_utils.write_results("acl", cases)
+    assert cases["entity_visible"]["p50_ms"] > 0
@@ -0,0 +1,134 @@
+"""
+DQQL compile pipeline micro-benchmarks over the filter corpus.
+
+Run with: pytest -m performance test/performance/test_bench_dqql.py -s
+
+test_dqql_compile_stages needs no database. It times each stage of
+antlr_service.get_sql for every expression in isolation:
+- lex: dqql_grammarLexer, with the whole token stream filled
+- parse: dqql_grammarParser.expr() over those tokens
+- visit: DqqlVisitor building the entity query; path and name are the parts
+  of it spent in path_service and the name converters
+- security: add_security_to_sql
+- total: get_sql end to end
+It also records the token count and the size of the generated SQL.
+
+test_dqql_planning runs the generated SQL against the integration test
+database with EXPLAIN ANALYZE and reports PostgreSQL planning versus
+execution time per expression. Results: test/performance/results/
+dqql_compile.json and dqql_planning.json.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.api.filter.antlr import antlr_service
+from app.api.filter.antlr.dqqlVisitor import DqqlVisitor, parse_tokens, tokenize
+from app.services import config_service
+from test.performance import bench_utils
+from test.performance.dqql_corpus import FILTER_CORPUS
+
+# Compiling does not look these up; they only end up in the ACL subqueries
+ORG_ID = 1
+USER_ID = 1
+
+
+class TimedVisitor(DqqlVisitor):
+    """DqqlVisitor that adds up the time spent in the path and name converters"""
+
+    def __init__(self, db_schema, tags):
+        super().__init__(db_schema, tags)
+        self.timings = {"path": 0.0, "name": 0.0}
+
+    def __timed(self, stage, convert, *args):
+        started = time.perf_counter()
+        convert(*args)
+        self.timings[stage] += time.perf_counter() - started
+
+    def convert_path_to_sql(self, ctx):
+        self.__timed("path", super().convert_path_to_sql, ctx)
+
+    def convert_name_to_sql(self, path, cmpOp, val):
+        self.__timed("name", super().convert_name_to_sql, path, cmpOp, val)
+
+    def convert_name_without_cmp(self, ctx):
+        self.__timed("name", super().convert_name_without_cmp, ctx)
+
+
+def compile_stages(expression: str, tags: list) -> dict:
+    """Seconds per stage for one compile of expression"""
+    timings = {}
+    started = time.perf_counter()
+    stream = tokenize(expression)
+    timings["lex"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    tree = parse_tokens(stream)
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    visitor = TimedVisitor(config_service.dbSchema, tags)
+    sql_select = visitor.build_sql_clause(tree)
+    timings["visit"] = time.perf_counter() - started
+    timings.update(visitor.timings)
+
+    started = time.perf_counter()
+    antlr_service.add_security_to_sql(sql_select, ORG_ID, USER_ID, config_service.dbSchema,
+                                      visitor.build_dynamic_columns("a"))
+    timings["security"] = time.perf_counter() - started
+    return timings
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_dqql_compile_stages():
+    cases = {}
+    for name, (expression, tags) in FILTER_CORPUS.items():
+        sql = antlr_service.get_sql(expression, tags, ORG_ID, USER_ID, config_service.dbSchema)
+        stream = tokenize(expression)
+        # the staged pipeline must compile to exactly what the endpoint runs
+        assert antlr_service.get_sql_from_tree(
+            parse_tokens(stream), tags, ORG_ID, USER_ID, config_service.dbSchema) == sql
+
+        for _ in range(bench_utils.WARMUP):
+            compile_stages(expression, tags)
+        runs = [compile_stages(expression, tags) for _ in range(bench_utils.REPEAT)]
+        for stage in runs[0]:
+            cases["{}/{}".format(name, stage)] = bench_utils.summarize([run[stage] for run in runs])
+
+        summary = bench_utils.summarize(bench_utils.time_calls(
+            lambda: antlr_service.get_sql(expression, tags, ORG_ID, USER_ID, config_service.dbSchema)))
+        summary.update({"filter": expression, "tags": tags, "tokens": len(stream.tokens),
+                        "sql_bytes": len(sql.encode())})
+        cases["{}/total".format(name)] = summary
+
+    bench_utils.write_results("dqql_compile", cases)
+    assert all(cases["{}/total".format(name)]["p50_ms"] > 0 for name in FILTER_CORPUS)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_dqql_planning(db, simulator_org, bench_user_id):
+    """Planning versus execution time of the generated SQL, as PostgreSQL reports them"""
+    cases = {}
+    for name, (expression, tags) in FILTER_CORPUS.items():
+        sql = antlr_service.get_sql(expression, tags, simulator_org["id"], bench_user_id, config_service.dbSchema)
+        plans = []
+
+        def explain():
+            # TIMING OFF: only the totals are read, per-node clock calls would inflate them
+            plans.append(db.execute(text("EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) " + sql)).scalar()[0])
+
+        bench_utils.time_calls(explain)
+        plans = plans[bench_utils.WARMUP:]
+        cases["{}/planning".format(name)] = bench_utils.summarize(
+            [plan["Planning Time"] / 1000 for plan in plans])
+        summary = bench_utils.summarize([plan["Execution Time"] / 1000 for plan in plans])
+        summary.update({"filter": expression, "tags": tags, "rows": plans[-1]["Plan"]["Actual Rows"],
+                        "sql_bytes": len(sql.encode())})
+        cases["{}/execution".format(name)] = summary
+
+    bench_utils.write_results("dqql_planning", cases)
+    assert cases["has_point/execution"]["rows"] > 0
@@ -0,0 +1,32 @@
+"""
+/filter benchmark over a corpus of representative DQQL expressions.
+
+Run with: pytest -m performance test/performance/test_bench_filter.py -s
+Results: test/performance/results/filter.json.
+"""
+
+import pytest
+
+from test.performance import bench_utils
+from test.performance.dqql_corpus import FILTER_CORPUS
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_filter_corpus(client, simulator_org):
+    cases = {}
+    for name, (expression, tags) in FILTER_CORPUS.items():
+        payload = {"filter": expression, "org_id": simulator_org["id"], "tags": tags}
+        matched = []
+
+        def run():
+            response = client.post("/filter", json=payload)
+            assert response.status_code == 200, "{}: {}".format(expression, response.text)
+            matched[:] = response.json()
+
+        summary = bench_utils.summarize(bench_utils.time_calls(run))
+        summary.update({"filter": expression, "tags": tags, "entities": len(matched)})
+        cases[name] = summary
+
+    bench_utils.write_results("filter", cases)
+    assert cases["has_point"]["entities"] > 0
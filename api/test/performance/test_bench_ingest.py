@@ -0,0 +1,44 @@
+"""
+/bulk/value ingest benchmark at several batch sizes.
+
+Run with: pytest -m performance test/performance/test_bench_ingest.py -s
+Batch sizes come from BENCH_BATCH_SIZES (default 100,500,1000,5000). The
+same simulator-generated window is re-posted, so every run upserts the same
+rows. Results: test/performance/results/ingest.json.
+"""
+
+import gzip
+import itertools
+import json
+
+import pytest
+
+from test.performance import bench_utils
+
+BATCH_SIZES = bench_utils.env_list("BENCH_BATCH_SIZES", "100,500,1000,5000")
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_bulk_value_batch_sizes(client, simulator_org, bench_values):
+    """Latency per request and values/s for each batch size, plain JSON and gzip bodies"""
+    cases = {}
+    for batch_size in BATCH_SIZES:
+        batches = bench_utils.chunks(bench_values, batch_size)
+        bodies = [json.dumps({"org_id": simulator_org["id"], "values": batch}).encode() for batch in batches]
+        for encoding in ("identity", "gzip"):
+            if encoding == "gzip":
+                bodies = [gzip.compress(body, compresslevel=5) for body in bodies]
+            headers = {"Content-Type": "application/json", "Content-Encoding": encoding}
+            cycle = itertools.cycle(bodies)
+
+            def post():
+                response = client.post("/bulk/value", data=next(cycle), headers=headers)
+                assert response.status_code == 200, response.text
+
+            summary = bench_utils.summarize(bench_utils.time_calls(post), items_per_call=batch_size)
+            summary["request_bytes"] = sum(len(body) for body in bodies) // len(bodies)
+            cases["batch_{}_{}".format(batch_size, encoding)] = summary
+
+    bench_utils.write_results("ingest", cases)
+    assert all(case["p50_ms"] > 0 for case in cases.values())
@@ -0,0 +1,76 @@
+"""
+Value read benchmarks: /values raw and aggregated, and /point/value deep
+pagination.
+
+Run with: pytest -m performance test/performance/test_bench_values.py -s
+/values reads the benchmark window ingested by the bench_window fixture.
+/point/value pages through all history of the BENCH_PAGE_POINTS busiest
+points at the offsets in BENCH_PAGE_OFFSETS. Results:
+test/performance/results/values.json and point_value_pagination.json.
+"""
+
+import os
+
+import pytest
+
+from test.performance import bench_utils
+
+VALUES_FILTER = "point and sensor and temp"
+PAGE_OFFSETS = bench_utils.env_list("BENCH_PAGE_OFFSETS", "0,1000,5000,20000,50000")
+PAGE_POINTS = int(os.getenv("BENCH_PAGE_POINTS", "50"))
+PAGE_LIMIT = 1000
+
+# name -> operation; an empty aggregation returns raw rows
+OPERATIONS = {
+    "raw": {"aggregation": "", "time": "", "timeInSeconds": 0},
+    "avg_15m": {"aggregation": "avg", "time": "15m", "timeInSeconds": 900},
+    "avg_1h": {"aggregation": "avg", "time": "1h", "timeInSeconds": 3600},
+    "max_1d": {"aggregation": "max", "time": "1d", "timeInSeconds": 86400},
+}
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_values_raw_and_aggregated(client, simulator_org, bench_window):
+    date_from, date_to = bench_window
+    cases = {}
+    for name, operation in OPERATIONS.items():
+        payload = {"filter": VALUES_FILTER, "org_id": simulator_org["id"], "tags": [], "val_tag": "dis",
+                   "date_from": date_from, "date_to": date_to, "operation": operation}
+        rows = []
+
+        def run():
+            response = client.post("/values", json=payload)
+            assert response.status_code == 200, response.text
+            rows[:] = response.json()
+
+        summary = bench_utils.summarize(bench_utils.time_calls(run))
+        summary.update({"operation": operation, "rows": len(rows)})
+        cases[name] = summary
+
+    bench_utils.write_results("values", cases)
+    assert cases["raw"]["rows"] > 0
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_point_value_deep_pagination(client, simulator_org, bench_window, bench_points):
+    """Cost of OFFSET paging: same page size, growing skip"""
+    points = bench_points[:PAGE_POINTS]
+    cases = {}
+    for skip in PAGE_OFFSETS:
+        payload = {"org_id": simulator_org["id"], "points": points, "skip": skip, "limit": PAGE_LIMIT,
+                   "date_from": "2000-01-01 00:00:00", "date_to": "2100-01-01 00:00:00"}
+        rows = []
+
+        def run():
+            response = client.post("/point/value", json=payload)
+            assert response.status_code == 200, response.text
+            rows[:] = response.json()
+
+        summary = bench_utils.summarize(bench_utils.time_calls(run))
+        summary.update({"skip": skip, "limit": PAGE_LIMIT, "points": len(points), "rows": len(rows)})
+        cases["skip_{}".format(skip)] = summary
+
+    bench_utils.write_results("point_value_pagination", cases)
+    assert cases["skip_0"]["rows"] > 0
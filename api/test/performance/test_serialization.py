@@ -0,0 +1,73 @@
+"""
+Response serialization benchmark for value reads: a 1000-row page encoded
+through the response model (orm_mode validation, jsonable_encoder,
+json.dumps) versus json_response_service (dicts from tuples, orjson).
+
+Run with: pytest -m performance test/performance/test_serialization.py -s
+No database needed. Results are printed and written to
+test/performance/results/serialization.json.
+"""
+
+import datetime
+import decimal
+import json
+import os
+import timeit
+from collections import namedtuple
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import parse_obj_as
+
+from app.model.pydantic.filter import value_schema
+from app.services import json_response_service
+from test.performance import bench_utils
+
+ROWS = int(os.getenv("SERIALIZATION_BENCHMARK_ROWS", "1000"))
+REPEAT = int(os.getenv("SERIALIZATION_BENCHMARK_REPEAT", "20"))
+
+FIELDS = json_response_service.schema_fields(value_schema.ValueBase)
+OrmRow = namedtuple("OrmRow", FIELDS)
+
+
+def sample_rows():
+    """Core rows as tuples; value_dict arrives as the driver's dict"""
+    start = datetime.datetime(2024, 1, 1)
+    return [
+        (start + datetime.timedelta(seconds=i), None, 1000 + i % 50, decimal.Decimal("{}.125".format(i)),
+         None, None, None, {"unit": "kW", "quality": i % 3})
+        for i in range(ROWS)
+    ]
+
+
+def model_response(rows):
+    """What the endpoints did before: ORM rows (value_dict re-encoded by Jsonb) through the response model"""
+    orm_rows = [OrmRow(*row[:-1], json.dumps(row[-1])) for row in rows]
+    models = parse_obj_as(list[value_schema.ValueBase], [value_schema.ValueBase.from_orm(row) for row in orm_rows])
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def lean_response(rows):
+    return json_response_service.RowsResponse(json_response_service.rows_to_dicts(FIELDS, rows)).body
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_value_page_serialization():
+    """Lean responses encode the same JSON and are faster than the response model path"""
+    rows = sample_rows()
+    assert json.loads(lean_response(rows)) == json.loads(model_response(rows))
+
+    model_s = min(timeit.repeat(lambda: model_response(rows), number=1, repeat=REPEAT))
+    lean_s = min(timeit.repeat(lambda: lean_response(rows), number=1, repeat=REPEAT))
+    report = {
+        "rows": ROWS,
+        "repeat": REPEAT,
+        "model_ms": round(model_s * 1000, 3),
+        "lean_ms": round(lean_s * 1000, 3),
+        "speedup": round(model_s / lean_s, 1),
+    }
+    bench_utils.write_results("serialization", {"value_page": report})
+
+    assert lean_s < model_s
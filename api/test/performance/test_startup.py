@@ -0,0 +1,57 @@
+"""
+Cold-start benchmark: time and memory to import app.main in a fresh process.
+
+Run with: pytest -m performance test/performance/test_startup.py -s
+Needs the same database as the integration tests. Results are printed and
+written to test/performance/results/startup.json.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from test.performance import bench_utils
+
+API_ROOT = bench_utils.API_ROOT
+RUNS = int(os.getenv("STARTUP_BENCHMARK_RUNS", "5"))
+
+PROBE = """
+import json, resource, time
+started = time.monotonic()
+import app.main as main
+print(json.dumps({
+    "seconds": time.monotonic() - started,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "timings": main.startup_timings,
+}))
+"""
+
+
+def cold_start():
+    env = dict(os.environ, CONFIG_PATH=str(API_ROOT / "test" / "test_config.json"), dk_env="test",
+               PYTHONPATH=str(API_ROOT / "src"))
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=API_ROOT, env=env,
+                            capture_output=True, text=True, timeout=120, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_cold_start():
+    """Import app.main RUNS times; value tables must not be built at startup"""
+    runs = [cold_start() for _ in range(RUNS)]
+    seconds = [run["seconds"] for run in runs]
+    report = {
+        "runs": RUNS,
+        "median_seconds": round(statistics.median(seconds), 3),
+        "max_seconds": round(max(seconds), 3),
+        "median_max_rss_mb": round(statistics.median(run["max_rss_kb"] for run in runs) / 1024, 1),
+        "timings": runs[-1]["timings"],
+    }
+    bench_utils.write_results("startup", {"cold_start": report})
+
+    assert report["median_seconds"] > 0
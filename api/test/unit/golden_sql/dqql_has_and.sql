@@ -0,0 +1,16 @@
+ SELECT root.id AS entity_id , root.tag_id, root.value_n, root.value_b, root.value_s, root.value_ts, root.value_ref, root.value_enum ,root.value_table FROM (select a.id , a.tag_id, a.value_n, a.value_b, a.value_s, a.value_ts, a.value_ref, a.value_enum ,org_root.value_table value_table from (select distinct on (et.entity_id) et.entity_id as id , et.tag_id, et.value_n, et.value_b, et.value_s, et.value_ts, et.value_ref, et.value_enum from core.entity_tag et join core.tag_def td ON et.tag_id = td.id where et.entity_id in (
+        select e.id
+            from core."entity" e,
+                 core.entity_tag et  where e.id = et.entity_id AND ( e.id in
+        (select entity_id
+            from core.entity_tag et1, core.tag_def td1
+            where et1.tag_id = td1.id and td1.name = 'point')
+         and  e.id in
+        (select entity_id
+            from core.entity_tag et2, core.tag_def td2
+            where et2.tag_id = td2.id and td2.name = 'sensor')
+         and  e.id in
+        (select entity_id
+            from core.entity_tag et3, core.tag_def td3
+            where et3.tag_id = td3.id and td3.name = 'temp')
+        )) ORDER BY et.entity_id, et.tag_id) a, core.org org_root, core.org_entity_permission oep_root, core.tag_def td, core.tag_meta tm where  td.name = 'lib' and org_root.id = oep_root.org_id and oep_root.entity_id = a.id and td.id = tm.attribute and tm.tag_id = a.tag_id  and ((exists (select 1 from core.org_entity_permission oep where  oep.org_id = 1 and oep.entity_id = a.id) or exists (select 1 from core.user_entity_add_permission ueap where   ueap.user_id = 2 and ueap.entity_id = a.id) and not exists (select 1 from core.user_entity_rev_permission uerp where   uerp.user_id = 2 and uerp.entity_id = a.id)) and ((exists (select 1 from core.org_tag_permission otp where  otp.org_id = 1 and otp.tag_id = tm.value)  or exists (select 1 from core.user_tag_add_permission utap where   utap.user_id = 2 and utap.tag_id = tm.value)) and  not exists (select 1 from  core.user_tag_rev_permission utrp where   utrp.user_id = 2 and utrp.tag_id = tm.value)))) root GROUP BY root.id , root.tag_id, root.value_n, root.value_b, root.value_s, root.value_ts, root.value_ref, root.value_enum ,value_table
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Set-based bulk importer row helpers (no database).
+"""
+
+import csv
+
+import pytest
+
+from db_converter.services import bulk_import_service
+
+
+@pytest.mark.unit
+def test_def_rows_skip_tag_def_fields():
+    """Documentation keys and scalar values are tag_def fields, not tag_meta"""
+    defs = {"rows": [{
+        "def": {"_kind": "symbol", "val": "ahu"},
+        "doc": "Air handling unit",
+        "dis": "AHU",
+        "children": [{"val": "discharge"}],
+        "dependsOn": [{"val": "phIoT"}],
+        "wikipedia": {"val": "https://en.wikipedia.org/wiki/Air_handler"},
+        "version": "3.9.15",
+        "minVal": 0,
+        "is": [{"val": "equip"}],
+    }]}
+    assert list(bulk_import_service.getDefRows(defs)) == [("ahu", "is", "equip")]
+
+
+@pytest.mark.unit
+def test_def_rows_lists_vals_and_markers():
+    """A list gives one row per item, {"val": x} gives x, a dict without val gives a NULL value"""
+    defs = {"rows": [{
+        "def": {"val": "ahu"},
+        "is": [{"val": "equip"}, {"val": "airHandlingEquip"}],
+        "lib": {"_kind": "symbol", "val": "lib:phIoT"},
+        "mandatory": {"_kind": "marker"},
+    }]}
+    assert list(bulk_import_service.getDefRows(defs)) == [
+        ("ahu", "is", "equip"),
+        ("ahu", "is", "airHandlingEquip"),
+        ("ahu", "lib", "lib:phIoT"),
+        ("ahu", "mandatory", None),
+    ]
+
+
+@pytest.mark.unit
+def test_copy_buffer_null_vs_empty_string():
+    """None is written as the NULL marker; with NULL '\\N' COPY reads the empty field as ''"""
+    buffer = bulk_import_service.toCopyBuffer([("ahu", None, ""), ("say \"hi\", ok", "x", "1")])
+    assert buffer.getvalue() == 'ahu,\\N,\n"say ""hi"", ok",x,1\n'
+    assert list(csv.reader(buffer)) == [["ahu", "\\N", ""], ['say "hi", ok', "x", "1"]]
+
+
+@pytest.mark.unit
+def test_csv_entity_tag_rows_empty_value_is_marker(tmp_path):
+    path = tmp_path / "entity_tags.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["entity", "tag", "value"])
+        writer.writerow(["point:1", "sensor", ""])
+        writer.writerow(["point:1", "unit", "kW"])
+    assert list(bulk_import_service.getCsvEntityTagRows(str(path))) == [
+        ("point:1", "sensor", None),
+        ("point:1", "unit", "kW"),
+    ]
@@ -0,0 +1,67 @@
+"""
+HTTP compression middleware (no database).
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services import compression_service
+from app.services.compression_service import CompressionMiddleware
+
+PAYLOAD = {"values": [{"entity_id": i, "value_n": i * 1.5} for i in range(200)]}
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return json.loads(await request.body())
+
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, max_request_size=64 * 1024)
+    return TestClient(app)
+
+
+@pytest.mark.unit
+def test_negotiate_encoding():
+    assert compression_service.negotiate_encoding("") is None
+    assert compression_service.negotiate_encoding("gzip;q=0, br") is None
+    assert compression_service.negotiate_encoding("br, gzip;q=0.5") == "gzip"
+    assert compression_service.negotiate_encoding("*") == compression_service.supported_encodings()[0]
+
+
+@pytest.mark.unit
+def test_gzip_request_and_response(client):
+    """A gzip body reaches the handler decompressed; the large response comes back gzip"""
+    response = client.post("/echo", data=gzip.compress(json.dumps(PAYLOAD).encode()),
+                           headers={"Content-Encoding": "gzip", "Content-Type": "application/json",
+                                    "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == PAYLOAD
+
+
+@pytest.mark.unit
+def test_small_response_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert response.json() == {"status": "ok"}
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.unit
+def test_rejected_request_bodies(client):
+    """Unknown encodings, corrupt data and decompression bombs are refused before routing"""
+    assert client.post("/echo", data=b"x", headers={"Content-Encoding": "br"}).status_code == 415
+    assert client.post("/echo", data=b"not gzip", headers={"Content-Encoding": "gzip"}).status_code == 400
+    bomb = gzip.compress(b" " * (128 * 1024))
+    assert client.post("/echo", data=bomb, headers={"Content-Encoding": "gzip"}).status_code == 413
@@ -0,0 +1,56 @@
+"""
+Bulk CSV bootstrap helpers (no database).
+"""
+
+import csv
+
+import pytest
+
+from app.db.data_loader import loader
+from app.model.sqlalchemy import acl_org_model, history_model, source_object_model
+
+
+def read_copy_buffer(buffer):
+    return list(csv.reader(buffer))
+
+
+@pytest.mark.unit
+def test_copy_columns_rename_and_drop_unknown():
+    """object_id loads into entity_id; CSV columns the table lacks are ignored"""
+    table = source_object_model.EntityTag.__table__
+    columns = loader.get_copy_columns(table, ["id", "object_id", "tag_id", "legacy_column"])
+    assert columns == [("id", "id"), ("object_id", "entity_id"), ("tag_id", "tag_id")]
+
+
+@pytest.mark.unit
+def test_copy_rows_nulls_and_empty_defaults():
+    """Empty strings become NULL, except columns the ORM loaders default to empty"""
+    table = source_object_model.EntityTag.__table__
+    columns = loader.get_copy_columns(table, ["id", "value_s", "value_list", "value_dict"])
+    rows = loader.to_copy_rows([{"id": "7", "value_s": "", "value_list": "", "value_dict": ""},
+                                {"id": "8", "value_s": 'say "hi", ok', "value_list": '{"a"}', "value_dict": '{"k": 1}'}],
+                               columns)
+    assert read_copy_buffer(loader.to_copy_buffer(rows)) == [
+        ["7", "\\N", "{}", "{}"],
+        ["8", 'say "hi", ok', '{"a"}', '{"k": 1}'],
+    ]
+
+
+@pytest.mark.unit
+def test_pref_unit_array_literal():
+    data_loader = loader.DataLoader(None)
+    assert data_loader.convertPrefUnit('{"kW","W"}') == '{"kW","W"}'
+    assert data_loader.convertPrefUnit("['kW']") == '{"kW"}'
+
+
+@pytest.mark.unit
+def test_bulk_load_plan_dependency_order():
+    """Parents load before the tables that reference them, history last"""
+    plan = [model.__table__ for model, _ in loader.DataLoader(None).get_bulk_load_plan()]
+    position = {table.name: i for i, table in enumerate(plan)}
+    for table in plan:
+        for fk in table.foreign_keys:
+            parent = fk.column.table.name
+            if parent in position and parent != table.name:
+                assert position[parent] < position[table.name], "{} before {}".format(parent, table.name)
+    assert plan.index(acl_org_model.OrgEntityPermission.__table__) < plan.index(history_model.TagDefHistory.__table__)
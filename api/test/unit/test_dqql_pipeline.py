@@ -0,0 +1,39 @@
+"""
+DQQL compile stages (no database).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.api.filter.antlr import antlr_service
+from app.api.filter.antlr.antlr_error_listener import AntlrError
+from app.api.filter.antlr.dqqlVisitor import parse, parse_tokens, tokenize
+
+# SQL generated by get_sql before it was split into stages (org 1, user 2, schema core)
+GOLDEN_SQL = Path(__file__).parent / "golden_sql"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name,expression,tags", [
+    ("has_and", "point and sensor and temp", []),
+    ("cmp_in_tags", "point and kind IN ('Number','Bool')", ["dis", "kind"]),
+    ("path_missing_all_tags", "point and equipRef->siteRef->site and not cmd", ["*"]),
+])
+def test_staged_compile_matches_golden_sql(name, expression, tags):
+    golden = (GOLDEN_SQL / "dqql_{}.sql".format(name)).read_text()
+    assert antlr_service.get_sql(expression, tags, 1, 2, "core") == golden
+    tree = parse_tokens(tokenize(expression))
+    assert antlr_service.get_sql_from_tree(tree, tags, 1, 2, "core") == golden
+
+
+@pytest.mark.unit
+def test_tokenize_lexes_whole_filter():
+    stream = tokenize("point and equipRef->ahu")
+    assert [token.text for token in stream.tokens if token.text.strip()] == ["point", "and", "equipRef", "->", "ahu", "<EOF>"]
+
+
+@pytest.mark.unit
+def test_parse_raises_on_syntax_error():
+    with pytest.raises(AntlrError):
+        parse("point and and temp")
@@ -0,0 +1,68 @@
+"""
+Exporter writer tests (no database).
+
+Entities arrive as a stream of (entity_type, row) grouped by type, the way
+entity_service.stream_entities yields them from the server-side cursor.
+"""
+
+import io
+import zipfile
+
+import openpyxl
+import pytest
+
+from app.services.export.services import xls_service
+
+
+HIERARCHY = [
+    ("equip", {"len": 1, "real_tags": ["ahu equip", "equip meter"]}),
+    ("point", {"len": 1, "real_tags": ["point"]}),
+]
+COLUMNS = {
+    "equip": ["db_id", "disabled", "ahu", "dis"],
+    "point": ["db_id", "disabled", "dis", "equipRef"],
+}
+
+
+def entities():
+    yield "equip", {"db_id": 1, "disabled": "", "ahu": "1", "dis": "AHU-1"}
+    yield "equip", {"db_id": 2, "disabled": "", "dis": "Meter"}
+    yield "point", {"db_id": 3, "disabled": "", "equipRef": "ahu-1,meter"}
+
+
+@pytest.mark.unit
+def test_xlsx_one_sheet_per_type():
+    """Write-only workbook: info tab plus one sheet per type, values in their columns"""
+    output = xls_service.writeXLSFile(HIERARCHY, COLUMNS, entities(), io.BytesIO())
+    output.seek(0)
+    wb = openpyxl.load_workbook(output)
+
+    assert wb.sheetnames == ["info", "equip", "point"]
+    assert [list(r) for r in wb["info"].iter_rows(values_only=True)] == [
+        ["equip", "point"], ["ahu equip", "point"], ["equip meter", None]
+    ]
+    assert [list(r) for r in wb["equip"].iter_rows(values_only=True)] == [
+        ["db_id", "disabled", "ahu", "dis"], [1, None, "1", "AHU-1"], [2, None, None, "Meter"]
+    ]
+
+
+@pytest.mark.unit
+def test_csv_zip_one_file_per_type():
+    """CSV export: one member per type, rows streamed in order"""
+    output = xls_service.writeCSVZip(HIERARCHY, COLUMNS, entities(), io.BytesIO())
+    zf = zipfile.ZipFile(output)
+
+    assert zf.namelist() == ["info.csv", "equip.csv", "point.csv"]
+    assert zf.read("point.csv").decode().splitlines() == ["db_id,disabled,dis,equipRef", '3,,,"ahu-1,meter"']
+
+
+@pytest.mark.unit
+def test_sheet_names_are_excel_safe():
+    """Sheet names are sanitized, truncated to 31 characters and unique"""
+    used = set()
+    long_name = "equip point sensor temp zone air discharge"
+    first = xls_service.getSafeSheetName(long_name, used)
+    second = xls_service.getSafeSheetName(long_name, used)
+
+    assert len(first) == 31 and len(second) == 31 and first != second
+    assert xls_service.getSafeSheetName("a/b:c", used) == "a_b_c"
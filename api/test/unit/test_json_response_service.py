@@ -0,0 +1,51 @@
+"""
+Lean JSON responses for value and filter reads (no database).
+"""
+
+import datetime
+import decimal
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.model.pydantic.filter import value_schema
+from app.model.sqlalchemy import values_tables
+from app.services import json_response_service, value_service
+
+TS = datetime.datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+
+@pytest.mark.unit
+def test_rows_match_response_model_encoding():
+    """Same JSON as validating through the response model and FastAPI's encoder"""
+    fields = json_response_service.schema_fields(value_schema.ValueBase)
+    row = (TS, None, 42, decimal.Decimal("21.50"), None, "ok", None, {"a": [1, 2]})
+    fast = json_response_service.RowsResponse(json_response_service.rows_to_dicts(fields, [row])).body
+
+    model = value_schema.ValueBase(**dict(zip(fields, row[:-1])), value_dict=json.dumps(row[-1]))
+    assert json.loads(fast) == json.loads(json.dumps(jsonable_encoder([model])))
+    assert json.loads(fast)[0]["value_n"] == 21.5
+
+
+@pytest.mark.unit
+def test_project_rows_fills_missing_fields():
+    """Raw query columns are reduced to the model's fields; absent ones are null"""
+    rows = json_response_service.project_rows(["ts", "time", "value_n"], ["value_n", "ts", "status"],
+                                              [(decimal.Decimal(1), TS, "ok")])
+    assert rows == [{"ts": TS, "time": None, "value_n": decimal.Decimal(1)}]
+
+
+@pytest.mark.unit
+def test_select_value_fields_nulls_unknown_columns():
+    """Tables without value_dict still answer with every response field"""
+    table = values_tables.build_value_table("value_demo", columns={"entity_id", "ts", "value_n"})
+    stmt = value_service.select_value_fields(table, ["ts", "entity_id", "value_n", "value_dict"])
+    assert [column.name for column in stmt.selected_columns] == ["ts", "entity_id", "value_n", "value_dict"]
+    assert "NULL AS value_dict" in str(stmt)
+
+
+@pytest.mark.unit
+def test_unsupported_type_raises():
+    with pytest.raises(TypeError):
+        json_response_service.RowsResponse([object()])
@@ -0,0 +1,80 @@
+"""
+Request tracing and SQL fingerprints (SQLite engine, no database server).
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.services.tracing_service import Tracer, fingerprint
+
+
+def fake_request(method="GET"):
+    return SimpleNamespace(scope={}, method=method)
+
+
+@pytest.mark.unit
+def test_fingerprint_normalizes_literals_and_lists():
+    """Same query shape, different values: one fingerprint"""
+    a = fingerprint("select * from core.entity_tag where entity_id in (1, 2, 3) and value_s = 'ahu'")
+    b = fingerprint("select *  from core.entity_tag\n where entity_id in (42) and value_s = 'o''brien'")
+    c = fingerprint("select * from core.entity_tag where entity_id in (%(entity_id_1_1)s, %(entity_id_1_2)s) "
+                    "and value_s = %(value_s_1)s")
+    assert a == b == c
+    assert a[1] == "select * from core.entity_tag where entity_id in (?) and value_s = ?"
+    assert fingerprint("select * from core.td10")[1] == "select * from core.td10"
+
+
+@pytest.mark.unit
+def test_request_phases_and_statements():
+    tracer = Tracer(enabled=True, slow_query_ms=0, explain=False, sample_size=100)
+    engine = create_engine("sqlite://")
+    tracer.instrument(engine)
+
+    trace, token = tracer.start_request()
+    with tracer.phase("acl"):
+        with tracer.phase("acl"):
+            time.sleep(0.01)
+        with engine.connect() as connection:
+            connection.execute(text("select 1 where 2 = :x"), {"x": 2})
+    timing = tracer.finish_request(fake_request(), 200, trace, token)
+
+    assert trace.statements == 1
+    assert 0.01 <= trace.phases["acl"] < 0.5
+    assert "db_execute" in trace.phases and "sql_compile" in trace.phases
+    assert timing.startswith("acl;dur=") and "total;dur=" in timing
+
+    stats = tracer.get_stats()
+    route = stats["routes"]["GET unmatched"]
+    assert route["count"] == 1 and route["avg_statements"] == 1
+    assert route["p50_ms"] <= route["p99_ms"]
+    assert stats["statements"][0]["sql"] == "select ? where ? = ?"
+
+
+@pytest.mark.unit
+def test_statements_outside_requests_and_slow_log(caplog):
+    """Background statements still count; slow ones are logged by fingerprint"""
+    tracer = Tracer(enabled=True, slow_query_ms=1, explain=False, sample_size=100)
+    engine = create_engine("sqlite://")
+    tracer.instrument(engine)
+    tracer.instrument(engine)
+    with engine.connect() as connection:
+        connection.execute(text("with recursive n(i) as (select 1 union all select i + 1 from n where i < 200000) "
+                                "select count(*) from n"))
+    stats = tracer.get_stats()
+    assert stats["statements"][0]["count"] == 1
+    assert stats["routes"] == {}
+    assert stats["slow_statements"] == 1
+    assert "Slow query" in caplog.text
+
+
+@pytest.mark.unit
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False, slow_query_ms=0, explain=False, sample_size=100)
+    trace, token = tracer.start_request()
+    with tracer.phase("auth"):
+        pass
+    assert tracer.finish_request(fake_request(), 200, trace, token) is None
+    assert tracer.get_stats()["requests"] == 0
@@ -0,0 +1,97 @@
+"""
+Org -> value table registry (no database).
+"""
+
+import pytest
+
+from app.services import value_service, value_table_registry
+from app.services.value_table_registry import ValueTableRegistry
+
+BASE_COLUMNS = ["entity_id", "ts", "value_n", "value_b", "value_s", "value_ts", "status"]
+
+
+def catalog_rows(org_id, value_table, value_dict=True, current=True):
+    """information_schema rows for an org's value tables."""
+    columns = BASE_COLUMNS + (["value_dict"] if value_dict else [])
+    names = [value_table] + (["{}_current".format(value_table)] if current else [])
+    return [(org_id, value_table, name, column) for name in names for column in columns]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeCatalog:
+    """Answers the registry's catalog query from a list of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, statement, params):
+        self.queries += 1
+        org_id = params.get("org_id")
+        return FakeResult([row for row in self.rows if org_id is None or row[0] == org_id])
+
+
+@pytest.mark.unit
+def test_org_looked_up_once_with_catalog_columns():
+    db = FakeCatalog(catalog_rows(9001, "values_acme") + catalog_rows(9002, "values_legacy", value_dict=False))
+    registry = ValueTableRegistry(0)
+
+    entry = registry.get(db, 9001)
+    assert entry.table.name == "values_acme"
+    assert [c.name for c in entry.table.primary_key] == ["entity_id", "ts"]
+    assert [c.name for c in entry.current_table.primary_key] == ["entity_id"]
+    assert registry.get(db, 9001) is entry
+    assert db.queries == 1, "Second lookup is served from the registry"
+
+    legacy = registry.get(db, 9002)
+    assert value_service.has_value_dict(entry.table)
+    assert not value_service.has_value_dict(legacy.table), "value_dict capability comes from the catalog"
+    assert registry.get_stats()["orgs_with_value_dict"] == 1
+
+
+@pytest.mark.unit
+def test_new_org_and_refresh_org():
+    db = FakeCatalog([])
+    registry = ValueTableRegistry(0)
+    assert registry.get(db, 9100) is None
+
+    db.rows = catalog_rows(9100, "values_new_org", value_dict=False)
+    assert registry.get(db, 9100) is None and db.queries == 1, "Unknown org is remembered as a miss"
+    registry.refresh_org(db, 9100)  # what create_org does
+    assert registry.get(db, 9100).table.name == "values_new_org", "Org created after startup is picked up"
+
+    db.rows = catalog_rows(9100, "values_new_org")
+    assert value_service.has_value_dict(registry.refresh_org(db, 9100).table), "Added column picked up on refresh"
+
+    db.rows = []
+    assert registry.refresh_org(db, 9100) is None, "Deleted org is no longer routed"
+
+
+@pytest.mark.unit
+def test_org_without_current_table():
+    db = FakeCatalog(catalog_rows(9200, "values_history_only", current=False))
+    entry = ValueTableRegistry(0).get(db, 9200)
+    assert entry.table.name == "values_history_only"
+    assert entry.current_table is None
+
+
+@pytest.mark.unit
+def test_cached_miss_expires(monkeypatch):
+    db = FakeCatalog([])
+    registry = ValueTableRegistry(0)
+    for _ in range(5):
+        assert registry.get(db, 9300) is None
+    assert db.queries == 1, "Repeated bad org ids are answered without the catalog"
+    assert registry.get_stats()["cached_misses"] == 4
+
+    monkeypatch.setattr(value_table_registry, "MISS_TTL_S", 0)
+    registry.refresh_org(db, 9300)
+    db.rows = catalog_rows(9300, "values_late_org")
+    assert registry.get(db, 9300).table.name == "values_late_org", "Org outside the API is picked up after the TTL"
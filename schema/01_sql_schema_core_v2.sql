@@ -182,6 +182,21 @@ CREATE TABLE core.entity_test (
 CREATE INDEX ix_core_entity_test__id ON core.entity_test USING btree (id);
 
 
+-- core.haystack_defs_import definition
+
+-- Drop table
+
+-- DROP TABLE core.haystack_defs_import;
+
+CREATE TABLE core.haystack_defs_import (
+	content_hash varchar(64) NOT NULL,
+	"source" varchar NOT NULL,
+	def_count int4 NOT NULL,
+	imported_at timestamptz DEFAULT now() NOT NULL,
+	CONSTRAINT haystack_defs_import_pkey PRIMARY KEY (content_hash)
+);
+
+
 -- core.org definition
 
 -- Drop table
@@ -5,11 +5,14 @@ Provides REST API for monitoring and controlling the Haystack building data simu
 
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
+from service.metrics import REGISTRY, TICK_PHASE_SECONDS
+
 logger = logging.getLogger(__name__)
 
 
@@ -130,15 +133,8 @@ def create_app(simulator_service, state_db, activity_logger, start_time: datetim
 
             state = result[0]
 
-            # Get total points from activity log (approximate)
-            count_query = """
-                SELECT COALESCE(SUM((details->>'point_count')::int), 0) as total
-                FROM core.simulator_activity_log
-                WHERE event_type = 'generation'
-                AND details->>'point_count' IS NOT NULL
-            """
-            count_result = state_db.execute_query(count_query)
-            points_total = count_result[0]['total'] if count_result else 0
+            # Total points from the activity logger's running rollups
+            points_total = activity_logger.rollups.snapshot()['points_generated_total']
 
             return StatusResponse(
                 status=state['status'],
@@ -390,56 +386,20 @@ def create_app(simulator_service, state_db, activity_logger, start_time: datetim
     async def get_metrics():
         """Get generation metrics and statistics."""
         try:
-            # Get total points generated
-            points_query = """
-                SELECT COALESCE(SUM((details->>'point_count')::int), 0) as total
-                FROM core.simulator_activity_log
-                WHERE event_type = 'generation'
-                AND details->>'point_count' IS NOT NULL
-            """
-            points_result = state_db.execute_query(points_query)
-            total_points = points_result[0]['total'] if points_result else 0
-
-            # Get entity count from last generation event
-            entity_query = """
-                SELECT details->>'entity_count' as count
-                FROM core.simulator_activity_log
-                WHERE event_type = 'generation'
-                AND details->>'entity_count' IS NOT NULL
-                ORDER BY timestamp DESC LIMIT 1
-            """
-            entity_result = state_db.execute_query(entity_query)
-            total_entities = int(entity_result[0]['count']) if entity_result and entity_result[0]['count'] else 0
-
-            # Calculate generation rate (last 10 minutes)
-            rate_query = """
-                SELECT
-                    COALESCE(SUM((details->>'point_count')::int), 0) as points,
-                    EXTRACT(EPOCH FROM (MAX(timestamp) - MIN(timestamp)))/60 as minutes
-                FROM core.simulator_activity_log
-                WHERE event_type = 'generation'
-                AND timestamp >= NOW() - INTERVAL '10 minutes'
-            """
-            rate_result = state_db.execute_query(rate_query)
-            if rate_result and rate_result[0]['minutes'] and rate_result[0]['minutes'] > 0:
-                generation_rate = rate_result[0]['points'] / rate_result[0]['minutes']
-            else:
-                generation_rate = None
-
-            # Get error count (last 24 hours)
-            error_count = activity_logger.get_error_count(
-                since=datetime.now() - timedelta(hours=24)
-            )
+            # Totals, rate (last 10 minutes) and 24h errors from the running rollups
+            rollups = activity_logger.rollups.snapshot()
 
             # Calculate uptime
             uptime = (datetime.now() - start_time).total_seconds()
 
+            last_tick = TICK_PHASE_SECONDS.snapshot(phase='total')
+
             return MetricsResponse(
-                total_points_generated=total_points,
-                total_entities=total_entities,
-                generation_rate_per_min=generation_rate,
-                last_interval_duration_ms=None,  # TODO: Track this
-                error_count_24h=error_count,
+                total_points_generated=rollups['points_generated_total'],
+                total_entities=rollups['entity_count'],
+                generation_rate_per_min=rollups['generation_rate_per_min'],
+                last_interval_duration_ms=last_tick['last'] * 1000 if last_tick else None,
+                error_count_24h=rollups['error_count_24h'],
                 uptime_seconds=uptime
             )
 
@@ -450,4 +410,21 @@ def create_app(simulator_service, state_db, activity_logger, start_time: datetim
                 detail=f"Failed to retrieve metrics: {str(e)}"
             )
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def prometheus_metrics():
+        """In-process metrics in Prometheus text format.
+
+        Served from memory only, so scraping never queries either database.
+        """
+        running = 1 if getattr(simulator_service, 'running', False) else 0
+        text = (
+            "# HELP simulator_status Service status (1=running, 0=stopped)\n"
+            "# TYPE simulator_status gauge\n"
+            f"simulator_status {running}\n"
+            "# HELP simulator_uptime_seconds Seconds since service start\n"
+            "# TYPE simulator_uptime_seconds gauge\n"
+            f"simulator_uptime_seconds {(datetime.now() - start_time).total_seconds()}\n"
+        )
+        return PlainTextResponse(text + REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
     return app
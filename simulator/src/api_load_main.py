@@ -0,0 +1,140 @@
+"""Entry point for load-testing the platform API's ingest path.
+
+Generates building data and posts it to /bulk/value through ApiValueSink
+instead of writing to the database directly, then reports latency
+percentiles and throughput. Run it against a local API + database stack
+to benchmark ingest.
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import yaml
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent))
+
+from database.connection import DatabaseConnection
+from database.schema_setup import SchemaSetup
+from generators.entities import EntityGenerator
+from service.api_sink import ApiValueSink, ApiLoadGenerator
+from service_main import load_config_with_env
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def load_entity_map(db: DatabaseConnection) -> dict:
+    """Load entity names to IDs from the ``id`` tag.
+
+    Args:
+        db: Database connection
+
+    Returns:
+        Dictionary mapping entity names to IDs
+    """
+    rows = db.execute_query("""
+        SELECT e.id, et_id.value_s as entity_name
+        FROM core.entity e
+        JOIN core.entity_tag et_id ON e.id = et_id.entity_id
+        JOIN core.tag_def td_id ON et_id.tag_id = td_id.id
+        WHERE td_id.name = 'id'
+    """)
+    return {row['entity_name']: row['id'] for row in rows if row['entity_name']}
+
+
+def main():
+    """API load generator entry point."""
+    parser = argparse.ArgumentParser(description='Replay simulated building data into the API /bulk/value endpoint')
+    parser.add_argument('--start', type=str, help='Replay start (ISO format, default: --days before now)')
+    parser.add_argument('--days', type=float, default=1.0, help='Days of data to replay')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='Simulated seconds per wall-clock second (0 = as fast as possible)')
+    parser.add_argument('--batch-size', type=int, help='Data points per request (env API_SINK_BATCH_SIZE)')
+    parser.add_argument('--concurrency', type=int, help='Requests in flight (env API_SINK_CONCURRENCY)')
+    parser.add_argument('--gzip', action='store_true', default=None,
+                        help='Gzip request bodies (env API_SINK_GZIP)')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    db_config_path = os.getenv('DB_CONFIG_PATH', 'config/database_config.yaml')
+    building_config_path = os.getenv('BUILDING_CONFIG_PATH', 'config/building_config.yaml')
+
+    db_config = load_config_with_env(db_config_path)
+    with open(building_config_path, 'r') as f:
+        building_config = yaml.safe_load(f)
+
+    interval = building_config['generation']['data_interval_minutes']
+    if args.start:
+        start_time = datetime.fromisoformat(args.start)
+    else:
+        now = datetime.now().replace(second=0, microsecond=0)
+        start_time = now - timedelta(days=args.days)
+        start_time -= timedelta(minutes=start_time.minute % interval)
+    end_time = start_time + timedelta(days=args.days) - timedelta(minutes=interval)
+
+    # Entities are created directly in the database; only values go through the API
+    db = DatabaseConnection(db_config['database'])
+    schema = SchemaSetup(db)
+    org_id, _ = schema.initialize_organization(
+        db_config['organization']['name'],
+        db_config['organization']['key']
+    )
+    entity_map = load_entity_map(db)
+    if not entity_map:
+        logger.info("No entities found, generating them")
+        entity_map = EntityGenerator(schema, building_config).generate_all_entities()
+    db.close()
+
+    sink = ApiValueSink.from_env(
+        org_id,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        gzip_body=args.gzip
+    )
+    logger.info(f"Posting to {sink.url} (org {org_id}, batch size {sink.batch_size}, "
+                f"concurrency {sink.concurrency}, gzip {sink.gzip_body})")
+
+    stop_requested = False
+
+    def request_stop(signum, frame):
+        nonlocal stop_requested
+        logger.info(f"Received signal {signum}, stopping replay...")
+        stop_requested = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    try:
+        generator = ApiLoadGenerator(sink, building_config, entity_map)
+        report = generator.run(start_time, end_time, rate=args.rate, should_stop=lambda: stop_requested)
+    finally:
+        sink.close()
+
+    report['start'] = start_time.isoformat()
+    report['end'] = end_time.isoformat()
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        Path(args.output).write_text(output)
+        logger.info(f"Report written to {args.output}")
+
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,10 @@ from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_batch
-from psycopg2.pool import SimpleConnectionPool
 import pandas as pd
 
+from database.pool import InstrumentedConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,21 +25,35 @@ class DatabaseConnection:
                 - database: Database name
                 - user: Database user
                 - password: Database password
+                - pool_min: Minimum pooled connections (optional, default 1)
+                - pool_max: Maximum pooled connections (optional, default 20)
+                - pool_timeout: Seconds to wait for a free connection (optional, default 30)
+                - statement_timeout_ms: Per-statement timeout (optional, 0 = none)
         """
         self.config = config
-        self.pool: Optional[SimpleConnectionPool] = None
+        self.pool: Optional[InstrumentedConnectionPool] = None
+        self._prepared: Dict[str, str] = {}
         self._initialize_pool()
         
     def _initialize_pool(self):
         """Initialize connection pool."""
+        connect_kwargs = {}
+        statement_timeout_ms = int(self.config.get('statement_timeout_ms', 0))
+        if statement_timeout_ms > 0:
+            connect_kwargs['options'] = f'-c statement_timeout={statement_timeout_ms}'
+
         try:
-            self.pool = SimpleConnectionPool(
-                1, 20,  # Min and max connections
+            self.pool = InstrumentedConnectionPool(
+                self.config.get('pool_min', 1),
+                self.config.get('pool_max', 20),
+                name=self.config['database'],
+                timeout=float(self.config.get('pool_timeout', 30)),
                 host=self.config['host'],
                 port=self.config['port'],
                 database=self.config['database'],
                 user=self.config['user'],
-                password=self.config['password']
+                password=self.config['password'],
+                **connect_kwargs
             )
             logger.info("Database connection pool initialized successfully")
         except Exception as e:
@@ -47,20 +62,86 @@ class DatabaseConnection:
             
     @contextmanager
     def get_connection(self):
-        """Get a connection from the pool."""
-        conn = None
-        try:
-            conn = self.pool.getconn()
-            yield conn
-            conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database operation failed: {e}")
-            raise
-        finally:
-            if conn:
-                self.pool.putconn(conn)
+        """Get a connection from the pool.
+
+        Connections are thread-affine: a nested call on the same thread
+        returns the connection already held, and only the outermost scope
+        commits (or rolls back on error).
+        """
+        with self.pool.connection() as (conn, outermost):
+            if not outermost:
+                yield conn
+                return
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                if not conn.closed:
+                    conn.rollback()
+                logger.error(f"Database operation failed: {e}")
+                raise
+
+    def transaction(self):
+        """Run several operations in one transaction on one connection.
+
+        Helpers such as execute_query and execute_update called inside the
+        block reuse the same connection and are committed together::
+
+            with db.transaction():
+                db.execute_update(...)
+                db.execute_update(...)
+
+        Returns:
+            Context manager yielding the connection
+        """
+        return self.get_connection()
+
+    def prepare(self, name: str, query: str) -> str:
+        """Register a server-side prepared statement.
+
+        The statement is prepared lazily, once per pooled connection, the
+        first time execute_prepared runs it there.
+
+        Args:
+            name: Statement name (a valid SQL identifier)
+            query: SQL using $1, $2, ... placeholders
+
+        Returns:
+            The statement name
+        """
+        self._prepared[name] = query
+        return name
+
+    def execute_prepared(self, name: str, params: tuple = ()) -> List[Dict]:
+        """Execute a statement registered with prepare.
+
+        Args:
+            name: Statement name
+            params: Parameter values, in placeholder order
+
+        Returns:
+            List of dictionaries with query results
+        """
+        query = self._prepared[name]
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if name not in conn.prepared_statements:
+                    cur.execute(f"PREPARE {name} AS {query}")
+                    conn.prepared_statements.add(name)
+                if params:
+                    placeholders = ', '.join(['%s'] * len(params))
+                    cur.execute(f"EXECUTE {name} ({placeholders})", params)
+                else:
+                    cur.execute(f"EXECUTE {name}")
+                return cur.fetchall()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage statistics.
+
+        Returns:
+            Dictionary with pool size, in-use count, checkouts, timeouts and max wait
+        """
+        return self.pool.stats()
                 
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
         """Execute a SELECT query and return results.
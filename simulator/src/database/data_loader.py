@@ -241,18 +241,44 @@ class DataLoader:
         return df
         
     def delete_old_data(self, days_to_keep: int = 30):
-        """Delete data older than specified days.
-        
+        """Drop data older than specified days.
+
+        Drops whole chunks instead of deleting rows, so only chunks lying
+        entirely before the cutoff are removed and no dead tuples are left
+        behind. Retention that runs on a schedule is configured through
+        StoragePolicyManager instead.
+
         Args:
             days_to_keep: Number of days of data to keep
+
+        Returns:
+            Number of chunks dropped
+        """
+        query = "SELECT drop_chunks(%s, older_than => make_interval(days => %s)) AS chunk"
+        dropped = self.db.execute_query(query, (f"core.{self.table_name}", days_to_keep))
+        logger.info(f"Dropped {len(dropped)} chunks older than {days_to_keep} days")
+        return len(dropped)
+        
+    def get_current_values(self, entity_ids: List[int]) -> Dict[int, Any]:
+        """Get the current numeric value for a set of entities.
+
+        Args:
+            entity_ids: Entity IDs to look up
+
+        Returns:
+            Dictionary mapping entity ID to its current value_n
         """
+        if not entity_ids:
+            return {}
+
         query = f"""
-            DELETE FROM core.{self.table_name}
-            WHERE ts < NOW() - INTERVAL '%s days'
+            SELECT entity_id, value_n
+            FROM core.{self.current_table_name}
+            WHERE entity_id = ANY(%s)
         """
-        rows_deleted = self.db.execute_update(query, (days_to_keep,))
-        logger.info(f"Deleted {rows_deleted} old records")
-        
+        result = self.db.execute_query(query, (list(entity_ids),))
+        return {row['entity_id']: row['value_n'] for row in result}
+
     def get_row_count(self) -> int:
         """Get total number of rows in time-series table.
 
@@ -292,68 +318,24 @@ class DataLoader:
             'chiller_energy': {}
         }
 
-        # Get latest electric energy
-        query = f"""
+        # The totalizer lookups run every interval, so they are prepared once
+        # per connection and executed together on one connection
+        last_value = self.db.prepare(f"last_totalizer_{self.table_name}", f"""
             SELECT v.value_n
             FROM core.{self.table_name} v
             JOIN core.entity_tag et ON v.entity_id = et.entity_id
             JOIN core.tag_def td ON et.tag_id = td.id
-            WHERE td.name = 'energy'
+            WHERE td.name = $1
             AND v.entity_id IN (
                 SELECT et2.entity_id
                 FROM core.entity_tag et2
                 JOIN core.tag_def td2 ON et2.tag_id = td2.id
-                WHERE td2.name = 'elec'
+                WHERE td2.name = $2
             )
             ORDER BY v.ts DESC
             LIMIT 1
-        """
-        result = self.db.execute_query(query)
-        if result and result[0]['value_n'] is not None:
-            totalizers['electric_energy'] = float(result[0]['value_n'])
-
-        # Get latest gas volume
-        query = f"""
-            SELECT v.value_n
-            FROM core.{self.table_name} v
-            JOIN core.entity_tag et ON v.entity_id = et.entity_id
-            JOIN core.tag_def td ON et.tag_id = td.id
-            WHERE td.name = 'volume'
-            AND v.entity_id IN (
-                SELECT et2.entity_id
-                FROM core.entity_tag et2
-                JOIN core.tag_def td2 ON et2.tag_id = td2.id
-                WHERE td2.name = 'naturalGas'
-            )
-            ORDER BY v.ts DESC
-            LIMIT 1
-        """
-        result = self.db.execute_query(query)
-        if result and result[0]['value_n'] is not None:
-            totalizers['gas_volume'] = float(result[0]['value_n'])
-
-        # Get latest water volume
-        query = f"""
-            SELECT v.value_n
-            FROM core.{self.table_name} v
-            JOIN core.entity_tag et ON v.entity_id = et.entity_id
-            JOIN core.tag_def td ON et.tag_id = td.id
-            WHERE td.name = 'volume'
-            AND v.entity_id IN (
-                SELECT et2.entity_id
-                FROM core.entity_tag et2
-                JOIN core.tag_def td2 ON et2.tag_id = td2.id
-                WHERE td2.name = 'water'
-            )
-            ORDER BY v.ts DESC
-            LIMIT 1
-        """
-        result = self.db.execute_query(query)
-        if result and result[0]['value_n'] is not None:
-            totalizers['water_volume'] = float(result[0]['value_n'])
-
-        # Get chiller energies
-        query = f"""
+        """)
+        chiller_energy = self.db.prepare(f"last_chiller_energy_{self.table_name}", f"""
             SELECT et_id.value_s as point_id, v.value_n
             FROM core.{self.table_name} v
             JOIN core.entity e ON v.entity_id = e.id
@@ -367,8 +349,22 @@ class DataLoader:
             AND v.ts = (
                 SELECT MAX(ts) FROM core.{self.table_name} WHERE entity_id = v.entity_id
             )
-        """
-        result = self.db.execute_query(query)
+        """)
+
+        with self.db.transaction():
+            # Latest electric energy, gas volume and water volume
+            for key, quantity, medium in (
+                ('electric_energy', 'energy', 'elec'),
+                ('gas_volume', 'volume', 'naturalGas'),
+                ('water_volume', 'volume', 'water')
+            ):
+                result = self.db.execute_prepared(last_value, (quantity, medium))
+                if result and result[0]['value_n'] is not None:
+                    totalizers[key] = float(result[0]['value_n'])
+
+            # Chiller energies
+            result = self.db.execute_prepared(chiller_energy)
+
         for row in result:
             point_id = row['point_id']
             if point_id:
@@ -0,0 +1,129 @@
+"""Thread-safe, instrumented connection pool.
+
+Wraps psycopg2's ThreadedConnectionPool with:
+- blocking checkout with a timeout (instead of failing when exhausted)
+- per-thread affinity: nested checkouts on one thread share one connection,
+  so helpers called inside a transaction run on it
+- wait/usage metrics in the shared metrics registry
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Tuple
+
+import psycopg2.extensions
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+
+from service.metrics import DB_POOL_WAIT_SECONDS, DB_POOL_IN_USE, DB_POOL_CHECKOUTS, DB_POOL_TIMEOUTS
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(PoolError):
+    """No connection became available within the checkout timeout."""
+
+
+class TrackedConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements it has prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+
+class InstrumentedConnectionPool:
+    """Blocking, thread-affine connection pool with metrics."""
+
+    def __init__(self, minconn: int, maxconn: int, name: str, timeout: float = 30.0,
+                 **connect_kwargs):
+        """Initialize pool.
+
+        Args:
+            minconn: Connections opened up front
+            maxconn: Maximum open connections
+            name: Label for metrics (usually the database name)
+            timeout: Seconds to wait for a free connection before PoolTimeout
+            connect_kwargs: Arguments for psycopg2.connect
+        """
+        self.name = name
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._pool = ThreadedConnectionPool(
+            minconn, maxconn, connection_factory=TrackedConnection, **connect_kwargs
+        )
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._max_wait = 0.0
+
+    @contextmanager
+    def connection(self) -> Iterator[Tuple[TrackedConnection, bool]]:
+        """Check out a connection for the calling thread.
+
+        Yields:
+            (connection, outermost) -- outermost is False when the thread
+            already holds a connection from an enclosing checkout
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            yield held, False
+            return
+
+        wait_start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._stats_lock:
+                self._timeouts += 1
+            DB_POOL_TIMEOUTS.inc(database=self.name)
+            raise PoolTimeout(f"No connection available in pool '{self.name}' after {self.timeout}s")
+
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        wait = time.perf_counter() - wait_start
+        DB_POOL_WAIT_SECONDS.observe(wait, database=self.name)
+        DB_POOL_CHECKOUTS.inc(database=self.name)
+        with self._stats_lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._max_wait = max(self._max_wait, wait)
+            DB_POOL_IN_USE.set(self._in_use, database=self.name)
+
+        self._local.conn = conn
+        try:
+            yield conn, True
+        finally:
+            self._local.conn = None
+            try:
+                self._pool.putconn(conn, close=bool(conn.closed))
+            finally:
+                with self._stats_lock:
+                    self._in_use -= 1
+                    DB_POOL_IN_USE.set(self._in_use, database=self.name)
+                self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool usage statistics.
+
+        Returns:
+            Dictionary with size, in-use count, checkouts, timeouts and max wait
+        """
+        with self._stats_lock:
+            return {
+                'max_connections': self.maxconn,
+                'in_use': self._in_use,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'max_wait_seconds': round(self._max_wait, 6)
+            }
+
+    def closeall(self):
+        """Close every pooled connection."""
+        self._pool.closeall()
@@ -4,6 +4,8 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from psycopg2.extras import execute_values, Json
+
 logger = logging.getLogger(__name__)
 
 
@@ -167,6 +169,112 @@ class SchemaSetup:
         logger.info(f"Created entity {entity_id} with {len(tags)} tags")
         return entity_id
         
+    def create_entities(self, tag_list: List[Dict[str, Any]],
+                        value_table_id: str = "demo") -> List[int]:
+        """Create many entities in a single transaction.
+        
+        Tag definitions for all entities are resolved with one query, and
+        entities, entity tags and organization permissions are each written
+        with one multi-row INSERT.
+        
+        Args:
+            tag_list: List of Haystack tag dictionaries, one per entity
+            value_table_id: Value table identifier
+            
+        Returns:
+            List of entity IDs in the same order as tag_list
+        """
+        if not tag_list:
+            return []
+            
+        tag_names = sorted({name for tags in tag_list for name in tags})
+        
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                tag_ids = self._resolve_tag_defs(cur, tag_names)
+                
+                entity_rows = execute_values(
+                    cur,
+                    "INSERT INTO core.entity (value_table_id) VALUES %s RETURNING id",
+                    [(value_table_id,) for _ in tag_list],
+                    page_size=len(tag_list),
+                    fetch=True
+                )
+                entity_ids = [row[0] for row in entity_rows]
+                
+                tag_rows = [
+                    (entity_id, tag_ids[tag_name]) + self._tag_value_columns(value)
+                    for entity_id, tags in zip(entity_ids, tag_list)
+                    for tag_name, value in tags.items()
+                ]
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO core.entity_tag
+                    (entity_id, tag_id, value_n, value_b, value_s, value_ts, value_dict, value_ref)
+                    VALUES %s
+                    """,
+                    tag_rows,
+                    page_size=1000
+                )
+                
+                if self.org_id:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO core.org_entity_permission (org_id, entity_id)
+                        VALUES %s
+                        ON CONFLICT (org_id, entity_id) DO NOTHING
+                        """,
+                        [(self.org_id, entity_id) for entity_id in entity_ids],
+                        page_size=1000
+                    )
+                    
+        logger.info(f"Created {len(entity_ids)} entities with {len(tag_rows)} tags")
+        return entity_ids
+        
+    def _resolve_tag_defs(self, cur, tag_names: List[str]) -> Dict[str, int]:
+        """Look up tag definition IDs, creating any that are missing.
+        
+        Args:
+            cur: Open cursor of the current transaction
+            tag_names: Tag names to resolve
+            
+        Returns:
+            Dictionary mapping tag name to tag definition ID
+        """
+        cur.execute(
+            "SELECT name, id FROM core.tag_def WHERE name = ANY(%s)",
+            (list(tag_names),)
+        )
+        tag_ids = dict(cur.fetchall())
+        
+        missing = [name for name in tag_names if name not in tag_ids]
+        if missing:
+            rows = execute_values(
+                cur,
+                """
+                INSERT INTO core.tag_def (name) VALUES %s
+                ON CONFLICT (name) DO NOTHING
+                RETURNING name, id
+                """,
+                [(name,) for name in missing],
+                page_size=len(missing),
+                fetch=True
+            )
+            tag_ids.update(dict(rows))
+            logger.info(f"Created {len(rows)} tag definitions")
+            
+            # Names inserted concurrently by another worker aren't returned
+            if len(rows) < len(missing):
+                cur.execute(
+                    "SELECT name, id FROM core.tag_def WHERE name = ANY(%s)",
+                    ([name for name in missing if name not in tag_ids],)
+                )
+                tag_ids.update(dict(cur.fetchall()))
+            
+        return tag_ids
+        
     def _add_entity_tags(self, entity_id: int, tags: Dict[str, Any]):
         """Add tags to an entity.
         
@@ -216,6 +324,25 @@ class SchemaSetup:
         # Get tag ID
         tag_id = self._ensure_tag_def(tag_name)
         
+        # Insert tag value
+        query = """
+            INSERT INTO core.entity_tag 
+            (entity_id, tag_id, value_n, value_b, value_s, value_ts, value_dict, value_ref)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        params = (entity_id, tag_id) + self._tag_value_columns(value)
+        self.db.execute_update(query, params)
+        
+    @staticmethod
+    def _tag_value_columns(value: Any) -> tuple:
+        """Map a tag value onto the entity_tag value columns.
+        
+        Args:
+            value: Tag value
+            
+        Returns:
+            Tuple of (value_n, value_b, value_s, value_ts, value_dict, value_ref)
+        """
         # Determine value column based on type
         value_cols = {
             'value_n': None,
@@ -233,7 +360,7 @@ class SchemaSetup:
         elif isinstance(value, datetime):
             value_cols['value_ts'] = value
         elif isinstance(value, dict):
-            value_cols['value_dict'] = value
+            value_cols['value_dict'] = Json(value)
         elif isinstance(value, str):
             # Check if it's a reference
             if value.startswith('@') or value.endswith('Ref'):
@@ -244,18 +371,10 @@ class SchemaSetup:
         else:
             value_cols['value_s'] = str(value)
             
-        # Insert tag value
-        query = """
-            INSERT INTO core.entity_tag 
-            (entity_id, tag_id, value_n, value_b, value_s, value_ts, value_dict, value_ref)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        params = (
-            entity_id, tag_id,
+        return (
             value_cols['value_n'], value_cols['value_b'], value_cols['value_s'],
             value_cols['value_ts'], value_cols['value_dict'], value_cols['value_ref']
         )
-        self.db.execute_update(query, params)
         
     def _add_org_permission(self, entity_id: int):
         """Add organization permission for entity.
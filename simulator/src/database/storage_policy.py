@@ -0,0 +1,336 @@
+"""Storage policies for an organization's value hypertables.
+
+Applies TimescaleDB native compression (segmented by entity, ordered by
+time), chunk interval sizing and chunk-based retention to ``values_<org>``
+and ``values_<org>_current``, driven by the ``organization.storage`` section
+of the database config, and measures table size and query latency so the
+effect of a policy change can be reported.
+"""
+
+import logging
+import re
+import statistics
+import time
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Applied when the org config does not override them. The current table
+# holds one row per entity and is rewritten every interval, so it is only
+# chunked; compression and retention are opt-in there.
+DEFAULT_POLICY = {
+    'chunk_interval': '1 day',
+    'compress_after': '7 days',
+    'retention': None,
+    'segment_by': 'entity_id',
+    'order_by': 'ts DESC'
+}
+DEFAULT_CURRENT_POLICY = {
+    'chunk_interval': '7 days',
+    'compress_after': None,
+    'retention': None
+}
+
+_COLUMN_SPEC = re.compile(r'^[a-z_][a-z0-9_]*(\s+(asc|desc))?$', re.IGNORECASE)
+
+# Representative API read patterns, timed before and after a policy change
+BENCHMARK_QUERIES = {
+    'latest_value': """
+        SELECT ts, value_n FROM core.{table}
+        WHERE entity_id = %(entity_id)s
+        ORDER BY ts DESC LIMIT 1
+    """,
+    'raw_1d': """
+        SELECT ts, value_n FROM core.{table}
+        WHERE entity_id = %(entity_id)s AND ts > %(end)s - INTERVAL '1 day' AND ts <= %(end)s
+        ORDER BY ts
+    """,
+    'hourly_7d': """
+        SELECT time_bucket('1 hour', ts) AS bucket, AVG(value_n)
+        FROM core.{table}
+        WHERE entity_id = %(entity_id)s AND ts > %(end)s - INTERVAL '7 days' AND ts <= %(end)s
+        GROUP BY bucket ORDER BY bucket
+    """,
+    'daily_30d': """
+        SELECT time_bucket('1 day', ts) AS bucket, AVG(value_n), MAX(value_n)
+        FROM core.{table}
+        WHERE entity_id = %(entity_id)s AND ts > %(end)s - INTERVAL '30 days' AND ts <= %(end)s
+        GROUP BY bucket ORDER BY bucket
+    """
+}
+
+
+def resolve_policies(org_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Build the value and current table policies for an organization.
+
+    ``organization.storage`` overrides DEFAULT_POLICY, and its optional
+    ``current`` subsection overrides DEFAULT_CURRENT_POLICY for the current
+    table. Intervals are PostgreSQL interval strings; None disables the
+    corresponding policy.
+
+    Args:
+        org_config: The ``organization`` section of the database config
+
+    Returns:
+        Dictionary mapping table name to its policy
+    """
+    storage = dict(org_config.get('storage') or {})
+    current_overrides = storage.pop('current', None) or {}
+
+    for overrides in (storage, current_overrides):
+        unknown = set(overrides) - set(DEFAULT_POLICY)
+        if unknown:
+            raise ValueError(f"Unknown storage policy settings: {sorted(unknown)}")
+
+    value_policy = {**DEFAULT_POLICY, **storage}
+    current_policy = {**value_policy, **DEFAULT_CURRENT_POLICY, **current_overrides}
+
+    for policy in (value_policy, current_policy):
+        for key in ('segment_by', 'order_by'):
+            if not _COLUMN_SPEC.match(policy[key]):
+                raise ValueError(f"Invalid {key} column spec: {policy[key]!r}")
+
+    value_table = f"values_{org_config['key']}"
+    return {value_table: value_policy, f"{value_table}_current": current_policy}
+
+
+class StoragePolicyManager:
+    """Applies and measures storage policies for one organization."""
+
+    def __init__(self, db, org_config: Dict[str, Any]):
+        """Initialize policy manager.
+
+        Args:
+            db: DatabaseConnection to the TimescaleDB database
+            org_config: The ``organization`` section of the database config
+        """
+        self.db = db
+        self.policies = resolve_policies(org_config)
+
+    def is_hypertable(self, table: str) -> bool:
+        """Check whether a table is a hypertable.
+
+        Args:
+            table: Table name in the core schema
+
+        Returns:
+            True if the table is a hypertable
+        """
+        result = self.db.execute_query("""
+            SELECT 1 FROM timescaledb_information.hypertables
+            WHERE hypertable_schema = 'core' AND hypertable_name = %s
+        """, (table,))
+        return bool(result)
+
+    def apply(self) -> Dict[str, List[str]]:
+        """Apply every table's policy.
+
+        Returns:
+            Dictionary mapping table name to the actions taken
+        """
+        return {table: self.apply_table(table, policy) for table, policy in self.policies.items()}
+
+    def apply_table(self, table: str, policy: Dict[str, Any]) -> List[str]:
+        """Apply chunk interval, compression and retention to one table.
+
+        A new chunk interval only affects chunks created afterwards.
+
+        Args:
+            table: Table name in the core schema
+            policy: Resolved policy for the table
+
+        Returns:
+            Actions taken, for reporting
+        """
+        if not self.is_hypertable(table):
+            # e.g. the current table, whose primary key (entity_id) excludes ts
+            logger.warning(f"core.{table} is not a hypertable, skipping storage policy")
+            return ['skipped: not a hypertable']
+
+        qualified = f"core.{table}"
+        actions = []
+
+        self.db.execute_query(
+            "SELECT set_chunk_time_interval(%s, %s::interval)", (qualified, policy['chunk_interval'])
+        )
+        actions.append(f"chunk interval {policy['chunk_interval']}")
+
+        if policy['compress_after']:
+            try:
+                self.db.execute_update(f"""
+                    ALTER TABLE {qualified} SET (
+                        timescaledb.compress,
+                        timescaledb.compress_segmentby = '{policy['segment_by']}',
+                        timescaledb.compress_orderby = '{policy['order_by']}'
+                    )
+                """)
+                actions.append(f"compression segmentby {policy['segment_by']} orderby {policy['order_by']}")
+            except Exception as e:
+                # Settings cannot change while compressed chunks exist
+                logger.warning(f"Could not update compression settings on {qualified}: {e}")
+            self.db.execute_query(
+                "SELECT remove_compression_policy(%s, if_exists => TRUE)", (qualified,)
+            )
+            self.db.execute_query(
+                "SELECT add_compression_policy(%s, %s::interval)", (qualified, policy['compress_after'])
+            )
+            actions.append(f"compress after {policy['compress_after']}")
+        else:
+            self.db.execute_query("SELECT remove_compression_policy(%s, if_exists => TRUE)", (qualified,))
+            actions.append("no compression policy")
+
+        self.db.execute_query("SELECT remove_retention_policy(%s, if_exists => TRUE)", (qualified,))
+        if policy['retention']:
+            self.db.execute_query(
+                "SELECT add_retention_policy(%s, %s::interval)", (qualified, policy['retention'])
+            )
+            actions.append(f"drop chunks older than {policy['retention']}")
+        else:
+            actions.append("no retention policy")
+
+        logger.info(f"Storage policy for {qualified}: {', '.join(actions)}")
+        return actions
+
+    def run_now(self) -> Dict[str, Dict[str, int]]:
+        """Compress and drop eligible chunks now instead of waiting for the jobs.
+
+        Returns:
+            Dictionary mapping table name to compressed and dropped chunk counts
+        """
+        results = {}
+        for table, policy in self.policies.items():
+            if not self.is_hypertable(table):
+                continue
+            qualified = f"core.{table}"
+            counts = {'chunks_compressed': 0, 'chunks_dropped': 0}
+            if policy['retention']:
+                dropped = self.db.execute_query(
+                    "SELECT drop_chunks(%s, older_than => %s::interval) AS chunk",
+                    (qualified, policy['retention'])
+                )
+                counts['chunks_dropped'] = len(dropped)
+            if policy['compress_after']:
+                compressed = self.db.execute_query("""
+                    SELECT compress_chunk(c, if_not_compressed => TRUE) AS chunk
+                    FROM show_chunks(%s, older_than => %s::interval) c
+                """, (qualified, policy['compress_after']))
+                counts['chunks_compressed'] = len(compressed)
+            logger.info(f"{qualified}: compressed {counts['chunks_compressed']}, "
+                        f"dropped {counts['chunks_dropped']} chunks")
+            results[table] = counts
+        return results
+
+    def measure_size(self, table: str) -> Dict[str, Any]:
+        """Measure a table's on-disk size and chunk counts.
+
+        Args:
+            table: Table name in the core schema
+
+        Returns:
+            Dictionary with total_bytes, chunks and compressed_chunks
+        """
+        qualified = f"core.{table}"
+        if not self.is_hypertable(table):
+            result = self.db.execute_query(
+                "SELECT pg_total_relation_size(%s::regclass) AS total_bytes", (qualified,)
+            )
+            return {'total_bytes': int(result[0]['total_bytes']), 'chunks': 0, 'compressed_chunks': 0}
+
+        size = self.db.execute_query(
+            "SELECT total_bytes FROM hypertable_detailed_size(%s::regclass)", (qualified,)
+        )
+        chunks = self.db.execute_query("""
+            SELECT COUNT(*) AS chunks, COUNT(*) FILTER (WHERE is_compressed) AS compressed_chunks
+            FROM timescaledb_information.chunks
+            WHERE hypertable_schema = 'core' AND hypertable_name = %s
+        """, (table,))
+        return {
+            'total_bytes': int(size[0]['total_bytes'] or 0) if size else 0,
+            'chunks': int(chunks[0]['chunks']),
+            'compressed_chunks': int(chunks[0]['compressed_chunks'])
+        }
+
+    def benchmark_queries(self, table: str, repeats: int = 5) -> Dict[str, float]:
+        """Time representative read queries against a value table.
+
+        Uses the entity with the most recent sample and the table's latest
+        timestamp, so runs before and after a policy change are comparable.
+
+        Args:
+            table: Value table name in the core schema
+            repeats: Runs per query; the median is reported
+
+        Returns:
+            Dictionary mapping query name to median latency in milliseconds
+        """
+        sample = self.db.execute_query(
+            f"SELECT entity_id, ts AS end_ts FROM core.{table} ORDER BY ts DESC LIMIT 1"
+        )
+        if not sample:
+            return {}
+        params = {'entity_id': sample[0]['entity_id'], 'end': sample[0]['end_ts']}
+
+        timings = {}
+        for name, query in BENCHMARK_QUERIES.items():
+            sql = query.format(table=table)
+            runs = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                self.db.execute_query(sql, params)
+                runs.append((time.perf_counter() - start) * 1000)
+            timings[name] = round(statistics.median(runs), 2)
+        return timings
+
+    def snapshot(self, benchmark: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Measure every table's size and, for value tables, query latency.
+
+        Args:
+            benchmark: Whether to time the benchmark queries
+
+        Returns:
+            Dictionary mapping table name to its measurements
+        """
+        results = {}
+        for table in self.policies:
+            results[table] = self.measure_size(table)
+            if benchmark and not table.endswith('_current'):
+                results[table]['query_ms'] = self.benchmark_queries(table)
+        return results
+
+
+def compare_snapshots(before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Report space saved and query speed change between two snapshots.
+
+    Args:
+        before: snapshot() taken before applying policies
+        after: snapshot() taken after applying policies
+
+    Returns:
+        Dictionary mapping table name to size and latency deltas
+    """
+    report = {}
+    for table, b in before.items():
+        a = after.get(table, {})
+        saved = b['total_bytes'] - a.get('total_bytes', 0)
+        entry = {
+            'bytes_before': b['total_bytes'],
+            'bytes_after': a.get('total_bytes', 0),
+            'bytes_saved': saved,
+            'percent_saved': round(100.0 * saved / b['total_bytes'], 1) if b['total_bytes'] else 0.0,
+            'chunks_after': a.get('chunks', 0),
+            'compressed_chunks_after': a.get('compressed_chunks', 0)
+        }
+        queries = {}
+        for name, ms_before in b.get('query_ms', {}).items():
+            ms_after = a.get('query_ms', {}).get(name)
+            if ms_after is None:
+                continue
+            queries[name] = {
+                'ms_before': ms_before,
+                'ms_after': ms_after,
+                'speedup': round(ms_before / ms_after, 2) if ms_after else None
+            }
+        if queries:
+            entry['queries'] = queries
+        report[table] = entry
+    return report
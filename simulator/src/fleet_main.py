@@ -0,0 +1,119 @@
+"""Main entry point for fleet-scale simulation.
+
+This script simulates many buildings at once for load-testing the platform.
+Sites are sharded across worker processes and fleet throughput and tick
+latency are reported through the health check server.
+"""
+
+import logging
+import sys
+import os
+import time
+import signal
+from pathlib import Path
+
+import yaml
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent))
+
+from service.fleet import FleetSimulator, expand_fleet_configs
+from service.scheduler import DataGenerationScheduler
+from service.health_server import HealthCheckServer
+from service_main import load_config_with_env
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Fleet service entry point."""
+    logger.info("=" * 60)
+    logger.info("Haystack Building Data Simulator - Fleet Mode")
+    logger.info("=" * 60)
+
+    shutdown_requested = False
+
+    def request_shutdown(signum, frame):
+        nonlocal shutdown_requested
+        logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+        shutdown_requested = True
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+
+    fleet = None
+    scheduler = None
+    health_server = None
+
+    try:
+        db_config_path = os.getenv('DB_CONFIG_PATH', 'config/database_config.yaml')
+        fleet_config_path = os.getenv('FLEET_CONFIG_PATH', 'config/fleet_config.yaml')
+
+        logger.info(f"Loading database config from: {db_config_path}")
+        db_config = load_config_with_env(db_config_path)
+
+        logger.info(f"Loading fleet config from: {fleet_config_path}")
+        with open(fleet_config_path, 'r') as f:
+            fleet_config = yaml.safe_load(f)['fleet']
+
+        # Building config paths in the fleet config are relative to the simulator root
+        site_configs = expand_fleet_configs(fleet_config, base_dir=Path(fleet_config_path).parent.parent)
+
+        health_port = int(os.getenv('HEALTH_CHECK_PORT', '8080'))
+        workers = int(os.getenv('FLEET_WORKERS', fleet_config.get('workers', 4)))
+        pool_size = int(fleet_config.get('pool_size', 4))
+        interval_minutes = int(os.getenv('SERVICE_INTERVAL_MINUTES', fleet_config.get('interval_minutes', 15)))
+
+        logger.info("Fleet configuration:")
+        logger.info(f"  Sites: {len(site_configs)}")
+        logger.info(f"  Workers: {workers} (pool size {pool_size} each)")
+        logger.info(f"  Health port: {health_port}")
+
+        fleet = FleetSimulator(
+            db_config,
+            site_configs,
+            db_config['tables']['value_table'],
+            workers=workers,
+            pool_size=pool_size,
+            interval_minutes=interval_minutes
+        )
+
+        if not fleet.startup():
+            logger.error("Fleet startup failed")
+            sys.exit(1)
+
+        health_server = HealthCheckServer(port=health_port, health_callback=fleet.health_check)
+        health_server.start()
+
+        scheduler = DataGenerationScheduler(interval_minutes=interval_minutes)
+        scheduler.start(fleet.generate_current_interval)
+
+        logger.info("Fleet started successfully! Press Ctrl+C to stop")
+
+        while not shutdown_requested:
+            time.sleep(1)
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        if scheduler:
+            scheduler.stop()
+        if health_server:
+            health_server.stop()
+        if fleet:
+            fleet.shutdown()
+
+    logger.info("Fleet stopped successfully")
+
+
+if __name__ == '__main__':
+    main()
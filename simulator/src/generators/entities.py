@@ -10,51 +10,95 @@ logger = logging.getLogger(__name__)
 class EntityGenerator:
     """Generates Project Haystack compliant entities."""
     
-    def __init__(self, schema_setup, config: Dict[str, Any]):
+    def __init__(self, schema_setup, config: Dict[str, Any], id_prefix: str = ""):
         """Initialize entity generator.
         
         Args:
             schema_setup: SchemaSetup instance
             config: Building configuration dictionary
+            id_prefix: Prefix for equipment and point ``id`` tags so several
+                sites can share one database (entity_map keys stay unprefixed)
         """
         self.schema = schema_setup
         self.config = config
+        self.id_prefix = id_prefix
         self.entity_map = {}  # Store entity IDs for references
+        self._pending = []  # (tags, entity_map keys) awaiting creation
+
+    def _ref(self, local_id: str) -> str:
+        """Return the stored Haystack id for a site-local entity name."""
+        return f"{self.id_prefix}{local_id}"
         
     def generate_all_entities(self) -> Dict[str, int]:
         """Generate all building entities.
         
+        Tag dictionaries for every site, equipment and point entity are
+        collected first and then written in one batch.
+        
         Returns:
             Dictionary mapping entity names to IDs
         """
         logger.info("Starting entity generation...")
         
-        # Generate site
-        site_id = self.generate_site()
+        # Collect site
+        self.generate_site()
+        
+        # Collect chillers
+        self.generate_chillers()
         
-        # Generate chillers
-        chiller_ids = self.generate_chillers()
+        # Collect AHUs
+        self.generate_ahus()
         
-        # Generate AHUs
-        ahu_ids = self.generate_ahus()
+        # Collect VAV boxes
+        self.generate_vav_boxes()
         
-        # Generate VAV boxes
-        vav_ids = self.generate_vav_boxes()
+        # Collect meters
+        self.generate_meters()
         
-        # Generate meters
-        meter_ids = self.generate_meters()
+        # Collect points for all equipment
+        self.generate_all_points()
         
-        # Generate points for all equipment
-        point_ids = self.generate_all_points()
+        # Create everything in one transaction
+        self.flush()
         
         logger.info(f"Entity generation complete. Created {len(self.entity_map)} entities")
         return self.entity_map
         
-    def generate_site(self) -> int:
-        """Generate site entity.
+    def _add_entity(self, tags: Dict[str, Any], *keys: str) -> str:
+        """Queue an entity for creation.
+        
+        Args:
+            tags: Haystack tags for the entity
+            keys: entity_map keys the new entity ID is stored under
+            
+        Returns:
+            Primary entity_map key of the queued entity
+        """
+        self._pending.append((tags, keys))
+        return keys[0]
+        
+    def flush(self) -> List[int]:
+        """Create all queued entities and record their IDs in entity_map.
         
         Returns:
-            Site entity ID
+            List of created entity IDs in queue order
+        """
+        if not self._pending:
+            return []
+            
+        entity_ids = self.schema.create_entities([tags for tags, _ in self._pending])
+        for (tags, keys), entity_id in zip(self._pending, entity_ids):
+            for key in keys:
+                self.entity_map[key] = entity_id
+                
+        self._pending = []
+        return entity_ids
+        
+    def generate_site(self) -> str:
+        """Collect site entity.
+        
+        Returns:
+            Site entity name
         """
         site_config = self.config['site']
         
@@ -73,26 +117,24 @@ class EntityGenerator:
             "floors": site_config['floors']
         }
         
-        site_id = self.schema.create_entity(site_tags)
-        self.entity_map['site'] = site_id
-        self.entity_map[site_config['id']] = site_id
+        self._add_entity(site_tags, 'site', site_config['id'])
         
-        logger.info(f"Created site entity: {site_config['name']} (ID: {site_id})")
-        return site_id
+        logger.info(f"Collected site entity: {site_config['name']}")
+        return site_config['id']
         
-    def generate_chillers(self) -> List[int]:
-        """Generate chiller entities.
+    def generate_chillers(self) -> List[str]:
+        """Collect chiller entities.
         
         Returns:
-            List of chiller entity IDs
+            List of chiller entity names
         """
         chiller_config = self.config['equipment']['chillers']
         site_ref = self.config['site']['id']
-        chiller_ids = []
+        chiller_names = []
         
         for i in range(1, chiller_config['count'] + 1):
             chiller_tags = {
-                "id": f"equip-chiller-{i}",
+                "id": self._ref(f"equip-chiller-{i}"),
                 "dis": f"Chiller #{i} - {'Primary' if i == 1 else 'Backup'}",
                 "equip": True,
                 "chiller": True,
@@ -106,24 +148,22 @@ class EntityGenerator:
                 "primaryEquip": (i == 1)
             }
             
-            chiller_id = self.schema.create_entity(chiller_tags)
-            chiller_ids.append(chiller_id)
-            self.entity_map[f"chiller-{i}"] = chiller_id
-            self.entity_map[f"equip-chiller-{i}"] = chiller_id
-            
-            logger.info(f"Created chiller entity: Chiller #{i} (ID: {chiller_id})")
+            chiller_names.append(
+                self._add_entity(chiller_tags, f"equip-chiller-{i}", f"chiller-{i}")
+            )
             
-        return chiller_ids
+        logger.info(f"Collected {len(chiller_names)} chiller entities")
+        return chiller_names
         
-    def generate_ahus(self) -> List[int]:
-        """Generate Air Handling Unit entities.
+    def generate_ahus(self) -> List[str]:
+        """Collect Air Handling Unit entities.
         
         Returns:
-            List of AHU entity IDs
+            List of AHU entity names
         """
         ahu_config = self.config['equipment']['ahus']
         site_ref = self.config['site']['id']
-        ahu_ids = []
+        ahu_names = []
         
         floors_per_ahu = ahu_config['floors_per_ahu']
         total_floors = self.config['site']['floors']
@@ -133,7 +173,7 @@ class EntityGenerator:
             end_floor = min(i * floors_per_ahu, total_floors)
             
             ahu_tags = {
-                "id": f"equip-ahu-{i}",
+                "id": self._ref(f"equip-ahu-{i}"),
                 "dis": f"AHU-{i} Floors {start_floor}-{end_floor}",
                 "equip": True,
                 "ahu": True,
@@ -141,30 +181,26 @@ class EntityGenerator:
                 "airHandling": True,
                 "manufacturer": ahu_config['manufacturer'],
                 "model": ahu_config['model'],
-                "chilledWaterRef": "equip-chiller-1",  # Primary chiller
+                "chilledWaterRef": self._ref("equip-chiller-1"),  # Primary chiller
                 "floorsServed": f"{start_floor}-{end_floor}",
                 "startFloor": start_floor,
                 "endFloor": end_floor
             }
             
-            ahu_id = self.schema.create_entity(ahu_tags)
-            ahu_ids.append(ahu_id)
-            self.entity_map[f"ahu-{i}"] = ahu_id
-            self.entity_map[f"equip-ahu-{i}"] = ahu_id
+            ahu_names.append(self._add_entity(ahu_tags, f"equip-ahu-{i}", f"ahu-{i}"))
             
-            logger.info(f"Created AHU entity: AHU-{i} (ID: {ahu_id})")
-            
-        return ahu_ids
+        logger.info(f"Collected {len(ahu_names)} AHU entities")
+        return ahu_names
         
-    def generate_vav_boxes(self) -> List[int]:
-        """Generate VAV box entities.
+    def generate_vav_boxes(self) -> List[str]:
+        """Collect VAV box entities.
         
         Returns:
-            List of VAV entity IDs
+            List of VAV entity names
         """
         vav_config = self.config['equipment']['vav_boxes']
         site_ref = self.config['site']['id']
-        vav_ids = []
+        vav_names = []
         
         total_floors = self.config['site']['floors']
         floors_per_ahu = self.config['equipment']['ahus']['floors_per_ahu']
@@ -172,13 +208,13 @@ class EntityGenerator:
         for floor in range(1, total_floors + 1):
             # Determine which AHU serves this floor
             ahu_num = ((floor - 1) // floors_per_ahu) + 1
-            ahu_ref = f"equip-ahu-{ahu_num}"
+            ahu_ref = self._ref(f"equip-ahu-{ahu_num}")
             
             for zone in vav_config['zones']:
                 vav_id_str = f"equip-vav-{floor}-{zone.lower()}"
                 
                 vav_tags = {
-                    "id": vav_id_str,
+                    "id": self._ref(vav_id_str),
                     "dis": f"VAV-{floor}{zone[0]} Floor {floor} {zone}",
                     "equip": True,
                     "vav": True,
@@ -191,28 +227,24 @@ class EntityGenerator:
                     "minFlowRatio": self.config['performance']['vav']['min_flow_ratio']
                 }
                 
-                vav_id = self.schema.create_entity(vav_tags)
-                vav_ids.append(vav_id)
-                self.entity_map[vav_id_str] = vav_id
-                
-                logger.debug(f"Created VAV entity: {vav_id_str} (ID: {vav_id})")
+                vav_names.append(self._add_entity(vav_tags, vav_id_str))
                 
-        logger.info(f"Created {len(vav_ids)} VAV box entities")
-        return vav_ids
+        logger.info(f"Collected {len(vav_names)} VAV box entities")
+        return vav_names
         
-    def generate_meters(self) -> List[int]:
-        """Generate utility meter entities.
+    def generate_meters(self) -> List[str]:
+        """Collect utility meter entities.
         
         Returns:
-            List of meter entity IDs
+            List of meter entity names
         """
         meters_config = self.config['equipment']['meters']
         site_ref = self.config['site']['id']
-        meter_ids = []
+        meter_names = []
         
         # Electric meter
         electric_tags = {
-            "id": meters_config['electric']['id'],
+            "id": self._ref(meters_config['electric']['id']),
             "dis": meters_config['electric']['name'],
             "equip": True,
             "meter": True,
@@ -220,13 +252,11 @@ class EntityGenerator:
             "siteRef": site_ref,
             "submeterOf": site_ref
         }
-        electric_id = self.schema.create_entity(electric_tags)
-        meter_ids.append(electric_id)
-        self.entity_map[meters_config['electric']['id']] = electric_id
+        meter_names.append(self._add_entity(electric_tags, meters_config['electric']['id']))
         
         # Gas meter
         gas_tags = {
-            "id": meters_config['gas']['id'],
+            "id": self._ref(meters_config['gas']['id']),
             "dis": meters_config['gas']['name'],
             "equip": True,
             "meter": True,
@@ -234,13 +264,11 @@ class EntityGenerator:
             "siteRef": site_ref,
             "submeterOf": site_ref
         }
-        gas_id = self.schema.create_entity(gas_tags)
-        meter_ids.append(gas_id)
-        self.entity_map[meters_config['gas']['id']] = gas_id
+        meter_names.append(self._add_entity(gas_tags, meters_config['gas']['id']))
         
         # Water meter
         water_tags = {
-            "id": meters_config['water']['id'],
+            "id": self._ref(meters_config['water']['id']),
             "dis": meters_config['water']['name'],
             "equip": True,
             "meter": True,
@@ -248,39 +276,37 @@ class EntityGenerator:
             "siteRef": site_ref,
             "submeterOf": site_ref
         }
-        water_id = self.schema.create_entity(water_tags)
-        meter_ids.append(water_id)
-        self.entity_map[meters_config['water']['id']] = water_id
+        meter_names.append(self._add_entity(water_tags, meters_config['water']['id']))
         
-        logger.info(f"Created {len(meter_ids)} meter entities")
-        return meter_ids
+        logger.info(f"Collected {len(meter_names)} meter entities")
+        return meter_names
         
-    def generate_all_points(self) -> List[int]:
-        """Generate all point entities for equipment.
+    def generate_all_points(self) -> List[str]:
+        """Collect all point entities for equipment.
         
         Returns:
-            List of all point entity IDs
+            List of all point entity names
         """
-        point_ids = []
+        point_names = []
         
         # Generate chiller points
-        point_ids.extend(self._generate_chiller_points())
+        point_names.extend(self._generate_chiller_points())
         
         # Generate AHU points
-        point_ids.extend(self._generate_ahu_points())
+        point_names.extend(self._generate_ahu_points())
         
         # Generate VAV points
-        point_ids.extend(self._generate_vav_points())
+        point_names.extend(self._generate_vav_points())
         
         # Generate meter points
-        point_ids.extend(self._generate_meter_points())
+        point_names.extend(self._generate_meter_points())
         
-        logger.info(f"Created {len(point_ids)} point entities")
-        return point_ids
+        logger.info(f"Collected {len(point_names)} point entities")
+        return point_names
         
-    def _generate_chiller_points(self) -> List[int]:
-        """Generate points for all chillers."""
-        point_ids = []
+    def _generate_chiller_points(self) -> List[str]:
+        """Collect points for all chillers."""
+        point_names = []
         site_ref = self.config['site']['id']
         
         chiller_points = [
@@ -309,11 +335,11 @@ class EntityGenerator:
                 point_id_str = f"point-chiller-{i}-{point['suffix']}"
                 
                 point_tags = {
-                    "id": point_id_str,
+                    "id": self._ref(point_id_str),
                     "dis": f"Chiller {i} {point['dis']}",
                     "point": True,
                     "siteRef": site_ref,
-                    "equipRef": equip_ref,
+                    "equipRef": self._ref(equip_ref),
                     "kind": point['kind']
                 }
                 
@@ -322,15 +348,13 @@ class EntityGenerator:
                     if key not in ['suffix', 'dis', 'kind']:
                         point_tags[key] = value
                         
-                point_id = self.schema.create_entity(point_tags)
-                point_ids.append(point_id)
-                self.entity_map[point_id_str] = point_id
+                point_names.append(self._add_entity(point_tags, point_id_str))
                 
-        return point_ids
+        return point_names
         
-    def _generate_ahu_points(self) -> List[int]:
-        """Generate points for all AHUs."""
-        point_ids = []
+    def _generate_ahu_points(self) -> List[str]:
+        """Collect points for all AHUs."""
+        point_names = []
         site_ref = self.config['site']['id']
         
         ahu_points = [
@@ -355,11 +379,11 @@ class EntityGenerator:
                 point_id_str = f"point-ahu-{i}-{point['suffix']}"
                 
                 point_tags = {
-                    "id": point_id_str,
+                    "id": self._ref(point_id_str),
                     "dis": f"AHU {i} {point['dis']}",
                     "point": True,
                     "siteRef": site_ref,
-                    "equipRef": equip_ref,
+                    "equipRef": self._ref(equip_ref),
                     "kind": point['kind']
                 }
                 
@@ -367,15 +391,13 @@ class EntityGenerator:
                     if key not in ['suffix', 'dis', 'kind']:
                         point_tags[key] = value
                         
-                point_id = self.schema.create_entity(point_tags)
-                point_ids.append(point_id)
-                self.entity_map[point_id_str] = point_id
+                point_names.append(self._add_entity(point_tags, point_id_str))
                 
-        return point_ids
+        return point_names
         
-    def _generate_vav_points(self) -> List[int]:
-        """Generate points for all VAV boxes."""
-        point_ids = []
+    def _generate_vav_points(self) -> List[str]:
+        """Collect points for all VAV boxes."""
+        point_names = []
         site_ref = self.config['site']['id']
         
         vav_points = [
@@ -402,11 +424,11 @@ class EntityGenerator:
                     point_id_str = f"point-vav-{floor}-{zone.lower()}-{point['suffix']}"
                     
                     point_tags = {
-                        "id": point_id_str,
+                        "id": self._ref(point_id_str),
                         "dis": f"Floor {floor} {zone} {point['dis']}",
                         "point": True,
                         "siteRef": site_ref,
-                        "equipRef": equip_ref,
+                        "equipRef": self._ref(equip_ref),
                         "kind": point['kind'],
                         "floor": floor,
                         "zone": zone.lower()
@@ -416,15 +438,13 @@ class EntityGenerator:
                         if key not in ['suffix', 'dis', 'kind']:
                             point_tags[key] = value
                             
-                    point_id = self.schema.create_entity(point_tags)
-                    point_ids.append(point_id)
-                    self.entity_map[point_id_str] = point_id
+                    point_names.append(self._add_entity(point_tags, point_id_str))
                     
-        return point_ids
+        return point_names
         
-    def _generate_meter_points(self) -> List[int]:
-        """Generate points for utility meters."""
-        point_ids = []
+    def _generate_meter_points(self) -> List[str]:
+        """Collect points for utility meters."""
+        point_names = []
         site_ref = self.config['site']['id']
         
         # Electric meter points
@@ -442,11 +462,11 @@ class EntityGenerator:
             point_id_str = f"point-{electric_ref}-{point['suffix']}"
             
             point_tags = {
-                "id": point_id_str,
+                "id": self._ref(point_id_str),
                 "dis": f"Main Electric {point['dis']}",
                 "point": True,
                 "siteRef": site_ref,
-                "equipRef": electric_ref,
+                "equipRef": self._ref(electric_ref),
                 "kind": point['kind']
             }
             
@@ -454,9 +474,7 @@ class EntityGenerator:
                 if key not in ['suffix', 'dis', 'kind']:
                     point_tags[key] = value
                     
-            point_id = self.schema.create_entity(point_tags)
-            point_ids.append(point_id)
-            self.entity_map[point_id_str] = point_id
+            point_names.append(self._add_entity(point_tags, point_id_str))
             
         # Gas meter points
         gas_points = [
@@ -471,11 +489,11 @@ class EntityGenerator:
             point_id_str = f"point-{gas_ref}-{point['suffix']}"
             
             point_tags = {
-                "id": point_id_str,
+                "id": self._ref(point_id_str),
                 "dis": f"Main Gas {point['dis']}",
                 "point": True,
                 "siteRef": site_ref,
-                "equipRef": gas_ref,
+                "equipRef": self._ref(gas_ref),
                 "kind": point['kind']
             }
             
@@ -483,9 +501,7 @@ class EntityGenerator:
                 if key not in ['suffix', 'dis', 'kind']:
                     point_tags[key] = value
                     
-            point_id = self.schema.create_entity(point_tags)
-            point_ids.append(point_id)
-            self.entity_map[point_id_str] = point_id
+            point_names.append(self._add_entity(point_tags, point_id_str))
             
         # Water meter points
         water_points = [
@@ -500,11 +516,11 @@ class EntityGenerator:
             point_id_str = f"point-{water_ref}-{point['suffix']}"
             
             point_tags = {
-                "id": point_id_str,
+                "id": self._ref(point_id_str),
                 "dis": f"Main Water {point['dis']}",
                 "point": True,
                 "siteRef": site_ref,
-                "equipRef": water_ref,
+                "equipRef": self._ref(water_ref),
                 "kind": point['kind']
             }
             
@@ -512,8 +528,6 @@ class EntityGenerator:
                 if key not in ['suffix', 'dis', 'kind']:
                     point_tags[key] = value
                     
-            point_id = self.schema.create_entity(point_tags)
-            point_ids.append(point_id)
-            self.entity_map[point_id_str] = point_id
+            point_names.append(self._add_entity(point_tags, point_id_str))
             
-        return point_ids
\ No newline at end of file
+        return point_names
\ No newline at end of file
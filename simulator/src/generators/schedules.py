@@ -1,196 +1,238 @@
 """Occupancy and operational schedule generators."""
 
 import logging
-from typing import Dict, Any, List, Tuple
-from datetime import datetime, time, timedelta
+from typing import Dict, Any, List, Tuple, Sequence
+from datetime import date, datetime, time, timedelta
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
-class ScheduleGenerator:
-    """Generates realistic occupancy and operational schedules."""
+class CalendarCache:
+    """Precomputed calendar and base occupancy lookup tables.
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize schedule generator.
+    For each year, holiday/weekend flags are stored per day and base
+    occupancy (before random variation) per day and interval slot, so
+    lookups are plain array indexing. Timestamps that are not aligned to
+    the interval use the slot they fall in.
+    """
+    
+    WEEKEND = 1
+    HOLIDAY = 2
+    
+    # Fixed date US federal holidays (month, day)
+    FIXED_HOLIDAYS = [(1, 1), (7, 4), (12, 25)]
+    
+    # Floating holidays (month, weekday, nth occurrence; -1 = last)
+    FLOATING_HOLIDAYS = [
+        (1, 0, 3),   # Martin Luther King Jr. Day (3rd Monday in January)
+        (2, 0, 3),   # Presidents Day (3rd Monday in February)
+        (5, 0, -1),  # Memorial Day (last Monday in May)
+        (9, 0, 1),   # Labor Day (1st Monday in September)
+        (10, 0, 2),  # Columbus Day (2nd Monday in October)
+        (11, 3, 4),  # Thanksgiving (4th Thursday in November)
+    ]
+    
+    def __init__(self, schedules: Dict[str, Any], interval_minutes: int = 15):
+        """Initialize calendar cache.
         
         Args:
-            config: Building configuration dictionary
+            schedules: 'schedules' section of the building configuration
+            interval_minutes: Slot width in minutes
         """
-        self.config = config
-        self.random_state = np.random.RandomState(42)
+        self.interval_minutes = interval_minutes
+        self.slots_per_day = (24 * 60) // interval_minutes
+        self.weekend_default = schedules['weekend']['default']
         
-    def get_occupancy_ratio(self, timestamp: datetime) -> float:
-        """Get occupancy ratio for a specific timestamp.
+        # Weekday schedule interpolated at every slot start
+        points = []
+        for time_str, ratio in schedules['weekday'].items():
+            hour_part, minute_part = map(int, time_str.split(':'))
+            points.append((hour_part + minute_part / 60.0, ratio))
+        points.sort()
+        
+        slot_hours = np.arange(self.slots_per_day) * interval_minutes / 60.0
+        self.weekday_profile = np.interp(
+            slot_hours, [p[0] for p in points], [p[1] for p in points]
+        )
+        
+        # Weekend/holiday schedule - minimal occupancy, slight daytime bump
+        slot_hour = slot_hours.astype(int)
+        self.off_day_profile = np.where(
+            (slot_hour >= 8) & (slot_hour <= 17),
+            self.weekend_default + 0.02,
+            self.weekend_default
+        )
+        
+        self._years: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        
+    @classmethod
+    def holidays(cls, year: int) -> List[date]:
+        """Holiday dates for a year.
         
         Args:
-            timestamp: Timestamp to get occupancy for
+            year: Calendar year
             
         Returns:
-            Occupancy ratio (0.0 to 1.0)
+            List of holiday dates
         """
-        hour = timestamp.hour
-        minute = timestamp.minute
-        is_weekend = timestamp.weekday() >= 5
-        is_holiday = self._is_holiday(timestamp)
+        days = [date(year, month, day) for month, day in cls.FIXED_HOLIDAYS]
         
-        if is_weekend or is_holiday:
-            # Weekend/holiday schedule - minimal occupancy
-            base_ratio = self.config['schedules']['weekend']['default']
-            
-            # Slight variation during daytime
-            if 8 <= hour <= 17:
-                base_ratio += 0.02
-                
-        else:
-            # Weekday schedule
-            base_ratio = self._get_weekday_occupancy(hour, minute)
+        for month, weekday, n in cls.FLOATING_HOLIDAYS:
+            if n > 0:
+                first = date(year, month, 1)
+                day = 1 + (weekday - first.weekday()) % 7 + 7 * (n - 1)
+            else:
+                next_month = date(year + month // 12, month % 12 + 1, 1)
+                last = next_month - timedelta(days=1)
+                day = last.day - (last.weekday() - weekday) % 7
+            days.append(date(year, month, day))
             
-        # Add random variation (±5%)
-        variation = self.random_state.normal(0, 0.05)
-        final_ratio = max(0.0, min(1.0, base_ratio + variation))
+        return days
         
-        return final_ratio
-        
-    def _get_weekday_occupancy(self, hour: int, minute: int) -> float:
-        """Get weekday occupancy ratio for hour and minute.
+    def year_tables(self, year: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (building on first use) the lookup tables for a year.
         
         Args:
-            hour: Hour (0-23)
-            minute: Minute (0-59)
+            year: Calendar year
             
         Returns:
-            Occupancy ratio
+            Tuple of (day flags with shape (days,), base occupancy with
+            shape (days, slots_per_day))
         """
-        # Convert to decimal hours
-        decimal_hour = hour + minute / 60.0
-        
-        # Get schedule points
-        schedule = self.config['schedules']['weekday']
-        
-        # Convert schedule keys to decimal hours and sort
-        schedule_points = []
-        for time_str, ratio in schedule.items():
-            hour_part, minute_part = map(int, time_str.split(':'))
-            decimal_time = hour_part + minute_part / 60.0
-            schedule_points.append((decimal_time, ratio))
+        tables = self._years.get(year)
+        if tables is not None:
+            return tables
             
-        schedule_points.sort()
-        
-        # Find surrounding points for interpolation
-        if decimal_hour <= schedule_points[0][0]:
-            return schedule_points[0][1]
-        elif decimal_hour >= schedule_points[-1][0]:
-            return schedule_points[-1][1]
-        
-        # Find bracketing points
-        for i in range(len(schedule_points) - 1):
-            time1, ratio1 = schedule_points[i]
-            time2, ratio2 = schedule_points[i + 1]
+        days = np.arange(f'{year}-01-01', f'{year + 1}-01-01', dtype='datetime64[D]')
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        
+        flags = np.where(weekday >= 5, self.WEEKEND, 0).astype(np.int8)
+        for holiday in self.holidays(year):
+            flags[holiday.timetuple().tm_yday - 1] |= self.HOLIDAY
             
-            if time1 <= decimal_hour <= time2:
-                # Linear interpolation
-                if time2 == time1:
-                    return ratio1
-                    
-                weight = (decimal_hour - time1) / (time2 - time1)
-                return ratio1 + weight * (ratio2 - ratio1)
-                
-        return schedule_points[-1][1]
+        base = np.where(flags[:, np.newaxis] > 0, self.off_day_profile, self.weekday_profile)
         
-    def _is_holiday(self, timestamp: datetime) -> bool:
-        """Check if timestamp falls on a holiday.
+        tables = (flags, base)
+        self._years[year] = tables
+        return tables
+        
+    def _position(self, timestamp: datetime) -> Tuple[int, int, int]:
+        """Year, day index and slot of a timestamp."""
+        day = timestamp.timetuple().tm_yday - 1
+        slot = (timestamp.hour * 60 + timestamp.minute) // self.interval_minutes
+        return timestamp.year, day, slot
+        
+    def flags(self, timestamp: datetime) -> int:
+        """Calendar flags (WEEKEND | HOLIDAY) for a timestamp."""
+        year, day, _ = self._position(timestamp)
+        return int(self.year_tables(year)[0][day])
+        
+    def is_weekend(self, timestamp: datetime) -> bool:
+        """Check if timestamp falls on a weekend."""
+        return bool(self.flags(timestamp) & self.WEEKEND)
+        
+    def is_holiday(self, timestamp: datetime) -> bool:
+        """Check if timestamp falls on a holiday."""
+        return bool(self.flags(timestamp) & self.HOLIDAY)
+        
+    def base_occupancy(self, timestamp: datetime) -> float:
+        """Base occupancy ratio (without random variation) for a timestamp."""
+        year, day, slot = self._position(timestamp)
+        return float(self.year_tables(year)[1][day, slot])
+        
+    def weekday_occupancy(self, minute_of_day: int) -> float:
+        """Weekday schedule occupancy at a minute of the day."""
+        return float(self.weekday_profile[minute_of_day // self.interval_minutes])
+        
+    def lookup(self, timestamps: Sequence[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized flags and base occupancy for many timestamps.
         
         Args:
-            timestamp: Timestamp to check
+            timestamps: Timestamps (list, DatetimeIndex or datetime64 array)
             
         Returns:
-            True if holiday, False otherwise
+            Tuple of (flags, base occupancy) arrays
         """
-        # Simple holiday detection for US federal holidays
-        month = timestamp.month
-        day = timestamp.day
+        ts = np.asarray(timestamps, dtype='datetime64[m]')
+        days = ts.astype('datetime64[D]')
+        years = days.astype('datetime64[Y]')
+        day_index = (days - years).astype(np.int64)
+        slot = ((ts - days).astype(np.int64)) // self.interval_minutes
+        year_numbers = years.astype(np.int64) + 1970
+        
+        flags = np.empty(len(ts), dtype=np.int8)
+        base = np.empty(len(ts))
+        for year in np.unique(year_numbers):
+            mask = year_numbers == year
+            year_flags, year_base = self.year_tables(int(year))
+            flags[mask] = year_flags[day_index[mask]]
+            base[mask] = year_base[day_index[mask], slot[mask]]
+            
+        return flags, base
+
+
+class ScheduleGenerator:
+    """Generates realistic occupancy and operational schedules."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize schedule generator.
         
-        # Fixed date holidays
-        fixed_holidays = [
-            (1, 1),   # New Year's Day
-            (7, 4),   # Independence Day
-            (12, 25), # Christmas Day
-        ]
+        Args:
+            config: Building configuration dictionary
+        """
+        self.config = config
+        self.random_state = np.random.RandomState(
+            config.get('generation', {}).get('seed', 42)
+        )
+        self.calendar = CalendarCache(
+            config['schedules'],
+            config.get('generation', {}).get('data_interval_minutes', 15)
+        )
         
-        if (month, day) in fixed_holidays:
-            return True
-            
-        # Martin Luther King Jr. Day (3rd Monday in January)
-        if month == 1 and self._is_nth_weekday(timestamp, 1, 3):
-            return True
-            
-        # Presidents Day (3rd Monday in February)
-        if month == 2 and self._is_nth_weekday(timestamp, 1, 3):
-            return True
-            
-        # Memorial Day (last Monday in May)
-        if month == 5 and self._is_last_weekday(timestamp, 1):
-            return True
-            
-        # Labor Day (1st Monday in September)
-        if month == 9 and self._is_nth_weekday(timestamp, 1, 1):
-            return True
-            
-        # Columbus Day (2nd Monday in October)
-        if month == 10 and self._is_nth_weekday(timestamp, 1, 2):
-            return True
-            
-        # Thanksgiving (4th Thursday in November)
-        if month == 11 and self._is_nth_weekday(timestamp, 4, 4):
-            return True
+    def get_occupancy_ratio(self, timestamp: datetime) -> float:
+        """Get occupancy ratio for a specific timestamp.
+        
+        Args:
+            timestamp: Timestamp to get occupancy for
             
-        return False
+        Returns:
+            Occupancy ratio (0.0 to 1.0)
+        """
+        base_ratio = self.calendar.base_occupancy(timestamp)
         
-    def _is_nth_weekday(self, timestamp: datetime, weekday: int, n: int) -> bool:
-        """Check if timestamp is the nth occurrence of weekday in month.
+        # Add random variation (±5%)
+        variation = self.random_state.normal(0, 0.05)
+        final_ratio = max(0.0, min(1.0, base_ratio + variation))
+        
+        return final_ratio
+        
+    def get_occupancy_ratios(self, timestamps: Sequence[datetime]) -> np.ndarray:
+        """Get occupancy ratios for many timestamps at once.
+        
+        Draws the same random variation as calling get_occupancy_ratio
+        for each timestamp in order.
         
         Args:
-            timestamp: Timestamp to check
-            weekday: Day of week (0=Monday, 6=Sunday)
-            n: Which occurrence (1st, 2nd, etc.)
+            timestamps: Timestamps to get occupancy for
             
         Returns:
-            True if nth occurrence, False otherwise
+            Array of occupancy ratios (0.0 to 1.0)
         """
-        if timestamp.weekday() != weekday:
-            return False
-            
-        # Count occurrences of this weekday in the month
-        first_day = timestamp.replace(day=1)
-        count = 0
-        current_day = first_day
-        
-        while current_day.month == timestamp.month:
-            if current_day.weekday() == weekday:
-                count += 1
-                if current_day.day == timestamp.day:
-                    return count == n
-            current_day += timedelta(days=1)
-            
-        return False
+        _, base = self.calendar.lookup(timestamps)
+        variation = self.random_state.normal(0, 0.05, size=len(base))
+        return np.clip(base + variation, 0.0, 1.0)
         
-    def _is_last_weekday(self, timestamp: datetime, weekday: int) -> bool:
-        """Check if timestamp is the last occurrence of weekday in month.
+    def _is_holiday(self, timestamp: datetime) -> bool:
+        """Check if timestamp falls on a holiday.
         
         Args:
             timestamp: Timestamp to check
-            weekday: Day of week (0=Monday, 6=Sunday)
             
         Returns:
-            True if last occurrence, False otherwise
+            True if holiday, False otherwise
         """
-        if timestamp.weekday() != weekday:
-            return False
-            
-        # Check if there's another occurrence after this date
-        next_week = timestamp + timedelta(days=7)
-        return next_week.month != timestamp.month
+        return self.calendar.is_holiday(timestamp)
         
     def get_hvac_schedule(self, timestamp: datetime, occupancy_ratio: float) -> Dict[str, Any]:
         """Get HVAC operational schedule.
@@ -203,7 +245,7 @@ class ScheduleGenerator:
             Dictionary with HVAC schedule parameters
         """
         hour = timestamp.hour
-        is_weekend = timestamp.weekday() >= 5
+        is_weekend = self.calendar.is_weekend(timestamp)
         season = self._get_season(timestamp)
         
         # Determine if building systems should be running
@@ -365,7 +407,7 @@ class ScheduleGenerator:
             entry = {
                 'timestamp': current_date,
                 'occupancy_ratio': occupancy,
-                'is_weekend': current_date.weekday() >= 5,
+                'is_weekend': self.calendar.is_weekend(current_date),
                 'is_holiday': self._is_holiday(current_date),
                 'hvac': hvac_schedule,
                 'lighting': lighting_schedule
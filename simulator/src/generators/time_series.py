@@ -2,12 +2,14 @@
 
 import logging
 import random
-import math
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
+from generators.schedules import CalendarCache
+from generators.weather import WeatherSimulator
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,18 +17,26 @@ class TimeSeriesGenerator:
     """Generates realistic time-series data for building systems."""
 
     def __init__(self, config: Dict[str, Any], entity_map: Dict[str, int],
-                 initial_totalizers: Optional[Dict[str, Any]] = None):
+                 initial_totalizers: Optional[Dict[str, Any]] = None,
+                 weather_sim: Optional[WeatherSimulator] = None):
         """Initialize time-series generator.
 
         Args:
             config: Building configuration dictionary
             entity_map: Mapping of entity names to database IDs
             initial_totalizers: Optional initial totalizer values for resumption
+            weather_sim: Optional shared WeatherSimulator (one is created if omitted)
         """
         self.config = config
         self.entity_map = entity_map
-        self.random = random.Random(42)  # Reproducible random seed
-        self.np_random = np.random.RandomState(42)
+        seed = config.get('generation', {}).get('seed', 42)
+        self.random = random.Random(seed)  # Reproducible random seed
+        self.np_random = np.random.RandomState(seed)
+        self.calendar = CalendarCache(
+            config['schedules'],
+            config.get('generation', {}).get('data_interval_minutes', 15)
+        )
+        self.weather = weather_sim or WeatherSimulator(config['weather'])
 
         # Initialize totalizer accumulators for energy/volume meters
         if initial_totalizers:
@@ -71,14 +81,18 @@ class TimeSeriesGenerator:
         
         all_data = []
         
+        # Weather for the whole range in one pass
+        weather = self.weather.generate_series(start_time, end_time, interval_minutes)
+        
         # Generate data for each time point
-        for i, timestamp in enumerate(time_range):
+        for i, (timestamp, outdoor_temp, season) in enumerate(
+            zip(time_range, weather['dry_bulb_temp'], weather['season'])
+        ):
             if i % 1000 == 0:
                 progress = (i / len(time_range)) * 100
                 logger.info(f"Progress: {progress:.1f}% ({i}/{len(time_range)})")
                 
-            # Generate weather conditions for this timestamp
-            outdoor_temp, season = self._get_outdoor_conditions(timestamp)
+            outdoor_temp = float(outdoor_temp)
             
             # Generate occupancy ratio
             occupancy_ratio = self._get_occupancy_ratio(timestamp)
@@ -102,42 +116,8 @@ class TimeSeriesGenerator:
         Returns:
             Tuple of (temperature, season)
         """
-        # Determine season
-        month = timestamp.month
-        if month in [12, 1, 2]:
-            season = 'winter'
-        elif month in [3, 4, 5]:
-            season = 'spring'
-        elif month in [6, 7, 8]:
-            season = 'summer'
-        else:
-            season = 'fall'
-            
-        season_config = self.config['weather']['seasons'][season]
-        
-        # Generate temperature with daily and seasonal variation
-        hour = timestamp.hour
-        day_of_year = timestamp.timetuple().tm_yday
-        
-        # Daily temperature curve (cooler at night, warmer during day)
-        daily_factor = 0.5 * math.sin((hour - 6) * math.pi / 12) + 0.5
-        
-        # Seasonal variation
-        seasonal_factor = 0.5 * math.sin((day_of_year - 80) * 2 * math.pi / 365) + 0.5
-        
-        # Base temperature with variation
-        temp_range = season_config['max'] - season_config['min']
-        base_temp = season_config['min'] + (temp_range * seasonal_factor)
-        
-        # Add daily variation (±10°F swing)
-        daily_swing = 10 * (daily_factor - 0.5) * 2
-        
-        # Add random noise
-        noise = self.np_random.normal(0, 2)
-        
-        temperature = base_temp + daily_swing + noise
-        
-        return temperature, season
+        weather = self.weather.get_current_weather(timestamp)
+        return float(weather['dry_bulb_temp']), weather['season']
         
     def _get_occupancy_ratio(self, timestamp: datetime) -> float:
         """Get occupancy ratio for timestamp.
@@ -148,33 +128,11 @@ class TimeSeriesGenerator:
         Returns:
             Occupancy ratio (0-1)
         """
-        hour = timestamp.hour
-        is_weekend = timestamp.weekday() >= 5
-        
-        if is_weekend:
-            return self.config['schedules']['weekend']['default']
-            
-        # Find closest hour in weekday schedule
-        weekday_schedule = self.config['schedules']['weekday']
-        hour_key = f"{hour:02d}:00"
-        
-        if hour_key in weekday_schedule:
-            base_occupancy = weekday_schedule[hour_key]
-        else:
-            # Interpolate between closest hours
-            hours = sorted([int(h.split(':')[0]) for h in weekday_schedule.keys()])
-            
-            # Find surrounding hours
-            lower_hour = max([h for h in hours if h <= hour], default=hours[0])
-            upper_hour = min([h for h in hours if h > hour], default=hours[-1])
+        if self.calendar.is_weekend(timestamp):
+            return self.calendar.weekend_default
             
-            if lower_hour == upper_hour:
-                base_occupancy = weekday_schedule[f"{lower_hour:02d}:00"]
-            else:
-                lower_val = weekday_schedule[f"{lower_hour:02d}:00"]
-                upper_val = weekday_schedule[f"{upper_hour:02d}:00"]
-                ratio = (hour - lower_hour) / (upper_hour - lower_hour)
-                base_occupancy = lower_val + ratio * (upper_val - lower_val)
+        # Weekday schedule at the top of the hour
+        base_occupancy = self.calendar.weekday_occupancy(timestamp.hour * 60)
                 
         # Add some randomness
         noise = self.np_random.normal(0, 0.05)
@@ -1,9 +1,9 @@
 """Weather simulation module for realistic outdoor conditions."""
 
 import logging
-import math
+from collections import OrderedDict
 from typing import Dict, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
 import pandas as pd
 
@@ -11,7 +11,31 @@ logger = logging.getLogger(__name__)
 
 
 class WeatherSimulator:
-    """Simulates realistic weather patterns for building simulation."""
+    """Simulates realistic weather patterns for building simulation.
+    
+    Weather for a time range is generated in one vectorized pass and
+    memoized per (start, end, interval), so every consumer of the same
+    range shares one series. Noise is derived from the seed and the
+    timestamp alone, so a timestamp gets the same weather from every range
+    that contains it.
+    """
+    
+    SEASONS = ['winter', 'spring', 'summer', 'fall']
+    
+    # Season index for months 1-12
+    MONTH_SEASON = np.array([0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+    
+    # Per-season constants, in SEASONS order
+    SEASON_HUMIDITY = np.array([45, 55, 70, 60])
+    SEASON_WIND = np.array([12, 10, 6, 8])
+    SEASON_CLOUDINESS = np.array([0.6, 0.5, 0.3, 0.4])
+    
+    # Number of memoized series kept
+    CACHE_SIZE = 8
+    
+    # Noise streams, one per random weather parameter
+    (NOISE_TEMP, NOISE_HUMIDITY, NOISE_WIND, NOISE_DAY_CLOUDS,
+     NOISE_NIGHT_CLOUDS, NOISE_IRRADIANCE) = range(6)
     
     def __init__(self, config: Dict[str, Any], timezone: str = "America/New_York"):
         """Initialize weather simulator.
@@ -22,7 +46,13 @@ class WeatherSimulator:
         """
         self.config = config
         self.timezone = timezone
-        self.random_state = np.random.RandomState(42)
+        self.seed = int(config.get('seed', 42))
+        self._series_cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        
+        seasons = [config['seasons'][name] for name in self.SEASONS]
+        self._season_min = np.array([c['min'] for c in seasons], dtype=float)
+        self._season_max = np.array([c['max'] for c in seasons], dtype=float)
+        self._season_typical = np.array([c['typical'] for c in seasons], dtype=float)
         
     def generate_weather_data(self, start_date: datetime, 
                             end_date: datetime, 
@@ -47,162 +77,139 @@ class WeatherSimulator:
         """
         logger.info(f"Generating weather data from {start_date} to {end_date}")
         
-        # Create timestamp range
-        timestamps = pd.date_range(
-            start=start_date,
-            end=end_date,
-            freq=f'{interval_minutes}min'
-        )
-        
-        weather_data = []
-        
-        for timestamp in timestamps:
-            weather_point = self._generate_weather_point(timestamp)
-            weather_data.append(weather_point)
-            
-        df = pd.DataFrame(weather_data)
+        df = self.generate_series(start_date, end_date, interval_minutes).reset_index(drop=True)
         logger.info(f"Generated {len(df)} weather data points")
         
         return df
         
-    def _generate_weather_point(self, timestamp: datetime) -> Dict[str, Any]:
-        """Generate weather data for a single timestamp.
+    def generate_series(self, start_date: datetime, end_date: datetime,
+                        interval_minutes: int = 15) -> pd.DataFrame:
+        """Get the weather series for a time range, generating it once.
+        
+        The returned frame is shared between callers and must not be
+        modified.
         
         Args:
-            timestamp: Timestamp for weather data
+            start_date: Start of range (inclusive)
+            end_date: End of range (inclusive)
+            interval_minutes: Data interval in minutes
             
         Returns:
-            Dictionary with weather parameters
+            DataFrame indexed by timestamp with the columns listed in
+            generate_weather_data
         """
-        # Determine season
-        season = self._get_season(timestamp)
-        season_config = self.config['seasons'][season]
-        
-        # Generate temperature with seasonal and daily variation
-        dry_bulb_temp = self._generate_temperature(timestamp, season_config)
-        
-        # Generate humidity (inversely related to temperature)
-        humidity = self._generate_humidity(dry_bulb_temp, season)
-        
-        # Calculate wet bulb temperature
-        wet_bulb_temp = self._calculate_wet_bulb_temp(dry_bulb_temp, humidity)
-        
-        # Generate wind speed
-        wind_speed = self._generate_wind_speed(season, timestamp.hour)
+        key = (pd.Timestamp(start_date), pd.Timestamp(end_date), interval_minutes)
         
-        # Generate solar irradiance
-        solar_irradiance, cloud_cover = self._generate_solar_data(timestamp, season)
+        series = self._series_cache.get(key)
+        if series is not None:
+            self._series_cache.move_to_end(key)
+            return series
+            
+        timestamps = pd.date_range(start=key[0], end=key[1], freq=f'{interval_minutes}min')
+        series = self._generate_arrays(timestamps)
         
-        return {
-            'timestamp': timestamp,
-            'dry_bulb_temp': round(dry_bulb_temp, 1),
-            'wet_bulb_temp': round(wet_bulb_temp, 1),
-            'humidity': round(humidity, 0),
-            'wind_speed': round(wind_speed, 1),
-            'solar_irradiance': round(solar_irradiance, 0),
-            'cloud_cover': round(cloud_cover, 2),
-            'season': season
-        }
+        self._series_cache[key] = series
+        if len(self._series_cache) > self.CACHE_SIZE:
+            self._series_cache.popitem(last=False)
+            
+        return series
         
-    def _get_season(self, timestamp: datetime) -> str:
-        """Determine season from timestamp.
+    def _generate_arrays(self, timestamps: pd.DatetimeIndex) -> pd.DataFrame:
+        """Generate all weather parameters for many timestamps at once.
         
         Args:
-            timestamp: Datetime to check
+            timestamps: Timestamps for weather data
             
         Returns:
-            Season name
+            DataFrame indexed by timestamp
         """
-        month = timestamp.month
-        
-        if month in [12, 1, 2]:
-            return 'winter'
-        elif month in [3, 4, 5]:
-            return 'spring'
-        elif month in [6, 7, 8]:
-            return 'summer'
-        else:  # 9, 10, 11
-            return 'fall'
-            
-    def _generate_temperature(self, timestamp: datetime, 
-                            season_config: Dict[str, float]) -> float:
-        """Generate realistic temperature with seasonal and daily variation.
+        seconds = self._epoch_seconds(timestamps)
+        hour = timestamps.hour.to_numpy()
+        day_of_year = timestamps.dayofyear.to_numpy()
+        season_idx = self.MONTH_SEASON[timestamps.month.to_numpy() - 1]
+        
+        season_min = self._season_min[season_idx]
+        season_max = self._season_max[season_idx]
+        temp_range = season_max - season_min
+        
+        # Temperature: seasonal + daily + multi-day fronts + noise
+        seasonal_offset = np.sin((day_of_year - 80) * 2 * np.pi / 365)
+        seasonal_temp = self._season_typical[season_idx] + seasonal_offset * (temp_range * 0.3)
+        daily_temp = temp_range * 0.25 * np.sin((hour - 6) * np.pi / 12)
+        multi_day_phase = (day_of_year % 7) * 2 * np.pi / 7
+        multi_day_offset = np.sin(multi_day_phase) * (temp_range * 0.15)
+        noise = self._normal(seconds, self.NOISE_TEMP) * 2.0
+        dry_bulb = np.clip(seasonal_temp + daily_temp + multi_day_offset + noise,
+                           season_min, season_max)
+        
+        # Humidity (inversely related to temperature)
+        humidity = (self.SEASON_HUMIDITY[season_idx]
+                    - (dry_bulb - 70) * 0.3
+                    + self._normal(seconds, self.NOISE_HUMIDITY) * 8)
+        humidity = np.clip(humidity, 20, 95)
+        
+        wet_bulb = self._calculate_wet_bulb_temp(dry_bulb, humidity)
+        
+        # Wind (windier during the day)
+        base_wind = self.SEASON_WIND[season_idx]
+        diurnal_factor = np.where((hour >= 8) & (hour <= 18), 1.2, 0.8)
+        wind_speed = np.maximum(
+            0, base_wind * diurnal_factor + self._normal(seconds, self.NOISE_WIND) * base_wind * 0.3
+        )
         
-        Args:
-            timestamp: Current timestamp
-            season_config: Season configuration
-            
-        Returns:
-            Temperature in Fahrenheit
+        solar_irradiance, cloud_cover = self._generate_solar_arrays(seconds, hour, day_of_year, season_idx)
+        
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'dry_bulb_temp': np.round(dry_bulb, 1),
+            'wet_bulb_temp': np.round(wet_bulb, 1),
+            'humidity': np.round(humidity, 0),
+            'wind_speed': np.round(wind_speed, 1),
+            'solar_irradiance': np.round(solar_irradiance, 0),
+            'cloud_cover': np.round(cloud_cover, 2),
+            'season': np.array(self.SEASONS)[season_idx]
+        }, index=timestamps)
+        
+    @staticmethod
+    def _epoch_seconds(timestamps: pd.DatetimeIndex) -> np.ndarray:
+        """Seconds since the Unix epoch, the key the noise is derived from."""
+        return ((timestamps - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy().astype(np.uint64)
+        
+    def _uniform(self, seconds: np.ndarray, stream: int) -> np.ndarray:
+        """Uniform [0, 1) noise that depends only on seed, stream and timestamp.
+        
+        Hashes the three with the SplitMix64 finalizer, so any range of
+        timestamps draws the same values without shared generator state.
         """
-        hour = timestamp.hour
-        day_of_year = timestamp.timetuple().tm_yday
-        
-        # Base temperature from season
-        typical_temp = season_config['typical']
-        temp_range = season_config['max'] - season_config['min']
-        
-        # Seasonal variation (sinusoidal over the year)
-        # Peak summer around day 200, peak winter around day 20/385
-        seasonal_offset = math.sin((day_of_year - 80) * 2 * math.pi / 365)
-        seasonal_temp = typical_temp + seasonal_offset * (temp_range * 0.3)
-        
-        # Daily variation (cooler at night, warmer in afternoon)
-        daily_amplitude = temp_range * 0.25  # Daily swing
-        daily_offset = math.sin((hour - 6) * math.pi / 12)  # Peak at 2 PM
-        daily_temp = daily_amplitude * daily_offset
-        
-        # Multi-day weather patterns (simulate weather fronts)
-        multi_day_period = 7  # 7-day weather cycles
-        multi_day_phase = (day_of_year % multi_day_period) * 2 * math.pi / multi_day_period
-        multi_day_offset = math.sin(multi_day_phase) * (temp_range * 0.15)
-        
-        # Random noise
-        noise = self.random_state.normal(0, 2.0)
-        
-        # Combine all factors
-        temperature = seasonal_temp + daily_temp + multi_day_offset + noise
+        offset = (self.seed * 0xD1B54A32D192ED03 + stream * 0xBF58476D1CE4E5B9) % 2 ** 64
+        z = seconds * np.uint64(0x9E3779B97F4A7C15) + np.uint64(offset)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)).astype(float) * 2.0 ** -53
+        
+    def _normal(self, seconds: np.ndarray, stream: int) -> np.ndarray:
+        """Standard normal noise per timestamp (Box-Muller over two hashed uniforms)."""
+        u1 = 1.0 - self._uniform(seconds, 2 * stream + 64)
+        u2 = self._uniform(seconds, 2 * stream + 65)
+        return np.sqrt(-2.0 * np.log(u1)) * np.cos(2 * np.pi * u2)
         
-        # Clamp to reasonable bounds
-        temperature = max(season_config['min'], 
-                         min(season_config['max'], temperature))
-        
-        return temperature
-        
-    def _generate_humidity(self, temperature: float, season: str) -> float:
-        """Generate relative humidity based on temperature and season.
+    def _get_season(self, timestamp: datetime) -> str:
+        """Determine season from timestamp.
         
         Args:
-            temperature: Dry bulb temperature
-            season: Season name
+            timestamp: Datetime to check
             
         Returns:
-            Relative humidity percentage
+            Season name
         """
-        # Base humidity by season
-        season_humidity = {
-            'winter': 45,
-            'spring': 55,
-            'summer': 70,
-            'fall': 60
-        }
-        
-        base_humidity = season_humidity[season]
-        
-        # Humidity tends to be inversely related to temperature
-        temp_factor = -(temperature - 70) * 0.3
-        
-        # Add some randomness
-        noise = self.random_state.normal(0, 8)
+        return self.SEASONS[self.MONTH_SEASON[timestamp.month - 1]]
         
-        humidity = base_humidity + temp_factor + noise
-        
-        # Clamp to valid range
-        return max(20, min(95, humidity))
-        
-    def _calculate_wet_bulb_temp(self, dry_bulb: float, humidity: float) -> float:
+    def _calculate_wet_bulb_temp(self, dry_bulb, humidity):
         """Calculate wet bulb temperature from dry bulb and humidity.
         
+        Works on scalars and NumPy arrays.
+        
         Args:
             dry_bulb: Dry bulb temperature (°F)
             humidity: Relative humidity (%)
@@ -210,127 +217,77 @@ class WeatherSimulator:
         Returns:
             Wet bulb temperature (°F)
         """
-        # Simplified wet bulb calculation
+        # Simplified wet bulb calculation (Stull approximation)
         # Convert to Celsius for calculation
-        tc = (dry_bulb - 32) * 5/9
-        rh_decimal = humidity / 100
+        tc = (np.asarray(dry_bulb, dtype=float) - 32) * 5/9
+        rh = np.asarray(humidity, dtype=float)
         
-        # Approximation formula
-        tw_c = tc * math.atan(0.151977 * (rh_decimal * 100 + 8.313659) ** 0.5) + \
-               math.atan(tc + rh_decimal * 100) - \
-               math.atan(rh_decimal * 100 - 1.676331) + \
-               0.00391838 * (rh_decimal * 100) ** 1.5 * math.atan(0.023101 * rh_decimal * 100) - 4.686035
+        tw_c = tc * np.arctan(0.151977 * (rh + 8.313659) ** 0.5) + \
+               np.arctan(tc + rh) - \
+               np.arctan(rh - 1.676331) + \
+               0.00391838 * rh ** 1.5 * np.arctan(0.023101 * rh) - 4.686035
         
         # Convert back to Fahrenheit
         tw_f = tw_c * 9/5 + 32
         
         # Wet bulb can't be higher than dry bulb
-        return min(tw_f, dry_bulb)
-        
-    def _generate_wind_speed(self, season: str, hour: int) -> float:
-        """Generate wind speed with seasonal and diurnal variation.
-        
-        Args:
-            season: Season name
-            hour: Hour of day
-            
-        Returns:
-            Wind speed in mph
-        """
-        # Base wind speed by season
-        season_wind = {
-            'winter': 12,
-            'spring': 10,
-            'summer': 6,
-            'fall': 8
-        }
-        
-        base_wind = season_wind[season]
-        
-        # Diurnal variation (typically windier during day)
-        if 8 <= hour <= 18:
-            diurnal_factor = 1.2
-        else:
-            diurnal_factor = 0.8
-            
-        # Random variation
-        noise = self.random_state.normal(0, base_wind * 0.3)
-        
-        wind_speed = base_wind * diurnal_factor + noise
+        return np.minimum(tw_f, dry_bulb)
         
-        return max(0, wind_speed)
-        
-    def _generate_solar_data(self, timestamp: datetime, 
-                           season: str) -> Tuple[float, float]:
-        """Generate solar irradiance and cloud cover.
+    def _generate_solar_arrays(self, seconds: np.ndarray, hour: np.ndarray, day_of_year: np.ndarray,
+                               season_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate solar irradiance and cloud cover arrays.
         
         Args:
-            timestamp: Current timestamp
-            season: Season name
+            seconds: Epoch seconds per timestamp (noise key)
+            hour: Hour of day per timestamp
+            day_of_year: Day of year per timestamp
+            season_idx: Season index per timestamp
             
         Returns:
-            Tuple of (solar_irradiance W/m², cloud_cover 0-1)
+            Tuple of (solar_irradiance W/m², cloud_cover 0-1) arrays
         """
-        hour = timestamp.hour
-        day_of_year = timestamp.timetuple().tm_yday
-        
-        # No solar irradiance at night
-        if hour < 6 or hour > 19:
-            return 0.0, self.random_state.uniform(0.2, 0.8)
-            
-        # Calculate solar elevation angle (simplified)
-        # Solar noon is around hour 12
-        hour_angle = (hour - 12) * 15  # degrees
-        
-        # Declination angle varies with day of year
-        declination = 23.45 * math.sin(math.radians((360/365) * (day_of_year - 81)))
-        
-        # Assume latitude of 40° (typical US)
-        latitude = 40
-        
-        # Solar elevation angle
-        elevation = math.asin(
-            math.sin(math.radians(declination)) * math.sin(math.radians(latitude)) +
-            math.cos(math.radians(declination)) * math.cos(math.radians(latitude)) *
-            math.cos(math.radians(hour_angle))
+        # Solar elevation angle (simplified, solar noon at hour 12)
+        hour_angle = np.radians((hour - 12) * 15)
+        declination = np.radians(23.45 * np.sin(np.radians((360/365) * (day_of_year - 81))))
+        latitude = np.radians(40)  # Assume latitude of 40° (typical US)
+        elevation = np.arcsin(
+            np.sin(declination) * np.sin(latitude) +
+            np.cos(declination) * np.cos(latitude) * np.cos(hour_angle)
         )
+        max_irradiance = 1000 * np.sin(np.maximum(0, elevation))
         
-        # Convert to degrees and ensure positive
-        elevation_deg = max(0, math.degrees(elevation))
-        
-        # Maximum possible irradiance (clear sky)
-        max_irradiance = 1000 * math.sin(math.radians(elevation_deg))
-        
-        # Generate cloud cover (affects irradiance)
-        # More clouds in spring/winter, fewer in summer
-        season_cloudiness = {
-            'winter': 0.6,
-            'spring': 0.5,
-            'summer': 0.3,
-            'fall': 0.4
-        }
-        
-        base_clouds = season_cloudiness[season]
-        cloud_noise = self.random_state.normal(0, 0.2)
-        cloud_cover = max(0, min(1, base_clouds + cloud_noise))
-        
-        # Reduce irradiance based on cloud cover
-        cloud_factor = 1 - (cloud_cover * 0.8)  # Clouds block up to 80% of solar
+        # Cloud cover (more clouds in spring/winter, fewer in summer)
+        day_clouds = np.clip(
+            self.SEASON_CLOUDINESS[season_idx] + self._normal(seconds, self.NOISE_DAY_CLOUDS) * 0.2, 0, 1
+        )
+        night_clouds = 0.2 + self._uniform(seconds, self.NOISE_NIGHT_CLOUDS) * 0.6
         
-        irradiance = max_irradiance * cloud_factor
+        # Clouds block up to 80% of solar, plus some random variation
+        irradiance = max_irradiance * (1 - day_clouds * 0.8)
+        irradiance += self._normal(seconds, self.NOISE_IRRADIANCE) * irradiance * 0.1
         
-        # Add some random variation
-        irradiance += self.random_state.normal(0, irradiance * 0.1)
+        # No solar irradiance at night
+        night = (hour < 6) | (hour > 19)
+        irradiance = np.where(night, 0.0, np.maximum(0, irradiance))
+        cloud_cover = np.where(night, night_clouds, day_clouds)
         
-        return max(0, irradiance), cloud_cover
+        return irradiance, cloud_cover
         
     def get_current_weather(self, timestamp: datetime) -> Dict[str, Any]:
         """Get weather conditions for a specific timestamp.
         
+        Minute-aligned lookups are served from a memoized one-minute series
+        of the whole day, so live ticks share one series per day.
+        
         Args:
             timestamp: Timestamp for weather
             
         Returns:
             Dictionary with current weather conditions
         """
-        return self._generate_weather_point(timestamp)
\ No newline at end of file
+        ts = pd.Timestamp(timestamp)
+        if ts.second or ts.microsecond or ts.nanosecond:
+            return self.generate_series(ts, ts).iloc[0].to_dict()
+        day = ts.normalize()
+        series = self.generate_series(day, day + pd.Timedelta(days=1, minutes=-1), 1)
+        return series.loc[ts].to_dict()
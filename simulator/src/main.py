@@ -160,8 +160,8 @@ def generate_historical_data(data_loader: DataLoader, building_config: Dict[str,
     console.print(f"[bold blue]Generating {days} days of historical data...[/bold blue]")
     
     # Initialize generators
-    ts_gen = TimeSeriesGenerator(building_config, entity_map)
     weather_sim = WeatherSimulator(building_config['weather'])
+    ts_gen = TimeSeriesGenerator(building_config, entity_map, weather_sim=weather_sim)
     schedule_gen = ScheduleGenerator(building_config)
     
     # Generate data
@@ -187,11 +187,11 @@ def generate_current_values(data_loader: DataLoader, building_config: Dict[str,
     """
     console.print("[bold blue]Generating current values...[/bold blue]")
     
-    ts_gen = TimeSeriesGenerator(building_config, entity_map)
+    weather_sim = WeatherSimulator(building_config['weather'])
+    ts_gen = TimeSeriesGenerator(building_config, entity_map, weather_sim=weather_sim)
     current_time = datetime.now().replace(second=0, microsecond=0)
     
     # Generate current weather and occupancy
-    weather_sim = WeatherSimulator(building_config['weather'])
     schedule_gen = ScheduleGenerator(building_config)
     
     weather = weather_sim.get_current_weather(current_time)
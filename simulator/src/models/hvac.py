@@ -2,14 +2,35 @@
 
 import logging
 import math
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+
 from .building import Equipment, Point, EquipmentStatus
 
 logger = logging.getLogger(__name__)
 
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _unit_array(units: Sequence[Any], attr: str) -> np.ndarray:
+    """Collect one attribute of every unit into a float array."""
+    return np.array([getattr(unit, attr) for unit in units], dtype=float)
+
+
+def _per_timestep(values: ArrayLike, block: np.ndarray) -> np.ndarray:
+    """Broadcast a per-timestep input against a (timesteps, units) block.
+    
+    A 1-D input with one value per timestep is applied to every unit;
+    scalars and arrays already shaped like the block pass through.
+    """
+    values = np.asarray(values, dtype=float)
+    if block.ndim == 2 and values.ndim == 1 and values.shape[0] == block.shape[0]:
+        values = values[:, np.newaxis]
+    return np.broadcast_to(values, block.shape)
+
 
 @dataclass
 class ChillerModel(Equipment):
@@ -83,6 +104,48 @@ class ChillerModel(Equipment):
             'operating': True,
             'load_ratio': load_ratio
         }
+        
+    @classmethod
+    def calculate_performance_batch(cls, chillers: Sequence['ChillerModel'],
+                                    load_ratios: ArrayLike,
+                                    outdoor_temps: ArrayLike) -> Dict[str, np.ndarray]:
+        """Calculate performance of many chillers over many timesteps.
+        
+        Array version of calculate_performance. Chillers below minimum
+        load report zero power, COP and flow and a 70°F supply/return.
+        
+        Args:
+            chillers: Chillers, one per column
+            load_ratios: Load ratios, shape (timesteps, chillers) or (chillers,)
+            outdoor_temps: Outdoor temperatures, per timestep or per element
+            
+        Returns:
+            Dictionary of arrays shaped like load_ratios
+        """
+        load = np.asarray(load_ratios, dtype=float)
+        outdoor = _per_timestep(outdoor_temps, load)
+        
+        operating = load >= _unit_array(chillers, 'min_load_ratio')
+        
+        # Part-load efficiency curve (typical centrifugal chiller)
+        efficiency_factor = np.select(
+            [load < 0.3, load < 0.5, load < 0.8], [0.4, 0.75, 0.95], default=0.9
+        )
+        condenser_temp_impact = np.maximum(0.5, 1.0 - (outdoor - 85) * 0.02)
+        cop = np.maximum(2.0, _unit_array(chillers, 'cop_rated') * efficiency_factor * condenser_temp_impact)
+        
+        cooling_load_tons = _unit_array(chillers, 'capacity_tons') * load
+        supply_temp = _unit_array(chillers, 'supply_temp_setpoint') + (1 - load) * 4
+        
+        return {
+            'power_kw': np.where(operating, cooling_load_tons * 3.517 / cop, 0.0),
+            'cop': np.where(operating, cop, 0.0),
+            'supply_temp': np.where(operating, supply_temp, 70.0),
+            'return_temp': np.where(operating, supply_temp + 12, 70.0),
+            'flow_gpm': np.where(operating, 2.4 * cooling_load_tons, 0.0),
+            'operating': operating,
+            'load_ratio': load
+        }
 
 
 @dataclass
@@ -153,6 +216,55 @@ class AHUModel(Equipment):
             'outside_air_ratio': outside_air_ratio,
             'operating': True
         }
+        
+    @classmethod
+    def calculate_performance_batch(cls, ahus: Sequence['AHUModel'],
+                                    airflow_ratios: ArrayLike,
+                                    outdoor_temps: ArrayLike,
+                                    return_temps: ArrayLike = 72.0) -> Dict[str, np.ndarray]:
+        """Calculate performance of many AHUs over many timesteps.
+        
+        Array version of calculate_performance. AHUs below minimum airflow
+        report zero power, fan speed and airflow with supply and mixed air
+        at the return temperature.
+        
+        Args:
+            ahus: AHUs, one per column
+            airflow_ratios: Airflow ratios, shape (timesteps, ahus) or (ahus,)
+            outdoor_temps: Outdoor temperatures, per timestep or per element
+            return_temps: Return air temperatures, per timestep or per element
+            
+        Returns:
+            Dictionary of arrays shaped like airflow_ratios
+        """
+        airflow = np.asarray(airflow_ratios, dtype=float)
+        outdoor = _per_timestep(outdoor_temps, airflow)
+        return_temp = _per_timestep(return_temps, airflow)
+        
+        operating = airflow >= 0.2
+        
+        # Fan power curve (VFD), HP to kW
+        fan_power_ratio = airflow ** 2.5
+        fan_hp = _unit_array(ahus, 'supply_fan_hp') + _unit_array(ahus, 'return_fan_hp')
+        total_power = fan_hp * 0.746 * fan_power_ratio
+        
+        # Mixed air temperature (simplified economizer logic)
+        economizer = (outdoor >= 55) & (outdoor <= 65)
+        outside_air_ratio = np.where(economizer, np.clip((65 - outdoor) / 20, 0.15, 0.3), 0.15)
+        mixed_temp = return_temp * (1 - outside_air_ratio) + outdoor * outside_air_ratio
+        
+        supply_temp = np.broadcast_to(_unit_array(ahus, 'supply_temp_setpoint'), airflow.shape)
+        
+        return {
+            'supply_temp': np.where(operating, supply_temp, return_temp),
+            'mixed_temp': np.where(operating, mixed_temp, return_temp),
+            'return_temp': return_temp,
+            'supply_fan_speed': np.where(operating, airflow * 100, 0.0),
+            'power_kw': np.where(operating, total_power, 0.0),
+            'airflow_cfm': np.where(operating, _unit_array(ahus, 'max_airflow_cfm') * airflow, 0.0),
+            'outside_air_ratio': outside_air_ratio,
+            'operating': operating
+        }
 
 
 @dataclass
@@ -215,6 +327,51 @@ class VAVModel(Equipment):
             'occupied': occupied,
             'flow_ratio': airflow_cfm / self.max_airflow_cfm
         }
+        
+    @classmethod
+    def calculate_performance_batch(cls, vavs: Sequence['VAVModel'],
+                                    zone_temps: ArrayLike,
+                                    supply_temps: ArrayLike = 55.0,
+                                    occupied: Union[bool, Sequence[bool], np.ndarray] = True) -> Dict[str, np.ndarray]:
+        """Calculate performance of many VAV boxes over many timesteps.
+        
+        Array version of calculate_performance.
+        
+        Args:
+            vavs: VAV boxes, one per column
+            zone_temps: Zone temperatures, shape (timesteps, vavs) or (vavs,)
+            supply_temps: Supply air temperatures, per timestep or per element
+            occupied: Occupancy, per timestep or per element
+            
+        Returns:
+            Dictionary of arrays shaped like zone_temps
+        """
+        zone_temp = np.asarray(zone_temps, dtype=float)
+        supply_temp = _per_timestep(supply_temps, zone_temp)
+        occupied = _per_timestep(occupied, zone_temp).astype(bool)
+        
+        setpoint = np.broadcast_to(_unit_array(vavs, 'zone_temp_setpoint'), zone_temp.shape)
+        min_ratio = _unit_array(vavs, 'min_airflow_ratio')
+        max_airflow = _unit_array(vavs, 'max_airflow_cfm')
+        
+        # PI control logic (simplified): deadband, then 4°F for full range
+        temp_error = zone_temp - setpoint
+        flow_demand = np.where(np.abs(temp_error) < 1.0, 0.5, 0.5 + temp_error / 4.0)
+        flow_demand = np.clip(flow_demand, min_ratio, 1.0)
+        
+        # Unoccupied - minimum airflow
+        flow_ratio = np.where(occupied, flow_demand, min_ratio)
+        
+        return {
+            'zone_temp': zone_temp,
+            'zone_temp_sp': setpoint,
+            'airflow_cfm': max_airflow * flow_ratio,
+            'damper_position': flow_ratio * 100,
+            'supply_temp': supply_temp,
+            'heating_valve_position': np.zeros_like(zone_temp),  # Cooling only VAV
+            'occupied': occupied,
+            'flow_ratio': flow_ratio
+        }
 
 
 @dataclass
@@ -278,6 +435,65 @@ class UtilityMeter(Equipment):
             }
             
         return {}
+        
+    # Fixed (pressure psig, temperature °F) for flow meters
+    FLOW_METER_CONDITIONS = {
+        'gas': (5.0, 70.0),
+        'water': (65.0, 55.0)
+    }
+    
+    @classmethod
+    def calculate_consumption_batch(cls, meters: Sequence['UtilityMeter'],
+                                    load_kw: Optional[ArrayLike] = None,
+                                    flow_rate: Optional[ArrayLike] = None,
+                                    interval_minutes: int = 15) -> Dict[str, np.ndarray]:
+        """Calculate consumption of many meters of one type over many timesteps.
+        
+        Array version of calculate_consumption.
+        
+        Args:
+            meters: Meters, one per column, all of the same meter_type
+            load_kw: Loads in kW (electric), shape (timesteps, meters) or (meters,)
+            flow_rate: Flow rates (gas/water), shape (timesteps, meters) or (meters,)
+            interval_minutes: Integration interval
+            
+        Returns:
+            Dictionary of arrays shaped like the input
+            
+        Raises:
+            ValueError: If meters of different types are mixed
+        """
+        meter_types = {meter.meter_type for meter in meters}
+        if len(meter_types) != 1:
+            raise ValueError(f"Batch meters must share one meter_type, got {sorted(meter_types)}")
+        meter_type = meter_types.pop()
+        hours = interval_minutes / 60.0
+        
+        if meter_type == "electric":
+            power = np.nan_to_num(np.asarray(load_kw if load_kw is not None else 0.0, dtype=float))
+            power = np.broadcast_to(power, np.broadcast_shapes(power.shape, (len(meters),)))
+            
+            return {
+                'power': power,
+                'energy': power * hours,
+                'voltage': 480 + (power / 1000) * 2,
+                'current': np.where(power > 0, power * 1000 / (480 * 1.732), 0.0),
+                'power_factor': np.where(power > 50, 0.95, 1.0)
+            }
+            
+        if meter_type in cls.FLOW_METER_CONDITIONS:
+            flow = np.nan_to_num(np.asarray(flow_rate if flow_rate is not None else 0.0, dtype=float))
+            flow = np.broadcast_to(flow, np.broadcast_shapes(flow.shape, (len(meters),)))
+            pressure, temperature = cls.FLOW_METER_CONDITIONS[meter_type]
+            
+            return {
+                'flow': flow,
+                'volume': flow * hours,
+                'pressure': np.full(flow.shape, pressure),
+                'temperature': np.full(flow.shape, temperature)
+            }
+            
+        return {}
 
 
 @dataclass
@@ -334,6 +550,32 @@ class HVACSystem:
         
         return total_load
         
+    def calculate_cooling_load_batch(self, zone_temps: ArrayLike,
+                                     outdoor_temps: ArrayLike) -> np.ndarray:
+        """Calculate cooling load ratio for many timesteps at once.
+        
+        Array version of calculate_cooling_load.
+        
+        Args:
+            zone_temps: Zone temperatures, shape (timesteps, zones)
+            outdoor_temps: Outdoor temperature per timestep
+            
+        Returns:
+            Cooling load ratio (0-1) per timestep
+        """
+        zone_temps = np.atleast_2d(np.asarray(zone_temps, dtype=float))
+        outdoor = np.asarray(outdoor_temps, dtype=float)
+        
+        if zone_temps.shape[1] == 0:
+            return np.zeros(np.broadcast_shapes(outdoor.shape, (zone_temps.shape[0],)))
+            
+        setpoint = 72.0
+        avg_deviation = np.maximum(0, zone_temps - setpoint).mean(axis=1)
+        zone_load = np.minimum(1.0, avg_deviation / 4.0)
+        outdoor_load = np.maximum(0, (outdoor - 70) / 25)
+        
+        return np.minimum(1.0, zone_load * 0.7 + outdoor_load * 0.3)
+        
     def get_total_power_consumption(self) -> float:
         """Get total electrical power consumption of HVAC system.
         
@@ -3,11 +3,13 @@
 import logging
 import math
 import random
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Sequence, Iterable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -364,4 +366,277 @@ class SensorNetwork:
             
             # Schedule automatic recovery
             recovery_time = datetime.now() + timedelta(hours=duration_hours)
-            self.maintenance_schedule[sensor_id] = recovery_time
\ No newline at end of file
+            self.maintenance_schedule[sensor_id] = recovery_time
+            
+    def to_bank(self, seed: Optional[int] = None) -> 'SensorBank':
+        """Build a vectorized SensorBank from the sensors in this network.
+        
+        Args:
+            seed: Random seed for the bank
+            
+        Returns:
+            SensorBank holding the same sensors and state
+        """
+        return SensorBank.from_sensors(self.sensors.values(), seed=seed)
+
+
+class SensorBank:
+    """Struct-of-arrays model of many sensors.
+    
+    Applies the same effects as SensorModel.read_value (lag, drift, accuracy
+    error, noise, quantization, clamping, status and failure modes) to a
+    whole vector of true values at once, or to a (timesteps x sensors)
+    block.
+    """
+    
+    FAILURE_MODES = ('stuck', 'noisy', 'offset', 'communication')
+    STATUS_NAMES = np.array(['ok', 'stale', 'fault'])
+    OK, STALE, FAULT = 0, 1, 2
+    
+    def __init__(self, sensor_ids: Sequence[str],
+                 characteristics: Sequence[SensorCharacteristics],
+                 calibration_time: Optional[datetime] = None,
+                 seed: Optional[int] = None):
+        """Initialize sensor bank.
+        
+        Args:
+            sensor_ids: Unique identifiers, one per sensor
+            characteristics: Physical characteristics, one per sensor
+            calibration_time: Initial calibration time for all sensors
+            seed: Random seed for reproducible noise
+        """
+        if len(sensor_ids) != len(characteristics):
+            raise ValueError("sensor_ids and characteristics must have the same length")
+            
+        self.sensor_ids = list(sensor_ids)
+        self.index = {sensor_id: i for i, sensor_id in enumerate(self.sensor_ids)}
+        self.random = np.random.RandomState(seed)
+        
+        # Characteristics
+        self.accuracy = np.array([c.accuracy_percent for c in characteristics], dtype=float) / 100
+        self.resolution = np.array([c.resolution for c in characteristics], dtype=float)
+        self.tau = np.array([c.response_time_seconds for c in characteristics], dtype=float)
+        self.drift_rate = np.array([c.drift_rate_per_day for c in characteristics], dtype=float)
+        self.noise_stddev = np.array([c.noise_stddev for c in characteristics], dtype=float)
+        self.min_value = np.array([c.min_value for c in characteristics], dtype=float)
+        self.max_value = np.array([c.max_value for c in characteristics], dtype=float)
+        
+        # State (times are seconds since self.epoch; NaN means no reading yet)
+        self.epoch = np.datetime64(calibration_time or datetime.now(), 'us')
+        n = len(self.sensor_ids)
+        self.last_calibration = np.zeros(n)
+        self.last_value = np.full(n, np.nan)
+        self.last_timestamp = np.full(n, np.nan)
+        self.failure_mode = np.zeros(n, dtype=np.int8)  # 0 = healthy
+        
+    @classmethod
+    def from_sensors(cls, sensors: Iterable[SensorModel], seed: Optional[int] = None) -> 'SensorBank':
+        """Build a bank from individual sensor models, copying their state.
+        
+        Args:
+            sensors: SensorModel instances
+            seed: Random seed for the bank
+            
+        Returns:
+            SensorBank
+        """
+        sensors = list(sensors)
+        bank = cls([s.sensor_id for s in sensors], [s.char for s in sensors], seed=seed)
+        
+        for i, sensor in enumerate(sensors):
+            bank.last_calibration[i] = bank._seconds([sensor.last_calibration])[0]
+            if sensor.last_value is not None and sensor.last_timestamp is not None:
+                bank.last_value[i] = sensor.last_value
+                bank.last_timestamp[i] = bank._seconds([sensor.last_timestamp])[0]
+            if sensor.failure_mode in cls.FAILURE_MODES:
+                bank.failure_mode[i] = cls.FAILURE_MODES.index(sensor.failure_mode) + 1
+                
+        return bank
+        
+    def __len__(self) -> int:
+        return len(self.sensor_ids)
+        
+    def _seconds(self, timestamps) -> np.ndarray:
+        """Convert timestamps to float seconds since the bank epoch."""
+        ts = np.asarray(timestamps, dtype='datetime64[us]')
+        return (ts - self.epoch) / np.timedelta64(1, 's')
+        
+    def _indices(self, sensor_ids: Optional[Iterable[str]]) -> np.ndarray:
+        """Resolve sensor IDs to positions (all sensors if None)."""
+        if sensor_ids is None:
+            return np.arange(len(self.sensor_ids))
+        return np.array([self.index[s] for s in sensor_ids], dtype=int)
+        
+    def failure_mask(self, failure_mode: Optional[str] = None) -> np.ndarray:
+        """Boolean mask of failed sensors.
+        
+        Args:
+            failure_mode: Specific failure mode, or None for any failure
+            
+        Returns:
+            Boolean array, one entry per sensor
+        """
+        if failure_mode is None:
+            return self.failure_mode > 0
+        return self.failure_mode == self.FAILURE_MODES.index(failure_mode) + 1
+        
+    def read(self, true_values: np.ndarray, timestamp: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Read all sensors for one timestep.
+        
+        Args:
+            true_values: Actual physical values, one per sensor
+            timestamp: Current timestamp
+            
+        Returns:
+            Tuple of (readings, status codes) arrays
+        """
+        readings, status = self.read_block(np.asarray(true_values, dtype=float)[np.newaxis, :], [timestamp])
+        return readings[0], status[0]
+        
+    def read_block(self, true_values: np.ndarray,
+                   timestamps: Sequence[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """Read all sensors over a block of timesteps.
+        
+        Random draws for the whole block are made up front; only the
+        first-order lag, which depends on the previous reading, is stepped
+        through time, and each step is vectorized across sensors.
+        
+        Args:
+            true_values: Array of shape (timesteps, sensors)
+            timestamps: One timestamp per row of true_values
+            
+        Returns:
+            Tuple of (readings, status codes) arrays of shape (timesteps, sensors)
+        """
+        true_values = np.asarray(true_values, dtype=float)
+        steps, n = true_values.shape
+        if n != len(self.sensor_ids):
+            raise ValueError(f"Expected {len(self.sensor_ids)} sensors, got {n}")
+        if len(timestamps) != steps:
+            raise ValueError(f"Expected {steps} timestamps, got {len(timestamps)}")
+            
+        times = self._seconds(timestamps)
+        
+        # Pre-draw all randomness for the block
+        accuracy_draw = self.random.uniform(-1, 1, size=(steps, n))
+        noise_draw = self.random.standard_normal(size=(steps, n))
+        comm_draw = self.random.random_sample(size=(steps, n))
+        
+        # Drift in percent, per timestep and sensor
+        drift = self.drift_rate * (times[:, np.newaxis] - self.last_calibration) / 86400
+        
+        failed = self.failure_mode > 0
+        healthy = ~failed
+        safe_tau = np.where(self.tau > 0, self.tau, 1.0)
+        safe_resolution = np.where(self.resolution > 0, self.resolution, 1.0)
+        
+        readings = np.empty((steps, n))
+        status = np.empty((steps, n), dtype=np.int8)
+        
+        for t in range(steps):
+            true_t = true_values[t]
+            
+            # Apply sensor lag (first-order response)
+            has_last = ~np.isnan(self.last_value)
+            dt = np.maximum(times[t] - np.where(has_last, self.last_timestamp, times[t]), 0.0)
+            alpha = np.where(self.tau > 0, 1 - np.exp(-dt / safe_tau), 1.0)
+            lagged = np.where(has_last, self.last_value + alpha * (true_t - self.last_value), true_t)
+            
+            # Drift, accuracy error and noise
+            drifted = lagged * (1 + drift[t] / 100)
+            reading = (drifted
+                       + self.accuracy * drifted * accuracy_draw[t]
+                       + self.noise_stddev * noise_draw[t])
+            
+            # Resolution quantization and physical limits
+            reading = np.where(self.resolution > 0,
+                               np.round(reading / safe_resolution) * safe_resolution,
+                               reading)
+            reading = np.clip(reading, self.min_value, self.max_value)
+            
+            code = np.full(n, self.OK, dtype=np.int8)
+            code[comm_draw[t] < 0.01] = self.STALE
+            code[(reading <= self.min_value) | (reading >= self.max_value)] = self.FAULT
+            code[np.abs(drift[t]) > 2.0] = self.STALE
+            
+            if failed.any():
+                reading, code = self._apply_failures(reading, code, true_t, noise_draw[t])
+                
+            readings[t] = reading
+            status[t] = code
+            
+            # Failed sensors keep their previous state
+            self.last_value = np.where(healthy, reading, self.last_value)
+            self.last_timestamp = np.where(healthy, times[t], self.last_timestamp)
+            
+        return readings, status
+        
+    def _apply_failures(self, reading: np.ndarray, code: np.ndarray, true_values: np.ndarray,
+                        noise_draw: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Overwrite readings and status of failed sensors.
+        
+        Args:
+            reading: Healthy readings for this timestep
+            code: Healthy status codes for this timestep
+            true_values: True physical values
+            noise_draw: Standard normal draws for this timestep
+            
+        Returns:
+            Tuple of (readings, status codes)
+        """
+        last = np.nan_to_num(self.last_value, nan=0.0)
+        
+        stuck = self.failure_mask('stuck')
+        noisy = self.failure_mask('noisy')
+        offset = self.failure_mask('offset')
+        communication = self.failure_mask('communication')
+        
+        reading = np.where(stuck | communication, last, reading)
+        reading = np.where(noisy, true_values + noise_draw * self.noise_stddev * 10, reading)
+        reading = np.where(offset, true_values + self.max_value * 0.1, reading)
+        
+        code = np.where(self.failure_mask(), self.FAULT, code).astype(np.int8)
+        code[communication] = self.STALE
+        
+        return reading, code
+        
+    def status_names(self, codes: np.ndarray) -> np.ndarray:
+        """Map status codes to status strings ('ok', 'stale', 'fault').
+        
+        Args:
+            codes: Status codes from read or read_block
+            
+        Returns:
+            Array of status strings
+        """
+        return self.STATUS_NAMES[codes]
+        
+    def calibrate(self, timestamp: datetime, sensor_ids: Optional[Iterable[str]] = None):
+        """Calibrate sensors (reset drift).
+        
+        Args:
+            timestamp: Calibration timestamp
+            sensor_ids: Sensors to calibrate, or None for all
+        """
+        self.last_calibration[self._indices(sensor_ids)] = self._seconds([timestamp])[0]
+        
+    def induce_failure(self, failure_mode: str, sensor_ids: Optional[Iterable[str]] = None):
+        """Induce a failure mode for testing.
+        
+        Args:
+            failure_mode: Type of failure ('stuck', 'noisy', 'offset', 'communication')
+            sensor_ids: Sensors to fail, or None for all
+        """
+        if failure_mode not in self.FAILURE_MODES:
+            raise ValueError(f"Unknown failure mode: {failure_mode}")
+        idx = self._indices(sensor_ids)
+        self.failure_mode[idx] = self.FAILURE_MODES.index(failure_mode) + 1
+        logger.warning(f"{len(idx)} sensors failure induced: {failure_mode}")
+        
+    def clear_failure(self, sensor_ids: Optional[Iterable[str]] = None):
+        """Clear failure mode.
+        
+        Args:
+            sensor_ids: Sensors to clear, or None for all
+        """
+        self.failure_mode[self._indices(sensor_ids)] = 0
@@ -2,26 +2,247 @@
 
 Logs domain-level events (generation, errors, config changes) to the activity_log
 table in the state database for monitoring and debugging.
+
+Events are queued in memory and written by a background thread in multi-row
+inserts, so logging never blocks the generation tick on a database round
+trip. Running rollups (points generated, error counts, generation rate) are
+kept alongside the queue so status and metrics endpoints do not have to
+aggregate the log table.
 """
 
 import logging
+import queue
+import threading
+import time
+from collections import deque
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
 
+from psycopg2.extras import execute_values
+
 logger = logging.getLogger(__name__)
 
+# Windows used by the status/metrics rollups
+RATE_WINDOW_SECONDS = 600
+ERROR_WINDOW_SECONDS = 24 * 3600
+
+
+class ActivityRollups:
+    """Running aggregates over logged events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.points_generated_total = 0
+        self.last_entity_count = 0
+        self.event_counts: Dict[str, int] = {}
+        self._generations = deque()  # (epoch seconds, point_count) within RATE_WINDOW_SECONDS
+        self._errors = deque()       # epoch seconds within ERROR_WINDOW_SECONDS
+
+    def seed(self, event_counts: Dict[str, int], points_total: int, entity_count: int,
+             recent_generations: List[tuple], recent_errors: List[float]):
+        """Initialize from the persisted log (called once at startup)."""
+        with self._lock:
+            self.event_counts = dict(event_counts)
+            self.points_generated_total = points_total
+            self.last_entity_count = entity_count
+            self._generations = deque(sorted(recent_generations))
+            self._errors = deque(sorted(recent_errors))
+
+    def add(self, epoch: float, event_type: str, details: Optional[Dict[str, Any]]):
+        """Fold one event into the rollups."""
+        with self._lock:
+            # Prune here too, so the windows stay bounded when nobody reads snapshots
+            self._prune(epoch)
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+            if event_type == 'generation' and details:
+                points = int(details.get('point_count') or 0)
+                self.points_generated_total += points
+                self.last_entity_count = int(details.get('entity_count') or self.last_entity_count)
+                self._generations.append((epoch, points))
+            elif event_type == 'error':
+                self._errors.append(epoch)
+
+    def errors_since(self, epoch: float) -> int:
+        """Errors logged at or after an epoch within the 24-hour window."""
+        with self._lock:
+            self._prune(time.time())
+            return sum(1 for error_epoch in self._errors if error_epoch >= epoch)
+
+    def _prune(self, now: float):
+        """Drop window entries older than their window at ``now`` (caller holds the lock)."""
+        while self._generations and self._generations[0][0] < now - RATE_WINDOW_SECONDS:
+            self._generations.popleft()
+        while self._errors and self._errors[0] < now - ERROR_WINDOW_SECONDS:
+            self._errors.popleft()
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Current rollup values.
+
+        Args:
+            now: Epoch seconds to evaluate windows at (defaults to now)
+
+        Returns:
+            Dictionary with totals, generation rate (points/min over the last
+            10 minutes, None without two generations) and 24h error count
+        """
+        now = now or time.time()
+        with self._lock:
+            self._prune(now)
+
+            rate = None
+            if len(self._generations) > 1:
+                minutes = (self._generations[-1][0] - self._generations[0][0]) / 60
+                if minutes > 0:
+                    rate = sum(points for _, points in self._generations) / minutes
+
+            return {
+                'points_generated_total': self.points_generated_total,
+                'entity_count': self.last_entity_count,
+                'generation_rate_per_min': rate,
+                'error_count_24h': len(self._errors),
+                'event_counts': dict(self.event_counts)
+            }
+
 
 class ActivityLogger:
     """Logs simulator activity events to database."""
 
-    def __init__(self, state_db):
+    def __init__(self, state_db, batch_size: int = 100, flush_interval: float = 2.0,
+                 max_queue: int = 10000):
         """Initialize activity logger.
 
         Args:
             state_db: DatabaseConnection instance for state database
+            batch_size: Events per multi-row insert (also triggers an early flush)
+            flush_interval: Maximum seconds an event waits in the queue
+            max_queue: Queue bound; events beyond it are dropped and counted. Events
+                of failed inserts are retried on the next flush, up to the same bound
         """
         self.state_db = state_db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped_events = 0
+        self.rollups = ActivityRollups()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._retry = deque()  # rows of failed inserts, written first on the next flush
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+
+        self._load_rollups()
+
+        self._writer = threading.Thread(target=self._run_writer, name='activity-logger', daemon=True)
+        self._writer.start()
+
+    def _load_rollups(self):
+        """Seed rollups from the persisted log with one pass at startup."""
+        query = """
+            SELECT event_type,
+                   COUNT(*) AS count,
+                   COALESCE(SUM((details->>'point_count')::bigint)
+                            FILTER (WHERE event_type = 'generation'), 0) AS points
+            FROM core.simulator_activity_log
+            GROUP BY event_type
+        """
+        recent_query = """
+            SELECT event_type, EXTRACT(EPOCH FROM timestamp) AS epoch,
+                   details->>'point_count' AS point_count,
+                   details->>'entity_count' AS entity_count
+            FROM core.simulator_activity_log
+            WHERE timestamp >= NOW() - INTERVAL '24 hours'
+            AND event_type IN ('generation', 'error')
+            ORDER BY timestamp
+        """
+        try:
+            counts = self.state_db.execute_query(query)
+            recent = self.state_db.execute_query(recent_query)
+
+            cutoff = time.time() - RATE_WINDOW_SECONDS
+            generations = [
+                (float(r['epoch']), int(r['point_count'] or 0)) for r in recent
+                if r['event_type'] == 'generation' and float(r['epoch']) >= cutoff
+            ]
+            entity_counts = [r['entity_count'] for r in recent if r['event_type'] == 'generation' and r['entity_count']]
+
+            self.rollups.seed(
+                event_counts={r['event_type']: r['count'] for r in counts},
+                points_total=sum(int(r['points']) for r in counts),
+                entity_count=int(entity_counts[-1]) if entity_counts else 0,
+                recent_generations=generations,
+                recent_errors=[float(r['epoch']) for r in recent if r['event_type'] == 'error']
+            )
+        except Exception as e:
+            logger.error(f"Failed to load activity rollups: {e}")
+
+    def _run_writer(self):
+        """Background loop: flush on a full batch or when the interval elapses."""
+        while not self._closed.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            while self._queue.qsize() < self.batch_size and not self._closed.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._closed.wait(min(remaining, 0.05))
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all queued events.
+
+        Returns:
+            Number of events written
+        """
+        with self._flush_lock:
+            written = 0
+            while True:
+                rows = []
+                while self._retry and len(rows) < self.batch_size:
+                    rows.append(self._retry.popleft())
+                while len(rows) < self.batch_size:
+                    try:
+                        rows.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not rows:
+                    return written
+                try:
+                    with self.state_db.get_connection() as conn:
+                        with conn.cursor() as cur:
+                            execute_values(
+                                cur,
+                                """
+                                INSERT INTO core.simulator_activity_log
+                                (timestamp, event_type, message, details)
+                                VALUES %s
+                                """,
+                                rows,
+                                page_size=len(rows)
+                            )
+                    written += len(rows)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(rows)} activity events, retrying on next flush: {e}")
+                    self._keep_for_retry(rows)
+                    return written
+
+    def _keep_for_retry(self, rows: List[tuple]):
+        """Put rows of a failed insert back in front, dropping the oldest beyond max_queue."""
+        self._retry.extendleft(reversed(rows))
+        while len(self._retry) > self.max_queue:
+            self._retry.popleft()
+            self.dropped_events += 1
+
+    def close(self):
+        """Stop the background writer and flush remaining events."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._writer.join(timeout=10)
+        self.flush()
+        if self._retry:
+            logger.warning(f"Activity logger closed with {len(self._retry)} unwritten events")
+        if self.dropped_events:
+            logger.warning(f"Activity logger dropped {self.dropped_events} events (queue full)")
 
     def log_event(
         self,
@@ -39,26 +260,22 @@ class ActivityLogger:
             timestamp: Event timestamp (defaults to now)
 
         Returns:
-            True if logged successfully, False otherwise
+            True if queued successfully, False otherwise
         """
         try:
-            query = """
-                INSERT INTO core.simulator_activity_log
-                (timestamp, event_type, message, details)
-                VALUES (%s, %s, %s, %s)
-            """
-
             ts = timestamp or datetime.now()
             details_json = json.dumps(details) if details else None
 
-            self.state_db.execute_update(
-                query,
-                (ts, event_type, message, details_json)
-            )
+            self._queue.put_nowait((ts, event_type, message, details_json))
+            self.rollups.add(ts.timestamp(), event_type, details)
 
             logger.debug(f"Logged activity: {event_type} - {message}")
             return True
 
+        except queue.Full:
+            self.dropped_events += 1
+            logger.warning(f"Activity queue full, dropped {event_type} event")
+            return False
         except Exception as e:
             logger.error(f"Failed to log activity event: {e}")
             return False
@@ -184,6 +401,9 @@ class ActivityLogger:
         Returns:
             List of activity log records
         """
+        # Make queued events visible to the query
+        self.flush()
+
         try:
             # Build query with filters
             query = "SELECT * FROM core.simulator_activity_log WHERE 1=1"
@@ -245,6 +465,11 @@ class ActivityLogger:
         Returns:
             Number of error events
         """
+        if since and since.timestamp() >= time.time() - ERROR_WINDOW_SECONDS:
+            # Served from the in-memory window, which covers the last 24 hours
+            return self.rollups.errors_since(since.timestamp())
+
+        self.flush()
         try:
             query = "SELECT COUNT(*) as count FROM core.simulator_activity_log WHERE event_type = 'error'"
             params = []
@@ -0,0 +1,368 @@
+"""API output sink for load-generating against the platform API.
+
+Posts generated data points to the API's /bulk/value endpoint the way real
+pollers do, instead of writing straight to TimescaleDB, and records the
+latency and throughput achieved so the simulator doubles as an ingest
+benchmark harness.
+"""
+
+import gzip
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from generators.time_series import TimeSeriesGenerator
+from generators.weather import WeatherSimulator
+from generators.schedules import ScheduleGenerator
+
+logger = logging.getLogger(__name__)
+
+# Value columns accepted by the API's ValueBase schema
+VALUE_FIELDS = ('value_n', 'value_b', 'value_s', 'value_ts', 'value_dict')
+
+
+class LoadStats:
+    """Thread-safe recorder of request latency and throughput."""
+
+    def __init__(self, window: int = 100000):
+        """Initialize stats.
+
+        Args:
+            window: Number of most recent request latencies kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes_sent = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, latency_seconds: float, rows: int, body_bytes: int, ok: bool):
+        """Record one request.
+
+        Args:
+            latency_seconds: Request round-trip time
+            rows: Data points in the request
+            body_bytes: Request body size on the wire
+            ok: Whether the API accepted the request
+        """
+        now = time.perf_counter()
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = now - latency_seconds
+            self.finished_at = now
+            self.latencies.append(latency_seconds)
+            self.requests += 1
+            self.bytes_sent += body_bytes
+            if ok:
+                self.rows += rows
+            else:
+                self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize recorded requests.
+
+        Returns:
+            Dictionary with counts, throughput and latency percentiles (ms)
+        """
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            elapsed = (self.finished_at - self.started_at) if self.started_at else 0.0
+            requests_total, errors, rows, bytes_sent = self.requests, self.errors, self.rows, self.bytes_sent
+
+        summary = {
+            'requests': requests_total,
+            'errors': errors,
+            'rows': rows,
+            'bytes_sent': bytes_sent,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+            'requests_per_second': round(requests_total / elapsed, 2) if elapsed > 0 else 0.0,
+            'latency_ms': {}
+        }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            summary['latency_ms'] = {
+                'p50': round(float(p50), 2),
+                'p95': round(float(p95), 2),
+                'p99': round(float(p99), 2),
+                'mean': round(float(latencies.mean()), 2),
+                'max': round(float(latencies.max()), 2)
+            }
+        return summary
+
+
+class ApiValueSink:
+    """Writes data points to the platform API's /bulk/value endpoint.
+
+    Exposes the same insert_time_series_batch/update_current_values
+    interface as DataLoader so it can stand in for it.
+    """
+
+    def __init__(self, api_url: str, api_key: str, org_id: int,
+                 batch_size: int = 1000, concurrency: int = 4,
+                 gzip_body: bool = False, timeout: float = 30.0):
+        """Initialize API sink.
+
+        Args:
+            api_url: Base URL of the platform API
+            api_key: Bearer token sent in the Authorization header
+            org_id: Organization the values belong to
+            batch_size: Data points per /bulk/value request
+            concurrency: Requests in flight at once
+            gzip_body: Send gzip-compressed request bodies
+            timeout: Request timeout in seconds
+        """
+        self.url = f"{api_url.rstrip('/')}/bulk/value"
+        self.org_id = org_id
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.gzip_body = gzip_body
+        self.timeout = timeout
+        self.stats = LoadStats()
+
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+        if gzip_body:
+            self.headers['Content-Encoding'] = 'gzip'
+
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='api-sink')
+
+    @classmethod
+    def from_env(cls, org_id: int, **overrides) -> 'ApiValueSink':
+        """Create a sink configured from environment variables.
+
+        Uses API_URL and API_KEY, plus optional API_SINK_BATCH_SIZE,
+        API_SINK_CONCURRENCY and API_SINK_GZIP. Keyword arguments take
+        precedence over the environment.
+
+        Args:
+            org_id: Organization the values belong to
+            overrides: Constructor arguments to use instead of env values
+
+        Returns:
+            ApiValueSink
+        """
+        settings = {
+            'api_url': os.getenv('API_URL', 'http://localhost:8000'),
+            'api_key': os.getenv('API_KEY', ''),
+            'batch_size': int(os.getenv('API_SINK_BATCH_SIZE', '1000')),
+            'concurrency': int(os.getenv('API_SINK_CONCURRENCY', '4')),
+            'gzip_body': os.getenv('API_SINK_GZIP', 'false').lower() == 'true'
+        }
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(org_id=org_id, **settings)
+
+    def _session(self) -> requests.Session:
+        """Keep-alive session for the calling thread."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    @staticmethod
+    def serialize_point(point: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a generated data point to the API's value schema.
+
+        Args:
+            point: Data point with entity_id, ts and value columns
+
+        Returns:
+            JSON-serializable value dictionary
+        """
+        value = {
+            'entity_id': int(point['entity_id']),
+            'ts': point['ts'].isoformat()
+        }
+        for field in VALUE_FIELDS:
+            field_value = point.get(field)
+            if field_value is None or (isinstance(field_value, float) and math.isnan(field_value)):
+                continue
+            if isinstance(field_value, datetime):
+                field_value = field_value.isoformat()
+            elif isinstance(field_value, np.generic):
+                field_value = field_value.item()
+            value[field] = field_value
+        return value
+
+    def encode_batch(self, points: List[Dict[str, Any]]) -> bytes:
+        """Encode one /bulk/value request body.
+
+        Args:
+            points: Data points for the request
+
+        Returns:
+            Request body, gzip-compressed if enabled
+        """
+        body = json.dumps({
+            'org_id': self.org_id,
+            'values': [self.serialize_point(p) for p in points]
+        }).encode('utf-8')
+        return gzip.compress(body, compresslevel=5) if self.gzip_body else body
+
+    def _post(self, points: List[Dict[str, Any]]) -> bool:
+        """Post one batch and record its latency.
+
+        Args:
+            points: Data points for the request
+
+        Returns:
+            True if the API accepted the batch
+        """
+        body = self.encode_batch(points)
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self._session().post(self.url, data=body, timeout=self.timeout)
+            ok = response.ok
+            if response.status_code == 503:
+                logger.error("API primary database unavailable")
+            elif not ok:
+                logger.error(f"/bulk/value returned {response.status_code}: {response.text[:200]}")
+        except requests.RequestException as e:
+            logger.error(f"/bulk/value request failed: {e}")
+        finally:
+            self.stats.record(time.perf_counter() - start, len(points), len(body), ok)
+        return ok
+
+    def insert_time_series_batch(self, data_points: List[Dict[str, Any]]) -> bool:
+        """Post data points in batches, with up to `concurrency` in flight.
+
+        Args:
+            data_points: Data points as produced by TimeSeriesGenerator
+
+        Returns:
+            True if every batch was accepted
+        """
+        if not data_points:
+            return True
+
+        batches = [
+            data_points[i:i + self.batch_size]
+            for i in range(0, len(data_points), self.batch_size)
+        ]
+        return all(self._executor.map(self._post, batches))
+
+    def update_current_values(self, data_points: List[Dict[str, Any]]) -> bool:
+        """No-op: /bulk/value already maintains the current value table.
+
+        Args:
+            data_points: Data points already posted
+
+        Returns:
+            True
+        """
+        return True
+
+    def close(self):
+        """Wait for in-flight requests and close connections."""
+        self._executor.shutdown(wait=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+
+class ApiLoadGenerator:
+    """Replays generated building data into an ApiValueSink."""
+
+    def __init__(self, sink: ApiValueSink, building_config: Dict[str, Any],
+                 entity_map: Dict[str, int], initial_totalizers: Optional[Dict[str, Any]] = None):
+        """Initialize load generator.
+
+        Args:
+            sink: Sink to post data points to
+            building_config: Building configuration
+            entity_map: Mapping of entity names to database IDs
+            initial_totalizers: Optional totalizer values to continue from
+        """
+        self.sink = sink
+        self.building_config = building_config
+        self.interval_minutes = building_config['generation']['data_interval_minutes']
+        self.weather_sim = WeatherSimulator(building_config['weather'])
+        self.ts_gen = TimeSeriesGenerator(building_config, entity_map, initial_totalizers=initial_totalizers,
+                                          weather_sim=self.weather_sim)
+        self.schedule_gen = ScheduleGenerator(building_config)
+
+    def run(self, start_time: datetime, end_time: datetime, rate: float = 0.0,
+            should_stop=None) -> Dict[str, Any]:
+        """Generate and post every interval in a time range.
+
+        Args:
+            start_time: First interval to generate
+            end_time: Last interval to generate (inclusive)
+            rate: Simulated seconds per wall-clock second (0 = as fast as possible)
+            should_stop: Optional callable returning True to stop early
+
+        Returns:
+            Load statistics, including how far replay fell behind the target rate
+        """
+        weather = self.weather_sim.generate_series(start_time, end_time, self.interval_minutes)
+        occupancies = self.schedule_gen.get_occupancy_ratios(weather.index)
+
+        logger.info(f"Replaying {len(weather)} intervals from {start_time} to {end_time} "
+                    f"at {'max' if rate <= 0 else f'{rate:g}x'} speed")
+
+        wall_start = time.perf_counter()
+        max_lag = 0.0
+        intervals = 0
+        failed_intervals = 0
+
+        for timestamp, outdoor_temp, season, occupancy in zip(
+            weather.index, weather['dry_bulb_temp'], weather['season'], occupancies
+        ):
+            if should_stop and should_stop():
+                logger.info("Replay stopped early")
+                break
+
+            if rate > 0:
+                target = wall_start + (timestamp - weather.index[0]).total_seconds() / rate
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+
+            points = self.ts_gen._generate_timestamp_data(
+                timestamp.to_pydatetime(), float(outdoor_temp), season, float(occupancy)
+            )
+            if not self.sink.insert_time_series_batch(points):
+                failed_intervals += 1
+            intervals += 1
+
+        summary = self.sink.stats.summary()
+        summary.update({
+            'intervals': intervals,
+            'failed_intervals': failed_intervals,
+            'points_per_interval': len(points) if intervals else 0,
+            'rate': rate,
+            'max_lag_seconds': round(max_lag, 3),
+            'batch_size': self.sink.batch_size,
+            'concurrency': self.sink.concurrency,
+            'gzip': self.sink.gzip_body
+        })
+        return summary
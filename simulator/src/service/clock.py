@@ -0,0 +1,169 @@
+"""Simulation clocks for the continuous service.
+
+The service normally runs on the wall clock. A VirtualClock lets the
+scheduler advance simulated time as fast as the write path allows, or at a
+fixed multiplier of real time, so weeks of continuous operation can be
+soak-tested in hours.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def align_to_interval(ts: datetime, interval_minutes: int) -> datetime:
+    """Round a timestamp down to the start of its interval.
+
+    Args:
+        ts: Timestamp to align
+        interval_minutes: Interval length in minutes
+
+    Returns:
+        Interval start (seconds and microseconds cleared)
+    """
+    minute_of_day = ts.hour * 60 + ts.minute
+    aligned = minute_of_day - minute_of_day % interval_minutes
+    return ts.replace(hour=aligned // 60, minute=aligned % 60, second=0, microsecond=0)
+
+
+class WallClock:
+    """Real time."""
+
+    virtual = False
+
+    def now(self) -> datetime:
+        """Current wall-clock time."""
+        return datetime.now()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get clock status information.
+
+        Returns:
+            Dictionary with clock status
+        """
+        return {'mode': 'wall'}
+
+
+class VirtualClock:
+    """Simulated time advanced explicitly by the scheduler."""
+
+    virtual = True
+
+    def __init__(self, start: Optional[datetime] = None, rate: float = 0.0,
+                 end: Optional[datetime] = None):
+        """Initialize virtual clock.
+
+        Args:
+            start: Initial simulated time (None = set later, e.g. resume point)
+            rate: Simulated seconds per wall-clock second (0 = as fast as possible)
+            end: Optional simulated time after which replay stops
+        """
+        self.rate = rate
+        self.end = end
+        self.max_lag_seconds = 0.0
+        self._lock = threading.Lock()
+        self._current: Optional[datetime] = None
+        self._anchor_virtual: Optional[datetime] = None
+        self._anchor_wall = 0.0
+        if start is not None:
+            self.set(start)
+
+    @classmethod
+    def from_env(cls) -> Optional['VirtualClock']:
+        """Create a virtual clock if SIMULATION_CLOCK=virtual.
+
+        Reads SIMULATION_START, SIMULATION_END (ISO timestamps) and
+        SIMULATION_RATE (multiplier, 0 = as fast as possible).
+
+        Returns:
+            VirtualClock, or None when running on the wall clock
+        """
+        if os.getenv('SIMULATION_CLOCK', 'wall').lower() != 'virtual':
+            return None
+
+        start = os.getenv('SIMULATION_START')
+        end = os.getenv('SIMULATION_END')
+        return cls(
+            start=datetime.fromisoformat(start) if start else None,
+            rate=float(os.getenv('SIMULATION_RATE', '0')),
+            end=datetime.fromisoformat(end) if end else None
+        )
+
+    @property
+    def started(self) -> bool:
+        """Whether the simulated time has been set."""
+        return self._current is not None
+
+    def set(self, ts: datetime):
+        """Jump to a simulated time and restart pacing from there.
+
+        Args:
+            ts: New simulated time
+        """
+        with self._lock:
+            self._current = ts
+            self._anchor_virtual = ts
+            self._anchor_wall = time.monotonic()
+        logger.info(f"Virtual clock set to {ts}")
+
+    def now(self) -> datetime:
+        """Current simulated time."""
+        if self._current is None:
+            raise RuntimeError("Virtual clock has not been started")
+        return self._current
+
+    def finished(self) -> bool:
+        """Whether simulated time has passed the configured end."""
+        return self.end is not None and self._current is not None and self._current > self.end
+
+    def advance(self, delta: timedelta, stop_event: Optional[threading.Event] = None) -> bool:
+        """Advance simulated time, pacing to the configured rate.
+
+        Args:
+            delta: Simulated time to advance by
+            stop_event: Optional event that interrupts pacing waits
+
+        Returns:
+            False if interrupted by stop_event, True otherwise
+        """
+        with self._lock:
+            target = self._current + delta
+            if self.rate > 0:
+                wall_target = self._anchor_wall + (target - self._anchor_virtual).total_seconds() / self.rate
+                delay = wall_target - time.monotonic()
+            else:
+                delay = 0.0
+
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+        elif self.rate > 0:
+            self.max_lag_seconds = max(self.max_lag_seconds, -delay)
+
+        with self._lock:
+            self._current = target
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get clock status information.
+
+        Returns:
+            Dictionary with clock status
+        """
+        status = {
+            'mode': 'virtual',
+            'rate': self.rate,
+            'simulated_time': self._current.isoformat() if self._current else None,
+            'max_lag_seconds': round(self.max_lag_seconds, 3)
+        }
+        if self.end:
+            status['end_time'] = self.end.isoformat()
+        return status
@@ -6,6 +6,7 @@ with lifecycle management and error handling.
 
 import logging
 import signal
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
@@ -18,6 +19,8 @@ from generators.weather import WeatherSimulator
 from generators.schedules import ScheduleGenerator
 from service.state_manager import StateManager
 from service.gap_filler import GapFiller
+from service.clock import WallClock, align_to_interval
+from service.metrics import TICK_PHASE_SECONDS, TICKS_TOTAL, ROWS_WRITTEN
 from service.haystack_defs_importer import import_haystack_definitions
 
 logger = logging.getLogger(__name__)
@@ -27,7 +30,7 @@ class ContinuousDataService:
     """Manages continuous data generation service lifecycle."""
 
     def __init__(self, db_config: Dict[str, Any], building_config: Dict[str, Any],
-                 value_table: str = 'values_demo', activity_logger=None):
+                 value_table: str = 'values_demo', activity_logger=None, clock=None):
         """Initialize continuous data service.
 
         Args:
@@ -35,11 +38,14 @@ class ContinuousDataService:
             building_config: Building configuration
             value_table: Name of the values table
             activity_logger: Optional ActivityLogger instance for event logging
+            clock: Optional VirtualClock for accelerated replay (defaults to wall clock)
         """
         self.db_config = db_config
         self.building_config = building_config
         self.value_table = value_table
         self.activity_logger = activity_logger
+        self.clock = clock or WallClock()
+        self.interval_minutes = building_config['generation']['data_interval_minutes']
 
         # Initialize components
         self.data_db: Optional[DatabaseConnection] = None  # TimescaleDB - building data
@@ -47,6 +53,9 @@ class ContinuousDataService:
         self.state_manager: Optional[StateManager] = None
         self.entity_map: Dict[str, int] = {}
 
+        # Weather series shared by gap filling and interval generation
+        self.weather_sim = WeatherSimulator(building_config['weather'])
+
         self.running = False
         self.shutdown_requested = False
 
@@ -145,8 +154,19 @@ class ContinuousDataService:
                 self.entity_map = self._load_entity_map()
                 logger.info(f"Loaded {len(self.entity_map)} entities")
 
+            # Virtual replay resumes right after the last stored interval unless told otherwise
+            if self.clock.virtual and not self.clock.started:
+                last_ts = self.state_manager.detect_last_timestamp(self.value_table)
+                if last_ts:
+                    resume_ts = last_ts + timedelta(minutes=self.interval_minutes)
+                else:
+                    resume_ts = datetime.now()
+                self.clock.set(align_to_interval(resume_ts, self.interval_minutes))
+
             # Detect and fill any gaps
-            gap_start, gap_end, num_intervals = self.state_manager.calculate_gap(self.value_table)
+            gap_start, gap_end, num_intervals = self.state_manager.calculate_gap(
+                self.value_table, current_time=self.clock.now()
+            )
 
             if num_intervals > 0:
                 logger.info(f"Detected gap of {num_intervals} intervals - filling...")
@@ -155,7 +175,10 @@ class ContinuousDataService:
                 totalizers = self.state_manager.get_totalizer_states(self.value_table)
 
                 # Fill the gap
-                gap_filler = GapFiller(self.data_db, self.building_config, self.entity_map, self.value_table)
+                gap_filler = GapFiller(
+                    self.data_db, self.building_config, self.entity_map, self.value_table,
+                    weather_sim=self.weather_sim
+                )
                 success = gap_filler.fill_gap_incremental(
                     gap_start,
                     gap_end,
@@ -171,7 +194,7 @@ class ContinuousDataService:
             # Save startup state
             self.state_manager.save_service_state(
                 status='running',
-                config={'mode': 'continuous', 'version': '1.0'}
+                config={'mode': 'continuous', 'version': '1.0', 'clock': self.clock.get_status()}
             )
 
             self.running = True
@@ -190,15 +213,16 @@ class ContinuousDataService:
     def generate_current_interval(self) -> bool:
         """Generate data for the current 15-minute interval.
 
+        "Current" is taken from the service clock, so under a VirtualClock
+        this generates the simulated interval the scheduler has reached.
+
         Returns:
             True if successful, False otherwise
         """
+        tick_start = time.perf_counter()
         try:
-            # Get current time aligned to 15-minute interval
-            current_time = datetime.now().replace(second=0, microsecond=0)
-            aligned_time = current_time.replace(
-                minute=(current_time.minute // 15) * 15
-            )
+            # Get current time aligned to the data interval
+            aligned_time = align_to_interval(self.clock.now(), self.interval_minutes)
 
             logger.info(f"Generating data for interval: {aligned_time}")
 
@@ -210,13 +234,13 @@ class ContinuousDataService:
             ts_gen = TimeSeriesGenerator(
                 self.building_config,
                 self.entity_map,
-                initial_totalizers=totalizers
+                initial_totalizers=totalizers,
+                weather_sim=self.weather_sim
             )
-            weather_sim = WeatherSimulator(self.building_config['weather'])
             schedule_gen = ScheduleGenerator(self.building_config)
 
             # Generate weather and occupancy
-            weather = weather_sim.get_current_weather(aligned_time)
+            weather = self.weather_sim.get_current_weather(aligned_time)
             occupancy = schedule_gen.get_occupancy_ratio(aligned_time)
 
             # Generate data points
@@ -226,19 +250,25 @@ class ContinuousDataService:
                 weather['season'],
                 occupancy
             )
+            TICK_PHASE_SECONDS.observe(time.perf_counter() - tick_start, phase='generate')
 
             # Insert data
-            data_loader.insert_time_series_batch(data_points)
+            with TICK_PHASE_SECONDS.time(phase='insert'):
+                data_loader.insert_time_series_batch(data_points)
+            ROWS_WRITTEN.inc(len(data_points), target='values')
 
             # Update current values
-            data_loader.update_current_values(data_points)
+            with TICK_PHASE_SECONDS.time(phase='current_update'):
+                data_loader.update_current_values(data_points)
+            ROWS_WRITTEN.inc(len(data_points), target='current')
 
             # Save state
-            self.state_manager.save_service_state(
-                status='running',
-                last_run_ts=aligned_time,
-                totalizers=ts_gen.totalizers
-            )
+            with TICK_PHASE_SECONDS.time(phase='state_save'):
+                self.state_manager.save_service_state(
+                    status='running',
+                    last_run_ts=aligned_time,
+                    totalizers=ts_gen.totalizers
+                )
 
             # Log generation event
             if self.activity_logger:
@@ -251,10 +281,13 @@ class ContinuousDataService:
                 except Exception as e:
                     logger.warning(f"Failed to log generation event: {e}")
 
+            TICK_PHASE_SECONDS.observe(time.perf_counter() - tick_start, phase='total')
+            TICKS_TOTAL.inc(result='success')
             logger.info(f"Successfully generated {len(data_points)} data points for {aligned_time}")
             return True
 
         except Exception as e:
+            TICKS_TOTAL.inc(result='error')
             logger.error(f"Error generating interval data: {e}", exc_info=True)
             if self.state_manager:
                 self.state_manager.save_service_state(
@@ -293,6 +326,9 @@ class ContinuousDataService:
             'timestamp': datetime.now().isoformat()
         }
 
+        if self.clock.virtual:
+            status['clock'] = self.clock.get_status()
+
         if self.state_manager:
             try:
                 service_state = self.state_manager.get_service_state()
@@ -481,7 +517,8 @@ class ContinuousDataService:
         metrics = {
             'running': self.running,
             'entity_count': len(self.entity_map),
-            'value_table': self.value_table
+            'value_table': self.value_table,
+            'clock': self.clock.get_status()
         }
 
         if self.state_manager:
@@ -497,11 +534,22 @@ class ContinuousDataService:
                 logger.error(f"Failed to get state metrics: {e}")
                 metrics['metrics_error'] = str(e)
 
-        # Get count of generated points (if possible)
+        # Points written by this process, from the in-process registry
+        metrics['points_written'] = int(ROWS_WRITTEN.get(target='values') + ROWS_WRITTEN.get(target='gap_fill'))
+        tick = TICK_PHASE_SECONDS.snapshot(phase='total')
+        if tick:
+            metrics['last_interval_duration_ms'] = round(tick['last'] * 1000, 1)
+
+        metrics['db_pools'] = {
+            name: db.get_pool_stats()
+            for name, db in (('data', self.data_db), ('state', self.state_db)) if db
+        }
+
+        # Estimated table size from planner statistics (no full-table scan)
         if self.data_db:
             try:
-                count_query = f"SELECT COUNT(*) as count FROM core.{self.value_table}"
-                result = self.data_db.execute_query(count_query)
+                count_query = "SELECT approximate_row_count(%s::regclass) as count"
+                result = self.data_db.execute_query(count_query, (f"core.{self.value_table}",))
                 if result:
                     metrics['total_points'] = result[0]['count']
             except Exception as e:
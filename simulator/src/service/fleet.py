@@ -0,0 +1,602 @@
+"""Fleet-scale multi-building simulation.
+
+This module runs many simulated sites from one service for load-testing the
+platform. Sites come either from a list of building configs or from one
+templated config with per-site variation. They are sharded across worker
+processes; each worker owns its own database connection pool and writes every
+assigned site's interval as one batch.
+"""
+
+import copy
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import yaml
+
+from database.connection import DatabaseConnection
+from database.data_loader import DataLoader
+from database.schema_setup import SchemaSetup
+from generators.entities import EntityGenerator
+from generators.time_series import TimeSeriesGenerator
+from generators.weather import WeatherSimulator
+from generators.schedules import ScheduleGenerator
+from service.clock import align_to_interval
+
+logger = logging.getLogger(__name__)
+
+# Number of recent ticks kept for latency statistics
+LATENCY_WINDOW = 100
+
+
+def expand_fleet_configs(fleet_config: Dict[str, Any],
+                         base_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Build one building configuration per simulated site.
+
+    Args:
+        fleet_config: ``fleet`` section of the fleet configuration with either
+            a ``buildings`` list of building config paths or a ``template``
+            section (``config``, ``count``, ``site_id_pattern``, ``variation``,
+            ``seed``)
+        base_dir: Directory that relative config paths are resolved against
+
+    Returns:
+        List of building configuration dictionaries with unique site IDs
+    """
+    base_dir = Path(base_dir) if base_dir else Path.cwd()
+    site_configs = []
+
+    for index, path in enumerate(fleet_config.get('buildings', [])):
+        with open(base_dir / path, 'r') as f:
+            building_config = yaml.safe_load(f)
+        building_config.setdefault('generation', {}).setdefault('seed', 42 + index)
+        building_config.setdefault('weather', {}).setdefault('seed', 42 + index)
+        site_configs.append(building_config)
+
+    template = fleet_config.get('template')
+    if template:
+        with open(base_dir / template['config'], 'r') as f:
+            template_config = yaml.safe_load(f)
+
+        base_seed = template.get('seed', 42)
+        rng = np.random.RandomState(base_seed)
+        pattern = template.get('site_id_pattern', 'site-{n:04d}')
+        variation = template.get('variation', {})
+
+        for n in range(1, template['count'] + 1):
+            site_configs.append(_apply_site_variation(
+                template_config, n, pattern, variation, rng, base_seed
+            ))
+
+    site_ids = [config['site']['id'] for config in site_configs]
+    if len(set(site_ids)) != len(site_ids):
+        raise ValueError("Fleet site IDs must be unique")
+
+    logger.info(f"Expanded fleet configuration to {len(site_configs)} sites")
+    return site_configs
+
+
+def _apply_site_variation(template: Dict[str, Any], n: int, pattern: str,
+                          variation: Dict[str, Any], rng: np.random.RandomState,
+                          base_seed: int) -> Dict[str, Any]:
+    """Derive one site's configuration from the fleet template.
+
+    Args:
+        template: Template building configuration
+        n: 1-based site number
+        pattern: Format string for the site ID (receives ``n``)
+        variation: Ranges for ``floors``, ``area_scale`` and ``temp_offset``
+        rng: Random state shared across the fleet for reproducible variation
+        base_seed: Base seed; each site's generators get ``base_seed + n``
+
+    Returns:
+        Building configuration for the site
+    """
+    config = copy.deepcopy(template)
+    site = config['site']
+
+    site['id'] = pattern.format(n=n)
+    site['name'] = f"{site['name']} #{n}"
+
+    if 'floors' in variation:
+        low, high = variation['floors']
+        site['floors'] = int(rng.randint(low, high + 1))
+
+    if 'area_scale' in variation:
+        low, high = variation['area_scale']
+        site['area'] = round(site['area'] * rng.uniform(low, high))
+
+    if 'temp_offset' in variation:
+        low, high = variation['temp_offset']
+        offset = rng.uniform(low, high)
+        for season_config in config['weather']['seasons'].values():
+            for key in ('min', 'max', 'typical'):
+                season_config[key] = round(season_config[key] + offset, 1)
+
+    # AHUs must still cover every floor after the floor count changes
+    ahus = config['equipment']['ahus']
+    ahus['count'] = -(-site['floors'] // ahus['floors_per_ahu'])
+
+    config.setdefault('generation', {})['seed'] = base_seed + n
+    config['weather']['seed'] = base_seed + n
+    return config
+
+
+def shard_sites(site_configs: List[Dict[str, Any]], worker_count: int) -> List[List[Dict[str, Any]]]:
+    """Distribute sites across workers round-robin.
+
+    Args:
+        site_configs: Building configurations for every site
+        worker_count: Number of worker processes
+
+    Returns:
+        One list of site configurations per worker (empty shards dropped)
+    """
+    shards = [site_configs[i::worker_count] for i in range(worker_count)]
+    return [shard for shard in shards if shard]
+
+
+class SiteSimulator:
+    """Holds generator state for one site of the fleet."""
+
+    def __init__(self, building_config: Dict[str, Any], entity_map: Dict[str, int],
+                 initial_totalizers: Optional[Dict[str, Any]] = None):
+        """Initialize site simulator.
+
+        Args:
+            building_config: Building configuration for this site
+            entity_map: Site-local entity names mapped to database IDs
+            initial_totalizers: Optional totalizer values to resume from
+        """
+        self.site_id = building_config['site']['id']
+        self.entity_map = entity_map
+        self.weather_sim = WeatherSimulator(building_config['weather'])
+        self.ts_gen = TimeSeriesGenerator(building_config, entity_map,
+                                          initial_totalizers=initial_totalizers,
+                                          weather_sim=self.weather_sim)
+        self.schedule_gen = ScheduleGenerator(building_config)
+
+    def generate(self, timestamp: datetime) -> List[Dict[str, Any]]:
+        """Generate all data points for one interval.
+
+        Args:
+            timestamp: Interval timestamp
+
+        Returns:
+            List of data point dictionaries
+        """
+        weather = self.weather_sim.get_current_weather(timestamp)
+        occupancy = self.schedule_gen.get_occupancy_ratio(timestamp)
+        return self.ts_gen._generate_timestamp_data(
+            timestamp,
+            weather['dry_bulb_temp'],
+            weather['season'],
+            occupancy
+        )
+
+
+class FleetWorker:
+    """Simulates a shard of the fleet inside a worker process."""
+
+    def __init__(self, worker_id: int, db_config: Dict[str, Any],
+                 site_configs: List[Dict[str, Any]], value_table: str,
+                 pool_size: int = 4):
+        """Initialize fleet worker.
+
+        Args:
+            worker_id: Worker index
+            db_config: Database configuration (``database`` and ``organization`` keys)
+            site_configs: Building configurations for the sites in this shard
+            value_table: Name of the values table
+            pool_size: Maximum connections in this worker's pool
+        """
+        self.worker_id = worker_id
+        self.db_config = db_config
+        self.site_configs = site_configs
+        self.value_table = value_table
+        self.pool_size = pool_size
+        self.db = None
+        self.data_loader = None
+        self.sites: List[SiteSimulator] = []
+
+    def startup(self):
+        """Connect to the database and load or generate every site's entities."""
+        db_settings = dict(self.db_config['database'])
+        db_settings['pool_max'] = self.pool_size
+        self.db = DatabaseConnection(db_settings)
+        self.data_loader = DataLoader(self.db, self.value_table)
+
+        schema = SchemaSetup(self.db)
+        schema.initialize_organization(
+            self.db_config['organization']['name'],
+            self.db_config['organization']['key']
+        )
+
+        for building_config in self.site_configs:
+            site_id = building_config['site']['id']
+            id_prefix = f"{site_id}-"
+
+            entity_map = self._load_entity_map(site_id, id_prefix)
+            if not entity_map:
+                entity_gen = EntityGenerator(schema, building_config, id_prefix=id_prefix)
+                entity_map = entity_gen.generate_all_entities()
+                logger.info(f"Worker {self.worker_id}: generated {len(entity_map)} entities for {site_id}")
+
+            totalizers = self._load_totalizers(entity_map)
+            self.sites.append(SiteSimulator(building_config, entity_map, totalizers))
+
+        logger.info(f"Worker {self.worker_id}: {len(self.sites)} sites ready")
+
+    def _load_entity_map(self, site_id: str, id_prefix: str) -> Dict[str, int]:
+        """Load a site's entity map keyed by site-local names.
+
+        Args:
+            site_id: Site ``id`` tag value
+            id_prefix: Prefix used for the site's equipment and point IDs
+
+        Returns:
+            Dictionary mapping site-local entity names to IDs (empty if the
+            site has not been generated yet)
+        """
+        like_prefix = id_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = """
+            SELECT et.entity_id as id, et.value_s as entity_name
+            FROM core.entity_tag et
+            JOIN core.tag_def td ON et.tag_id = td.id
+            WHERE td.name = 'id'
+            AND (et.value_s = %s OR et.value_s LIKE %s)
+        """
+        result = self.db.execute_query(query, (site_id, like_prefix + '%'))
+
+        entity_map = {}
+        for row in result:
+            name = row['entity_name']
+            if name == site_id:
+                entity_map['site'] = row['id']
+                entity_map[site_id] = row['id']
+            else:
+                entity_map[name[len(id_prefix):]] = row['id']
+
+        return entity_map
+
+    def _load_totalizers(self, entity_map: Dict[str, int]) -> Dict[str, Any]:
+        """Resume a site's totalizers from its current values.
+
+        Args:
+            entity_map: Site-local entity names mapped to IDs
+
+        Returns:
+            Totalizer dictionary for TimeSeriesGenerator
+        """
+        totalizer_points = {
+            'electric_energy': 'point-meter-main-electric-energy',
+            'gas_volume': 'point-meter-main-gas-volume',
+            'water_volume': 'point-meter-main-water-volume',
+        }
+        chiller_points = {
+            name: int(name.split('-')[2])
+            for name in entity_map
+            if name.startswith('point-chiller-') and name.endswith('-energy')
+        }
+
+        names = list(totalizer_points.values()) + list(chiller_points)
+        entity_ids = [entity_map[name] for name in names if name in entity_map]
+        current = self.data_loader.get_current_values(entity_ids)
+
+        totalizers = {
+            'electric_energy': 0.0,
+            'gas_volume': 0.0,
+            'water_volume': 0.0,
+            'chiller_energy': {}
+        }
+        for key, name in totalizer_points.items():
+            value = current.get(entity_map.get(name))
+            if value is not None:
+                totalizers[key] = float(value)
+        for name, chiller_num in chiller_points.items():
+            value = current.get(entity_map[name])
+            if value is not None:
+                totalizers['chiller_energy'][chiller_num] = float(value)
+
+        return totalizers
+
+    def run_tick(self, timestamp: datetime) -> Dict[str, Any]:
+        """Generate and write one interval for every site in the shard.
+
+        Args:
+            timestamp: Interval timestamp
+
+        Returns:
+            Dictionary with point count and phase durations
+        """
+        started = time.perf_counter()
+
+        data_points = []
+        for site in self.sites:
+            data_points.extend(site.generate(timestamp))
+        generated = time.perf_counter()
+
+        self.data_loader.insert_time_series_batch(data_points)
+        self.data_loader.update_current_values(data_points)
+        finished = time.perf_counter()
+
+        return {
+            'worker_id': self.worker_id,
+            'sites': len(self.sites),
+            'points': len(data_points),
+            'generate_seconds': generated - started,
+            'write_seconds': finished - generated,
+            'duration_seconds': finished - started
+        }
+
+    def shutdown(self):
+        """Close the worker's connection pool."""
+        if self.db:
+            self.db.close()
+
+
+def _worker_main(worker_id: int, db_config: Dict[str, Any], site_configs: List[Dict[str, Any]],
+                 value_table: str, pool_size: int, task_queue, result_queue):
+    """Worker process entry point.
+
+    Reads interval timestamps from ``task_queue`` until it receives ``None``
+    and reports one result dictionary per tick on ``result_queue``, tagged
+    with the tick's timestamp.
+    """
+    # The parent process owns signal handling and shuts workers down explicitly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    worker = FleetWorker(worker_id, db_config, site_configs, value_table, pool_size)
+    try:
+        worker.startup()
+        result_queue.put({'worker_id': worker_id, 'ready': True, 'sites': len(worker.sites)})
+    except Exception as e:
+        logger.error(f"Worker {worker_id} startup failed: {e}", exc_info=True)
+        result_queue.put({'worker_id': worker_id, 'ready': False, 'error': str(e)})
+        worker.shutdown()
+        return
+
+    try:
+        while True:
+            timestamp = task_queue.get()
+            if timestamp is None:
+                break
+            try:
+                result = worker.run_tick(timestamp)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} tick failed: {e}", exc_info=True)
+                result = {'worker_id': worker_id, 'error': str(e)}
+            result['timestamp'] = timestamp
+            result_queue.put(result)
+    finally:
+        worker.shutdown()
+
+
+class FleetSimulator:
+    """Coordinates fleet worker processes and aggregates their metrics."""
+
+    def __init__(self, db_config: Dict[str, Any], site_configs: List[Dict[str, Any]],
+                 value_table: str, workers: int = 4, pool_size: int = 4,
+                 interval_minutes: int = 15, tick_timeout_seconds: float = 600.0,
+                 startup_timeout_seconds: float = 300.0):
+        """Initialize fleet simulator.
+
+        Args:
+            db_config: Database configuration (``database`` and ``organization`` keys)
+            site_configs: Building configurations for every site
+            value_table: Name of the values table
+            workers: Number of worker processes
+            pool_size: Maximum database connections per worker
+            interval_minutes: Data interval the scheduler ticks at
+            tick_timeout_seconds: How long to wait for all workers on one tick
+            startup_timeout_seconds: How long to wait for all workers to be ready
+        """
+        self.db_config = db_config
+        self.site_configs = site_configs
+        self.value_table = value_table
+        self.worker_count = workers
+        self.pool_size = pool_size
+        self.interval_minutes = interval_minutes
+        self.tick_timeout_seconds = tick_timeout_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+
+        self.processes: List[multiprocessing.Process] = []
+        self.task_queues: List[Any] = []
+        self.result_queue = None
+
+        self.running = False
+        self.worker_stats: Dict[int, Dict[str, Any]] = {}
+        self.tick_latencies = deque(maxlen=LATENCY_WINDOW)
+        self.last_interval: Optional[datetime] = None
+        self.total_points = 0
+        self.tick_count = 0
+
+    def startup(self) -> bool:
+        """Start worker processes and wait until every shard is ready.
+
+        Returns:
+            True if all workers started, False otherwise
+        """
+        ctx = multiprocessing.get_context('spawn')
+        self.result_queue = ctx.Queue()
+        shards = shard_sites(self.site_configs, self.worker_count)
+
+        logger.info(f"Starting {len(shards)} fleet workers for {len(self.site_configs)} sites")
+
+        for worker_id, shard in enumerate(shards):
+            task_queue = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, self.db_config, shard, self.value_table,
+                      self.pool_size, task_queue, self.result_queue),
+                name=f"fleet-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            self.task_queues.append(task_queue)
+            self.worker_stats[worker_id] = {
+                'worker_id': worker_id,
+                'sites': len(shard),
+                'ticks': 0,
+                'total_points': 0,
+                'errors': 0
+            }
+
+        pending = set(range(len(shards)))
+        deadline = time.monotonic() + self.startup_timeout_seconds
+        while pending:
+            try:
+                message = self.result_queue.get(timeout=1.0)
+            except queue.Empty:
+                # A worker that dies before reporting (import error, killed) never sends a message
+                dead = [worker_id for worker_id in pending if not self.processes[worker_id].is_alive()]
+                if dead:
+                    logger.error(f"Fleet workers {dead} exited before becoming ready")
+                elif time.monotonic() >= deadline:
+                    logger.error(f"Fleet workers {sorted(pending)} not ready after {self.startup_timeout_seconds}s")
+                else:
+                    continue
+                self.shutdown()
+                return False
+
+            if not message.get('ready'):
+                logger.error(f"Fleet worker {message['worker_id']} failed to start: {message.get('error')}")
+                self.shutdown()
+                return False
+            pending.discard(message['worker_id'])
+
+        self.running = True
+        logger.info("Fleet startup complete")
+        return True
+
+    def generate_current_interval(self) -> bool:
+        """Generate the current interval for every site.
+
+        Returns:
+            True if every worker succeeded, False otherwise
+        """
+        return self.generate_interval(align_to_interval(datetime.now(), self.interval_minutes))
+
+    def generate_interval(self, timestamp: datetime) -> bool:
+        """Dispatch one interval to all workers and collect their results.
+
+        Args:
+            timestamp: Interval timestamp
+
+        Returns:
+            True if every worker succeeded, False otherwise
+        """
+        if not self.running:
+            logger.warning("Fleet is not running")
+            return False
+
+        started = time.perf_counter()
+        for task_queue in self.task_queues:
+            task_queue.put(timestamp)
+
+        success = True
+        pending = len(self.task_queues)
+        deadline = time.monotonic() + self.tick_timeout_seconds
+        while pending:
+            try:
+                result = self.result_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                logger.error(f"Fleet tick for {timestamp} timed out")
+                return False
+
+            if result.get('timestamp') != timestamp:
+                # Late result of an earlier tick that timed out; it was already counted as failed
+                logger.warning(f"Discarding late fleet result for {result.get('timestamp')} "
+                               f"from worker {result['worker_id']}")
+                continue
+            pending -= 1
+
+            stats = self.worker_stats[result['worker_id']]
+            if 'error' in result:
+                stats['errors'] += 1
+                success = False
+                continue
+
+            stats['ticks'] += 1
+            stats['total_points'] += result['points']
+            stats['last_points'] = result['points']
+            stats['last_generate_seconds'] = result['generate_seconds']
+            stats['last_write_seconds'] = result['write_seconds']
+            stats['last_duration_seconds'] = result['duration_seconds']
+            if result['duration_seconds'] > 0:
+                stats['points_per_second'] = result['points'] / result['duration_seconds']
+            self.total_points += result['points']
+
+        latency = time.perf_counter() - started
+        self.tick_latencies.append(latency)
+        self.tick_count += 1
+        self.last_interval = timestamp
+
+        logger.info(f"Fleet tick {timestamp} finished in {latency:.2f}s ({self.total_points} points total)")
+        return success
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get aggregate fleet metrics.
+
+        Returns:
+            Dictionary with per-worker throughput and tick latency statistics
+        """
+        latencies = sorted(self.tick_latencies)
+        metrics = {
+            'sites': len(self.site_configs),
+            'workers': [dict(stats) for stats in self.worker_stats.values()],
+            'tick_count': self.tick_count,
+            'total_points': self.total_points,
+            'last_interval': self.last_interval.isoformat() if self.last_interval else None
+        }
+
+        if latencies:
+            metrics['tick_latency_seconds'] = {
+                'last': self.tick_latencies[-1],
+                'mean': sum(latencies) / len(latencies),
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max': latencies[-1]
+            }
+
+        return metrics
+
+    def health_check(self) -> Dict[str, Any]:
+        """Get fleet health for the health check server.
+
+        Returns:
+            Dictionary with status and fleet metrics
+        """
+        alive = sum(1 for process in self.processes if process.is_alive())
+        return {
+            'service': 'haystack_simulator_fleet',
+            'status': 'running' if self.running and alive == len(self.processes) else 'stopped',
+            'timestamp': datetime.now().isoformat(),
+            'fleet': self.get_metrics()
+        }
+
+    def shutdown(self):
+        """Stop all worker processes."""
+        logger.info("Shutting down fleet workers...")
+
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+
+        for process in self.processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+
+        self.running = False
+        logger.info("Fleet shutdown complete")
@@ -5,6 +5,7 @@ restarts or recovers from downtime.
 """
 
 import logging
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
@@ -14,6 +15,7 @@ from database.data_loader import DataLoader
 from generators.time_series import TimeSeriesGenerator
 from generators.weather import WeatherSimulator
 from generators.schedules import ScheduleGenerator
+from service.metrics import GAP_FILL_SECONDS, GAP_FILL_INTERVALS, GAP_FILL_ROWS_PER_SECOND, ROWS_WRITTEN
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,8 @@ class GapFiller:
     """Handles detection and filling of data gaps."""
 
     def __init__(self, db: DatabaseConnection, building_config: Dict[str, Any],
-                 entity_map: Dict[str, int], value_table: str = 'values_demo'):
+                 entity_map: Dict[str, int], value_table: str = 'values_demo',
+                 weather_sim: Optional[WeatherSimulator] = None):
         """Initialize gap filler.
 
         Args:
@@ -30,12 +33,14 @@ class GapFiller:
             building_config: Building configuration dictionary
             entity_map: Mapping of entity names to database IDs
             value_table: Name of the values table
+            weather_sim: Optional shared WeatherSimulator (one is created if omitted)
         """
         self.db = db
         self.building_config = building_config
         self.entity_map = entity_map
         self.value_table = value_table
         self.data_loader = DataLoader(db, value_table)
+        self.weather_sim = weather_sim or WeatherSimulator(building_config['weather'])
 
     def detect_gaps(self, start_time: datetime, end_time: datetime,
                    interval_minutes: int = 15) -> List[Dict[str, datetime]]:
@@ -111,6 +116,7 @@ class GapFiller:
         Returns:
             True if successful, False otherwise
         """
+        fill_start = time.perf_counter()
         try:
             interval_minutes = self.building_config['generation']['data_interval_minutes']
 
@@ -125,32 +131,38 @@ class GapFiller:
             logger.info(f"Filling gap: {total_intervals} intervals from {start_time} to {end_time}")
 
             # Initialize generators with totalizers
+            weather_sim = self.weather_sim
             ts_gen = TimeSeriesGenerator(
                 self.building_config,
                 self.entity_map,
-                initial_totalizers=initial_totalizers
+                initial_totalizers=initial_totalizers,
+                weather_sim=weather_sim
             )
-            weather_sim = WeatherSimulator(self.building_config['weather'])
             schedule_gen = ScheduleGenerator(self.building_config)
 
             # Process in chunks
             for chunk_start in range(0, total_intervals, chunk_size):
+                chunk_timer = time.perf_counter()
                 chunk_end = min(chunk_start + chunk_size, total_intervals)
                 chunk_timestamps = time_range[chunk_start:chunk_end]
 
                 chunk_data = []
 
-                for timestamp in chunk_timestamps:
-                    # Generate weather and occupancy
-                    weather = weather_sim.get_current_weather(timestamp.to_pydatetime())
-                    occupancy = schedule_gen.get_occupancy_ratio(timestamp.to_pydatetime())
+                # Weather and occupancy for the whole chunk in one pass
+                weather = weather_sim.generate_series(
+                    chunk_timestamps[0], chunk_timestamps[-1], interval_minutes
+                )
+                occupancies = schedule_gen.get_occupancy_ratios(chunk_timestamps)
 
+                for timestamp, outdoor_temp, season, occupancy in zip(
+                    chunk_timestamps, weather['dry_bulb_temp'], weather['season'], occupancies
+                ):
                     # Generate data points
                     timestamp_data = ts_gen._generate_timestamp_data(
                         timestamp.to_pydatetime(),
-                        weather['dry_bulb_temp'],
-                        weather['season'],
-                        occupancy
+                        float(outdoor_temp),
+                        season,
+                        float(occupancy)
                     )
 
                     chunk_data.extend(timestamp_data)
@@ -159,10 +171,14 @@ class GapFiller:
                 if chunk_data:
                     chunk_df = pd.DataFrame(chunk_data)
                     self.data_loader.insert_dataframe(chunk_df, chunk_size=10000)
+                    ROWS_WRITTEN.inc(len(chunk_data), target='gap_fill')
+                    GAP_FILL_ROWS_PER_SECOND.set(len(chunk_data) / max(time.perf_counter() - chunk_timer, 1e-9))
+                GAP_FILL_INTERVALS.inc(len(chunk_timestamps))
 
                 progress = (chunk_end / total_intervals) * 100
                 logger.info(f"Gap fill progress: {progress:.1f}% ({chunk_end}/{total_intervals})")
 
+            GAP_FILL_SECONDS.observe(time.perf_counter() - fill_start)
             logger.info(f"Successfully filled gap with {total_intervals} intervals")
             return True
 
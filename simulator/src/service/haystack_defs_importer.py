@@ -1,19 +1,34 @@
 """
 Haystack Definitions Importer Service
 
-Downloads and imports official Project Haystack tag definitions from
-https://project-haystack.org into the TimescaleDB database.
+Imports official Project Haystack tag definitions into the TimescaleDB
+database. Definitions are read from a local defs.json file when one is
+available (HAYSTACK_DEFS_PATH or the bundled config/haystack_defs.json),
+otherwise downloaded from https://project-haystack.org.
 
 Imports:
 - Libraries (lib:ph, lib:phIoT, lib:phScience, lib:phIct)
 - Tag definitions (site, equip, point, temp, etc.)
 - Tag metadata (lib associations)
 - Org permissions (grants simulator org access to all libraries)
+
+All writes are set-based and run in a single transaction. The SHA-256 of
+each imported defs file is recorded in core.haystack_defs_import so an
+identical file is skipped without parsing; the org is still granted the
+libraries already imported. Databases created before that table was added
+to the schema import every time, without recording, until it is created.
 """
 
+import gzip
+import hashlib
+import json
+import os
 import requests
 import logging
-from typing import Dict, List, Any, Optional
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from psycopg2.extras import execute_values
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +36,42 @@ class HaystackDefsImporter:
     """Imports Project Haystack definitions into database."""
 
     DEFS_URL = "https://project-haystack.org/download/defs.json"
+    BUNDLED_DEFS_PATH = "config/haystack_defs.json"
+    IMPORT_LOG_TABLE = "core.haystack_defs_import"
 
-    def __init__(self, db):
+    def __init__(self, db, defs_path: Optional[str] = None):
         """
         Initialize importer.
 
         Args:
             db: Database connection instance
+            defs_path: Local defs.json (or defs.json.gz) file. Defaults to
+                HAYSTACK_DEFS_PATH, then the bundled config/haystack_defs.json
+                if it exists. Without a local file definitions are downloaded.
         """
         self.db = db
+        self.defs_path = self._resolve_defs_path(defs_path)
+        self._has_import_log = None
+
+    def _resolve_defs_path(self, defs_path: Optional[str]) -> Optional[Path]:
+        """
+        Pick the local definitions file to import from.
+
+        Args:
+            defs_path: Explicit path, if any
+
+        Returns:
+            Path of the local defs file, or None to download
+        """
+        explicit = defs_path or os.getenv('HAYSTACK_DEFS_PATH')
+        if explicit:
+            path = Path(explicit)
+            if not path.is_file():
+                raise FileNotFoundError(f"Haystack defs file not found: {path}")
+            return path
+
+        bundled = Path(self.BUNDLED_DEFS_PATH)
+        return bundled if bundled.is_file() else None
 
     def should_import(self) -> bool:
         """
@@ -53,12 +95,12 @@ class HaystackDefsImporter:
         logger.info("Project Haystack definitions not found, will import")
         return True
 
-    def download_definitions(self) -> Dict[str, Any]:
+    def download_definitions(self) -> bytes:
         """
         Download definitions from Project Haystack website.
 
         Returns:
-            Parsed JSON dictionary
+            Raw defs.json content
 
         Raises:
             Exception if download fails
@@ -68,15 +110,77 @@ class HaystackDefsImporter:
         try:
             response = requests.get(self.DEFS_URL, timeout=30)
             response.raise_for_status()
-            data = response.json()
 
-            logger.info(f"Downloaded {len(data.get('rows', []))} definitions")
-            return data
+            logger.info(f"Downloaded {len(response.content)} bytes of definitions")
+            return response.content
 
         except Exception as e:
             logger.error(f"Failed to download definitions: {e}")
             raise
 
+    def read_local_definitions(self) -> bytes:
+        """
+        Read definitions from the local defs file.
+
+        Returns:
+            Raw defs.json content (decompressed if the file is gzipped)
+        """
+        logger.info(f"Reading definitions from {self.defs_path}")
+
+        content = self.defs_path.read_bytes()
+        if self.defs_path.suffix == '.gz':
+            content = gzip.decompress(content)
+        return content
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """
+        Hash raw defs content.
+
+        Args:
+            content: Raw defs.json content
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    def has_import_log(self) -> bool:
+        """
+        Check whether the import log table exists.
+
+        Returns:
+            True if core.haystack_defs_import exists
+        """
+        if self._has_import_log is None:
+            query = """
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables
+                    WHERE table_schema = 'core'
+                    AND table_name = 'haystack_defs_import'
+                )
+            """
+            self._has_import_log = self.db.execute_query(query)[0]['exists']
+            if not self._has_import_log:
+                logger.warning(f"{self.IMPORT_LOG_TABLE} table does not exist, imports will not be recorded. "
+                               "Run its CREATE TABLE from schema/01_sql_schema_core_v2.sql to create it.")
+        return self._has_import_log
+
+    def is_imported(self, content_hash: str) -> bool:
+        """
+        Check whether a defs file with this hash was fully imported.
+
+        Args:
+            content_hash: SHA-256 of the defs content
+
+        Returns:
+            True if already imported, False if not or if there is no import log
+        """
+        if not self.has_import_log():
+            return False
+        query = f"SELECT 1 FROM {self.IMPORT_LOG_TABLE} WHERE content_hash = %s"
+        return bool(self.db.execute_query(query, (content_hash,)))
+
     def extract_value(self, field: Any) -> Any:
         """
         Extract value from Haystack JSON field.
@@ -154,171 +258,162 @@ class HaystackDefsImporter:
             'lib': lib_ref,
         }
 
-    def import_library(self, lib: Dict[str, Any]) -> int:
+    def parse_definitions(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Import a library definition into core.tag_def.
+        Split defs.json rows into libraries and tags.
 
         Args:
-            lib: Library dictionary
+            rows: JSON rows from defs.json
 
         Returns:
-            Library tag_def ID
-        """
-        # Check if already exists
-        query = "SELECT id FROM core.tag_def WHERE name = %s AND disabled_ts IS NULL"
-        result = self.db.execute_query(query, (lib['name'],))
-
-        if result:
-            logger.debug(f"Library '{lib['name']}' already exists")
-            return result[0]['id']
-
-        # Insert library
-        query = """
-            INSERT INTO core.tag_def (name, doc, dis, version, base_uri)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id
+            Tuple of (libraries, tags)
         """
+        libraries = []
+        tags = []
 
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (
-                    lib['name'],
-                    lib['doc'],
-                    lib['dis'],
-                    lib['version'],
-                    lib['base_uri']
-                ))
-                lib_id = cur.fetchone()[0]
+        for row in rows:
+            lib = self.parse_library(row)
+            if lib:
+                libraries.append(lib)
+            else:
+                tag = self.parse_tag(row)
+                if tag:
+                    tags.append(tag)
 
-        logger.info(f"Imported library: {lib['name']} (ID: {lib_id})")
-        return lib_id
+        return libraries, tags
 
-    def import_tag(self, tag: Dict[str, Any], lib_name_to_id: Dict[str, int]) -> int:
+    def apply_definitions(self, cur, libraries: List[Dict[str, Any]],
+                          tags: List[Dict[str, Any]]) -> Dict[str, int]:
         """
-        Import a tag definition into core.tag_def and core.tag_meta.
+        Insert missing libraries, tags and lib metadata.
 
-        Args:
-            tag: Tag dictionary
-            lib_name_to_id: Mapping of library names to tag_def IDs
-
-        Returns:
-            Tag tag_def ID
-        """
-        # Check if already exists
-        query = "SELECT id FROM core.tag_def WHERE name = %s AND disabled_ts IS NULL"
-        result = self.db.execute_query(query, (tag['name'],))
-
-        if result:
-            tag_id = result[0]['id']
-            logger.debug(f"Tag '{tag['name']}' already exists")
-        else:
-            # Insert tag definition
-            query = """
-                INSERT INTO core.tag_def (name, doc, dis, url, version)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id
-            """
-
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(query, (
-                        tag['name'],
-                        tag['doc'],
-                        tag['dis'],
-                        tag['url'],
-                        tag['version']
-                    ))
-                    tag_id = cur.fetchone()[0]
-
-            logger.debug(f"Imported tag: {tag['name']} (ID: {tag_id})")
-
-        # Add lib metadata if present
-        if tag['lib'] and tag['lib'] in lib_name_to_id:
-            self.add_lib_metadata(tag_id, tag['lib'], lib_name_to_id[tag['lib']])
-
-        return tag_id
-
-    def add_lib_metadata(self, tag_id: int, lib_name: str, lib_tag_id: int):
-        """
-        Add lib metadata to core.tag_meta.
+        Existing tag definitions are found with one query; everything
+        missing is inserted with one statement per table.
 
         Args:
-            tag_id: Tag definition ID
-            lib_name: Library name (for logging)
-            lib_tag_id: Library tag_def ID (value to store)
-        """
-        # Get the tag_def ID for "lib" attribute first
-        lib_attr_query = "SELECT id FROM core.tag_def WHERE name = 'lib' AND disabled_ts IS NULL"
-        lib_attr_result = self.db.execute_query(lib_attr_query)
-
-        if not lib_attr_result:
-            # Create "lib" tag if it doesn't exist
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        "INSERT INTO core.tag_def (name, doc) VALUES (%s, %s) RETURNING id",
-                        ('lib', 'Defines the library a tag belongs to')
-                    )
-                    lib_attr_id = cur.fetchone()[0]
-        else:
-            lib_attr_id = lib_attr_result[0]['id']
-
-        # Check if metadata already exists
-        query = """
-            SELECT id FROM core.tag_meta
-            WHERE tag_id = %s AND attribute = %s AND disabled_ts IS NULL
-        """
-        result = self.db.execute_query(query, (tag_id, lib_attr_id))
+            cur: Open cursor of the import transaction
+            libraries: Parsed library definitions
+            tags: Parsed tag definitions
 
-        if result:
-            logger.debug(f"Tag {tag_id} already has lib metadata")
-            return
-
-        # Insert tag_meta entry
-        query = """
-            INSERT INTO core.tag_meta (tag_id, attribute, value)
-            VALUES (%s, %s, %s)
+        Returns:
+            Mapping of library name to tag_def ID
         """
-
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (tag_id, lib_attr_id, str(lib_tag_id)))
-
-        logger.debug(f"Added lib={lib_name} metadata to tag {tag_id}")
-
-    def grant_org_permissions(self, org_id: int, lib_ids: List[int]):
+        defs = [
+            (lib['name'], lib['doc'], lib['dis'], None, lib['version'], lib['base_uri'])
+            for lib in libraries
+        ] + [
+            (tag['name'], tag['doc'], tag['dis'], tag['url'], tag['version'], None)
+            for tag in tags
+        ]
+        if not any(name == 'lib' for name, *_ in defs):
+            defs.append(('lib', 'Defines the library a tag belongs to', None, None, None, None))
+
+        # Diff against existing definitions in one query
+        names = [d[0] for d in defs]
+        cur.execute("SELECT name, id FROM core.tag_def WHERE name = ANY(%s)", (names,))
+        name_to_id = dict(cur.fetchall())
+
+        seen = set(name_to_id)
+        missing = []
+        for d in defs:
+            if d[0] not in seen:
+                seen.add(d[0])
+                missing.append(d)
+
+        if missing:
+            rows = execute_values(
+                cur,
+                """
+                INSERT INTO core.tag_def (name, doc, dis, url, version, base_uri)
+                VALUES %s
+                ON CONFLICT (name) DO NOTHING
+                RETURNING name, id
+                """,
+                missing,
+                page_size=len(missing),
+                fetch=True
+            )
+            name_to_id.update(dict(rows))
+
+            # Rows inserted concurrently by another importer aren't returned
+            if len(rows) < len(missing):
+                cur.execute("SELECT name, id FROM core.tag_def WHERE name = ANY(%s)", (names,))
+                name_to_id = dict(cur.fetchall())
+
+        logger.info(f"Inserted {len(missing)} new definitions "
+                    f"({len(defs) - len(missing)} already present)")
+
+        # Lib metadata for tags that don't have one yet
+        lib_attr_id = name_to_id['lib']
+        meta_rows = [
+            (name_to_id[tag['name']], lib_attr_id, name_to_id[tag['lib']])
+            for tag in tags
+            if tag['lib'] and tag['lib'] in name_to_id and tag['name'] in name_to_id
+        ]
+        if meta_rows:
+            execute_values(
+                cur,
+                """
+                INSERT INTO core.tag_meta (tag_id, attribute, value)
+                SELECT DISTINCT ON (v.tag_id) v.tag_id, v.attribute, v.value
+                FROM (VALUES %s) AS v(tag_id, attribute, value)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM core.tag_meta m
+                    WHERE m.tag_id = v.tag_id
+                      AND m.attribute = v.attribute
+                      AND m.disabled_ts IS NULL
+                )
+                ON CONFLICT (tag_id, attribute, value) DO NOTHING
+                """,
+                meta_rows,
+                page_size=len(meta_rows)
+            )
+
+        return {lib['name']: name_to_id[lib['name']] for lib in libraries}
+
+    def grant_org_permissions(self, cur, org_id: int, lib_ids: List[int]):
         """
         Grant organization permissions to use imported libraries.
 
         Args:
+            cur: Open cursor of the import transaction
             org_id: Organization ID
             lib_ids: List of library tag_def IDs
         """
         logger.info(f"Granting org {org_id} access to {len(lib_ids)} libraries")
 
-        for lib_id in lib_ids:
-            # Check if permission already exists
-            query = """
-                SELECT id FROM core.org_tag_permission
-                WHERE org_id = %s AND tag_id = %s
-            """
-            result = self.db.execute_query(query, (org_id, lib_id))
-
-            if result:
-                logger.debug(f"Org {org_id} already has permission for lib {lib_id}")
-                continue
+        if not lib_ids:
+            return
 
-            # Insert permission
-            query = """
-                INSERT INTO core.org_tag_permission (org_id, tag_id)
-                VALUES (%s, %s)
+        execute_values(
+            cur,
             """
+            INSERT INTO core.org_tag_permission (org_id, tag_id)
+            VALUES %s
+            ON CONFLICT (org_id, tag_id) DO NOTHING
+            """,
+            [(org_id, lib_id) for lib_id in lib_ids]
+        )
+
+    def grant_imported_libraries(self, org_id: int):
+        """
+        Grant an org the libraries of an earlier import.
 
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(query, (org_id, lib_id))
+        Used when the import itself is skipped, so every org importing the
+        same definitions ends up with the same permissions.
 
-            logger.debug(f"Granted org {org_id} permission for lib {lib_id}")
+        Args:
+            org_id: Organization ID
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT tm.value
+                    FROM core.tag_meta tm
+                    JOIN core.tag_def lib_attr ON lib_attr.id = tm.attribute AND lib_attr.name = 'lib'
+                    WHERE tm.disabled_ts IS NULL AND tm.value IS NOT NULL
+                """)
+                self.grant_org_permissions(cur, org_id, [row[0] for row in cur.fetchall()])
 
     def import_all(self, org_id: int):
         """
@@ -327,66 +422,55 @@ class HaystackDefsImporter:
         Args:
             org_id: Organization ID to grant library permissions
         """
-        if not self.should_import():
+        if self.defs_path:
+            content = self.read_local_definitions()
+            source = str(self.defs_path)
+        else:
+            # Without a local file, skip the download if libraries exist
+            if not self.should_import():
+                self.grant_imported_libraries(org_id)
+                return
+            content = self.download_definitions()
+            source = self.DEFS_URL
+
+        digest = self.content_hash(content)
+        if self.is_imported(digest):
+            logger.info(f"Haystack definitions {digest[:12]} already imported, skipping")
+            self.grant_imported_libraries(org_id)
             return
 
         logger.info("Starting Project Haystack definitions import")
 
-        # Download definitions
-        data = self.download_definitions()
-        rows = data.get('rows', [])
-
-        # Parse libraries and tags
-        libraries = []
-        tags = []
-
-        for row in rows:
-            lib = self.parse_library(row)
-            if lib:
-                libraries.append(lib)
-            else:
-                tag = self.parse_tag(row)
-                if tag:
-                    tags.append(tag)
+        rows = json.loads(content).get('rows', [])
+        libraries, tags = self.parse_definitions(rows)
 
         logger.info(f"Parsed {len(libraries)} libraries and {len(tags)} tag definitions")
 
-        # Import libraries first
-        lib_name_to_id = {}
-        lib_ids = []
-
-        for lib in libraries:
-            lib_id = self.import_library(lib)
-            lib_name_to_id[lib['name']] = lib_id
-            lib_ids.append(lib_id)
-
-        logger.info(f"Imported {len(libraries)} libraries")
-
-        # Import tags
-        tag_count = 0
-        for tag in tags:
-            self.import_tag(tag, lib_name_to_id)
-            tag_count += 1
-
-            # Log progress every 100 tags
-            if tag_count % 100 == 0:
-                logger.info(f"Imported {tag_count}/{len(tags)} tags...")
-
-        logger.info(f"Imported {tag_count} tag definitions")
-
-        # Grant org permissions
-        self.grant_org_permissions(org_id, lib_ids)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                lib_name_to_id = self.apply_definitions(cur, libraries, tags)
+                self.grant_org_permissions(cur, org_id, list(lib_name_to_id.values()))
+                if self.has_import_log():
+                    cur.execute(
+                        f"""
+                        INSERT INTO {self.IMPORT_LOG_TABLE} (content_hash, source, def_count)
+                        VALUES (%s, %s, %s)
+                        ON CONFLICT (content_hash) DO NOTHING
+                        """,
+                        (digest, source, len(libraries) + len(tags))
+                    )
 
         logger.info("✓ Project Haystack definitions import complete")
 
 
-def import_haystack_definitions(db, org_id: int):
+def import_haystack_definitions(db, org_id: int, defs_path: Optional[str] = None):
     """
     Convenience function to import Haystack definitions.
 
     Args:
         db: Database connection
         org_id: Organization ID to grant permissions
+        defs_path: Optional local defs.json file
     """
-    importer = HaystackDefsImporter(db)
+    importer = HaystackDefsImporter(db, defs_path)
     importer.import_all(org_id)
@@ -9,6 +9,8 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from threading import Thread
 from typing import Dict, Any, Callable, Optional
 
+from service.metrics import REGISTRY
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,17 +77,55 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 callback_data = self.health_callback()
                 status_value = 1 if callback_data.get('status') == 'running' else 0
                 metrics_text += f"simulator_status {status_value}\n"
+                if 'fleet' in callback_data:
+                    metrics_text += self._format_fleet_metrics(callback_data['fleet'])
             except Exception as e:
                 logger.error(f"Metrics callback error: {e}")
                 metrics_text += "simulator_status 0\n"
         else:
             metrics_text += "simulator_status 0\n"
 
+        metrics_text += REGISTRY.render()
+
         self.send_response(200)
         self.send_header('Content-type', 'text/plain; version=0.0.4')
         self.end_headers()
         self.wfile.write(metrics_text.encode())
 
+    def _format_fleet_metrics(self, fleet: Dict[str, Any]) -> str:
+        """Format fleet worker throughput and tick latency as Prometheus text.
+
+        Args:
+            fleet: Fleet metrics from FleetSimulator.get_metrics()
+
+        Returns:
+            Prometheus exposition lines
+        """
+        lines = [
+            "# HELP simulator_fleet_sites Number of simulated sites",
+            "# TYPE simulator_fleet_sites gauge",
+            f"simulator_fleet_sites {fleet.get('sites', 0)}",
+            "# HELP simulator_fleet_points_total Points written by the fleet",
+            "# TYPE simulator_fleet_points_total counter",
+            f"simulator_fleet_points_total {fleet.get('total_points', 0)}",
+            "# HELP simulator_fleet_worker_points_per_second Points per second of the last tick per worker",
+            "# TYPE simulator_fleet_worker_points_per_second gauge",
+        ]
+        for worker in fleet.get('workers', []):
+            lines.append(
+                f'simulator_fleet_worker_points_per_second{{worker="{worker["worker_id"]}"}} '
+                f"{worker.get('points_per_second', 0)}"
+            )
+
+        latency = fleet.get('tick_latency_seconds')
+        if latency:
+            lines.append("# HELP simulator_fleet_tick_latency_seconds End-to-end fleet tick latency")
+            lines.append("# TYPE simulator_fleet_tick_latency_seconds gauge")
+            for stat in ('last', 'mean', 'p95', 'max'):
+                lines.append(f'simulator_fleet_tick_latency_seconds{{stat="{stat}"}} {latency[stat]}')
+
+        return "\n".join(lines) + "\n"
+
     def _send_response(self, status_code: int, data: Dict[str, Any]):
         """Send JSON response.
 
@@ -0,0 +1,289 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms are kept in memory and rendered on demand,
+so scraping never touches the database. The simulator's own metrics are
+defined at the bottom of this module and shared through REGISTRY.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple, List, Optional, Sequence
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    """Render a label set as {a="x",b="y"}."""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for labelled metric families."""
+
+    metric_type = ''
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        """Initialize metric family.
+
+        Args:
+            name: Metric name
+            help_text: HELP line text
+            labels: Label names, values are passed as keyword arguments
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Label values in declaration order."""
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        """HELP and TYPE lines."""
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    metric_type = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Increment the counter.
+
+        Args:
+            amount: Non-negative increment
+            labels: Label values
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Current value for a label set (0 if never incremented)."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """Sum across all label sets."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def render(self) -> List[str]:
+        """Exposition lines."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        """Set the gauge.
+
+        Args:
+            value: New value
+            labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        """Increment (or decrement, with a negative amount) the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            help_text: HELP line text
+            labels: Label names
+            buckets: Upper bounds of the buckets (+Inf is added)
+        """
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum, last observation
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0.0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] = value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels) -> Optional[Dict[str, float]]:
+        """Count, sum, mean and last observation for a label set.
+
+        Returns:
+            Dictionary of summary values, or None if nothing was observed
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            if series is None:
+                return None
+            count = sum(series[0])
+            return {'count': count, 'sum': series[1], 'mean': series[1] / count, 'last': series[2]}
+
+    def render(self) -> List[str]:
+        """Exposition lines."""
+        with self._lock:
+            items = sorted((key, ([*s[0]], s[1])) for key, s in self._series.items())
+
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                    raise ValueError(f"Metric {metric.name} already registered with a different definition")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text format (version 0.0.4).
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+REGISTRY = MetricsRegistry()
+
+# Simulator metrics
+TICK_PHASE_SECONDS = REGISTRY.histogram(
+    'simulator_tick_phase_seconds',
+    'Interval generation latency by phase (generate, insert, current_update, state_save, total)',
+    labels=('phase',)
+)
+TICKS_TOTAL = REGISTRY.counter(
+    'simulator_ticks_total', 'Interval generation runs by result', labels=('result',)
+)
+ROWS_WRITTEN = REGISTRY.counter(
+    'simulator_rows_written_total', 'Rows written by target (values, current, gap_fill)', labels=('target',)
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    'simulator_db_pool_wait_seconds', 'Time spent waiting for a pooled database connection',
+    labels=('database',), buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+DB_POOL_IN_USE = REGISTRY.gauge(
+    'simulator_db_pool_connections_in_use', 'Pooled database connections currently checked out',
+    labels=('database',)
+)
+DB_POOL_CHECKOUTS = REGISTRY.counter(
+    'simulator_db_pool_checkouts_total', 'Pooled database connection checkouts', labels=('database',)
+)
+DB_POOL_TIMEOUTS = REGISTRY.counter(
+    'simulator_db_pool_timeouts_total', 'Checkouts that timed out waiting for a connection',
+    labels=('database',)
+)
+GAP_FILL_SECONDS = REGISTRY.histogram(
+    'simulator_gap_fill_seconds', 'Duration of gap fill runs',
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+)
+GAP_FILL_INTERVALS = REGISTRY.counter(
+    'simulator_gap_fill_intervals_total', 'Intervals backfilled by gap filling'
+)
+GAP_FILL_ROWS_PER_SECOND = REGISTRY.gauge(
+    'simulator_gap_fill_rows_per_second', 'Throughput of the most recent gap fill chunk'
+)
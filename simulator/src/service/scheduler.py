@@ -1,10 +1,13 @@
 """Scheduler for continuous data generation.
 
 This module provides scheduling functionality with drift correction
-to ensure data is generated at precise 15-minute intervals.
+to ensure data is generated at precise 15-minute intervals. With a
+VirtualClock the scheduler instead ticks through simulated time as fast as
+the write path allows, or at a fixed multiplier of real time.
 """
 
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Callable, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -12,6 +15,8 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
 import time
 
+from service.clock import VirtualClock
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,22 +24,31 @@ class DataGenerationScheduler:
     """Manages scheduled data generation with drift correction."""
 
     def __init__(self, interval_minutes: int = 15, max_retries: int = 3,
-                 retry_delay_seconds: int = 60):
+                 retry_delay_seconds: int = 60, clock: Optional[VirtualClock] = None):
         """Initialize scheduler.
 
         Args:
             interval_minutes: Interval between data generations (default 15)
             max_retries: Maximum number of retries on failure
             retry_delay_seconds: Delay between retries in seconds
+            clock: Optional VirtualClock to tick through simulated time
+                instead of firing on wall-clock cron triggers
         """
         self.interval_minutes = interval_minutes
         self.max_retries = max_retries
         self.retry_delay_seconds = retry_delay_seconds
+        self.clock = clock
 
         self.scheduler: Optional[BackgroundScheduler] = None
         self.job_callback: Optional[Callable] = None
         self.retry_count = 0
 
+        # Virtual-time replay
+        self._replay_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.ticks = 0
+        self.last_tick_seconds = 0.0
+
     def start(self, job_callback: Callable[[], bool]):
         """Start the scheduler with the provided job callback.
 
@@ -42,6 +56,17 @@ class DataGenerationScheduler:
             job_callback: Function to call on each interval (should return True on success)
         """
         self.job_callback = job_callback
+
+        if self.clock is not None:
+            self._stop_event.clear()
+            self._replay_thread = threading.Thread(
+                target=self._run_virtual, name='virtual-scheduler', daemon=True
+            )
+            self._replay_thread.start()
+            logger.info(f"Scheduler started in virtual time at {self.clock.rate or 'max'}x "
+                        f"with {self.interval_minutes}-minute intervals")
+            return
+
         self.scheduler = BackgroundScheduler()
 
         # Add event listeners
@@ -79,8 +104,28 @@ class DataGenerationScheduler:
         logger.info("Executing initial data generation...")
         self._execute_with_retry()
 
-    def _execute_with_retry(self):
-        """Execute job with retry logic."""
+    def _run_virtual(self):
+        """Tick through simulated time until stopped or past the clock's end."""
+        interval = timedelta(minutes=self.interval_minutes)
+
+        while not self._stop_event.is_set() and not self.clock.finished():
+            tick_start = time.perf_counter()
+            self._execute_with_retry()
+            self.last_tick_seconds = time.perf_counter() - tick_start
+            self.ticks += 1
+
+            if not self.clock.advance(interval, self._stop_event):
+                break
+
+        if self.clock.finished():
+            logger.info(f"Virtual replay reached end time {self.clock.end} after {self.ticks} intervals")
+
+    def _execute_with_retry(self) -> bool:
+        """Execute job with retry logic.
+
+        Returns:
+            True if the job eventually succeeded, False otherwise
+        """
         for attempt in range(self.max_retries):
             try:
                 logger.info(f"Executing data generation job (attempt {attempt + 1}/{self.max_retries})")
@@ -90,7 +135,7 @@ class DataGenerationScheduler:
                 if success:
                     self.retry_count = 0  # Reset on success
                     logger.info("Data generation job completed successfully")
-                    return
+                    return True
                 else:
                     logger.warning(f"Data generation job failed (attempt {attempt + 1})")
 
@@ -100,11 +145,13 @@ class DataGenerationScheduler:
             # Wait before retry (except on last attempt)
             if attempt < self.max_retries - 1:
                 logger.info(f"Retrying in {self.retry_delay_seconds} seconds...")
-                time.sleep(self.retry_delay_seconds)
+                if self._stop_event.wait(self.retry_delay_seconds):
+                    break
 
         # All retries exhausted
         self.retry_count += 1
         logger.error(f"Data generation job failed after {self.max_retries} attempts")
+        return False
 
     def _job_executed_listener(self, event):
         """Listen to job execution events for monitoring.
@@ -119,6 +166,12 @@ class DataGenerationScheduler:
 
     def stop(self):
         """Stop the scheduler."""
+        if self._replay_thread:
+            self._stop_event.set()
+            self._replay_thread.join()
+            self._replay_thread = None
+            logger.info("Scheduler stopped")
+
         if self.scheduler:
             self.scheduler.shutdown(wait=True)
             logger.info("Scheduler stopped")
@@ -129,6 +182,9 @@ class DataGenerationScheduler:
         Returns:
             Next run time or None if scheduler not running
         """
+        if self.clock is not None:
+            return self.clock.now() if self.is_running() else None
+
         if self.scheduler and self.scheduler.running:
             job = self.scheduler.get_job('data_generation_job')
             if job:
@@ -141,6 +197,8 @@ class DataGenerationScheduler:
         Returns:
             True if running, False otherwise
         """
+        if self.clock is not None:
+            return self._replay_thread is not None and self._replay_thread.is_alive()
         return self.scheduler is not None and self.scheduler.running
 
     def get_status(self) -> dict:
@@ -156,6 +214,11 @@ class DataGenerationScheduler:
             'max_retries': self.max_retries
         }
 
+        if self.clock is not None:
+            status['clock'] = self.clock.get_status()
+            status['ticks'] = self.ticks
+            status['last_tick_seconds'] = round(self.last_tick_seconds, 3)
+
         next_run = self.get_next_run_time()
         if next_run:
             status['next_run_time'] = next_run.isoformat()
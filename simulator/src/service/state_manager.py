@@ -104,17 +104,20 @@ class StateManager:
             logger.error(f"Error detecting entities: {e}")
             return False
 
-    def calculate_gap(self, value_table: str = 'values_demo') -> Tuple[Optional[datetime], Optional[datetime], int]:
+    def calculate_gap(self, value_table: str = 'values_demo',
+                      current_time: Optional[datetime] = None) -> Tuple[Optional[datetime], Optional[datetime], int]:
         """Calculate time gap from last data to present.
 
         Args:
             value_table: Name of the values table
+            current_time: "Present" to measure the gap to (defaults to now;
+                simulated time when replaying on a virtual clock)
 
         Returns:
             Tuple of (start_time, end_time, num_intervals) for gap
         """
         last_ts = self.detect_last_timestamp(value_table)
-        current_time = datetime.now().replace(second=0, microsecond=0)
+        current_time = (current_time or datetime.now()).replace(second=0, microsecond=0)
 
         if not last_ts:
             logger.info("No existing data - full historical generation needed")
@@ -277,49 +280,51 @@ class StateManager:
         """
 
         try:
-            result = self.state_db.execute_query(query_check, (self.service_name,))
-
-            if result:
-                # Update existing record
-                query = """
-                    UPDATE core.simulator_state
-                    SET status = %s,
-                        last_run_timestamp = COALESCE(%s, last_run_timestamp),
-                        totalizers = COALESCE(%s, totalizers),
-                        config = COALESCE(%s, config),
-                        error_message = %s,
-                        updated_at = NOW()
-                    WHERE service_name = %s
-                """
-                self.state_db.execute_update(
-                    query,
-                    (
-                        status,
-                        last_run_ts,
-                        json.dumps(totalizers) if totalizers else None,
-                        json.dumps(config) if config else None,
-                        error_message,
-                        self.service_name
+            # Check and write on one connection so they commit together
+            with self.state_db.transaction():
+                result = self.state_db.execute_query(query_check, (self.service_name,))
+
+                if result:
+                    # Update existing record
+                    query = """
+                        UPDATE core.simulator_state
+                        SET status = %s,
+                            last_run_timestamp = COALESCE(%s, last_run_timestamp),
+                            totalizers = COALESCE(%s, totalizers),
+                            config = COALESCE(%s, config),
+                            error_message = %s,
+                            updated_at = NOW()
+                        WHERE service_name = %s
+                    """
+                    self.state_db.execute_update(
+                        query,
+                        (
+                            status,
+                            last_run_ts,
+                            json.dumps(totalizers) if totalizers else None,
+                            json.dumps(config) if config else None,
+                            error_message,
+                            self.service_name
+                        )
                     )
-                )
-            else:
-                # Insert new record
-                query = """
-                    INSERT INTO core.simulator_state
-                    (service_name, status, last_run_timestamp, totalizers, config, error_message)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """
-                self.state_db.execute_update(
-                    query,
-                    (
-                        self.service_name,
-                        status,
-                        last_run_ts,
-                        json.dumps(totalizers) if totalizers else None,
-                        json.dumps(config) if config else None,
-                        error_message
+                else:
+                    # Insert new record
+                    query = """
+                        INSERT INTO core.simulator_state
+                        (service_name, status, last_run_timestamp, totalizers, config, error_message)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                    """
+                    self.state_db.execute_update(
+                        query,
+                        (
+                            self.service_name,
+                            status,
+                            last_run_ts,
+                            json.dumps(totalizers) if totalizers else None,
+                            json.dumps(config) if config else None,
+                            error_message
+                        )
                     )
-                )
 
             logger.info(f"Saved service state: {status}")
 
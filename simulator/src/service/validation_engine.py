@@ -0,0 +1,417 @@
+"""Single-pass validation engine for simulator data.
+
+The value table is read once, one time chunk at a time, with chunks scanned
+in parallel. Each check is a reducer: it turns a chunk into a small partial
+result, and the partials are combined in time order into the final verdict.
+This replaces running one heavy query per check over the whole table.
+"""
+
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from database.connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+CHUNK_COLUMNS = ['entity_id', 'ts', 'value_n', 'value_b', 'value_s', 'status']
+
+# Samples kept per finding in the report
+MAX_SAMPLES = 10
+
+
+class ValidationContext:
+    """Entity metadata shared by reducers, loaded once per run."""
+
+    def __init__(self, start: datetime, end: datetime, interval_minutes: int = 15,
+                 point_ids: Optional[Set[int]] = None, totalizer_ids: Optional[Set[int]] = None,
+                 status_ids: Optional[Set[int]] = None, current_ids: Optional[Set[int]] = None,
+                 names: Optional[Dict[int, str]] = None):
+        """Initialize context.
+
+        Args:
+            start: Start of the validated range (inclusive)
+            end: End of the validated range (exclusive)
+            interval_minutes: Expected data interval
+            point_ids: All point entity IDs
+            totalizer_ids: Entity IDs tagged ``totalizing``
+            status_ids: Boolean status point entity IDs
+            current_ids: Entity IDs present in the current value table
+            names: Entity ID to ``id`` tag, for readable samples
+        """
+        self.start = start
+        self.end = end
+        self.interval_minutes = interval_minutes
+        self.point_ids = point_ids or set()
+        self.totalizer_ids = totalizer_ids or set()
+        self.status_ids = status_ids or set()
+        self.current_ids = current_ids
+        self.names = names or {}
+
+    def name(self, entity_id: int) -> str:
+        """Readable entity name."""
+        return self.names.get(int(entity_id), str(entity_id))
+
+
+class Reducer(ABC):
+    """A validation check over the chunked value stream.
+
+    Subclasses implement scan() (runs in worker threads, one call per chunk)
+    and combine() (runs once, with partials in chunk order).
+    """
+
+    name = ''
+
+    @abstractmethod
+    def scan(self, chunk: pd.DataFrame, context: ValidationContext) -> Any:
+        """Reduce one chunk, sorted by entity_id then ts, to a partial result."""
+
+    @abstractmethod
+    def combine(self, partials: List[Any], context: ValidationContext) -> Dict[str, Any]:
+        """Merge partial results into a report entry with a 'passed' key."""
+
+
+class ContinuityReducer(Reducer):
+    """Missing intervals and interval consistency across all data."""
+
+    name = 'continuity'
+
+    def __init__(self, min_consistency: float = 95.0):
+        """Initialize reducer.
+
+        Args:
+            min_consistency: Percentage of expected-length steps required to pass
+        """
+        self.min_consistency = min_consistency
+
+    def scan(self, chunk, context):
+        return np.unique(chunk['ts'].values)
+
+    def combine(self, partials, context):
+        timestamps = np.unique(np.concatenate(partials)) if partials else np.array([], dtype='datetime64[ns]')
+        if len(timestamps) == 0:
+            return {'passed': False, 'timestamps': 0, 'message': 'No data in range'}
+
+        interval = np.timedelta64(context.interval_minutes, 'm')
+        steps = np.diff(timestamps)
+        gap_index = np.flatnonzero(steps > interval)
+        correct = int(np.sum(steps == interval))
+        consistency = correct / len(steps) * 100 if len(steps) else 100.0
+
+        expected = pd.date_range(context.start, context.end, freq=f'{context.interval_minutes}min', inclusive='left')
+        missing = int(len(expected.difference(pd.DatetimeIndex(timestamps))))
+
+        return {
+            'passed': len(gap_index) == 0 and consistency >= self.min_consistency,
+            'timestamps': int(len(timestamps)),
+            'expected_intervals': int(len(expected)),
+            'missing_intervals': missing,
+            'gap_count': int(len(gap_index)),
+            'gaps': [
+                {
+                    'start': str(pd.Timestamp(timestamps[i])),
+                    'end': str(pd.Timestamp(timestamps[i + 1])),
+                    'minutes': float(steps[i] / np.timedelta64(1, 'm'))
+                }
+                for i in gap_index[:MAX_SAMPLES]
+            ],
+            'interval_consistency_pct': round(consistency, 2)
+        }
+
+
+class DuplicateReducer(Reducer):
+    """More than one row for the same entity and timestamp."""
+
+    name = 'duplicates'
+
+    def scan(self, chunk, context):
+        dupes = chunk[chunk.duplicated(['entity_id', 'ts'], keep='first')]
+        samples = dupes[['entity_id', 'ts']].drop_duplicates().head(MAX_SAMPLES)
+        return len(dupes), [(int(e), str(ts)) for e, ts in samples.itertuples(index=False)]
+
+    def combine(self, partials, context):
+        count = sum(p[0] for p in partials)
+        samples = [s for p in partials for s in p[1]][:MAX_SAMPLES]
+        return {
+            'passed': count == 0,
+            'duplicate_rows': count,
+            'samples': [{'entity': context.name(e), 'ts': ts} for e, ts in samples]
+        }
+
+
+class MonotonicTotalizerReducer(Reducer):
+    """Totalizers must never decrease, including across chunk boundaries."""
+
+    name = 'totalizers'
+
+    def scan(self, chunk, context):
+        data = chunk[chunk['entity_id'].isin(context.totalizer_ids) & chunk['value_n'].notna()]
+        if data.empty:
+            return {}, 0, []
+
+        values = data['value_n'].astype(float)
+        same_entity = data['entity_id'].eq(data['entity_id'].shift())
+        decreases = data[same_entity & (values < values.shift())]
+        samples = [(int(e), str(ts)) for e, ts in decreases[['entity_id', 'ts']].head(MAX_SAMPLES).itertuples(index=False)]
+
+        grouped = data.groupby('entity_id')
+        edges = {
+            int(entity_id): (first, last)
+            for entity_id, first, last in zip(
+                grouped.size().index, grouped['value_n'].first().astype(float), grouped['value_n'].last().astype(float)
+            )
+        }
+        return edges, len(decreases), samples
+
+    def combine(self, partials, context):
+        decreases = sum(p[1] for p in partials)
+        samples = [s for p in partials for s in p[2]]
+        boundary_decreases = 0
+        last_seen: Dict[int, float] = {}
+        for edges, _, _ in partials:
+            for entity_id, (first, last) in edges.items():
+                if entity_id in last_seen and first < last_seen[entity_id]:
+                    boundary_decreases += 1
+                    samples.append((entity_id, 'chunk boundary'))
+                last_seen[entity_id] = last
+
+        total = decreases + boundary_decreases
+        return {
+            'passed': total == 0,
+            'totalizers_checked': len(last_seen),
+            'decreases': total,
+            'samples': [{'entity': context.name(e), 'ts': ts} for e, ts in samples[:MAX_SAMPLES]]
+        }
+
+
+class CoverageReducer(Reducer):
+    """Points with history in range and with a current value."""
+
+    name = 'coverage'
+
+    def __init__(self, min_coverage: float = 100.0):
+        """Initialize reducer.
+
+        Args:
+            min_coverage: Percentage of points that must have history to pass
+        """
+        self.min_coverage = min_coverage
+
+    def scan(self, chunk, context):
+        return set(chunk['entity_id'].unique().tolist()), len(chunk)
+
+    def combine(self, partials, context):
+        seen = set().union(*(p[0] for p in partials)) if partials else set()
+        rows = sum(p[1] for p in partials)
+        points = context.point_ids or seen
+        missing_history = sorted(points - seen)
+        coverage = (len(points) - len(missing_history)) / len(points) * 100 if points else 0.0
+
+        result = {
+            'passed': bool(points) and coverage >= self.min_coverage,
+            'points': len(points),
+            'points_with_history': len(points) - len(missing_history),
+            'history_coverage_pct': round(coverage, 2),
+            'rows': rows,
+            'missing_history': [context.name(e) for e in missing_history[:MAX_SAMPLES]]
+        }
+        if context.current_ids is not None:
+            missing_current = sorted(points - context.current_ids)
+            result['points_with_current'] = len(points) - len(missing_current)
+            result['missing_current'] = [context.name(e) for e in missing_current[:MAX_SAMPLES]]
+            result['passed'] = result['passed'] and not missing_current
+        return result
+
+
+class StatusReducer(Reducer):
+    """Data quality status distribution and boolean status point values."""
+
+    name = 'status'
+
+    def __init__(self, max_bad_pct: float = 5.0):
+        """Initialize reducer.
+
+        Args:
+            max_bad_pct: Maximum percentage of rows with a non-'ok' status
+        """
+        self.max_bad_pct = max_bad_pct
+
+    def scan(self, chunk, context):
+        counts = chunk['status'].fillna('null').value_counts().to_dict()
+        status_rows = chunk[chunk['entity_id'].isin(context.status_ids)]
+        invalid = int(status_rows['value_b'].isna().sum())
+        return counts, invalid, len(status_rows)
+
+    def combine(self, partials, context):
+        counts: Dict[str, int] = {}
+        for partial_counts, _, _ in partials:
+            for status, count in partial_counts.items():
+                counts[status] = counts.get(status, 0) + int(count)
+        invalid = sum(p[1] for p in partials)
+        status_rows = sum(p[2] for p in partials)
+        total = sum(counts.values())
+        bad_pct = (total - counts.get('ok', 0)) / total * 100 if total else 0.0
+
+        return {
+            'passed': invalid == 0 and bad_pct <= self.max_bad_pct,
+            'status_counts': counts,
+            'non_ok_pct': round(bad_pct, 2),
+            'status_point_rows': status_rows,
+            'status_points_without_bool': invalid
+        }
+
+
+DEFAULT_REDUCERS = (ContinuityReducer, DuplicateReducer, MonotonicTotalizerReducer, CoverageReducer, StatusReducer)
+
+
+class ValidationEngine:
+    """Scans a value table once per time chunk and runs reducers over it."""
+
+    def __init__(self, db_config: Dict[str, Any], value_table: str, start: datetime, end: datetime,
+                 interval_minutes: int = 15, chunk: timedelta = timedelta(days=1),
+                 workers: int = 4, reducers: Optional[List[Reducer]] = None):
+        """Initialize validation engine.
+
+        Args:
+            db_config: Database connection configuration
+            value_table: Name of the values table (current table is <value_table>_current)
+            start: Start of the range to validate (inclusive)
+            end: End of the range to validate (exclusive)
+            interval_minutes: Expected data interval
+            chunk: Time span read per query
+            workers: Chunks scanned in parallel, each on its own connection
+            reducers: Checks to run (defaults to all built-in reducers)
+        """
+        self.db_config = db_config
+        self.value_table = value_table
+        self.start = start
+        self.end = end
+        self.interval_minutes = interval_minutes
+        self.chunk = chunk
+        self.workers = workers
+        self.reducers = reducers if reducers is not None else [cls() for cls in DEFAULT_REDUCERS]
+
+        self._local = threading.local()
+        self._connections: List[DatabaseConnection] = []
+        self._connections_lock = threading.Lock()
+
+    def _db(self) -> DatabaseConnection:
+        """Connection owned by the calling worker thread."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = DatabaseConnection(dict(self.db_config, pool_min=1, pool_max=1))
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    def chunk_ranges(self) -> List[Tuple[datetime, datetime]]:
+        """Split [start, end) into chunk-sized ranges."""
+        ranges = []
+        chunk_start = self.start
+        while chunk_start < self.end:
+            chunk_end = min(chunk_start + self.chunk, self.end)
+            ranges.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+        return ranges
+
+    def load_context(self) -> ValidationContext:
+        """Load entity metadata with one tag query and one current-table read."""
+        rows = self._db().execute_query("""
+            SELECT et.entity_id, td.name, et.value_s
+            FROM core.entity_tag et
+            JOIN core.tag_def td ON et.tag_id = td.id
+            WHERE td.name IN ('point', 'totalizing', 'id', 'kind')
+            AND (et.value_b IS TRUE OR et.value_s IS NOT NULL)
+        """)
+        tags: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            tags.setdefault(row['entity_id'], {})[row['name']] = row['value_s'] if row['value_s'] is not None else True
+
+        current = self._db().execute_query(f"SELECT DISTINCT entity_id FROM core.{self.value_table}_current")
+
+        points = {e for e, t in tags.items() if t.get('point') is True}
+        return ValidationContext(
+            self.start, self.end, self.interval_minutes,
+            point_ids=points,
+            totalizer_ids={e for e in points if tags[e].get('totalizing') is True},
+            status_ids={e for e in points if tags[e].get('kind') == 'Bool' and str(tags[e].get('id', '')).endswith('-status')},
+            current_ids={row['entity_id'] for row in current},
+            names={e: t['id'] for e, t in tags.items() if isinstance(t.get('id'), str)}
+        )
+
+    def fetch_chunk(self, chunk_start: datetime, chunk_end: datetime) -> pd.DataFrame:
+        """Read one chunk of the value table, ordered by entity then time."""
+        query = f"""
+            SELECT entity_id, ts, value_n, value_b, value_s, status
+            FROM core.{self.value_table}
+            WHERE ts >= %s AND ts < %s
+            ORDER BY entity_id, ts
+        """
+        with self._db().get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (chunk_start, chunk_end))
+                rows = cur.fetchall()
+        return pd.DataFrame(rows, columns=CHUNK_COLUMNS)
+
+    def _scan(self, chunk_range: Tuple[datetime, datetime], context: ValidationContext) -> Tuple[int, List[Any]]:
+        """Fetch one chunk and run every reducer's scan over it."""
+        chunk = self.fetch_chunk(*chunk_range)
+        chunk['ts'] = pd.to_datetime(chunk['ts'])
+        partials = [reducer.scan(chunk, context) for reducer in self.reducers]
+        logger.info(f"Scanned {chunk_range[0]} - {chunk_range[1]}: {len(chunk)} rows")
+        return len(chunk), partials
+
+    def run(self, context: Optional[ValidationContext] = None) -> Dict[str, Any]:
+        """Run all reducers over the range.
+
+        Args:
+            context: Entity metadata (loaded from the database if omitted)
+
+        Returns:
+            Report dictionary with per-check results and an overall 'passed'
+        """
+        started = time.perf_counter()
+        try:
+            context = context or self.load_context()
+            ranges = self.chunk_ranges()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='validate') as executor:
+                scanned = list(executor.map(lambda r: self._scan(r, context), ranges))
+        finally:
+            self.close()
+
+        checks = {}
+        for index, reducer in enumerate(self.reducers):
+            checks[reducer.name] = reducer.combine([partials[index] for _, partials in scanned], context)
+
+        return {
+            'table': self.value_table,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'chunks': len(ranges),
+            'rows_scanned': sum(rows for rows, _ in scanned),
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+            'passed': all(check['passed'] for check in checks.values()),
+            'checks': checks
+        }
+
+    def close(self):
+        """Close worker connections."""
+        with self._connections_lock:
+            for db in self._connections:
+                db.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def report_to_json(report: Dict[str, Any]) -> str:
+    """Serialize a validation report."""
+    return json.dumps(report, indent=2, default=str)
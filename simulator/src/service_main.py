@@ -20,6 +20,7 @@ from service.continuous_generator import ContinuousDataService
 from service.scheduler import DataGenerationScheduler
 from service.health_server import HealthCheckServer
 from service.activity_logger import ActivityLogger
+from service.clock import VirtualClock
 from api.simulator_api import create_app
 
 # Import uvicorn for running FastAPI
@@ -110,6 +111,7 @@ def load_config_with_env(config_path: str) -> Dict[str, Any]:
     config['database']['database'] = os.getenv('DB_NAME', config['database'].get('database', 'datakwip'))
     config['database']['user'] = os.getenv('DB_USER', config['database'].get('user', 'demo'))
     config['database']['password'] = os.getenv('DB_PASSWORD', config['database'].get('password', 'demo123'))
+    config['database']['statement_timeout_ms'] = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', config['database'].get('statement_timeout_ms', 0)))
 
     # Override with individual environment variables if present (State DB)
     config['state_database']['host'] = os.getenv('STATE_DB_HOST', config['state_database'].get('host', 'localhost'))
@@ -155,9 +157,15 @@ def main():
         logger.info(f"  API port: {api_port}")
         logger.info(f"  Data interval: {interval_minutes} minutes")
 
+        # Optional accelerated replay (SIMULATION_CLOCK=virtual)
+        clock = VirtualClock.from_env()
+        if clock:
+            logger.info(f"  Clock: virtual at {clock.rate or 'max'}x"
+                        f"{f' until {clock.end}' if clock.end else ''}")
+
         # Initialize service
         value_table = db_config['tables']['value_table']
-        service = ContinuousDataService(db_config, building_config, value_table)
+        service = ContinuousDataService(db_config, building_config, value_table, clock=clock)
 
         # Start service
         logger.info("Starting service...")
@@ -170,7 +178,8 @@ def main():
         activity_logger = ActivityLogger(service.state_db)
         activity_logger.log_start({
             'value_table': value_table,
-            'interval_minutes': interval_minutes
+            'interval_minutes': interval_minutes,
+            'clock': service.clock.get_status()
         })
 
         # Attach activity logger to service for generation event logging
@@ -203,7 +212,7 @@ def main():
 
         # Start scheduler
         logger.info("Starting data generation scheduler...")
-        scheduler = DataGenerationScheduler(interval_minutes=interval_minutes)
+        scheduler = DataGenerationScheduler(interval_minutes=interval_minutes, clock=clock)
         scheduler.start(service.generate_current_interval)
 
         logger.info("=" * 60)
@@ -222,6 +231,7 @@ def main():
         logger.info("Shutting down...")
         activity_logger.log_stop(reason="Graceful shutdown")
         scheduler.stop()
+        activity_logger.close()
         service.shutdown()
 
         logger.info("Service stopped successfully")
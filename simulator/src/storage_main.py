@@ -0,0 +1,71 @@
+"""Entry point for applying storage policies to an organization's value tables.
+
+Measures table size and read-query latency, applies the compression, chunk
+interval and retention policies from ``organization.storage`` in the
+database config, optionally compresses and drops eligible chunks right
+away, then measures again and reports space saved and query speed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent))
+
+from database.connection import DatabaseConnection
+from database.storage_policy import StoragePolicyManager, resolve_policies, compare_snapshots
+from service_main import load_config_with_env
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Storage policy entry point."""
+    parser = argparse.ArgumentParser(description='Apply compression and retention policies to value hypertables')
+    parser.add_argument('--run-now', action='store_true',
+                        help='Compress and drop eligible chunks now instead of waiting for background jobs')
+    parser.add_argument('--no-benchmark', action='store_true', help='Skip the before/after query timings')
+    parser.add_argument('--dry-run', action='store_true', help='Print the resolved policies and exit')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    db_config = load_config_with_env(os.getenv('DB_CONFIG_PATH', 'config/database_config.yaml'))
+    if args.dry_run:
+        print(json.dumps(resolve_policies(db_config['organization']), indent=2))
+        return
+
+    db = DatabaseConnection(db_config['database'])
+    try:
+        manager = StoragePolicyManager(db, db_config['organization'])
+        benchmark = not args.no_benchmark
+        before = manager.snapshot(benchmark=benchmark)
+        report = {'policies': manager.policies, 'actions': manager.apply()}
+        if args.run_now:
+            report['run_now'] = manager.run_now()
+        after = manager.snapshot(benchmark=benchmark)
+        report['comparison'] = compare_snapshots(before, after)
+    finally:
+        db.close()
+
+    output = json.dumps(report, indent=2, default=str)
+    print(output)
+
+    if args.output:
+        Path(args.output).write_text(output)
+        logger.info(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""Test the buffered ActivityLogger and its rollups."""
+
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from service.activity_logger import ActivityLogger
+
+
+class RecordingCursor:
+    """Minimal cursor for psycopg2's execute_values."""
+
+    class connection:
+        encoding = 'UTF8'
+
+    def __init__(self, db):
+        self.db = db
+
+    def mogrify(self, template, args):
+        self.db.rows.append(args)
+        return repr(args).encode()
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class RecordingStateDb:
+    """Stands in for the state DatabaseConnection."""
+
+    def __init__(self, seed_counts=(), seed_recent=()):
+        self.seed_counts = list(seed_counts)
+        self.seed_recent = list(seed_recent)
+        self.queries = []
+        self.statements = []
+        self.rows = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        if 'GROUP BY event_type' in query:
+            return self.seed_counts
+        if "INTERVAL '24 hours'" in query:
+            return self.seed_recent
+        return []
+
+    @contextmanager
+    def get_connection(self):
+        class Conn:
+            def cursor(conn):
+                return RecordingCursor(self)
+        yield Conn()
+
+
+def test_batched_inserts():
+    """Test that events are written as multi-row inserts on flush."""
+    print("\n=== TEST: Batched Inserts ===")
+
+    db = RecordingStateDb()
+    activity = ActivityLogger(db, batch_size=50, flush_interval=60)
+    for i in range(120):
+        activity.log_generation(datetime(2025, 1, 1) + timedelta(minutes=15 * i), 10, 5)
+    activity.close()
+
+    assert len(db.rows) == 120, "Every event should be written"
+    assert len(db.statements) == 3, "120 events at batch size 50 should take 3 inserts"
+    assert all(row[1] == 'generation' for row in db.rows)
+
+    print(f"✅ {len(db.rows)} events in {len(db.statements)} inserts")
+
+
+def test_time_threshold_flush():
+    """Test that the background writer flushes on the time threshold."""
+    print("\n=== TEST: Time Threshold ===")
+
+    db = RecordingStateDb()
+    activity = ActivityLogger(db, batch_size=1000, flush_interval=0.1)
+    activity.log_error("boom")
+    deadline = time.time() + 2
+    while not db.rows and time.time() < deadline:
+        time.sleep(0.02)
+    activity.close()
+
+    assert len(db.rows) == 1, "Pending event should be flushed without a full batch"
+
+    print("✅ Flushed on interval")
+
+
+def test_rollups():
+    """Test rollups seeded from the log and updated from new events."""
+    print("\n=== TEST: Rollups ===")
+
+    now = time.time()
+    db = RecordingStateDb(
+        seed_counts=[
+            {'event_type': 'generation', 'count': 4, 'points': 400},
+            {'event_type': 'error', 'count': 2, 'points': 0},
+        ],
+        seed_recent=[
+            {'event_type': 'error', 'epoch': now - 3600, 'point_count': None, 'entity_count': None},
+            {'event_type': 'generation', 'epoch': now - 7200, 'point_count': '100', 'entity_count': '40'},
+        ]
+    )
+    activity = ActivityLogger(db, flush_interval=60)
+    queries_after_startup = len(db.queries)
+
+    details = {'point_count': 150, 'entity_count': 42}
+    activity.log_event('generation', 'Generated', details, timestamp=datetime.now() - timedelta(minutes=5))
+    activity.log_event('generation', 'Generated', details, timestamp=datetime.now())
+    activity.log_error("boom")
+
+    rollups = activity.rollups.snapshot()
+    assert rollups['points_generated_total'] == 700
+    assert rollups['entity_count'] == 42
+    assert rollups['error_count_24h'] == 2, "One seeded and one new error in the last 24h"
+    assert rollups['event_counts'] == {'generation': 6, 'error': 3}
+    assert 55 <= rollups['generation_rate_per_min'] <= 65, "300 points over ~5 minutes"
+    assert activity.get_error_count(since=datetime.now() - timedelta(hours=2)) == 2
+    assert len(db.queries) == queries_after_startup, "Rollups should not query the log"
+
+    activity.close()
+    print(f"✅ Rollups: {rollups['points_generated_total']} points, {rollups['error_count_24h']} errors")
+
+
+def test_bounded_queue():
+    """Test that a full queue drops events instead of blocking."""
+    print("\n=== TEST: Bounded Queue ===")
+
+    db = RecordingStateDb()
+    activity = ActivityLogger(db, batch_size=1000, flush_interval=60, max_queue=5)
+    results = [activity.log_event('start', 'Started') for _ in range(8)]
+    activity.close()
+
+    assert results.count(False) == 3 and activity.dropped_events == 3
+    assert len(db.rows) == 5
+
+    print("✅ Overflow dropped and counted")
+
+
+def test_failed_insert_retried():
+    """Test that events of a failed insert are written on the next flush."""
+    print("\n=== TEST: Failed Insert Retried ===")
+
+    db = RecordingStateDb()
+    activity = ActivityLogger(db, batch_size=10, flush_interval=60, max_queue=4)
+    healthy = db.get_connection
+
+    @contextmanager
+    def broken():
+        raise ConnectionError("database down")
+        yield
+
+    db.get_connection = broken
+    for i in range(6):
+        activity.log_event('start', f'Started {i}')
+        if i == 2:
+            assert activity.flush() == 0
+    assert activity.flush() == 0
+    assert activity.dropped_events == 2, "Retry backlog should stay within max_queue"
+
+    db.get_connection = healthy
+    assert activity.flush() == 4
+    assert [row[2] for row in db.rows] == [f'Started {i}' for i in range(2, 6)], "Oldest events go first"
+    activity.close()
+
+    print("✅ Failed events retried")
+
+
+def test_rollup_windows_bounded():
+    """Test that rollup windows are pruned as events arrive, without snapshots."""
+    db = RecordingStateDb()
+    activity = ActivityLogger(db, batch_size=1000, flush_interval=60, max_queue=100000)
+    start = datetime(2025, 1, 1)
+    for i in range(2000):
+        ts = start + timedelta(minutes=i)
+        activity.log_event('generation', 'Generated', {'point_count': 1, 'entity_count': 1}, timestamp=ts)
+        activity.log_event('error', 'Failed', timestamp=ts)
+    activity.close()
+
+    assert len(activity.rollups._generations) <= 11, "Only the last 10 minutes of generations are kept"
+    assert len(activity.rollups._errors) <= 24 * 60 + 1, "Only the last 24 hours of errors are kept"
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("ACTIVITY LOGGER TESTS")
+    print("=" * 60)
+
+    try:
+        test_batched_inserts()
+        test_time_threshold_flush()
+        test_rollups()
+        test_bounded_queue()
+        test_failed_insert_retried()
+        test_rollup_windows_bounded()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL ACTIVITY LOGGER TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
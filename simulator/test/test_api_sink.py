@@ -0,0 +1,196 @@
+"""Test the API /bulk/value sink against a local HTTP server."""
+
+import gzip
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from datetime import datetime
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from generators.entities import EntityGenerator
+from service.api_sink import ApiValueSink, ApiLoadGenerator, LoadStats
+
+SIMULATOR_ROOT = Path(__file__).parent.parent
+
+
+class BulkValueHandler(BaseHTTPRequestHandler):
+    """Records /bulk/value posts, failing when asked to."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('Authorization'), payload))
+        status = 503 if server.fail else 200
+        response = json.dumps({'count': len(payload['values'])}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingSchema:
+    """Stands in for SchemaSetup and hands out sequential entity IDs."""
+
+    def create_entities(self, tag_list, value_table_id="demo"):
+        return list(range(1, len(tag_list) + 1))
+
+
+def start_server(fail=False):
+    """Start a recording server on a free port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BulkValueHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.fail = fail
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_points(count):
+    """Data points shaped like TimeSeriesGenerator output."""
+    ts = datetime(2025, 7, 15, 14, 0)
+    return [
+        {'entity_id': i + 1, 'ts': ts, 'value_n': float(i), 'value_b': None,
+         'value_s': None, 'status': 'ok'}
+        for i in range(count)
+    ]
+
+
+def test_serialize_point():
+    """Test conversion to the API value schema."""
+    print("\n=== TEST: Serialize Point ===")
+
+    value = ApiValueSink.serialize_point({
+        'entity_id': 7, 'ts': datetime(2025, 1, 1, 0, 15), 'value_n': float('nan'),
+        'value_b': True, 'value_s': None, 'status': 'ok'
+    })
+
+    assert value == {'entity_id': 7, 'ts': '2025-01-01T00:15:00', 'value_b': True}, \
+        "NaN/None values and non-API fields should be dropped"
+
+    print("✅ Points serialized to API schema")
+
+
+def test_batching_and_stats():
+    """Test batch splitting, auth header, gzip bodies and stats."""
+    print("\n=== TEST: Batching And Stats ===")
+
+    server, url = start_server()
+    sink = ApiValueSink(url, 'secret', org_id=3, batch_size=40, concurrency=3, gzip_body=True)
+    try:
+        assert sink.insert_time_series_batch(make_points(100))
+        assert sink.insert_time_series_batch([]), "Empty batches should be a no-op"
+    finally:
+        sink.close()
+        server.shutdown()
+
+    assert len(server.requests) == 3, "100 points at batch size 40 should take 3 requests"
+    assert {r[0] for r in server.requests} == {'/bulk/value'}
+    assert {r[1] for r in server.requests} == {'Bearer secret'}
+    assert all(r[2]['org_id'] == 3 for r in server.requests)
+    received = sorted(v['entity_id'] for r in server.requests for v in r[2]['values'])
+    assert received == list(range(1, 101)), "Every point should be posted exactly once"
+
+    summary = sink.stats.summary()
+    assert summary['requests'] == 3 and summary['errors'] == 0
+    assert summary['rows'] == 100
+    assert summary['bytes_sent'] > 0
+    assert 0 < summary['latency_ms']['p50'] <= summary['latency_ms']['p99'] <= summary['latency_ms']['max']
+
+    print(f"✅ Posted {summary['rows']} points in {summary['requests']} requests")
+
+
+def test_failures_recorded():
+    """Test that rejected requests are counted as errors."""
+    print("\n=== TEST: Failures Recorded ===")
+
+    server, url = start_server(fail=True)
+    sink = ApiValueSink(url, 'secret', org_id=3, batch_size=10)
+    try:
+        assert not sink.insert_time_series_batch(make_points(25))
+    finally:
+        sink.close()
+        server.shutdown()
+
+    summary = sink.stats.summary()
+    assert summary['errors'] == 3 and summary['rows'] == 0
+
+    print("✅ 503 responses counted as errors")
+
+
+def test_load_generator():
+    """Test replaying intervals through the sink."""
+    print("\n=== TEST: Load Generator ===")
+
+    with open(SIMULATOR_ROOT / 'config' / 'building_config.yaml') as f:
+        config = yaml.safe_load(f)
+    entity_map = EntityGenerator(CountingSchema(), config).generate_all_entities()
+
+    server, url = start_server()
+    sink = ApiValueSink(url, 'secret', org_id=1, batch_size=500)
+    try:
+        report = ApiLoadGenerator(sink, config, entity_map).run(
+            datetime(2025, 7, 15, 0, 0), datetime(2025, 7, 15, 3, 45)
+        )
+    finally:
+        sink.close()
+        server.shutdown()
+
+    assert report['intervals'] == 16, "Four hours at 15 minutes should be 16 intervals"
+    assert report['failed_intervals'] == 0
+    assert report['rows'] == sum(len(r[2]['values']) for r in server.requests)
+    assert report['rows'] > 0
+    assert {v['entity_id'] for r in server.requests for v in r[2]['values']} <= set(entity_map.values())
+
+    print(f"✅ Replayed {report['intervals']} intervals, {report['rows']} points")
+
+
+def test_stats_empty():
+    """Test summary with no requests."""
+    print("\n=== TEST: Empty Stats ===")
+
+    summary = LoadStats().summary()
+    assert summary['requests'] == 0 and summary['rows_per_second'] == 0.0
+    assert summary['latency_ms'] == {}
+
+    print("✅ Empty summary")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("API SINK TESTS")
+    print("=" * 60)
+
+    try:
+        test_serialize_point()
+        test_batching_and_stats()
+        test_failures_recorded()
+        test_load_generator()
+        test_stats_empty()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL API SINK TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
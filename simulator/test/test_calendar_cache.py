@@ -0,0 +1,101 @@
+"""Test calendar cache lookups and vectorized occupancy."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from generators.schedules import CalendarCache, ScheduleGenerator
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'building_config.yaml'
+
+
+def load_config():
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+def test_holidays():
+    """Test US federal holiday dates."""
+    print("\n=== TEST: Holidays ===")
+
+    holidays = set(CalendarCache.holidays(2025))
+
+    assert date(2025, 1, 20) in holidays, "MLK Day is the 3rd Monday of January"
+    assert date(2025, 5, 26) in holidays, "Memorial Day is the last Monday of May"
+    assert date(2025, 9, 1) in holidays, "Labor Day is the 1st Monday of September"
+    assert date(2025, 11, 27) in holidays, "Thanksgiving is the 4th Thursday of November"
+    assert date(2025, 7, 4) in holidays
+    assert len(holidays) == 9
+
+    print(f"✅ {len(holidays)} holidays in 2025")
+
+
+def test_lookup_tables():
+    """Test flags and base occupancy lookups."""
+    print("\n=== TEST: Lookup Tables ===")
+
+    calendar = CalendarCache(load_config()['schedules'], interval_minutes=15)
+
+    flags, base = calendar.year_tables(2024)
+    assert flags.shape == (366,), "Leap year has 366 days"
+    assert base.shape == (366, 96)
+
+    assert calendar.is_weekend(datetime(2025, 7, 12, 10, 0))
+    assert calendar.is_holiday(datetime(2025, 7, 4, 10, 0))
+    assert not calendar.is_holiday(datetime(2025, 7, 7, 10, 0))
+
+    assert calendar.base_occupancy(datetime(2025, 7, 15, 9, 0)) == 0.85
+    assert np.isclose(calendar.base_occupancy(datetime(2025, 7, 15, 7, 30)), 0.375), \
+        "Weekday schedule is interpolated between points"
+    assert np.isclose(calendar.base_occupancy(datetime(2025, 7, 4, 10, 0)), 0.07), \
+        "Holidays use the weekend schedule"
+
+    timestamps = pd.date_range('2024-12-31 12:00', '2025-01-02 12:00', freq='15min')
+    vec_flags, vec_base = calendar.lookup(timestamps)
+    assert list(vec_base) == [calendar.base_occupancy(t) for t in timestamps], \
+        "Vectorized lookup should match scalar lookup across years"
+    assert list(vec_flags) == [calendar.flags(t) for t in timestamps]
+
+    print("✅ Lookups consistent")
+
+
+def test_vectorized_occupancy():
+    """Test vectorized occupancy matches per-timestamp calls."""
+    print("\n=== TEST: Vectorized Occupancy ===")
+
+    config = load_config()
+    timestamps = pd.date_range('2025-07-01', '2025-07-08', freq='15min')
+
+    sched = ScheduleGenerator(config)
+    scalar = np.array([sched.get_occupancy_ratio(t.to_pydatetime()) for t in timestamps])
+    vector = ScheduleGenerator(config).get_occupancy_ratios(timestamps)
+
+    assert np.allclose(scalar, vector), "Same seed should give the same ratios"
+    assert vector.min() >= 0.0 and vector.max() <= 1.0
+
+    print(f"✅ {len(vector)} occupancy ratios match")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("CALENDAR CACHE TESTS")
+    print("=" * 60)
+
+    try:
+        test_holidays()
+        test_lookup_tables()
+        test_vectorized_occupancy()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL CALENDAR CACHE TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,213 @@
+"""Test the instrumented connection pool without a database."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database.connection import DatabaseConnection
+from database.pool import PoolTimeout
+
+
+class FakeCursor:
+    """Records executed statements."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((query, params))
+
+    def fetchall(self):
+        return [{'value_n': 1.0}]
+
+
+class FakeConnection:
+    """Connection stand-in tracking commits and rollbacks."""
+
+    def __init__(self):
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.executed = []
+        self.prepared_statements = set()
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    """Inner pool handing out fake connections."""
+
+    def __init__(self):
+        self.idle = []
+        self.created = []
+        self.discarded = []
+
+    def getconn(self):
+        if self.idle:
+            return self.idle.pop()
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.discarded.append(conn)
+        else:
+            self.idle.append(conn)
+
+    def closeall(self):
+        pass
+
+
+def make_db(pool_max=2, pool_timeout=0.2):
+    """DatabaseConnection whose pool never opens a real connection."""
+    db = DatabaseConnection({
+        'host': 'localhost', 'port': 5432, 'database': 'pool_test',
+        'user': 'test', 'password': 'test',
+        'pool_min': 0, 'pool_max': pool_max, 'pool_timeout': pool_timeout
+    })
+    db.pool._pool = FakePool()
+    return db
+
+
+def test_thread_affinity_and_transactions():
+    """Test nested checkouts share a connection and commit once."""
+    print("\n=== TEST: Thread Affinity And Transactions ===")
+
+    db = make_db()
+    with db.transaction() as conn:
+        db.execute_update("UPDATE a SET x = 1")
+        db.execute_query("SELECT 1")
+        with db.get_connection() as inner:
+            assert inner is conn, "Nested checkout should reuse the thread's connection"
+        assert conn.commits == 0, "Inner scopes must not commit"
+    assert conn.commits == 1 and len(conn.executed) == 2
+
+    try:
+        with db.transaction() as conn:
+            db.execute_update("UPDATE a SET x = 2")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert conn.rollbacks == 1 and conn.commits == 1, "Failed transaction should roll back"
+
+    stats = db.get_pool_stats()
+    assert stats['in_use'] == 0 and stats['checkouts'] == 2
+    assert len(db.pool._pool.created) == 1, "Connection should be reused across transactions"
+
+    print("✅ Nested operations ran on one connection and committed together")
+
+
+def test_blocking_checkout_and_timeout():
+    """Test an exhausted pool blocks, then times out."""
+    print("\n=== TEST: Blocking Checkout And Timeout ===")
+
+    db = make_db(pool_max=1, pool_timeout=0.1)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with db.get_connection():
+            held.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    held.wait(5)
+
+    try:
+        with db.get_connection():
+            pass
+        raise AssertionError("Checkout should time out while the only connection is held")
+    except PoolTimeout:
+        pass
+    assert db.get_pool_stats()['timeouts'] == 1
+
+    # A waiter is served as soon as the holder releases
+    db.pool.timeout = 5
+    threading.Timer(0.05, release.set).start()
+    start = time.perf_counter()
+    with db.get_connection():
+        waited = time.perf_counter() - start
+    worker.join()
+    assert waited >= 0.04, f"Checkout should have waited for the release, waited {waited:.3f}s"
+    assert db.get_pool_stats()['max_wait_seconds'] >= 0.04
+
+    print(f"✅ Exhausted pool timed out, then served a waiter after {waited * 1000:.0f} ms")
+
+
+def test_broken_connection_discarded():
+    """Test closed connections are not returned to the pool."""
+    print("\n=== TEST: Broken Connection Discarded ===")
+
+    db = make_db()
+    try:
+        with db.get_connection() as conn:
+            conn.closed = 2
+            raise RuntimeError("server closed the connection")
+    except RuntimeError:
+        pass
+    assert db.pool._pool.discarded == [conn] and not db.pool._pool.idle
+    assert conn.rollbacks == 0, "Rollback must not be attempted on a closed connection"
+
+    print("✅ Closed connection discarded")
+
+
+def test_prepared_statements():
+    """Test statements are prepared once per connection."""
+    print("\n=== TEST: Prepared Statements ===")
+
+    db = make_db()
+    name = db.prepare('last_value', 'SELECT value_n FROM t WHERE name = $1')
+    for _ in range(3):
+        assert db.execute_prepared(name, ('energy',)) == [{'value_n': 1.0}]
+
+    conn = db.pool._pool.created[0]
+    statements = [query for query, _ in conn.executed]
+    assert statements.count('PREPARE last_value AS SELECT value_n FROM t WHERE name = $1') == 1
+    assert statements.count('EXECUTE last_value (%s)') == 3
+    assert conn.executed[-1][1] == ('energy',)
+
+    print("✅ PREPARE ran once, EXECUTE three times")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("CONNECTION POOL TESTS")
+    print("=" * 60)
+
+    try:
+        test_thread_affinity_and_transactions()
+        test_blocking_checkout_and_timeout()
+        test_broken_connection_discarded()
+        test_prepared_statements()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL CONNECTION POOL TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,178 @@
+"""Test fleet configuration expansion and per-site generation."""
+
+import queue
+import sys
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from generators.entities import EntityGenerator
+from service.fleet import expand_fleet_configs, shard_sites, SiteSimulator, FleetSimulator
+
+SIMULATOR_ROOT = Path(__file__).parent.parent
+
+
+class RecordingSchema:
+    """Stands in for SchemaSetup and records created entity tags."""
+
+    def __init__(self):
+        self.entities = []
+
+    def create_entity(self, tags, value_table_id="demo"):
+        self.entities.append(tags)
+        return len(self.entities)
+
+    def create_entities(self, tag_list, value_table_id="demo"):
+        return [self.create_entity(tags, value_table_id) for tags in tag_list]
+
+
+def template_fleet(count=10):
+    """Fleet section using the bundled building config as template."""
+    return {
+        'template': {
+            'config': 'config/building_config.yaml',
+            'count': count,
+            'site_id_pattern': 'site-{n:04d}',
+            'seed': 7,
+            'variation': {
+                'floors': [4, 20],
+                'area_scale': [0.5, 2.0],
+                'temp_offset': [-8, 8]
+            }
+        }
+    }
+
+
+def test_expand_template():
+    """Test templated fleet expansion."""
+    print("\n=== TEST: Expand Template ===")
+
+    configs = expand_fleet_configs(template_fleet(), base_dir=SIMULATOR_ROOT)
+
+    assert len(configs) == 10, "Should create one config per site"
+    site_ids = [c['site']['id'] for c in configs]
+    assert site_ids[0] == 'site-0001'
+    assert len(set(site_ids)) == 10, "Site IDs should be unique"
+
+    for config in configs:
+        floors = config['site']['floors']
+        assert 4 <= floors <= 20, "Floors should respect the variation range"
+        ahus = config['equipment']['ahus']
+        assert ahus['count'] * ahus['floors_per_ahu'] >= floors, "AHUs should cover every floor"
+
+    seeds = {c['generation']['seed'] for c in configs}
+    assert len(seeds) == 10, "Each site should get its own generator seed"
+
+    again = expand_fleet_configs(template_fleet(), base_dir=SIMULATOR_ROOT)
+    assert [c['site']['floors'] for c in again] == [c['site']['floors'] for c in configs], \
+        "Expansion should be reproducible"
+
+    print(f"✅ Expanded {len(configs)} sites")
+
+
+def test_shard_sites():
+    """Test round-robin sharding."""
+    print("\n=== TEST: Shard Sites ===")
+
+    configs = expand_fleet_configs(template_fleet(count=10), base_dir=SIMULATOR_ROOT)
+    shards = shard_sites(configs, 3)
+
+    assert [len(s) for s in shards] == [4, 3, 3]
+    assert sum(len(s) for s in shards) == 10
+
+    assert len(shard_sites(configs[:2], 4)) == 2, "Empty shards should be dropped"
+
+    print(f"✅ Sharded into {len(shards)} workers")
+
+
+def test_prefixed_entities_and_generation():
+    """Test site-prefixed entity IDs and per-site data generation."""
+    print("\n=== TEST: Prefixed Entities ===")
+
+    config = expand_fleet_configs(template_fleet(count=1), base_dir=SIMULATOR_ROOT)[0]
+    schema = RecordingSchema()
+    entity_map = EntityGenerator(schema, config, id_prefix='site-0001-').generate_all_entities()
+
+    ids = [tags['id'] for tags in schema.entities]
+    assert len(set(ids)) == len(ids), "Entity IDs should be unique"
+    assert all(i == 'site-0001' or i.startswith('site-0001-') for i in ids), \
+        "Equipment and point IDs should carry the site prefix"
+    assert 'point-chiller-1-status' in entity_map, "Entity map keys should stay site-local"
+    assert len(set(entity_map.values())) == len(ids), "Every created entity should be mapped"
+    assert entity_map['site'] == entity_map['site-0001'] == 1
+
+    site = SiteSimulator(config, entity_map)
+    points = site.generate(datetime(2025, 7, 15, 14, 0))
+
+    assert points, "Site should generate data points"
+    assert {p['entity_id'] for p in points} <= set(entity_map.values())
+
+    print(f"✅ Generated {len(points)} points for {len(ids)} entities")
+
+
+def tick_result(worker_id, timestamp, points=10):
+    return {'worker_id': worker_id, 'timestamp': timestamp, 'points': points,
+            'generate_seconds': 0.1, 'write_seconds': 0.1, 'duration_seconds': 0.2}
+
+
+def test_fleet_discards_late_results():
+    """Test that results of a timed-out tick are not charged to the next one."""
+    print("\n=== TEST: Late Fleet Results ===")
+
+    fleet = FleetSimulator({}, [], 'value_demo', workers=2, tick_timeout_seconds=1.0)
+    fleet.running = True
+    fleet.task_queues = [queue.Queue(), queue.Queue()]
+    fleet.result_queue = queue.Queue()
+    fleet.worker_stats = {i: {'worker_id': i, 'sites': 1, 'ticks': 0, 'total_points': 0, 'errors': 0}
+                          for i in range(2)}
+
+    first, second = datetime(2025, 7, 15, 14, 0), datetime(2025, 7, 15, 14, 15)
+    fleet.result_queue.put(tick_result(0, first))
+    assert not fleet.generate_interval(first), "Tick should time out with one worker missing"
+
+    # The slow worker's first-tick result arrives during the second tick
+    for result in (tick_result(1, first, points=99), tick_result(0, second), tick_result(1, second)):
+        fleet.result_queue.put(result)
+    assert fleet.generate_interval(second)
+    assert fleet.worker_stats[1]['ticks'] == 1
+    assert fleet.worker_stats[1]['total_points'] == 10, "Late result should be discarded"
+    assert fleet.result_queue.empty()
+
+    print("✅ Late results discarded")
+
+
+def test_fleet_aligns_to_interval():
+    """Test that live ticks align to the configured interval."""
+    fleet = FleetSimulator({}, [], 'value_demo', interval_minutes=5)
+    ticks = []
+    fleet.generate_interval = ticks.append
+    fleet.generate_current_interval()
+
+    assert ticks[0].minute % 5 == 0 and ticks[0].second == 0 and ticks[0].microsecond == 0
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("FLEET TESTS")
+    print("=" * 60)
+
+    try:
+        test_expand_template()
+        test_shard_sites()
+        test_prefixed_entities_and_generation()
+        test_fleet_discards_late_results()
+        test_fleet_aligns_to_interval()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL FLEET TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,135 @@
+"""Test array-based HVAC models against their scalar versions."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.hvac import ChillerModel, AHUModel, VAVModel, UtilityMeter, HVACSystem
+
+rng = np.random.RandomState(7)
+OUTDOOR = rng.uniform(20, 100, size=24)
+
+
+def assert_matches_scalar(batch, scalar_fn, inputs, keys):
+    """Compare every element of a batch result with the scalar method."""
+    steps, units = inputs[0].shape
+    for t in range(steps):
+        for i in range(units):
+            expected = scalar_fn(t, i)
+            for key in keys:
+                if key in expected:
+                    assert np.isclose(batch[key][t, i], expected[key]), \
+                        f"{key} mismatch at ({t}, {i}): {batch[key][t, i]} != {expected[key]}"
+
+
+def test_chiller_batch():
+    """Test chiller batch performance."""
+    print("\n=== TEST: Chiller Batch ===")
+
+    chillers = [
+        ChillerModel(f"chiller-{i}", f"Chiller {i}", "site", "chiller", capacity_tons=300 + 100 * i)
+        for i in range(3)
+    ]
+    load = rng.uniform(0, 1, size=(24, 3))
+    batch = ChillerModel.calculate_performance_batch(chillers, load, OUTDOOR)
+
+    assert_matches_scalar(
+        batch, lambda t, i: chillers[i].calculate_performance(load[t, i], OUTDOOR[t]), [load],
+        ['power_kw', 'cop', 'supply_temp', 'return_temp', 'flow_gpm', 'operating']
+    )
+    print("✅ Chiller batch matches scalar model")
+
+
+def test_ahu_batch():
+    """Test AHU batch performance."""
+    print("\n=== TEST: AHU Batch ===")
+
+    ahus = [AHUModel(f"ahu-{i}", f"AHU {i}", "site", "ahu") for i in range(4)]
+    airflow = rng.uniform(0, 1, size=(24, 4))
+    batch = AHUModel.calculate_performance_batch(ahus, airflow, OUTDOOR)
+
+    assert_matches_scalar(
+        batch, lambda t, i: ahus[i].calculate_performance(airflow[t, i], OUTDOOR[t]), [airflow],
+        ['supply_temp', 'mixed_temp', 'supply_fan_speed', 'power_kw', 'airflow_cfm', 'operating']
+    )
+    print("✅ AHU batch matches scalar model")
+
+
+def test_vav_batch():
+    """Test VAV batch performance with per-timestep occupancy."""
+    print("\n=== TEST: VAV Batch ===")
+
+    vavs = [VAVModel(f"vav-{i}", f"VAV {i}", "site", "vav") for i in range(50)]
+    zone_temps = rng.uniform(66, 78, size=(24, 50))
+    occupied = np.arange(24) % 3 != 0
+    batch = VAVModel.calculate_performance_batch(vavs, zone_temps, 55.0, occupied)
+
+    assert_matches_scalar(
+        batch, lambda t, i: vavs[i].calculate_performance(zone_temps[t, i], 55.0, bool(occupied[t])),
+        [zone_temps], ['airflow_cfm', 'damper_position', 'flow_ratio']
+    )
+    print("✅ VAV batch matches scalar model")
+
+
+def test_meter_batch():
+    """Test meter batch consumption."""
+    print("\n=== TEST: Meter Batch ===")
+
+    electric = [UtilityMeter(f"elec-{i}", "Electric", "site", "meter") for i in range(2)]
+    load = rng.uniform(0, 500, size=(24, 2))
+    batch = UtilityMeter.calculate_consumption_batch(electric, load_kw=load)
+
+    assert_matches_scalar(
+        batch, lambda t, i: electric[i].calculate_consumption(load_kw=load[t, i]), [load],
+        ['power', 'energy', 'voltage', 'current', 'power_factor']
+    )
+
+    water = [UtilityMeter("water", "Water", "site", "meter", meter_type="water")]
+    result = UtilityMeter.calculate_consumption_batch(water, flow_rate=np.full((24, 1), 40.0))
+    assert np.allclose(result['volume'], 10.0) and np.allclose(result['pressure'], 65.0)
+
+    try:
+        UtilityMeter.calculate_consumption_batch(electric + water, load_kw=0.0)
+        assert False, "Mixed meter types should be rejected"
+    except ValueError:
+        pass
+
+    print("✅ Meter batch matches scalar model")
+
+
+def test_cooling_load_batch():
+    """Test system cooling load over a block of zone temperatures."""
+    print("\n=== TEST: Cooling Load Batch ===")
+
+    system = HVACSystem(site_ref="site")
+    zone_temps = rng.uniform(68, 78, size=(24, 200))
+    batch = system.calculate_cooling_load_batch(zone_temps, OUTDOOR)
+
+    expected = [system.calculate_cooling_load(list(zone_temps[t]), OUTDOOR[t]) for t in range(24)]
+    assert np.allclose(batch, expected)
+
+    print("✅ Cooling load batch matches scalar model")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("HVAC BATCH TESTS")
+    print("=" * 60)
+
+    try:
+        test_chiller_batch()
+        test_ahu_batch()
+        test_vav_batch()
+        test_meter_batch()
+        test_cooling_load_batch()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL HVAC BATCH TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
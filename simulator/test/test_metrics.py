@@ -0,0 +1,116 @@
+"""Test the in-process metrics registry and its Prometheus exposition."""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from fastapi.testclient import TestClient
+
+from service.metrics import MetricsRegistry, REGISTRY, TICK_PHASE_SECONDS
+from api.simulator_api import create_app
+
+
+def test_counter_and_gauge():
+    """Test labelled counters and gauges."""
+    print("\n=== TEST: Counter And Gauge ===")
+
+    registry = MetricsRegistry()
+    rows = registry.counter('rows_total', 'Rows written', labels=('target',))
+    rows.inc(10, target='values')
+    rows.inc(5, target='values')
+    rows.inc(3, target='current')
+    lag = registry.gauge('lag_seconds', 'Replay lag')
+    lag.set(2.5)
+    lag.inc(-0.5)
+
+    assert rows.get(target='values') == 15 and rows.total() == 18
+    assert registry.counter('rows_total', 'Rows written', labels=('target',)) is rows, \
+        "Re-registering should return the same metric"
+
+    text = registry.render()
+    assert '# TYPE rows_total counter' in text
+    assert 'rows_total{target="current"} 3' in text
+    assert 'rows_total{target="values"} 15' in text
+    assert 'lag_seconds 2.0' in text
+
+    for bad in (lambda: rows.inc(-1, target='values'), lambda: rows.inc(1), lambda: rows.inc(1, phase='x')):
+        try:
+            bad()
+            raise AssertionError("Invalid increment should raise")
+        except ValueError:
+            pass
+
+    print("✅ Counters and gauges rendered")
+
+
+def test_histogram():
+    """Test histogram buckets, sum, count and snapshot."""
+    print("\n=== TEST: Histogram ===")
+
+    registry = MetricsRegistry()
+    latency = registry.histogram('tick_seconds', 'Tick latency', labels=('phase',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, phase='insert')
+    with latency.time(phase='generate'):
+        pass
+
+    text = registry.render()
+    assert 'tick_seconds_bucket{phase="insert",le="0.1"} 2' in text, "le bounds are inclusive"
+    assert 'tick_seconds_bucket{phase="insert",le="1.0"} 3' in text
+    assert 'tick_seconds_bucket{phase="insert",le="+Inf"} 4' in text
+    assert 'tick_seconds_sum{phase="insert"} 3.65' in text
+    assert 'tick_seconds_count{phase="insert"} 4' in text
+    assert 'tick_seconds_count{phase="generate"} 1' in text
+
+    snapshot = latency.snapshot(phase='insert')
+    assert snapshot['count'] == 4 and snapshot['last'] == 3.0
+    assert latency.snapshot(phase='state_save') is None
+
+    print("✅ Histogram rendered")
+
+
+def test_prometheus_endpoint():
+    """Test /metrics on the simulator API serves the shared registry."""
+    print("\n=== TEST: Prometheus Endpoint ===")
+
+    class Service:
+        running = True
+
+    TICK_PHASE_SECONDS.observe(0.2, phase='total')
+    app = create_app(Service(), state_db=None, activity_logger=None, start_time=datetime.now())
+    response = TestClient(app).get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'simulator_status 1' in response.text
+    assert 'simulator_tick_phase_seconds_count{phase="total"}' in response.text
+    assert response.text == response.text.rstrip('\n') + '\n'
+    assert REGISTRY.render() in response.text
+
+    print("✅ /metrics served without database access")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("METRICS TESTS")
+    print("=" * 60)
+
+    try:
+        test_counter_and_gauge()
+        test_histogram()
+        test_prometheus_endpoint()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL METRICS TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
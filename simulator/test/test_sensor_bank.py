@@ -0,0 +1,125 @@
+"""Test the vectorized SensorBank sensor model."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.sensors import SensorBank, SensorCharacteristics, SensorFactory, SensorNetwork, SensorType
+
+START = datetime(2025, 7, 15, 0, 0)
+
+
+def ideal_sensor(**overrides):
+    """Sensor without noise, accuracy error, drift or lag."""
+    params = dict(
+        sensor_type=SensorType.TEMPERATURE,
+        accuracy_percent=0.0,
+        resolution=0.5,
+        response_time_seconds=0.0,
+        drift_rate_per_day=0.0,
+        noise_stddev=0.0,
+        min_value=0.0,
+        max_value=100.0
+    )
+    params.update(overrides)
+    return SensorCharacteristics(**params)
+
+
+def test_quantize_and_clamp():
+    """Test quantization and clamping on a vector of sensors."""
+    print("\n=== TEST: Quantize and Clamp ===")
+
+    bank = SensorBank(['a', 'b', 'c'], [ideal_sensor()] * 3, calibration_time=START, seed=1)
+    readings, status = bank.read(np.array([72.3, -5.0, 140.0]), START)
+
+    assert np.allclose(readings, [72.5, 0.0, 100.0])
+    assert list(bank.status_names(status)[1:]) == ['fault', 'fault'], "Clamped readings are faults"
+
+    print("✅ Readings quantized and clamped")
+
+
+def test_lag_over_block():
+    """Test first-order lag across a time block."""
+    print("\n=== TEST: Lag Over Block ===")
+
+    chars = [ideal_sensor(resolution=0.0), ideal_sensor(resolution=0.0, response_time_seconds=900.0)]
+    bank = SensorBank(['fast', 'slow'], chars, calibration_time=START, seed=1)
+
+    timestamps = [START + timedelta(minutes=15 * i) for i in range(4)]
+    true_values = np.array([[50.0, 50.0]] + [[60.0, 60.0]] * 3)
+    readings, _ = bank.read_block(true_values, timestamps)
+
+    assert readings.shape == (4, 2)
+    assert np.allclose(readings[:, 0], [50, 60, 60, 60]), "Zero time constant follows immediately"
+    expected = 50 + 10 * (1 - np.exp(-1.0))
+    assert np.isclose(readings[1, 1], expected), "One time constant reaches ~63% of the step"
+    assert np.all(np.diff(readings[1:, 1]) > 0), "Lagged sensor keeps approaching the target"
+
+    print("✅ Lag applied per sensor")
+
+
+def test_failure_masks():
+    """Test failure modes applied through masks."""
+    print("\n=== TEST: Failure Masks ===")
+
+    bank = SensorBank(['a', 'b', 'c', 'd'], [ideal_sensor()] * 4, calibration_time=START, seed=1)
+    bank.read(np.full(4, 40.0), START)
+
+    bank.induce_failure('stuck', ['a'])
+    bank.induce_failure('offset', ['b'])
+    bank.induce_failure('communication', ['c'])
+    assert bank.failure_mask().sum() == 3
+    assert bank.failure_mask('stuck').tolist() == [True, False, False, False]
+
+    readings, status = bank.read(np.full(4, 50.0), START + timedelta(minutes=15))
+    assert np.allclose(readings, [40.0, 60.0, 40.0, 50.0])
+    assert list(bank.status_names(status)) == ['fault', 'fault', 'stale', 'ok']
+
+    bank.clear_failure()
+    assert not bank.failure_mask().any()
+
+    print("✅ Failure modes masked")
+
+
+def test_from_network():
+    """Test building a bank from a SensorNetwork."""
+    print("\n=== TEST: From Network ===")
+
+    network = SensorNetwork()
+    for i in range(100):
+        network.add_sensor(SensorFactory.create_temperature_sensor(f"temp-{i}"))
+
+    bank = network.to_bank(seed=42)
+    bank.calibrate(START)
+    timestamps = [START + timedelta(minutes=15 * i) for i in range(96)]
+    readings, status = bank.read_block(np.full((96, 100), 72.0), timestamps)
+
+    assert readings.shape == (96, 100)
+    assert np.all(np.abs(readings - 72.0) < 2.0), "Readings should stay near the true value"
+    assert (status == SensorBank.OK).mean() > 0.9
+
+    print(f"✅ Read {readings.size} values from {len(bank)} sensors")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("SENSOR BANK TESTS")
+    print("=" * 60)
+
+    try:
+        test_quantize_and_clamp()
+        test_lag_over_block()
+        test_failure_masks()
+        test_from_network()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL SENSOR BANK TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,159 @@
+"""Test the single-pass validation engine on synthetic chunks."""
+
+import json
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from service.validation_engine import ValidationEngine, ValidationContext, CHUNK_COLUMNS, report_to_json
+
+START = datetime(2025, 6, 1)
+END = START + timedelta(days=2)
+STATUS_ID, TEMP_ID, METER_ID, MISSING_ID = 1, 2, 3, 4
+
+
+def make_rows(start=START, end=END, skip=(), duplicate=None, drop_after=None):
+    """Rows for a status point, a temperature point and an energy totalizer."""
+    rows = []
+    energy = 1000.0
+    for ts in pd.date_range(start, end, freq='15min', inclusive='left'):
+        ts = ts.to_pydatetime()
+        if ts in skip:
+            continue
+        energy += 2.5
+        if drop_after and ts >= drop_after:
+            energy -= 100.0
+            drop_after = None
+        rows.append((STATUS_ID, ts, None, True, None, 'ok'))
+        rows.append((TEMP_ID, ts, 72.0, None, None, 'ok'))
+        rows.append((METER_ID, ts, energy, None, None, 'ok'))
+    if duplicate:
+        rows.append((TEMP_ID, duplicate, 71.0, None, None, 'ok'))
+    return rows
+
+
+class InMemoryEngine(ValidationEngine):
+    """Serves chunks from a row list instead of the database."""
+
+    def __init__(self, rows, **kwargs):
+        super().__init__({}, 'values_test', START, END, chunk=timedelta(hours=6), **kwargs)
+        frame = pd.DataFrame(rows, columns=CHUNK_COLUMNS)
+        self.frame = frame.sort_values(['entity_id', 'ts'], kind='stable').reset_index(drop=True)
+        self.fetched = []
+
+    def fetch_chunk(self, chunk_start, chunk_end):
+        self.fetched.append(chunk_start)
+        mask = (self.frame['ts'] >= chunk_start) & (self.frame['ts'] < chunk_end)
+        return self.frame[mask].reset_index(drop=True)
+
+
+def context(current_ids=None):
+    return ValidationContext(
+        START, END,
+        point_ids={STATUS_ID, TEMP_ID, METER_ID},
+        totalizer_ids={METER_ID},
+        status_ids={STATUS_ID},
+        current_ids=current_ids if current_ids is not None else {STATUS_ID, TEMP_ID, METER_ID},
+        names={METER_ID: 'point-elec-meter-energy'}
+    )
+
+
+def test_clean_data_passes():
+    """Test that continuous, clean data passes every check."""
+    print("\n=== TEST: Clean Data ===")
+
+    engine = InMemoryEngine(make_rows(), workers=3)
+    report = engine.run(context())
+
+    assert report['passed'], json.dumps(report['checks'], indent=2, default=str)
+    assert report['chunks'] == 8 and len(engine.fetched) == 8, "Each chunk should be read exactly once"
+    assert report['rows_scanned'] == 192 * 3
+    assert report['checks']['continuity']['expected_intervals'] == 192
+    assert report['checks']['continuity']['interval_consistency_pct'] == 100.0
+    json.loads(report_to_json(report))
+
+    print(f"✅ {report['rows_scanned']} rows in {report['chunks']} chunks")
+
+
+def test_findings():
+    """Test gap, duplicate, totalizer, coverage and status findings."""
+    print("\n=== TEST: Findings ===")
+
+    gap = {START + timedelta(hours=10), START + timedelta(hours=10, minutes=15)}
+    # Totalizer drop exactly on a chunk boundary, and within a chunk
+    rows = make_rows(skip=gap, duplicate=START + timedelta(hours=20), drop_after=START + timedelta(hours=12))
+    rows = [r for r in rows if not (r[0] == METER_ID and r[1] == START + timedelta(hours=30))]
+    rows.append((STATUS_ID, START + timedelta(hours=30), None, None, None, 'fault'))
+    rows.remove((STATUS_ID, START + timedelta(hours=30), None, True, None, 'ok'))
+
+    report = InMemoryEngine(rows).run(context(current_ids={STATUS_ID, TEMP_ID}))
+    checks = report['checks']
+
+    assert not report['passed']
+    assert checks['continuity']['gap_count'] == 1 and checks['continuity']['missing_intervals'] == 2
+    assert checks['continuity']['gaps'][0]['minutes'] == 45.0
+    assert checks['duplicates']['duplicate_rows'] == 1
+    assert checks['totalizers']['decreases'] == 1, "Drop at a chunk boundary should be caught"
+    assert checks['totalizers']['samples'][0]['entity'] == 'point-elec-meter-energy'
+    assert checks['coverage']['missing_current'] == ['point-elec-meter-energy']
+    assert checks['status']['status_points_without_bool'] == 1
+    assert checks['status']['status_counts']['fault'] == 1
+
+    print("✅ All findings reported")
+
+
+def test_totalizer_drop_inside_chunk():
+    """Test a totalizer decrease between two rows of the same chunk."""
+    print("\n=== TEST: Totalizer Drop Inside Chunk ===")
+
+    rows = make_rows(drop_after=START + timedelta(hours=13))
+    report = InMemoryEngine(rows).run(context())
+
+    assert report['checks']['totalizers']['decreases'] == 1
+    assert report['checks']['totalizers']['samples'][0]['ts'].startswith('2025-06-01 13:00')
+
+    print("✅ In-chunk decrease detected")
+
+
+def test_missing_history():
+    """Test coverage of points with no data in range."""
+    print("\n=== TEST: Missing History ===")
+
+    ctx = context()
+    ctx.point_ids.add(MISSING_ID)
+    report = InMemoryEngine(make_rows()).run(ctx)
+
+    coverage = report['checks']['coverage']
+    assert not coverage['passed']
+    assert coverage['points_with_history'] == 3 and coverage['history_coverage_pct'] == 75.0
+
+    print("✅ Missing history reported")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("VALIDATION ENGINE TESTS")
+    print("=" * 60)
+
+    try:
+        test_clean_data_passes()
+        test_findings()
+        test_totalizer_drop_inside_chunk()
+        test_missing_history()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL VALIDATION ENGINE TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
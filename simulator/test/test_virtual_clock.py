@@ -0,0 +1,129 @@
+"""Test virtual-time replay in the scheduler."""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from service.clock import VirtualClock, WallClock, align_to_interval
+from service.scheduler import DataGenerationScheduler
+
+START = datetime(2025, 3, 1, 0, 0)
+
+
+def test_align_to_interval():
+    """Test interval alignment."""
+    print("\n=== TEST: Align To Interval ===")
+
+    assert align_to_interval(datetime(2025, 3, 1, 10, 44, 59, 5), 15) == datetime(2025, 3, 1, 10, 30)
+    assert align_to_interval(datetime(2025, 3, 1, 10, 44), 60) == datetime(2025, 3, 1, 10, 0)
+    assert align_to_interval(datetime(2025, 3, 1, 23, 59), 90) == datetime(2025, 3, 1, 22, 30)
+
+    print("✅ Timestamps aligned")
+
+
+def test_virtual_replay_max_speed():
+    """Test that the scheduler ticks every interval up to the end time."""
+    print("\n=== TEST: Virtual Replay (max speed) ===")
+
+    clock = VirtualClock(start=START, end=START + timedelta(days=2) - timedelta(minutes=15))
+    ticks = []
+    scheduler = DataGenerationScheduler(interval_minutes=15, clock=clock)
+    scheduler.start(lambda: ticks.append(clock.now()) or True)
+    scheduler._replay_thread.join(timeout=10)
+
+    assert not scheduler.is_running(), "Replay should stop after the end time"
+    assert len(ticks) == 192, "Two days at 15 minutes should be 192 intervals"
+    assert ticks[0] == START and ticks[-1] == START + timedelta(days=2, minutes=-15)
+    assert all(b - a == timedelta(minutes=15) for a, b in zip(ticks, ticks[1:])), \
+        "Intervals should be contiguous"
+
+    status = scheduler.get_status()
+    assert status['ticks'] == 192
+    assert status['clock']['mode'] == 'virtual'
+
+    print(f"✅ Replayed {len(ticks)} intervals")
+
+
+def test_virtual_replay_paced():
+    """Test that a rate multiplier paces replay against wall time."""
+    print("\n=== TEST: Virtual Replay (paced) ===")
+
+    # 15 simulated minutes per 0.05 wall seconds
+    clock = VirtualClock(start=START, rate=900 / 0.05)
+    ticks = []
+    scheduler = DataGenerationScheduler(interval_minutes=15, clock=clock)
+    started = time.monotonic()
+    scheduler.start(lambda: ticks.append(clock.now()) or True)
+    time.sleep(0.32)
+    scheduler.stop()
+    elapsed = time.monotonic() - started
+
+    assert not scheduler.is_running()
+    expected = elapsed / 0.05
+    assert expected - 2 <= len(ticks) <= expected + 2, f"Expected ~{expected:.0f} ticks, got {len(ticks)}"
+
+    print(f"✅ {len(ticks)} ticks in {elapsed:.2f}s")
+
+
+def test_failed_ticks_still_advance():
+    """Test that a failing interval is retried and replay moves on."""
+    print("\n=== TEST: Failed Ticks ===")
+
+    clock = VirtualClock(start=START, end=START + timedelta(hours=1))
+    calls = []
+
+    def job():
+        calls.append(clock.now())
+        return clock.now() != START
+
+    scheduler = DataGenerationScheduler(interval_minutes=15, max_retries=2,
+                                        retry_delay_seconds=0, clock=clock)
+    scheduler.start(job)
+    scheduler._replay_thread.join(timeout=10)
+
+    assert calls.count(START) == 2, "Failed interval should be retried"
+    assert len(set(calls)) == 5
+    assert scheduler.retry_count == 0, "Later success should reset the failure count"
+
+    print("✅ Replay continued past a failed interval")
+
+
+def test_wall_clock():
+    """Test the wall clock."""
+    print("\n=== TEST: Wall Clock ===")
+
+    clock = WallClock()
+    assert not clock.virtual
+    assert abs((clock.now() - datetime.now()).total_seconds()) < 1
+    assert not VirtualClock().started
+
+    print("✅ Wall clock")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("VIRTUAL CLOCK TESTS")
+    print("=" * 60)
+
+    try:
+        test_align_to_interval()
+        test_virtual_replay_max_speed()
+        test_virtual_replay_paced()
+        test_failed_ticks_still_advance()
+        test_wall_clock()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL VIRTUAL CLOCK TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
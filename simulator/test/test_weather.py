@@ -0,0 +1,113 @@
+"""Test the vectorized weather series."""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from generators.time_series import TimeSeriesGenerator
+from generators.weather import WeatherSimulator
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'building_config.yaml'
+
+
+def weather_config():
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)['weather']
+
+
+def test_series_bounds():
+    """Test a full year of weather stays within configured limits."""
+    print("\n=== TEST: Series Bounds ===")
+
+    config = weather_config()
+    sim = WeatherSimulator(config)
+    df = sim.generate_series(datetime(2025, 1, 1), datetime(2025, 12, 31, 23, 45), 15)
+
+    assert len(df) == 365 * 96
+    for season, group in df.groupby('season'):
+        limits = config['seasons'][season]
+        assert group['dry_bulb_temp'].between(limits['min'], limits['max']).all(), \
+            f"{season} temperatures should respect configured limits"
+
+    assert (df['wet_bulb_temp'] <= df['dry_bulb_temp']).all()
+    assert df['humidity'].between(20, 95).all()
+    assert (df['wind_speed'] >= 0).all()
+    assert df['cloud_cover'].between(0, 1).all()
+
+    night = df.index.hour < 6
+    assert (df.loc[night, 'solar_irradiance'] == 0).all(), "No sun at night"
+    assert df.loc[df.index.hour == 12, 'solar_irradiance'].mean() > 200
+
+    print(f"✅ {len(df)} weather points within limits")
+
+
+def test_series_memoized():
+    """Test that the same range is generated only once."""
+    print("\n=== TEST: Series Memoized ===")
+
+    sim = WeatherSimulator(weather_config())
+    start, end = datetime(2025, 7, 1), datetime(2025, 7, 2)
+
+    first = sim.generate_series(start, end, 15)
+    assert sim.generate_series(start, end, 15) is first, "Same range should be served from cache"
+    assert sim.generate_series(start, end, 60) is not first, "Interval is part of the cache key"
+
+    weather = sim.get_current_weather(datetime(2025, 7, 15, 14, 0))
+    assert sim.get_current_weather(datetime(2025, 7, 15, 14, 0)) == weather
+    assert weather['season'] == 'summer'
+
+    print("✅ Weather series memoized")
+
+
+def test_weather_deterministic_per_timestamp():
+    """Test that a timestamp gets the same weather from every range and lookup."""
+    print("\n=== TEST: Deterministic Weather ===")
+
+    config = weather_config()
+    sim = WeatherSimulator(config)
+    ts = datetime(2025, 7, 15, 14, 15)
+
+    week = sim.generate_series(datetime(2025, 7, 14), datetime(2025, 7, 20), 15)
+    chunk = sim.generate_series(datetime(2025, 7, 15, 12), datetime(2025, 7, 15, 18), 5)
+    assert week.loc[ts].to_dict() == chunk.loc[ts].to_dict()
+    assert WeatherSimulator(config).get_current_weather(ts) == week.loc[ts].to_dict(), \
+        "Live lookups should match gap-fill ranges, regardless of call order"
+
+    other = WeatherSimulator(dict(config, seed=config.get('seed', 42) + 1))
+    assert not other.generate_series(week.index[0], week.index[-1], 15)['dry_bulb_temp'].equals(
+        week['dry_bulb_temp']), "Seed should change the noise"
+
+    print("✅ Weather is deterministic per timestamp")
+
+
+def test_time_series_uses_shared_weather():
+    """Test that TimeSeriesGenerator consumes an injected WeatherSimulator."""
+    with open(CONFIG_PATH) as f:
+        config = yaml.safe_load(f)
+    sim = WeatherSimulator(config['weather'])
+
+    assert TimeSeriesGenerator(config, {}, weather_sim=sim).weather is sim
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("WEATHER TESTS")
+    print("=" * 60)
+
+    try:
+        test_series_bounds()
+        test_series_memoized()
+        test_weather_deterministic_per_timestamp()
+        test_time_series_uses_shared_weather()
+
+        print("\n" + "=" * 60)
+        print("✅ ALL WEATHER TESTS PASSED")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)
@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
-"""Comprehensive validation script to check current values and historical data for ALL points."""
+"""Comprehensive validation script to check current values and historical data for ALL points.
+
+History coverage comes from one chunked scan of the value table with the
+validation engine (see validate_dataset.py for the full suite).
+"""
 
 import logging
 import sys
 import os
 import yaml
 from datetime import datetime, timedelta
+from typing import Dict
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from database.connection import DatabaseConnection
+from service.validation_engine import ValidationEngine, CoverageReducer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,152 +27,103 @@ def load_database_config():
     config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'database_config.yaml')
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-        return config['database']
+        return yaml.safe_load(f)
 
 
-def validate_all_points_data(db: DatabaseConnection):
-    """Comprehensive validation of all points data."""
-    
-    print("=== COMPREHENSIVE POINTS DATA VALIDATION ===\n")
-    
-    # 1. Count total points
+class EquipmentCoverageReducer(CoverageReducer):
+    """History and current value coverage per equipRef."""
+
+    name = 'equipment_coverage'
+
+    def __init__(self, equip_refs: Dict[int, str]):
+        """Initialize reducer.
+
+        Args:
+            equip_refs: Point entity ID to equipRef
+        """
+        super().__init__()
+        self.equip_refs = equip_refs
+
+    def combine(self, partials, context):
+        seen = set().union(*(p[0] for p in partials)) if partials else set()
+        current = context.current_ids or set()
+        equipment: Dict[str, Dict[str, int]] = {}
+        for entity_id in context.point_ids:
+            counts = equipment.setdefault(self.equip_refs.get(entity_id) or 'Unknown',
+                                          {'total_points': 0, 'points_with_current': 0, 'points_with_history': 0})
+            counts['total_points'] += 1
+            counts['points_with_current'] += entity_id in current
+            counts['points_with_history'] += entity_id in seen
+        return {'passed': True, 'equipment': dict(sorted(equipment.items()))}
+
+
+def load_equip_refs(db: DatabaseConnection) -> Dict[int, str]:
+    """Map point entity IDs to their equipRef."""
     query = """
-        SELECT COUNT(*) as total_points
-        FROM core.entity e
-        JOIN core.entity_tag et ON e.id = et.entity_id
+        SELECT et.entity_id, et.value_s
+        FROM core.entity_tag et
         JOIN core.tag_def td ON et.tag_id = td.id
-        WHERE td.name = 'point' AND et.value_b = true
+        WHERE td.name = 'equipRef'
     """
-    result = db.execute_query(query)
-    total_points = result[0]['total_points']
-    print(f"Total point entities: {total_points}")
+    return {row['entity_id']: row['value_s'] for row in db.execute_query(query)}
+
+
+def validate_all_points_data(db: DatabaseConnection, db_config: dict, value_table: str):
+    """Comprehensive validation of all points data."""
     
-    # 2. Count points with current values
-    query = """
-        SELECT COUNT(*) as points_with_current
-        FROM core.entity e
-        JOIN core.entity_tag et ON e.id = et.entity_id
-        JOIN core.tag_def td ON et.tag_id = td.id
-        JOIN core.values_demo_current cv ON e.id = cv.entity_id
-        WHERE td.name = 'point' AND et.value_b = true
-    """
-    result = db.execute_query(query)
-    points_with_current = result[0]['points_with_current']
+    print("=== COMPREHENSIVE POINTS DATA VALIDATION ===\n")
+    current_table = f"{value_table}_current"
+
+    # Point, current value and 24h history coverage in one scan
+    end = datetime.now()
+    engine = ValidationEngine(
+        db_config,
+        value_table,
+        end - timedelta(hours=24),
+        end,
+        chunk=timedelta(hours=6),
+        reducers=[CoverageReducer(), EquipmentCoverageReducer(load_equip_refs(db))]
+    )
+    report = engine.run()
+    coverage = report['checks']['coverage']
+
+    total_points = coverage['points']
+    points_with_current = coverage['points_with_current']
+    points_with_history = coverage['points_with_history']
+    if total_points == 0:
+        print("No point entities found")
+        return
+
+    print(f"Total point entities: {total_points}")
     print(f"Points with current values: {points_with_current}")
     print(f"Current value coverage: {(points_with_current/total_points*100):.1f}%")
-    
-    # 3. Count points with historical data (last 24 hours)
-    since_time = datetime.now() - timedelta(hours=24)
-    query = """
-        SELECT COUNT(DISTINCT entity_id) as points_with_history
-        FROM core.values_demo
-        WHERE ts >= %s
-    """
-    result = db.execute_query(query, (since_time,))
-    points_with_history = result[0]['points_with_history']
     print(f"Points with historical data (24h): {points_with_history}")
-    print(f"Historical data coverage: {(points_with_history/total_points*100):.1f}%")
-    
-    # 4. Points missing current values
-    query = """
-        SELECT 
-            e.id as entity_id,
-            et_id.value_s as point_id,
-            et_name.value_s as point_name,
-            et_equipref.value_s as equip_ref
-        FROM core.entity e
-        JOIN core.entity_tag et_point ON e.id = et_point.entity_id
-        JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
-        LEFT JOIN core.entity_tag et_id ON e.id = et_id.entity_id
-        LEFT JOIN core.tag_def td_id ON et_id.tag_id = td_id.id AND td_id.name = 'id'
-        LEFT JOIN core.entity_tag et_name ON e.id = et_name.entity_id
-        LEFT JOIN core.tag_def td_name ON et_name.tag_id = td_name.id AND td_name.name = 'dis'
-        LEFT JOIN core.entity_tag et_equipref ON e.id = et_equipref.entity_id
-        LEFT JOIN core.tag_def td_equipref ON et_equipref.tag_id = td_equipref.id AND td_equipref.name = 'equipRef'
-        LEFT JOIN core.values_demo_current cv ON e.id = cv.entity_id
-        WHERE td_point.name = 'point' AND et_point.value_b = true
-        AND cv.entity_id IS NULL
-        ORDER BY et_equipref.value_s, et_id.value_s
-        LIMIT 20
-    """
-    missing_current = db.execute_query(query)
-    
-    if missing_current:
-        print(f"\n=== POINTS MISSING CURRENT VALUES ({len(missing_current)} shown, max 20) ===")
-        for point in missing_current:
-            print(f"  {point['point_id']} ({point['point_name']}) - Equipment: {point['equip_ref']}")
+    print(f"Historical data coverage: {coverage['history_coverage_pct']:.1f}%")
     
-    # 5. Points missing historical data
-    query = """
-        SELECT 
-            e.id as entity_id,
-            et_id.value_s as point_id,
-            et_name.value_s as point_name,
-            et_equipref.value_s as equip_ref
-        FROM core.entity e
-        JOIN core.entity_tag et_point ON e.id = et_point.entity_id
-        JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
-        LEFT JOIN core.entity_tag et_id ON e.id = et_id.entity_id
-        LEFT JOIN core.tag_def td_id ON et_id.tag_id = td_id.id AND td_id.name = 'id'
-        LEFT JOIN core.entity_tag et_name ON e.id = et_name.entity_id
-        LEFT JOIN core.tag_def td_name ON et_name.tag_id = td_name.id AND td_name.name = 'dis'
-        LEFT JOIN core.entity_tag et_equipref ON e.id = et_equipref.entity_id
-        LEFT JOIN core.tag_def td_equipref ON et_equipref.tag_id = td_equipref.id AND td_equipref.name = 'equipRef'
-        LEFT JOIN (
-            SELECT DISTINCT entity_id 
-            FROM core.values_demo 
-            WHERE ts >= %s
-        ) hd ON e.id = hd.entity_id
-        WHERE td_point.name = 'point' AND et_point.value_b = true
-        AND hd.entity_id IS NULL
-        ORDER BY et_equipref.value_s, et_id.value_s
-        LIMIT 20
-    """
-    missing_history = db.execute_query(query, (since_time,))
+    if coverage['missing_current']:
+        print(f"\n=== POINTS MISSING CURRENT VALUES ({total_points - points_with_current} total, "
+              f"{len(coverage['missing_current'])} shown) ===")
+        for point_id in coverage['missing_current']:
+            print(f"  {point_id}")
     
-    if missing_history:
-        print(f"\n=== POINTS MISSING HISTORICAL DATA ({len(missing_history)} shown, max 20) ===")
-        for point in missing_history:
-            print(f"  {point['point_id']} ({point['point_name']}) - Equipment: {point['equip_ref']}")
+    if coverage['missing_history']:
+        print(f"\n=== POINTS MISSING HISTORICAL DATA ({total_points - points_with_history} total, "
+              f"{len(coverage['missing_history'])} shown) ===")
+        for point_id in coverage['missing_history']:
+            print(f"  {point_id}")
     
-    # 6. Data coverage by equipment type
-    query = """
-        SELECT 
-            et_equipref.value_s as equipment_id,
-            COUNT(*) as total_points,
-            COUNT(cv.entity_id) as points_with_current,
-            COUNT(hd.entity_id) as points_with_history
-        FROM core.entity e
-        JOIN core.entity_tag et_point ON e.id = et_point.entity_id
-        JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
-        LEFT JOIN core.entity_tag et_equipref ON e.id = et_equipref.entity_id
-        LEFT JOIN core.tag_def td_equipref ON et_equipref.tag_id = td_equipref.id AND td_equipref.name = 'equipRef'
-        LEFT JOIN core.values_demo_current cv ON e.id = cv.entity_id
-        LEFT JOIN (
-            SELECT DISTINCT entity_id 
-            FROM core.values_demo 
-            WHERE ts >= %s
-        ) hd ON e.id = hd.entity_id
-        WHERE td_point.name = 'point' AND et_point.value_b = true
-        GROUP BY et_equipref.value_s
-        ORDER BY et_equipref.value_s
-    """
-    equipment_coverage = db.execute_query(query, (since_time,))
-    
-    print(f"\n=== DATA COVERAGE BY EQUIPMENT ===")
+    print("\n=== DATA COVERAGE BY EQUIPMENT ===")
     print(f"{'Equipment':<25} {'Total':<8} {'Current':<8} {'History':<8} {'Curr %':<8} {'Hist %':<8}")
     print("-" * 70)
     
-    for equip in equipment_coverage:
-        equip_id = equip['equipment_id'] or 'Unknown'
-        curr_pct = (equip['points_with_current'] / equip['total_points'] * 100) if equip['total_points'] > 0 else 0
-        hist_pct = (equip['points_with_history'] / equip['total_points'] * 100) if equip['total_points'] > 0 else 0
+    for equip_id, equip in report['checks']['equipment_coverage']['equipment'].items():
+        curr_pct = equip['points_with_current'] / equip['total_points'] * 100
+        hist_pct = equip['points_with_history'] / equip['total_points'] * 100
         
         print(f"{equip_id:<25} {equip['total_points']:<8} {equip['points_with_current']:<8} {equip['points_with_history']:<8} {curr_pct:<7.1f}% {hist_pct:<7.1f}%")
     
-    # 7. Sample current values by data type
-    query = """
+    # Current values by data type
+    query = f"""
         SELECT 
             'Boolean' as data_type,
             COUNT(*) as count,
@@ -176,7 +133,7 @@ def validate_all_points_data(db: DatabaseConnection):
         JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
         JOIN core.entity_tag et_kind ON e.id = et_kind.entity_id
         JOIN core.tag_def td_kind ON et_kind.tag_id = td_kind.id
-        LEFT JOIN core.values_demo_current cv ON e.id = cv.entity_id
+        LEFT JOIN core.{current_table} cv ON e.id = cv.entity_id
         WHERE td_point.name = 'point' AND et_point.value_b = true
         AND td_kind.name = 'kind' AND et_kind.value_s = 'Bool'
         
@@ -191,7 +148,7 @@ def validate_all_points_data(db: DatabaseConnection):
         JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
         JOIN core.entity_tag et_kind ON e.id = et_kind.entity_id
         JOIN core.tag_def td_kind ON et_kind.tag_id = td_kind.id
-        LEFT JOIN core.values_demo_current cv ON e.id = cv.entity_id
+        LEFT JOIN core.{current_table} cv ON e.id = cv.entity_id
         WHERE td_point.name = 'point' AND et_point.value_b = true
         AND td_kind.name = 'kind' AND et_kind.value_s = 'Number'
         
@@ -206,7 +163,7 @@ def validate_all_points_data(db: DatabaseConnection):
         JOIN core.tag_def td_point ON et_point.tag_id = td_point.id
         JOIN core.entity_tag et_kind ON e.id = et_kind.entity_id
         JOIN core.tag_def td_kind ON et_kind.tag_id = td_kind.id
-        LEFT JOIN core.values_demo_current cv ON e.id = cv.entity_id
+        LEFT JOIN core.{current_table} cv ON e.id = cv.entity_id
         WHERE td_point.name = 'point' AND et_point.value_b = true
         AND td_kind.name = 'kind' AND et_kind.value_s = 'Str'
     """
@@ -218,37 +175,23 @@ def validate_all_points_data(db: DatabaseConnection):
     print("-" * 50)
     
     for dt in data_types:
-        coverage = (dt['with_values'] / dt['count'] * 100) if dt['count'] > 0 else 0
-        print(f"{dt['data_type']:<10} {dt['count']:<12} {dt['with_values']:<12} {coverage:<9.1f}%")
-    
-    # 8. Historical data volume check
-    query = """
-        SELECT 
-            COUNT(*) as total_records,
-            COUNT(DISTINCT entity_id) as unique_points,
-            MIN(ts) as earliest_data,
-            MAX(ts) as latest_data,
-            AVG(EXTRACT(EPOCH FROM (MAX(ts) - MIN(ts)))/3600) as hours_span
-        FROM core.values_demo
-        WHERE ts >= %s
-    """
-    
-    volume_stats = db.execute_query(query, (since_time,))[0]
+        type_coverage = (dt['with_values'] / dt['count'] * 100) if dt['count'] > 0 else 0
+        print(f"{dt['data_type']:<10} {dt['count']:<12} {dt['with_values']:<12} {type_coverage:<9.1f}%")
     
-    print(f"\n=== HISTORICAL DATA VOLUME (24h) ===")
-    print(f"Total records: {volume_stats['total_records']:,}")
-    print(f"Unique points with data: {volume_stats['unique_points']}")
-    print(f"Data time span: {volume_stats['earliest_data']} to {volume_stats['latest_data']}")
+    print("\n=== HISTORICAL DATA VOLUME (24h) ===")
+    print(f"Total records: {report['rows_scanned']:,}")
+    print(f"Unique points with data: {points_with_history}")
+    print(f"Scanned {report['start']} to {report['end']} in {report['chunks']} chunks ({report['elapsed_seconds']}s)")
     
-    if volume_stats['total_records'] > 0:
-        avg_records_per_point = volume_stats['total_records'] / volume_stats['unique_points']
+    if points_with_history:
+        avg_records_per_point = report['rows_scanned'] / points_with_history
         print(f"Average records per point: {avg_records_per_point:.1f}")
     
-    # 9. Overall assessment
+    # Overall assessment
     print(f"\n=== OVERALL ASSESSMENT ===")
     
-    current_coverage = (points_with_current / total_points * 100) if total_points > 0 else 0
-    history_coverage = (points_with_history / total_points * 100) if total_points > 0 else 0
+    current_coverage = points_with_current / total_points * 100
+    history_coverage = coverage['history_coverage_pct']
     
     print(f"Current Values Coverage: {current_coverage:.1f}%")
     if current_coverage >= 90:
@@ -280,11 +223,12 @@ def validate_all_points_data(db: DatabaseConnection):
 def main():
     """Main validation function."""
     try:
-        db_config = load_database_config()
+        config = load_database_config()
+        db_config = config['database']
         print(f"Connecting to database: {db_config['host']}:{db_config['port']}/{db_config['database']}")
         
         db = DatabaseConnection(db_config)
-        validate_all_points_data(db)
+        validate_all_points_data(db, db_config, config['tables']['value_table'])
         db.close()
         
     except Exception as e:
@@ -293,4 +237,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
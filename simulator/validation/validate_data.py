@@ -1,21 +1,64 @@
-"""Standalone validation script to check database contents without modifying data."""
+"""Standalone validation script to check database contents without modifying data.
+
+The time-series table is not counted or aggregated directly: its size is
+TimescaleDB's approximate row count, and recent data is read in one chunked
+scan by the validation engine (see validate_dataset.py for the full suite).
+"""
 
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent / 'src'))
+from datetime import datetime, timedelta
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+import numpy as np
 import yaml
 from database.connection import DatabaseConnection
+from service.validation_engine import ValidationEngine, Reducer, CoverageReducer
 from rich.console import Console
 from rich.table import Table
 
 console = Console()
 
-def display_validation_results(db: DatabaseConnection) -> None:
+
+class TemperatureReducer(Reducer):
+    """Count, sum, minimum and maximum of numeric values of temp points."""
+
+    name = 'temperature'
+
+    def __init__(self, entity_ids):
+        """Initialize reducer.
+
+        Args:
+            entity_ids: Entity IDs tagged ``temp``
+        """
+        self.entity_ids = set(entity_ids)
+
+    def scan(self, chunk, context):
+        values = chunk.loc[chunk['entity_id'].isin(self.entity_ids), 'value_n'].dropna().astype(float)
+        if values.empty:
+            return 0, 0.0, np.inf, -np.inf
+        return len(values), float(values.sum()), float(values.min()), float(values.max())
+
+    def combine(self, partials, context):
+        count = sum(p[0] for p in partials)
+        if not count:
+            return {'passed': True, 'sample_count': 0}
+        return {
+            'passed': True,
+            'sample_count': count,
+            'avg_temp': sum(p[1] for p in partials) / count,
+            'min_temp': min(p[2] for p in partials),
+            'max_temp': max(p[3] for p in partials)
+        }
+
+
+def display_validation_results(db: DatabaseConnection, db_config: dict, value_table: str) -> None:
     """Display validation queries and results.
     
     Args:
         db: DatabaseConnection instance
+        db_config: Database connection configuration, for the value table scan
+        value_table: Name of the values table
     """
     console.print("\n[bold blue]Validation Results[/bold blue]")
     
@@ -23,8 +66,8 @@ def display_validation_results(db: DatabaseConnection) -> None:
     queries = {
         "Entities": "SELECT COUNT(*) as count FROM core.entity",
         "Entity Tags": "SELECT COUNT(*) as count FROM core.entity_tag", 
-        "Time-series Records": "SELECT COUNT(*) as count FROM core.values_demo",
-        "Current Values": "SELECT COUNT(*) as count FROM core.values_demo_current"
+        "Time-series Records (approx.)": f"SELECT approximate_row_count('core.{value_table}'::regclass) as count",
+        "Current Values": f"SELECT COUNT(*) as count FROM core.{value_table}_current"
     }
     
     table = Table(title="Database Summary")
@@ -41,45 +84,50 @@ def display_validation_results(db: DatabaseConnection) -> None:
             
     console.print(table)
     
-    # Time range analysis
+    # Recent data, read once by the validation engine
     console.print("\n[bold blue]Time Range Analysis[/bold blue]")
-    
-    time_queries = [
-        {
-            "name": "Historical Data Range",
-            "query": """
-                SELECT 
-                    MIN(ts) as earliest,
-                    MAX(ts) as latest,
-                    COUNT(*) as total_records
-                FROM core.values_demo
-            """
-        },
-        {
-            "name": "Current Values Latest",
-            "query": """
-                SELECT 
-                    MIN(ts) as earliest,
-                    MAX(ts) as latest,
-                    COUNT(*) as total_records
-                FROM core.values_demo_current
-            """
-        }
-    ]
-    
-    for query_info in time_queries:
-        try:
-            result = db.execute_query(query_info['query'])
-            if result:
-                data = result[0]
-                console.print(f"[cyan]{query_info['name']}:[/cyan]")
-                console.print(f"  Earliest: {data['earliest']}")
-                console.print(f"  Latest: {data['latest']}")
-                console.print(f"  Records: {data['total_records']:,}")
-            else:
-                console.print(f"[yellow]WARNING[/yellow] {query_info['name']}: No data")
-        except Exception as e:
-            console.print(f"[red]ERROR[/red] {query_info['name']}: {e}")
+
+    temp_ids = [row['entity_id'] for row in db.execute_query("""
+        SELECT et.entity_id
+        FROM core.entity_tag et
+        JOIN core.tag_def td ON et.tag_id = td.id
+        WHERE td.name = 'temp'
+    """)]
+    end = datetime.now()
+    report = ValidationEngine(
+        db_config,
+        value_table,
+        end - timedelta(hours=24),
+        end,
+        chunk=timedelta(hours=6),
+        reducers=[CoverageReducer(), TemperatureReducer(temp_ids)]
+    ).run()
+    coverage = report['checks']['coverage']
+
+    console.print("[cyan]Historical Data (Last 24 Hours):[/cyan]")
+    console.print(f"  From: {report['start']}")
+    console.print(f"  To: {report['end']}")
+    console.print(f"  Records: {report['rows_scanned']:,}")
+    console.print(f"  Points with data: {coverage['points_with_history']} of {coverage['points']}")
+
+    try:
+        result = db.execute_query(f"""
+            SELECT 
+                MIN(ts) as earliest,
+                MAX(ts) as latest,
+                COUNT(*) as total_records
+            FROM core.{value_table}_current
+        """)
+        if result:
+            data = result[0]
+            console.print("[cyan]Current Values Latest:[/cyan]")
+            console.print(f"  Earliest: {data['earliest']}")
+            console.print(f"  Latest: {data['latest']}")
+            console.print(f"  Records: {data['total_records']:,}")
+        else:
+            console.print("[yellow]WARNING[/yellow] Current Values Latest: No data")
+    except Exception as e:
+        console.print(f"[red]ERROR[/red] Current Values Latest: {e}")
     
     # Check what tags actually exist
     console.print("\n[bold blue]Available Tags Analysis[/bold blue]")
@@ -127,65 +175,33 @@ def display_validation_results(db: DatabaseConnection) -> None:
     # Sample data validation with better time ranges
     console.print("\n[bold blue]Sample Data Validation[/bold blue]")
     
-    sample_queries = [
-        {
-            "name": "Average Zone Temperatures (All Data)",
-            "query": """
-                SELECT AVG(v.value_n) as avg_temp, COUNT(*) as sample_count
-                FROM core.values_demo v
-                JOIN core.entity_tag et ON v.entity_id = et.entity_id
-                JOIN core.tag_def td ON et.tag_id = td.id
-                WHERE td.name = 'temp'
-            """
-        },
-        {
-            "name": "Zone Temperature Range",
-            "query": """
-                SELECT 
-                    MIN(v.value_n) as min_temp,
-                    MAX(v.value_n) as max_temp,
-                    AVG(v.value_n) as avg_temp
-                FROM core.values_demo v
-                JOIN core.entity_tag et ON v.entity_id = et.entity_id
-                JOIN core.tag_def td ON et.tag_id = td.id
-                WHERE td.name = 'temp'
-            """
-        },
-        {
-            "name": "Latest Chiller Status",
-            "query": """
-                SELECT COUNT(*) as running_chillers
-                FROM core.values_demo_current v
-                JOIN core.entity_tag et ON v.entity_id = et.entity_id  
-                JOIN core.tag_def td ON et.tag_id = td.id
-                WHERE td.name = 'status' AND v.value_b = true
-                AND et.entity_id IN (
-                    SELECT DISTINCT et2.entity_id 
-                    FROM core.entity_tag et2
-                    JOIN core.tag_def td2 ON et2.tag_id = td2.id
-                    WHERE td2.name = 'chiller'
-                )
-            """
-        }
-    ]
-    
-    for sample in sample_queries:
-        try:
-            result = db.execute_query(sample['query'])
-            if result:
-                data = result[0]
-                if sample['name'] == "Average Zone Temperatures (All Data)":
-                    console.print(f"[green]OK[/green] {sample['name']}: {data['avg_temp']:.1f}°F ({data['sample_count']:,} readings)")
-                elif sample['name'] == "Zone Temperature Range":
-                    console.print(f"[green]OK[/green] {sample['name']}: {data['min_temp']:.1f}°F - {data['max_temp']:.1f}°F (avg: {data['avg_temp']:.1f}°F)")
-                else:
-                    # Handle other queries with single values
-                    value = list(data.values())[0]
-                    console.print(f"[green]OK[/green] {sample['name']}: {value}")
-            else:
-                console.print(f"[yellow]WARNING[/yellow] {sample['name']}: No data")
-        except Exception as e:
-            console.print(f"[red]ERROR[/red] {sample['name']}: {e}")
+    temperature = report['checks']['temperature']
+    if temperature['sample_count']:
+        console.print(f"[green]OK[/green] Average Zone Temperatures (24h): {temperature['avg_temp']:.1f}°F ({temperature['sample_count']:,} readings)")
+        console.print(f"[green]OK[/green] Zone Temperature Range (24h): {temperature['min_temp']:.1f}°F - {temperature['max_temp']:.1f}°F (avg: {temperature['avg_temp']:.1f}°F)")
+    else:
+        console.print("[yellow]WARNING[/yellow] Zone Temperatures (24h): No data")
+
+    try:
+        result = db.execute_query(f"""
+            SELECT COUNT(*) as running_chillers
+            FROM core.{value_table}_current v
+            JOIN core.entity_tag et ON v.entity_id = et.entity_id  
+            JOIN core.tag_def td ON et.tag_id = td.id
+            WHERE td.name = 'status' AND v.value_b = true
+            AND et.entity_id IN (
+                SELECT DISTINCT et2.entity_id 
+                FROM core.entity_tag et2
+                JOIN core.tag_def td2 ON et2.tag_id = td2.id
+                WHERE td2.name = 'chiller'
+            )
+        """)
+        if result:
+            console.print(f"[green]OK[/green] Latest Chiller Status: {result[0]['running_chillers']}")
+        else:
+            console.print("[yellow]WARNING[/yellow] Latest Chiller Status: No data")
+    except Exception as e:
+        console.print(f"[red]ERROR[/red] Latest Chiller Status: {e}")
 
 def main():
     """Main validation function."""
@@ -202,7 +218,7 @@ def main():
     # Connect and validate
     try:
         db = DatabaseConnection(db_config['database'])
-        display_validation_results(db)
+        display_validation_results(db, db_config['database'], db_config['tables']['value_table'])
         console.print("\n[bold green]Validation completed successfully![/bold green]")
     except Exception as e:
         console.print(f"\n[red]Validation failed: {e}[/red]")
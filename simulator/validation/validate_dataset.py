@@ -0,0 +1,98 @@
+"""Validate a value table in one pass with the chunked validation engine.
+
+Runs continuity, duplicate, totalizer, coverage and status checks over a
+single scan of the value table (one query per time chunk, chunks in
+parallel) and prints or writes a JSON report.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import yaml
+from service.validation_engine import ValidationEngine, report_to_json
+
+
+def load_config():
+    """Load configurations."""
+    db_config_path = Path(__file__).parent.parent / 'config' / 'database_config.yaml'
+    building_config_path = Path(__file__).parent.parent / 'config' / 'building_config.yaml'
+
+    with open(db_config_path, 'r') as f:
+        db_config = yaml.safe_load(f)
+
+    with open(building_config_path, 'r') as f:
+        building_config = yaml.safe_load(f)
+
+    return db_config, building_config
+
+
+def main():
+    """Run the single-pass validation."""
+    parser = argparse.ArgumentParser(description='Single-pass validation of simulator data')
+    parser.add_argument('--hours', type=float, default=24, help='Validate the last N hours (default 24)')
+    parser.add_argument('--start', type=str, help='Range start (ISO format, overrides --hours)')
+    parser.add_argument('--end', type=str, help='Range end, exclusive (ISO format, default now)')
+    parser.add_argument('--chunk-hours', type=float, default=24, help='Hours of data per chunk query')
+    parser.add_argument('--workers', type=int, default=4, help='Chunks scanned in parallel')
+    parser.add_argument('--output', type=str, help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SINGLE-PASS DATA VALIDATION")
+    print("=" * 60)
+
+    try:
+        db_config, building_config = load_config()
+        interval = building_config['generation']['data_interval_minutes']
+
+        end = datetime.fromisoformat(args.end) if args.end else datetime.now()
+        start = datetime.fromisoformat(args.start) if args.start else end - timedelta(hours=args.hours)
+
+        engine = ValidationEngine(
+            db_config['database'],
+            db_config['tables']['value_table'],
+            start,
+            end,
+            interval_minutes=interval,
+            chunk=timedelta(hours=args.chunk_hours),
+            workers=args.workers
+        )
+        report = engine.run()
+
+        output = report_to_json(report)
+        if args.output:
+            Path(args.output).write_text(output)
+            print(f"Report written to {args.output}")
+        else:
+            print(output)
+
+        print("\n" + "=" * 60)
+        print("VALIDATION SUMMARY")
+        print("=" * 60)
+        print(f"Scanned {report['rows_scanned']:,} rows in {report['chunks']} chunks "
+              f"({report['elapsed_seconds']}s)")
+
+        for name, check in report['checks'].items():
+            status = "✅ PASS" if check['passed'] else "❌ FAIL"
+            print(f"{status}: {name}")
+
+        if report['passed']:
+            print("\n✅ ALL VALIDATIONS PASSED")
+            sys.exit(0)
+        else:
+            print("\n⚠️  SOME VALIDATIONS FAILED")
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
-"""Validation script to check equipment status and current values."""
+"""Validation script to check equipment status and current values.
+
+Recent data for status points comes from one chunked scan of the value
+table with the validation engine (see validate_dataset.py for the full suite).
+"""
 
 import logging
 import sys
 import os
 import yaml
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from database.connection import DatabaseConnection
+from service.validation_engine import ValidationEngine, Reducer, StatusReducer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,16 +29,52 @@ def load_database_config():
     if not os.path.exists(config_path):
         # Fallback to environment variables
         return {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': int(os.getenv('DB_PORT', 5432)),
-            'database': os.getenv('DB_NAME', 'haystack'),
-            'user': os.getenv('DB_USER', 'postgres'),
-            'password': os.getenv('DB_PASSWORD', 'password')
+            'database': {
+                'host': os.getenv('DB_HOST', 'localhost'),
+                'port': int(os.getenv('DB_PORT', 5432)),
+                'database': os.getenv('DB_NAME', 'haystack'),
+                'user': os.getenv('DB_USER', 'postgres'),
+                'password': os.getenv('DB_PASSWORD', 'password')
+            },
+            'tables': {'value_table': 'values_demo'}
         }
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-        return config['database']
+        return yaml.safe_load(f)
+
+
+class StatusPointActivityReducer(Reducer):
+    """Row count, latest timestamp and statuses seen per status point."""
+
+    name = 'status_points'
+
+    def __init__(self, entity_ids: Iterable[int]):
+        """Initialize reducer.
+
+        Args:
+            entity_ids: Status point entity IDs
+        """
+        self.entity_ids = set(entity_ids)
+
+    def scan(self, chunk, context):
+        data = chunk[chunk['entity_id'].isin(self.entity_ids)].assign(status=lambda df: df['status'].fillna('null'))
+        grouped = data.groupby('entity_id')
+        return {
+            int(entity_id): (int(count), latest, set(statuses))
+            for entity_id, count, latest, statuses in zip(
+                grouped.size().index, grouped.size(), grouped['ts'].max(), grouped['status'].unique()
+            )
+        }
+
+    def combine(self, partials, context):
+        points: Dict[int, Dict[str, Any]] = {}
+        for partial in partials:
+            for entity_id, (count, latest, statuses) in partial.items():
+                point = points.setdefault(entity_id, {'value_count': 0, 'latest_ts': latest, 'statuses': set()})
+                point['value_count'] += count
+                point['latest_ts'] = max(point['latest_ts'], latest)
+                point['statuses'] |= statuses
+        return {'passed': True, 'points': points}
 
 
 def get_equipment_list(db: DatabaseConnection) -> List[Dict[str, Any]]:
@@ -137,12 +178,14 @@ def get_status_points_for_equipment(db: DatabaseConnection, equip_id: str) -> Li
     return db.execute_query(query, (equip_id,))
 
 
-def get_current_values_for_points(db: DatabaseConnection, point_entity_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+def get_current_values_for_points(db: DatabaseConnection, point_entity_ids: List[int],
+                                  current_table: str = 'values_demo_current') -> Dict[int, Dict[str, Any]]:
     """Get current values for list of point entity IDs.
     
     Args:
         db: Database connection instance
         point_entity_ids: List of point entity IDs
+        current_table: Name of the current values table
         
     Returns:
         Dictionary mapping entity_id to current value data
@@ -160,7 +203,7 @@ def get_current_values_for_points(db: DatabaseConnection, point_entity_ids: List
             value_s,
             value_ts,
             status
-        FROM core.values_demo_current 
+        FROM core.{current_table} 
         WHERE entity_id IN ({placeholders})
     """
     
@@ -169,48 +212,38 @@ def get_current_values_for_points(db: DatabaseConnection, point_entity_ids: List
     return {row['entity_id']: dict(row) for row in results}
 
 
-def check_recent_values(db: DatabaseConnection, point_entity_ids: List[int], hours_back: int = 24) -> Dict[int, Dict[str, Any]]:
-    """Check for recent values in time-series table.
+def check_recent_values(db_config: Dict[str, Any], value_table: str, point_entity_ids: List[int],
+                        hours_back: int = 24) -> Dict[str, Any]:
+    """Check for recent values of status points in one scan of the time-series table.
     
     Args:
-        db: Database connection instance
+        db_config: Database connection configuration
+        value_table: Name of the values table
         point_entity_ids: List of point entity IDs
         hours_back: How many hours back to check
         
     Returns:
-        Dictionary with recent value statistics
+        Validation report with per-point 'status_points' and the 'status' distribution
     """
-    if not point_entity_ids:
-        return {}
-    
-    since_time = datetime.now() - timedelta(hours=hours_back)
-    placeholders = ','.join(['%s'] * len(point_entity_ids))
-    
-    query = f"""
-        SELECT 
-            entity_id,
-            COUNT(*) as value_count,
-            MAX(ts) as latest_ts,
-            MIN(ts) as earliest_ts,
-            COUNT(DISTINCT status) as status_variety,
-            array_agg(DISTINCT status) as statuses
-        FROM core.values_demo 
-        WHERE entity_id IN ({placeholders})
-        AND ts >= %s
-        GROUP BY entity_id
-    """
-    
-    params = tuple(point_entity_ids) + (since_time,)
-    results = db.execute_query(query, params)
-    
-    return {row['entity_id']: dict(row) for row in results}
+    end = datetime.now()
+    engine = ValidationEngine(
+        db_config,
+        value_table,
+        end - timedelta(hours=hours_back),
+        end,
+        chunk=timedelta(hours=6),
+        reducers=[StatusPointActivityReducer(point_entity_ids), StatusReducer()]
+    )
+    return engine.run()
 
 
-def validate_equipment_status(db: DatabaseConnection):
+def validate_equipment_status(db: DatabaseConnection, db_config: Dict[str, Any], value_table: str = 'values_demo'):
     """Validate equipment status and current values.
     
     Args:
         db: Database connection instance
+        db_config: Database connection configuration, for the value table scan
+        value_table: Name of the values table
         
     Returns:
         Dictionary with validation results
@@ -220,6 +253,7 @@ def validate_equipment_status(db: DatabaseConnection):
         'equipment_with_status_points': 0,
         'status_points_with_current_values': 0,
         'status_points_with_recent_data': 0,
+        'status_counts': {},
         'equipment_details': [],
         'issues': []
     }
@@ -253,23 +287,16 @@ def validate_equipment_status(db: DatabaseConnection):
                 
                 # Check current values for status points
                 point_ids = [sp['point_entity_id'] for sp in status_points]
-                current_values = get_current_values_for_points(db, point_ids)
-                recent_values = check_recent_values(db, point_ids)
+                current_values = get_current_values_for_points(db, point_ids, f"{value_table}_current")
                 
                 for sp in status_points:
                     point_id = sp['point_entity_id']
                     sp['has_current_value'] = point_id in current_values
                     sp['current_value_data'] = current_values.get(point_id)
-                    sp['has_recent_data'] = point_id in recent_values
-                    sp['recent_data_stats'] = recent_values.get(point_id)
                     
                     if sp['has_current_value']:
                         equip_detail['status_points_with_current_values'] += 1
                         results['status_points_with_current_values'] += 1
-                        
-                    if sp['has_recent_data']:
-                        equip_detail['status_points_with_recent_data'] += 1
-                        results['status_points_with_recent_data'] += 1
         
         results['equipment_details'].append(equip_detail)
         
@@ -279,6 +306,21 @@ def validate_equipment_status(db: DatabaseConnection):
         elif equip_detail['status_points_with_current_values'] == 0:
             results['issues'].append(f"Equipment {equip['equip_id']} ({equip['equip_name']}) status points have no current values")
     
+    # Recent data for every status point in one scan
+    all_point_ids = [sp['point_entity_id'] for equip in results['equipment_details'] for sp in equip['status_points']]
+    report = check_recent_values(db_config, value_table, all_point_ids)
+    recent_values = report['checks']['status_points']['points']
+    results['status_counts'] = report['checks']['status']['status_counts']
+    
+    for equip_detail in results['equipment_details']:
+        for sp in equip_detail['status_points']:
+            sp['has_recent_data'] = sp['point_entity_id'] in recent_values
+            sp['recent_data_stats'] = recent_values.get(sp['point_entity_id'])
+            
+            if sp['has_recent_data']:
+                equip_detail['status_points_with_recent_data'] += 1
+                results['status_points_with_recent_data'] += 1
+    
     return results
 
 
@@ -293,6 +335,7 @@ def print_validation_results(results: Dict[str, Any]):
     print(f"Equipment with status points: {results['equipment_with_status_points']}")
     print(f"Status points with current values: {results['status_points_with_current_values']}")
     print(f"Status points with recent data: {results['status_points_with_recent_data']}")
+    print(f"Data quality status (24h, all points): {results['status_counts']}")
     
     # Equipment details
     print("\n" + "="*60)
@@ -369,14 +412,15 @@ def main():
     
     try:
         # Load database configuration
-        db_config = load_database_config()
+        config = load_database_config()
+        db_config = config['database']
         logger.info(f"Connecting to database: {db_config['host']}:{db_config['port']}/{db_config['database']}")
         
         # Create database connection
         db = DatabaseConnection(db_config)
         
         # Validate equipment status
-        results = validate_equipment_status(db)
+        results = validate_equipment_status(db, db_config, config['tables']['value_table'])
         
         # Print results
         print_validation_results(results)